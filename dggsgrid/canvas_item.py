@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""Map canvas item that paints DGGS cell outlines from one prebuilt path.
+
+A ``QgsRubberBand`` keeps a growing multi-geometry and re-renders it through the
+geometry engine; for dense overlays ``CellRingsItem`` instead holds a single
+``QPainterPath`` of all cell rings in canvas CRS map units, built off the GUI
+thread, and draws it with one call through the current map-to-pixel transform.
+"""
+
+from qgis.core import QgsRectangle
+from qgis.gui import QgsMapCanvasItem
+from qgis.PyQt.QtCore import Qt
+from qgis.PyQt.QtGui import QPainter, QPainterPath, QPen, QTransform
+
+
+def geometry_path(geometries):
+    """QPainterPath with the rings of every part of *geometries* (QgsGeometry list).
+
+    Safe to call from a worker thread.
+    """
+    path = QPainterPath()
+    for geometry in geometries:
+        if geometry is None or geometry.isEmpty():
+            continue
+        if geometry.isMultipart():
+            for part in geometry.asGeometryCollection():
+                path.addPolygon(part.asQPolygonF())
+        else:
+            path.addPolygon(geometry.asQPolygonF())
+    return path
+
+
+class CellRingsItem(QgsMapCanvasItem):
+    """Canvas item drawing cell outlines from a ``QPainterPath`` in map units."""
+
+    def __init__(self, canvas):
+        super().__init__(canvas)
+        self.canvas = canvas
+        self._path = QPainterPath()
+        self._pen = QPen()
+        self._pen.setCosmetic(True)
+        self._pen.setJoinStyle(Qt.PenJoinStyle.MiterJoin)
+        # Same stacking as QgsRubberBand
+        self.setZValue(1000)
+
+    def setPath(self, path, color, width):
+        self._path = path
+        self._pen.setColor(color)
+        self._pen.setWidthF(width)
+        bounds = path.boundingRect()
+        self.setRect(
+            QgsRectangle(bounds.left(), bounds.top(), bounds.right(), bounds.bottom())
+        )
+        self.update()
+
+    def clear(self):
+        self._path = QPainterPath()
+        self.update()
+
+    def paint(self, painter, option=None, widget=None):
+        if self._path.isEmpty():
+            return
+        # Affine map units -> item pixels, anchored at the path origin for precision
+        bounds = self._path.boundingRect()
+        x0, y0 = bounds.left(), bounds.top()
+        map_to_pixel = self.canvas.mapSettings().mapToPixel()
+        origin = map_to_pixel.transform(x0, y0)
+        step_x = map_to_pixel.transform(x0 + 1, y0)
+        step_y = map_to_pixel.transform(x0, y0 + 1)
+        m11 = step_x.x() - origin.x()
+        m12 = step_x.y() - origin.y()
+        m21 = step_y.x() - origin.x()
+        m22 = step_y.y() - origin.y()
+        position = self.pos()
+        transform = QTransform(
+            m11,
+            m12,
+            m21,
+            m22,
+            origin.x() - m11 * x0 - m21 * y0 - position.x(),
+            origin.y() - m12 * x0 - m22 * y0 - position.y(),
+        )
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+        painter.setTransform(transform, True)
+        painter.setPen(self._pen)
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawPath(self._path)
+        painter.restore()
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""Cell budget for DGGS Viz canvas overlays.
+
+``estimate_cells`` gives a fast, closed-form estimate of how many cells of a
+DGGS fall in an EPSG:4326 bounding box: the global cell count at the resolution
+times the share of the globe (or of the grid's own domain) the box covers.
+``fit_resolution`` uses it to step an overlay down to coarser (parent) cells
+when the requested resolution would exceed the per-frame budget.
+"""
+
+from math import log, pi, radians, sin, tan
+
+from vgrid.dggs import maidenhead
+from vgrid.utils.constants import (
+    DGGAL_TYPES,
+    DGGRID_TYPES,
+    DGGS_TYPES,
+    GEOREF_RESOLUTION_DEGREES,
+)
+from vgrid.utils.io import gars_num_cells
+
+# How the cells of a grid are spread over the globe
+SPHERE = "sphere"  # roughly equal-area cells
+LATLON = "latlon"  # equal-angle cells in longitude/latitude
+MERCATOR = "mercator"  # Web Mercator tiles
+
+MERCATOR_MAX_LAT = 85.05112878
+DIGIPIN_BOUNDS = (63.5, 2.5, 99.5, 38.5)
+
+
+def _olc_num_cells(resolution):
+    if resolution <= 10:
+        return 162 * (400 ** ((resolution // 2) - 1))
+    return 162 * (400**4) * (20 ** (resolution - 10))
+
+
+def _olc_coarser(resolution):
+    # Pairs of digits up to 10 characters, one grid refinement character after that
+    return resolution - 2 if resolution <= 10 else resolution - 1
+
+
+def _georef_num_cells(resolution):
+    grid_size_deg = GEOREF_RESOLUTION_DEGREES[resolution]
+    return round(360.0 / grid_size_deg) * round(180.0 / grid_size_deg)
+
+
+def _ease_num_cells(resolution):
+    from ease_dggs.constants import levels_specs
+
+    return levels_specs[resolution]["n_row"] * levels_specs[resolution]["n_col"]
+
+
+def _a5_num_cells(resolution):
+    return 12 if resolution == 0 else 60 * (4 ** (resolution - 1))
+
+
+def _dggal_num_cells(dggal_type):
+    if dggal_type == "gnosis":
+        return lambda r: (16 * (4**r) + 8) // 3
+    if dggal_type == "healpix":
+        return lambda r: 12 * (4**r)
+    if dggal_type == "rhealpix":
+        return lambda r: 6 * (9**r)
+    aperture = int(dggal_type[4])
+    if dggal_type[5] == "h":
+        return lambda r: 10 * (aperture**r) + 2
+    return lambda r: 10 * (aperture**r)
+
+
+def _dggrid_num_cells(dggs_type):
+    name = dggs_type.upper()
+    if name == "IGEO7" or name.endswith("7H"):
+        aperture = 7
+    elif name.endswith("3H") and not name.endswith("43H"):
+        aperture = 3
+    else:
+        # Aperture 4 and mixed 4/3 grids (43H, PLANETRISK, SUPERFUND)
+        aperture = 4
+    if name.endswith("4T"):
+        return lambda r: 20 * (aperture**r)
+    if name.endswith("4D"):
+        return lambda r: 10 * (aperture**r)
+    return lambda r: 10 * (aperture**r) + 2
+
+
+# key: (number of cells on the globe at a resolution, layout)
+CELL_COUNTS = {
+    "h3": (lambda r: 2 + 120 * (7**r), SPHERE),
+    "s2": (lambda r: 6 * (4**r), SPHERE),
+    "a5": (_a5_num_cells, SPHERE),
+    "rhealpix": (lambda r: 6 * (9**r), SPHERE),
+    "isea4t": (lambda r: 20 * (4**r), SPHERE),
+    "isea3h": (lambda r: 10 * (3**r) + 2, SPHERE),
+    "ease": (_ease_num_cells, SPHERE),
+    "qtm": (lambda r: 8 * (4 ** (r - 1)), SPHERE),
+    "olc": (_olc_num_cells, LATLON),
+    "geohash": (lambda r: 32**r, LATLON),
+    "georef": (_georef_num_cells, LATLON),
+    "tilecode": (lambda r: 4**r, MERCATOR),
+    "maidenhead": (maidenhead.num_cells, LATLON),
+    "gars": (gars_num_cells, LATLON),
+    "digipin": (lambda r: 16**r, LATLON),
+}
+CELL_COUNTS.update(
+    {
+        f"dggal_{dggal_type}": (_dggal_num_cells(dggal_type), SPHERE)
+        for dggal_type in DGGAL_TYPES
+    }
+)
+
+COARSER = {"olc": _olc_coarser}
+
+
+def _spec(key):
+    """Return (num_cells, layout, min_res) for an overlay key, or None if unknown."""
+    if isinstance(key, tuple) and key[0] == "dggrid":
+        dggs_type = key[1]
+        if dggs_type not in DGGRID_TYPES:
+            return None
+        return (
+            _dggrid_num_cells(dggs_type),
+            SPHERE,
+            DGGRID_TYPES[dggs_type]["min_res"],
+        )
+    if key not in CELL_COUNTS:
+        return None
+    num_cells, layout = CELL_COUNTS[key]
+    if key.startswith("dggal_"):
+        min_res = DGGAL_TYPES[key[len("dggal_") :]]["min_res"]
+    else:
+        min_res = DGGS_TYPES[key]["min_res"]
+    return num_cells, layout, min_res
+
+
+def _clip(bbox, bounds):
+    min_x = max(bbox[0], bounds[0])
+    min_y = max(bbox[1], bounds[1])
+    max_x = min(bbox[2], bounds[2])
+    max_y = min(bbox[3], bounds[3])
+    return min_x, min_y, max(min_x, max_x), max(min_y, max_y)
+
+
+def _mercator_y(lat):
+    return log(tan(pi / 4 + radians(lat) / 2))
+
+
+def coverage_fraction(bbox, layout, domain=(-180.0, -90.0, 180.0, 90.0)):
+    """Share of the grid's cells that fall in *bbox* for the given layout."""
+    min_lon, min_lat, max_lon, max_lat = _clip(bbox, domain)
+    lon_fraction = (max_lon - min_lon) / (domain[2] - domain[0])
+    if layout == SPHERE:
+        return lon_fraction * (sin(radians(max_lat)) - sin(radians(min_lat))) / 2.0
+    if layout == MERCATOR:
+        min_lat = max(min_lat, -MERCATOR_MAX_LAT)
+        max_lat = min(max_lat, MERCATOR_MAX_LAT)
+        if max_lat <= min_lat:
+            return 0.0
+        return (
+            lon_fraction
+            * (_mercator_y(max_lat) - _mercator_y(min_lat))
+            / (2 * _mercator_y(MERCATOR_MAX_LAT))
+        )
+    return lon_fraction * (max_lat - min_lat) / (domain[3] - domain[1])
+
+
+def estimate_cells(key, resolution, bbox):
+    """Approximate number of cells of overlay *key* at *resolution* within *bbox*.
+
+    *bbox* is (min_lon, min_lat, max_lon, max_lat) in EPSG:4326. Returns None if
+    there is no estimator for *key*.
+    """
+    spec = _spec(key)
+    if spec is None:
+        return None
+    num_cells, layout, _ = spec
+    domain = DIGIPIN_BOUNDS if key == "digipin" else (-180.0, -90.0, 180.0, 90.0)
+    return round(num_cells(resolution) * coverage_fraction(bbox, layout, domain))
+
+
+def fit_resolution(key, resolution, bbox, max_cells):
+    """Return the finest resolution <= *resolution* whose cells in *bbox* fit *max_cells*.
+
+    Steps down one level at a time (i.e. to parent cells) and stops at the
+    grid's minimum resolution. A *max_cells* of 0 or less disables the budget.
+    """
+    spec = _spec(key)
+    if max_cells <= 0 or spec is None:
+        return resolution
+    min_res = spec[2]
+    coarser = COARSER.get(key, lambda r: r - 1)
+    try:
+        while (
+            resolution > min_res and estimate_cells(key, resolution, bbox) > max_cells
+        ):
+            resolution = max(min_res, coarser(resolution))
+    except (KeyError, ValueError):
+        pass
+    return resolution
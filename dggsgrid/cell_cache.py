@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""Pan-aware cell cache for DGGS Viz canvas overlays.
+
+Each overlay keeps the cells of the frame it last drew. When the canvas is
+panned at the same resolution only the newly exposed strips of the extent are
+enumerated; cells that leave a margin around the viewport are dropped from the
+frame. Canvas-CRS geometries are kept in an LRU keyed by
+(DGGS type, resolution, cell id) so panning back is also a cache hit.
+"""
+
+from collections import OrderedDict
+from threading import Lock
+
+from ..settings import settings
+from .grid_task import to_canvas_geometries
+from .overlay_stats import count, timed
+
+# Fraction of the extent width/height kept around the viewport before cells are dropped
+CACHE_MARGIN = 0.5
+
+
+def frame_context(canvas_crs, *options):
+    """Cache context for geometries drawn in *canvas_crs* with the given build options."""
+    return (canvas_crs.authid() or canvas_crs.toWkt(),) + options
+
+
+def _intersects(a, b):
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def _intersects_wrapped(bounds, bbox):
+    """Like _intersects, also matching cells shifted by 360 degrees across the antimeridian."""
+    return any(
+        _intersects(bounds, (bbox[0] + shift, bbox[1], bbox[2] + shift, bbox[3]))
+        for shift in (0.0, -360.0, 360.0)
+    )
+
+
+def _expand(bbox, margin):
+    dx = (bbox[2] - bbox[0]) * margin
+    dy = (bbox[3] - bbox[1]) * margin
+    return (bbox[0] - dx, bbox[1] - dy, bbox[2] + dx, bbox[3] + dy)
+
+
+def exposed_strips(old_bbox, new_bbox):
+    """Return the rectangles of *new_bbox* not covered by *old_bbox*.
+
+    Boxes are (min_lon, min_lat, max_lon, max_lat). Up to four strips are
+    returned; the whole new box when the two do not overlap.
+    """
+    if old_bbox is None or not _intersects(old_bbox, new_bbox):
+        return [new_bbox]
+    min_x, min_y, max_x, max_y = new_bbox
+    strips = []
+    if min_x < old_bbox[0]:
+        strips.append((min_x, min_y, old_bbox[0], max_y))
+    if max_x > old_bbox[2]:
+        strips.append((old_bbox[2], min_y, max_x, max_y))
+    mid_min_x = max(min_x, old_bbox[0])
+    mid_max_x = min(max_x, old_bbox[2])
+    if min_y < old_bbox[1]:
+        strips.append((mid_min_x, min_y, mid_max_x, old_bbox[1]))
+    if max_y > old_bbox[3]:
+        strips.append((mid_min_x, old_bbox[3], mid_max_x, max_y))
+    return strips
+
+
+class CellFrame:
+    """Cells of one drawn frame: {cell_id: (canvas geometry, EPSG:4326 bounds)}."""
+
+    def __init__(self, context, resolution, bbox, cells=None):
+        self.context = context
+        self.resolution = resolution
+        self.bbox = bbox
+        self.cells = cells if cells is not None else {}
+
+
+class CellCache:
+    """LRU of canvas-CRS cell geometries plus the last committed frame.
+
+    ``context`` is any hashable describing how geometries were built (canvas
+    CRS, antimeridian mode, ...); a change invalidates everything.
+    """
+
+    def __init__(self, dggs_type):
+        self.dggs_type = dggs_type
+        self._cells = OrderedDict()
+        self._lock = Lock()
+        self._context = None
+        self._frame = None
+
+    def clear(self):
+        with self._lock:
+            self._cells.clear()
+            self._context = None
+            self._frame = None
+
+    def begin_frame(self, context, resolution, bbox):
+        """Start a frame for *bbox* and return it with the strips still to compute."""
+        with self._lock:
+            if context != self._context:
+                self._cells.clear()
+                self._context = context
+                self._frame = None
+            previous = self._frame
+
+        if (
+            previous is None
+            or previous.resolution != resolution
+            or not _intersects(previous.bbox, bbox)
+        ):
+            return CellFrame(context, resolution, bbox), [bbox]
+
+        keep = _expand(bbox, CACHE_MARGIN)
+        retained = {
+            cell_id: entry
+            for cell_id, entry in previous.cells.items()
+            if _intersects_wrapped(entry[1], keep)
+        }
+        frame = CellFrame(context, resolution, bbox, retained)
+        return frame, exposed_strips(previous.bbox, bbox)
+
+    def commit(self, frame):
+        """Remember *frame* as drawn (call on the GUI thread once it is shown)."""
+        with self._lock:
+            if frame.context == self._context:
+                self._frame = frame
+
+    def _get(self, context, resolution, cell_id):
+        key = (self.dggs_type, resolution, cell_id)
+        with self._lock:
+            if context != self._context:
+                return None
+            entry = self._cells.get(key)
+            if entry is not None:
+                self._cells.move_to_end(key)
+            return entry
+
+    def _put(self, context, resolution, cell_id, entry):
+        budget = settings.overlayCacheSize
+        if budget <= 0:
+            return
+        key = (self.dggs_type, resolution, cell_id)
+        with self._lock:
+            if context != self._context:
+                return
+            self._cells[key] = entry
+            self._cells.move_to_end(key)
+            while len(self._cells) > budget:
+                self._cells.popitem(last=False)
+
+    def fill(self, task, frame, strips, cells_in_bbox, cell_polygon, trans_to_canvas):
+        """Add the cells of *strips* to *frame* and return all frame geometries.
+
+        ``cells_in_bbox(bbox)`` yields cell ids and ``cell_polygon(cell_id)``
+        returns a shapely polygon in EPSG:4326 (or None to skip). Cells missing
+        from the cache are reprojected with *trans_to_canvas* in one batch.
+        Returns None if *task* was canceled.
+        """
+        pending = {}
+        hits = 0
+        for strip in strips:
+            with timed("enumerate"):
+                cell_ids = list(cells_in_bbox(strip))
+            misses = {}
+            for cell_id in cell_ids:
+                if task.isCanceled():
+                    return None
+                if cell_id in frame.cells or cell_id in pending:
+                    continue
+                entry = self._get(frame.context, frame.resolution, cell_id)
+                if entry is not None:
+                    frame.cells[cell_id] = entry
+                    hits += 1
+                    continue
+                misses[cell_id] = None
+
+            with timed("geometry"):
+                for cell_id in misses:
+                    if task.isCanceled():
+                        return None
+                    polygon = cell_polygon(cell_id)
+                    if polygon is None or polygon.is_empty:
+                        continue
+                    pending[cell_id] = polygon
+        count("cache_hits", hits)
+        count("cache_misses", len(pending))
+
+        geometries = to_canvas_geometries(list(pending.values()), trans_to_canvas)
+        for (cell_id, polygon), geometry in zip(pending.items(), geometries):
+            entry = (geometry, polygon.bounds)
+            self._put(frame.context, frame.resolution, cell_id, entry)
+            frame.cells[cell_id] = entry
+        return [geometry for geometry, _ in frame.cells.values()]
@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+"""Canvas overlay grids for DGGAL types.
+
+All DGGAL overlays share one DGGRS instance per type and an LRU of zone
+polygons keyed by (type, level, zone). DGGAL is not known to be thread-safe,
+and the render task of a frame may still run while its successor starts, so
+every call into a DGGRS instance holds that type's lock. Zone outlines are read straight from
+the zone handles returned by ``listZones`` (refined WGS84 vertices), without
+going through text zone IDs and ``dggal_to_geo``.
+"""
+
+from collections import OrderedDict
+from threading import Lock, RLock
+
+import shapely
+from qgis.core import QgsWkbTypes
+from qgis.gui import QgsRubberBand
+from qgis.PyQt.QtCore import QObject, pyqtSlot
+
+from vgrid.utils.antimeridian import fix_polygon
+from vgrid.utils.constants import DGGAL_TYPES
+from vgrid.utils.io import validate_coordinate
+
+from ..settings import settings
+from .cell_cache import CellCache, frame_context
+from .global_grids import global_cells
+from .grid_task import GridRenderer
+from .overlay_manager import WORLD_BBOX
+
+# DGGAL imports
+from dggal import *
+
+# Initialize dggal application
+app = Application(appGlobals=globals())
+pydggal_setup(app)
+
+# dggs_type: (label, relativeDepth and mmPerPixel for getLevelFromScaleDenominator,
+#             coarsest level drawn as a whole-world grid, split at the antimeridian)
+DGGAL_VIZ_TYPES = {
+    "gnosis": ("GNOSIS", 8, 0, 3, False),
+    "isea4r": ("ISEA4R", 8, 0.28, 2, True),
+    "isea9r": ("ISEA9R", 5, 0.28, 2, True),
+    "isea3h": ("ISEA3H", 10, 0.28, 3, True),
+    "isea7h": ("ISEA7H", 6, 0.28, 2, True),
+    "isea7h_z7": ("ISEA7H_Z7", 6, 0.28, 2, True),
+    "ivea4r": ("IVEA4R", 8, 0.28, 2, True),
+    "ivea9r": ("IVEA9R", 5, 0.28, 2, True),
+    "ivea3h": ("IVEA3H", 10, 0.28, 3, True),
+    "ivea7h": ("IVEA7H", 6, 0.28, 2, True),
+    "ivea7h_z7": ("IVEA7H_Z7", 6, 0.28, 2, True),
+    "rtea4r": ("RTEA4R", 8, 0.28, 2, True),
+    "rtea9r": ("RTEA9R", 5, 0.28, 2, True),
+    "rtea3h": ("RTEA3H", 10, 0.28, 3, True),
+    "rtea7h": ("RTEA7H", 6, 0.28, 2, True),
+    "rtea7h_z7": ("RTEA7H_Z7", 6, 0.28, 2, True),
+    "healpix": ("HEALPix", 8, 0.28, 2, True),
+    "rhealpix": ("rHEALPix", 5, 0.28, 2, True),
+}
+
+_dggrs = {}  # dggs_type: (DGGRS instance, lock serializing calls to it)
+_dggrs_lock = Lock()
+
+_zones = OrderedDict()
+_zones_lock = Lock()
+
+
+def dggal_dggrs(dggs_type):
+    """Shared DGGRS instance for *dggs_type* and the lock to hold while using it."""
+    with _dggrs_lock:
+        entry = _dggrs.get(dggs_type)
+        if entry is None:
+            dggrs = globals()[DGGAL_TYPES[dggs_type]["class_name"]]()
+            entry = _dggrs[dggs_type] = (dggrs, RLock())
+        return entry
+
+
+def zone_polygon(dggs_type, level, zone):
+    """EPSG:4326 polygon of the zone handle *zone* (an int), or None.
+
+    Polygons are kept in an LRU shared by all DGGAL overlays, bounded by the
+    "DGGS Viz Cache Size" setting.
+    """
+    key = (dggs_type, level, zone)
+    with _zones_lock:
+        polygon = _zones.get(key)
+        if polygon is not None:
+            _zones.move_to_end(key)
+            return polygon
+
+    dggrs, dggrs_lock = dggal_dggrs(dggs_type)
+    with dggrs_lock:
+        vertices = dggrs.getZoneRefinedWGS84Vertices(zone, 0)
+        if not vertices or not vertices.count:
+            return None
+        polygon = shapely.Polygon(
+            [
+                (float(vertices[i].lon), float(vertices[i].lat))
+                for i in range(vertices.count)
+            ]
+        )
+
+    budget = settings.overlayCacheSize
+    if budget > 0:
+        with _zones_lock:
+            _zones[key] = polygon
+            _zones.move_to_end(key)
+            while len(_zones) > budget:
+                _zones.popitem(last=False)
+    return polygon
+
+
+class DGGALGrid(QObject):
+    def __init__(self, vgridtools, canvas, iface, dggs_type: str):
+        super().__init__()
+        self.vgridtools = vgridtools
+        self.canvas = canvas
+        self.iface = iface
+        self.dggs_type = dggs_type
+        self.key = f"dggal_{dggs_type}"
+        (
+            self.label,
+            self.relative_depth,
+            self.mm_per_pixel,
+            self.world_resolution,
+            self.antimeridian,
+        ) = DGGAL_VIZ_TYPES[dggs_type]
+        self.dggrs, self.dggrs_lock = dggal_dggrs(dggs_type)
+
+        self.dggal_marker = QgsRubberBand(self.canvas, QgsWkbTypes.PolygonGeometry)
+        self.dggal_marker.setStrokeColor(self._grid_color())
+        self.dggal_marker.setWidth(settings.gridWidth)
+
+        # DGGAL auto-update toggle and debounced extent listener
+        self.dggal_enabled = False
+        self.vgridtools.overlay_manager.register(
+            lambda: self.dggal_enabled, self._refreshDGGALGridOnExtent
+        )
+        self.dggal_renderer = GridRenderer(
+            self.canvas, self.dggal_marker, f"DGGAL {self.label} grid"
+        )
+        self.dggal_cache = CellCache(self.key)
+        self.removeMarker()
+
+    def _grid_color(self):
+        return getattr(settings, f"{self.key}Color")
+
+    def _resolution_from_scale(self, scale):
+        with self.dggrs_lock:
+            return self.dggrs.getLevelFromScaleDenominator(
+                scale, relativeDepth=self.relative_depth, mmPerPixel=self.mm_per_pixel
+            )
+
+    def dggal_grid(self):
+        try:
+            view = self.vgridtools.overlay_manager.frame()
+            canvas_crs = view.canvas_crs
+            resolution = view.resolution(self.key, self._resolution_from_scale)
+            if settings.zoomLevel:
+                zoom = view.zoom
+                self.iface.mainWindow().statusBar().showMessage(
+                    f"Zoom Level: {zoom:.2f} | DGGAL {self.label} resolution: {resolution}{view.budget_note(self.key)}"
+                )
+
+            if resolution <= self.world_resolution:
+                min_lon, min_lat, max_lon, max_lat = -180, -90, 180, 90
+            else:
+                min_lon, min_lat, max_lon, max_lat = view.bbox_4326
+
+            min_lon, min_lat, max_lon, max_lat = validate_coordinate(
+                min_lon, min_lat, max_lon, max_lat
+            )
+            split_antimeridian = self.antimeridian and settings.splitAntimeridian
+            trans_to_canvas = view.canvas_transform()
+            frame, strips = self.dggal_cache.begin_frame(
+                frame_context(canvas_crs, split_antimeridian),
+                resolution,
+                (min_lon, min_lat, max_lon, max_lat),
+            )
+
+            def cells_in_bbox(strip):
+                # Zone handles for the exposed strip and resolution
+                ll = GeoPoint(strip[1], strip[0])
+                ur = GeoPoint(strip[3], strip[2])
+                with self.dggrs_lock:
+                    zones = self.dggrs.listZones(resolution, GeoExtent(ll, ur))
+                    return [int(zone) for zone in zones]
+
+            def cell_polygon(zone):
+                try:
+                    polygon = zone_polygon(self.dggs_type, resolution, zone)
+                    if polygon is not None and split_antimeridian:
+                        polygon = fix_polygon(polygon)
+                    return polygon
+                except Exception:
+                    return None
+
+            def build(task):
+                if resolution <= self.world_resolution:
+                    # Whole-world grid: built once, then read from disk
+                    world = global_cells(
+                        self.key,
+                        resolution,
+                        (split_antimeridian,),
+                        lambda: (
+                            (zone, cell_polygon(zone))
+                            for zone in cells_in_bbox(WORLD_BBOX)
+                        ),
+                    )
+                    return self.dggal_cache.fill(
+                        task,
+                        frame,
+                        strips,
+                        lambda strip: world,
+                        world.get,
+                        trans_to_canvas,
+                    )
+                return self.dggal_cache.fill(
+                    task,
+                    frame,
+                    strips,
+                    cells_in_bbox,
+                    cell_polygon,
+                    trans_to_canvas,
+                )
+
+            self.dggal_renderer.submit(
+                build,
+                self._grid_color(),
+                on_applied=lambda: self.dggal_cache.commit(frame),
+            )
+
+        except Exception:
+            return
+
+    def enable_dggal(self, enabled: bool):
+        self.dggal_enabled = bool(enabled)
+        if not self.dggal_enabled:
+            self.removeMarker()
+
+    def _refreshDGGALGridOnExtent(self):
+        if self.dggal_enabled:
+            self.dggal_grid()
+
+    @pyqtSlot()
+    def removeMarker(self):
+        self.dggal_renderer.clear()
+        self.dggal_cache.clear()
+
+    def cleanup(self):
+        # Disconnect signals and delete rubber band
+        try:
+            self.vgridtools.overlay_manager.unregister(self._refreshDGGALGridOnExtent)
+            self.dggal_renderer.cleanup()
+        except Exception:
+            pass
+
+        try:
+            self.dggal_marker.reset(QgsWkbTypes.PolygonGeometry)
+            self.dggal_marker.deleteLater()
+        except Exception:
+            pass
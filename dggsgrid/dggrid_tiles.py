@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+"""Disk-backed tile cache for the DGGRID canvas overlays.
+
+Every DGGRID run starts the external executable through temporary files
+(about 1-3 s), so the overlay asks for cells on a fixed lon/lat tile scheme
+per resolution instead of the exact viewport. Finished tiles are written to
+``cache/dggrid_tiles`` (same ``.npz`` layout as the global grids) and kept in
+a small in-memory LRU; DGGRID only runs, once, for the tiles of a frame that
+are missing from both.
+"""
+
+import hashlib
+import os
+import shutil
+from collections import OrderedDict
+from math import ceil, floor
+from threading import Lock
+
+import numpy as np
+import shapely
+
+from ..utils.dggrid_instance import generate_grid_qgis, normalize_dggrid_cell_id
+from .cell_budget import estimate_cells
+from .global_grids import CACHE_DIR, load_cells, save_cells, vgrid_version
+from .overlay_stats import count, timed
+
+_DGGRID_TILES_DIR = os.path.join(CACHE_DIR, "dggrid_tiles")
+
+# Bump when the tile scheme or the file layout changes
+DGGRID_TILES_FORMAT = 1
+
+# Aim for about this many cells per tile; tiles are 180 / 2**k degrees wide
+TILE_TARGET_CELLS = 2000
+MAX_TILE_LEVEL = 16
+
+# Tiles kept in memory across frames
+TILE_MEMORY_SIZE = 256
+
+_tiles = OrderedDict()
+_tiles_lock = Lock()
+# One DGGRID run at a time, so a superseded task and its successor never
+# generate the same tiles twice
+_generate_lock = Lock()
+
+
+def tile_size(dggs_type, resolution):
+    """Tile width/height in degrees for *dggs_type* at *resolution*."""
+    for level in range(1, MAX_TILE_LEVEL + 1):
+        size = 180.0 / 2**level
+        cells = estimate_cells(("dggrid", dggs_type), resolution, (0, 0, size, size))
+        if cells is not None and cells <= TILE_TARGET_CELLS:
+            return size
+    return 180.0 / 2**MAX_TILE_LEVEL
+
+
+def tiles_for_bbox(bbox, size):
+    """(column, row) indices of the tiles of *size* degrees covering *bbox*."""
+    columns = round(360.0 / size)
+    rows = round(180.0 / size)
+    min_col = max(0, floor((bbox[0] + 180.0) / size))
+    max_col = min(columns, ceil((bbox[2] + 180.0) / size))
+    min_row = max(0, floor((bbox[1] + 90.0) / size))
+    max_row = min(rows, ceil((bbox[3] + 90.0) / size))
+    return [
+        (col, row)
+        for col in range(min_col, max(min_col + 1, max_col))
+        for row in range(min_row, max(min_row + 1, max_row))
+    ]
+
+
+def tile_bbox(tile, size):
+    col, row = tile
+    return (
+        -180.0 + col * size,
+        -90.0 + row * size,
+        -180.0 + (col + 1) * size,
+        -90.0 + (row + 1) * size,
+    )
+
+
+def _tiles_dir(dggs_type, resolution, densification, split_antimeridian):
+    tag = repr(
+        (
+            DGGRID_TILES_FORMAT,
+            vgrid_version(),
+            dggs_type,
+            resolution,
+            densification,
+            split_antimeridian,
+        )
+    )
+    digest = hashlib.sha1(tag.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(
+        _DGGRID_TILES_DIR, f"{dggs_type.lower()}_r{resolution}_{digest}"
+    )
+
+
+def _cached_tile(path):
+    with _tiles_lock:
+        cells = _tiles.get(path)
+        if cells is not None:
+            _tiles.move_to_end(path)
+            return cells
+    if not os.path.exists(path):
+        return None
+    try:
+        cells = load_cells(path)
+    except Exception:
+        return None
+    _remember(path, cells)
+    return cells
+
+
+def _remember(path, cells):
+    with _tiles_lock:
+        _tiles[path] = cells
+        _tiles.move_to_end(path)
+        while len(_tiles) > TILE_MEMORY_SIZE:
+            _tiles.popitem(last=False)
+
+
+def _cell_ids(gdf):
+    for column in ("global_id", "name", "seqnum"):
+        if column in gdf.columns:
+            return [normalize_dggrid_cell_id(value) for value in gdf[column]]
+    # No id column: fall back to the feature index (no dedup across tiles)
+    return [str(index) for index in gdf.index]
+
+
+def _generate_tiles(
+    dggrid_instance,
+    dggs_type,
+    resolution,
+    options,
+    split_antimeridian,
+    missing,
+    size,
+    folder,
+):
+    """Run DGGRID once over the union of the *missing* tiles and store each tile."""
+    bounds = [tile_bbox(tile, size) for tile in missing]
+    union = (
+        min(b[0] for b in bounds),
+        min(b[1] for b in bounds),
+        max(b[2] for b in bounds),
+        max(b[3] for b in bounds),
+    )
+    with timed("dggrid"):
+        gdf = generate_grid_qgis(
+            dggrid_instance,
+            dggs_type,
+            resolution,
+            list(union),
+            output_address_type="SEQNUM",
+            split_antimeridian=split_antimeridian,
+            aggregate=False,
+            options=options,
+        )
+    if gdf is None or gdf.empty:
+        cell_ids, polygons = [], np.empty(0, dtype=object)
+    else:
+        valid = ~(gdf.geometry.isna() | gdf.geometry.is_empty).to_numpy()
+        cell_ids = [cell_id for cell_id, ok in zip(_cell_ids(gdf), valid) if ok]
+        polygons = np.asarray(gdf.geometry.to_numpy()[valid], dtype=object)
+    cell_bounds = shapely.bounds(polygons) if len(polygons) else np.empty((0, 4))
+
+    generated = {}
+    for tile, (min_x, min_y, max_x, max_y) in zip(missing, bounds):
+        inside = np.flatnonzero(
+            (cell_bounds[:, 0] <= max_x)
+            & (cell_bounds[:, 2] >= min_x)
+            & (cell_bounds[:, 1] <= max_y)
+            & (cell_bounds[:, 3] >= min_y)
+        )
+        cells = {cell_ids[i]: polygons[i] for i in inside}
+        path = os.path.join(folder, f"{tile[0]}_{tile[1]}.npz")
+        try:
+            save_cells(path, list(cells.keys()), list(cells.values()))
+        except OSError:
+            # Read-only plugin folder: keep the tile in memory for this session
+            pass
+        _remember(path, cells)
+        generated[tile] = cells
+    return generated
+
+
+def dggrid_tile_cells(
+    task,
+    dggrid_instance,
+    dggs_type,
+    resolution,
+    bbox,
+    densification,
+    options,
+    split_antimeridian=False,
+):
+    """Return ``{cell_id: polygon}`` (EPSG:4326) for the cells of the tiles covering *bbox*.
+
+    Tiles come from memory or disk where possible; the rest are generated with
+    a single DGGRID run. Split and unsplit tiles are cached apart. Returns None
+    if *task* was canceled.
+    """
+    size = tile_size(dggs_type, resolution)
+    folder = _tiles_dir(dggs_type, resolution, densification, split_antimeridian)
+    tiles = tiles_for_bbox(bbox, size)
+
+    cells = {}
+    missing = []
+    for tile in tiles:
+        if task.isCanceled():
+            return None
+        tile_cells = _cached_tile(os.path.join(folder, f"{tile[0]}_{tile[1]}.npz"))
+        if tile_cells is None:
+            missing.append(tile)
+        else:
+            cells.update(tile_cells)
+    count("tile_hits", len(tiles) - len(missing))
+    count("tile_misses", len(missing))
+
+    if missing:
+        with _generate_lock:
+            if task.isCanceled():
+                return None
+            # Another task may have generated some of them while we waited
+            still_missing = []
+            for tile in missing:
+                path = os.path.join(folder, f"{tile[0]}_{tile[1]}.npz")
+                tile_cells = _cached_tile(path)
+                if tile_cells is None:
+                    still_missing.append(tile)
+                else:
+                    cells.update(tile_cells)
+            if still_missing:
+                generated = _generate_tiles(
+                    dggrid_instance,
+                    dggs_type,
+                    resolution,
+                    options,
+                    split_antimeridian,
+                    still_missing,
+                    size,
+                    folder,
+                )
+                for tile_cells in generated.values():
+                    cells.update(tile_cells)
+    return cells
+
+
+def clear_dggrid_tiles():
+    """Drop the DGGRID overlay tiles from memory and disk; return the number of files removed."""
+    with _tiles_lock:
+        _tiles.clear()
+    if not os.path.isdir(_DGGRID_TILES_DIR):
+        return 0
+    count = sum(len(files) for _, _, files in os.walk(_DGGRID_TILES_DIR))
+    shutil.rmtree(_DGGRID_TILES_DIR, ignore_errors=True)
+    return count
@@ -3,17 +3,14 @@
 
 from math import floor, log2
 
-from qgis.core import (
-    QgsCoordinateTransform,
-    QgsGeometry,
-    QgsProject,
-    QgsWkbTypes,
-)
+import numpy as np
+import shapely
+
+from qgis.core import QgsWkbTypes
 from qgis.gui import QgsRubberBand
-from qgis.PyQt.QtCore import QObject, QTimer, pyqtSlot
+from qgis.PyQt.QtCore import QObject, pyqtSlot
 
 from vgrid.utils.constants import DGGRID_TYPES
-from vgrid.utils.io import validate_coordinate
 
 from ..settings import settings
 from ..utils.dggrid_instance import (
@@ -22,7 +19,9 @@ from ..utils.dggrid_instance import (
     generate_grid_qgis,
     get_plugin_dggrid_instance,
 )
-from ..utils.latlon import epsg4326
+from .dggrid_tiles import dggrid_tile_cells
+from .global_grids import global_cells
+from .grid_task import GridRenderer, to_canvas_geometries
 
 # Map canvas zoom → DGGRID resolution: res = floor(zoom * k), per type (see webdggrid / MapLibre viz).
 _DGGRID_RESOLUTION_SCALE_K = {
@@ -53,11 +52,12 @@ class DGGRIDGrid(QObject):
         self.dggrid_marker.setWidth(settings.gridWidth)
 
         self.dggrid_enabled = False
-        self._extentTimer = QTimer(self)
-        self._extentTimer.setSingleShot(True)
-        self._extentTimer.setInterval(150)
-        self.canvas.extentsChanged.connect(self._onExtentsChanged)
-        self._extentTimer.timeout.connect(self._refreshDGGRIDGridOnExtent)
+        self.vgridtools.overlay_manager.register(
+            lambda: self.dggrid_enabled, self._refreshDGGRIDGridOnExtent
+        )
+        self.dggrid_renderer = GridRenderer(
+            self.canvas, self.dggrid_marker, "DGGRID grid"
+        )
         self.removeMarker()
 
     def _grid_color(self):
@@ -65,9 +65,6 @@ class DGGRIDGrid(QObject):
             settings, f"dggrid_{self.dggs_type.lower()}Color", settings.isea3hColor
         )
 
-    def _onExtentsChanged(self):
-        self._extentTimer.start()
-
     def _resolution_from_scale(self, scale: float) -> int:
         cfg = DGGRID_TYPES[self.dggs_type]
         zoom = 29.1402 - log2(scale)
@@ -77,46 +74,23 @@ class DGGRIDGrid(QObject):
 
     def dggrid_grid(self):
         try:
-            self.removeMarker()
-            self.dggrid_marker.reset(QgsWkbTypes.PolygonGeometry)
-            self.dggrid_marker.setStrokeColor(self._grid_color())
-            self.dggrid_marker.setWidth(settings.gridWidth)
-
-            canvas_extent = self.canvas.extent()
-            canvas_crs = QgsProject.instance().crs()
-            scale = self.canvas.scale()
-            resolution = self._resolution_from_scale(scale)
+            view = self.vgridtools.overlay_manager.frame()
+            resolution = view.resolution(
+                ("dggrid", self.dggs_type),
+                self._resolution_from_scale,
+            )
 
             if settings.zoomLevel:
-                zoom = 29.1402 - log2(scale)
+                zoom = view.zoom
                 self.iface.mainWindow().statusBar().showMessage(
-                    f"Zoom Level: {zoom:.2f} | DGGRID {self.dggs_type} resolution: {resolution}"
+                    f"Zoom Level: {zoom:.2f} | DGGRID {self.dggs_type} resolution: {resolution}{view.budget_note(('dggrid', self.dggs_type))}"
                 )
 
             if resolution <= 3:
                 min_lon, min_lat, max_lon, max_lat = -180, -90, 180, 90
                 bbox = [min_lon, min_lat, max_lon, max_lat]
             else:
-                min_lon, min_lat, max_lon, max_lat = (
-                    canvas_extent.xMinimum(),
-                    canvas_extent.yMinimum(),
-                    canvas_extent.xMaximum(),
-                    canvas_extent.yMaximum(),
-                )
-                if epsg4326 != canvas_crs:
-                    trans_to_4326 = QgsCoordinateTransform(
-                        canvas_crs, epsg4326, QgsProject.instance()
-                    )
-                    transformed_extent = trans_to_4326.transform(canvas_extent)
-                    min_lon, min_lat, max_lon, max_lat = (
-                        transformed_extent.xMinimum(),
-                        transformed_extent.yMinimum(),
-                        transformed_extent.xMaximum(),
-                        transformed_extent.yMaximum(),
-                    )
-                min_lon, min_lat, max_lon, max_lat = validate_coordinate(
-                    min_lon, min_lat, max_lon, max_lat
-                )
+                min_lon, min_lat, max_lon, max_lat = view.bbox_4326
                 bbox = [min_lon, min_lat, max_lon, max_lat]
 
             split_antimeridian = (
@@ -125,37 +99,67 @@ class DGGRIDGrid(QObject):
             )
             densification = settings.dggridDensificationSpinBox
             options = build_dggrid_options(densification)
-            gdf = generate_grid_qgis(
-                get_plugin_dggrid_instance(),
-                self.dggs_type,
-                resolution,
-                bbox,
-                output_address_type="SEQNUM",
-                split_antimeridian=split_antimeridian,
-                aggregate=False,
-                options=options,
-            )
-            if gdf is None or gdf.empty:
-                return
-
-            trans_to_canvas = None
-            if epsg4326 != canvas_crs:
-                trans_to_canvas = QgsCoordinateTransform(
-                    epsg4326, canvas_crs, QgsProject.instance()
+            # Resolved on the GUI thread: may prompt for / download the executable
+            dggrid_instance = get_plugin_dggrid_instance()
+            trans_to_canvas = view.canvas_transform()
+
+            def world_polygons():
+                gdf = generate_grid_qgis(
+                    dggrid_instance,
+                    self.dggs_type,
+                    resolution,
+                    bbox,
+                    output_address_type="SEQNUM",
+                    split_antimeridian=split_antimeridian,
+                    aggregate=False,
+                    options=options,
+                )
+                if gdf is None or gdf.empty:
+                    return []
+                return [
+                    geom
+                    for geom in gdf.geometry
+                    if geom is not None and not geom.is_empty
+                ]
+
+            def build(task):
+                if resolution <= 3:
+                    # Whole-world grid: built once, then read from disk
+                    world = global_cells(
+                        ("dggrid", self.dggs_type),
+                        resolution,
+                        (split_antimeridian, densification),
+                        lambda: enumerate(world_polygons()),
+                    )
+                    return to_canvas_geometries(list(world.values()), trans_to_canvas)
+
+                # Cached tiles around the viewport; DGGRID runs only for missing ones
+                cells = dggrid_tile_cells(
+                    task,
+                    dggrid_instance,
+                    self.dggs_type,
+                    resolution,
+                    bbox,
+                    densification,
+                    options,
+                    split_antimeridian,
+                )
+                if cells is None or task.isCanceled():
+                    return None
+                cell_polygons = np.asarray(list(cells.values()), dtype=object)
+                if len(cell_polygons) == 0:
+                    return []
+                # Tiles overhang the viewport: keep the cells that reach it
+                bounds = shapely.bounds(cell_polygons)
+                visible = (
+                    (bounds[:, 0] <= bbox[2])
+                    & (bounds[:, 2] >= bbox[0])
+                    & (bounds[:, 1] <= bbox[3])
+                    & (bounds[:, 3] >= bbox[1])
                 )
+                return to_canvas_geometries(cell_polygons[visible], trans_to_canvas)
 
-            for geom in gdf.geometry:
-                if geom is None or geom.is_empty:
-                    continue
-                try:
-                    cell_geom = QgsGeometry.fromWkt(geom.wkt)
-                    if trans_to_canvas is not None:
-                        cell_geom.transform(trans_to_canvas)
-                    self.dggrid_marker.addGeometry(cell_geom, None)
-                except Exception:
-                    continue
-
-            self.canvas.refresh()
+            self.dggrid_renderer.submit(build, self._grid_color())
         except Exception:
             return
 
@@ -170,19 +174,12 @@ class DGGRIDGrid(QObject):
 
     @pyqtSlot()
     def removeMarker(self):
-        self.dggrid_marker.reset(QgsWkbTypes.PolygonGeometry)
+        self.dggrid_renderer.clear()
 
     def cleanup(self):
         try:
-            self._extentTimer.stop()
-            try:
-                self._extentTimer.timeout.disconnect(self._refreshDGGRIDGridOnExtent)
-            except Exception:
-                pass
-            try:
-                self.canvas.extentsChanged.disconnect(self._onExtentsChanged)
-            except Exception:
-                pass
+            self.vgridtools.overlay_manager.unregister(self._refreshDGGRIDGridOnExtent)
+            self.dggrid_renderer.cleanup()
         except Exception:
             pass
         try:
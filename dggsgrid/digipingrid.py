@@ -1,15 +1,10 @@
-from qgis.core import (
-    QgsWkbTypes,
-    QgsCoordinateTransform,
-    QgsGeometry,
-    QgsProject,
-)
-from qgis.PyQt.QtCore import QObject, QTimer
+from qgis.core import QgsWkbTypes
+from qgis.PyQt.QtCore import QObject
 from qgis.gui import QgsRubberBand
 from qgis.PyQt.QtCore import pyqtSlot
 
 from math import log2
-from ..utils.latlon import epsg4326
+from .grid_task import GridRenderer, to_canvas_geometries
 from ..settings import settings
 
 # DIGIPIN imports
@@ -34,108 +29,76 @@ class DIGIPINGrid(QObject):
 
         # DIGIPIN auto-update toggle and debounced extent listener
         self.digipin_enabled = False
-        self._extentTimer = QTimer(self)
-        self._extentTimer.setSingleShot(True)
-        self._extentTimer.setInterval(150)
-        self.canvas.extentsChanged.connect(self._onExtentsChanged)
-        self._extentTimer.timeout.connect(self._refreshDigipinGridOnExtent)
+        self.vgridtools.overlay_manager.register(
+            lambda: self.digipin_enabled, self._refreshDigipinGridOnExtent
+        )
+        self.digipin_renderer = GridRenderer(
+            self.canvas, self.digipin_marker, "DIGIPIN grid"
+        )
         self.removeMarker()
 
-    def _onExtentsChanged(self):
-        self._extentTimer.start()
-
     def digipin_grid(self):
         try:
-            # Clear previous grid before drawing a new one
-            self.removeMarker()
-            self.digipin_marker.reset(QgsWkbTypes.PolygonGeometry)
-            self.digipin_marker.setStrokeColor(settings.digipinColor)
-            self.digipin_marker.setWidth(settings.gridWidth)
-
-            canvas_extent = self.canvas.extent()
-            canvas_crs = QgsProject.instance().crs()
-
-            scale = self.canvas.scale()
-            resolution = self._get_digipin_resolution(scale)
-            zoom = 29.1402 - log2(scale)
+            view = self.vgridtools.overlay_manager.frame()
+            resolution = view.resolution("digipin", self._get_digipin_resolution)
+            zoom = view.zoom
             if settings.zoomLevel:
                 self.iface.mainWindow().statusBar().showMessage(
-                    f"Zoom Level: {zoom:.2f} | DIGIPIN resolution: {resolution}"
-                )
-
-            min_lon, min_lat, max_lon, max_lat = (
-                canvas_extent.xMinimum(),
-                canvas_extent.yMinimum(),
-                canvas_extent.xMaximum(),
-                canvas_extent.yMaximum(),
-            )
-
-            # Transform to EPSG:4326 if needed
-            if epsg4326 != canvas_crs:
-                trans_to_4326 = QgsCoordinateTransform(
-                    canvas_crs, epsg4326, QgsProject.instance()
-                )
-                transformed_extent = trans_to_4326.transform(canvas_extent)
-                min_lon, min_lat, max_lon, max_lat = (
-                    transformed_extent.xMinimum(),
-                    transformed_extent.yMinimum(),
-                    transformed_extent.xMaximum(),
-                    transformed_extent.yMaximum(),
+                    f"Zoom Level: {zoom:.2f} | DIGIPIN resolution: {resolution}{view.budget_note('digipin')}"
                 )
 
-            # Calculate sampling density based on resolution
+            min_lon, min_lat, max_lon, max_lat = view.bbox_4326
             # Each level divides the cell by 4 (2x2 grid)
             base_width = 9.0  # degrees at resolution 1
             factor = 0.25 ** (resolution - 1)  # each level divides by 4
             sample_width = base_width * factor
+            trans_to_canvas = view.canvas_transform()
 
-            seen_cells = set()
+            def build(task):
+                cell_polygons = []
+                seen_cells = set()
 
-            # Sample points across the bounding box
-            lon = min_lon
-            while lon <= max_lon:
-                lat = min_lat
-                while lat <= max_lat:
-                    try:
-                        # Get DIGIPIN code for this point at the specified resolution
-                        digipin_id = latlon2digipin(lat, lon, resolution)
+                # Sample points across the bounding box
+                lon = min_lon
+                while lon <= max_lon:
+                    if task.isCanceled():
+                        return None
+                    lat = min_lat
+                    while lat <= max_lat:
+                        try:
+                            # Get DIGIPIN code for this point at the specified resolution
+                            digipin_id = latlon2digipin(lat, lon, resolution)
 
-                        if digipin_id == "Out of Bound":
-                            lat += sample_width
-                            continue
+                            if digipin_id == "Out of Bound":
+                                lat += sample_width
+                                continue
 
-                        if digipin_id in seen_cells:
-                            lat += sample_width
-                            continue
+                            if digipin_id in seen_cells:
+                                lat += sample_width
+                                continue
 
-                        seen_cells.add(digipin_id)
+                            seen_cells.add(digipin_id)
 
-                        # Get the bounds for this DIGIPIN cell
-                        cell_polygon = digipin2geo(digipin_id)
+                            # Get the bounds for this DIGIPIN cell
+                            cell_polygon = digipin2geo(digipin_id)
 
-                        if isinstance(
-                            cell_polygon, str
-                        ):  # Error like 'Invalid DIGIPIN'
-                            lat += sample_width
-                            continue
+                            if isinstance(
+                                cell_polygon, str
+                            ):  # Error like 'Invalid DIGIPIN'
+                                lat += sample_width
+                                continue
 
-                        # Convert to QgsGeometry and add to rubber band
-                        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-                        if epsg4326 != canvas_crs:
-                            trans = QgsCoordinateTransform(
-                                epsg4326, canvas_crs, QgsProject.instance()
-                            )
-                            cell_geometry.transform(trans)
-                        self.digipin_marker.addGeometry(cell_geometry, None)
+                            cell_polygons.append(cell_polygon)
 
-                    except Exception:
-                        # Skip cells with errors
-                        pass
+                        except Exception:
+                            # Skip cells with errors
+                            pass
 
-                    lat += sample_width
-                lon += sample_width
+                        lat += sample_width
+                    lon += sample_width
+                return to_canvas_geometries(cell_polygons, trans_to_canvas)
 
-            self.canvas.refresh()
+            self.digipin_renderer.submit(build, settings.digipinColor)
 
         except Exception:
             return
@@ -175,20 +138,13 @@ class DIGIPINGrid(QObject):
 
     @pyqtSlot()
     def removeMarker(self):
-        self.digipin_marker.reset(QgsWkbTypes.PolygonGeometry)
+        self.digipin_renderer.clear()
 
     def cleanup(self):
         # Disconnect signals and delete rubber band
         try:
-            self._extentTimer.stop()
-            try:
-                self._extentTimer.timeout.disconnect(self._refreshDigipinGridOnExtent)
-            except Exception:
-                pass
-            try:
-                self.canvas.extentsChanged.disconnect(self._onExtentsChanged)
-            except Exception:
-                pass
+            self.vgridtools.overlay_manager.unregister(self._refreshDigipinGridOnExtent)
+            self.digipin_renderer.cleanup()
         except Exception:
             pass
 
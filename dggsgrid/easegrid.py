@@ -1,19 +1,13 @@
 from shapely.geometry import box, Polygon
-from qgis.core import (
-    QgsWkbTypes,
-    QgsCoordinateTransform,
-    QgsGeometry,
-    QgsProject,
-)
-from qgis.PyQt.QtCore import QObject, QTimer
+from qgis.core import QgsWkbTypes
+from qgis.PyQt.QtCore import QObject
 from qgis.gui import QgsRubberBand
 from qgis.PyQt.QtCore import pyqtSlot
 
 from math import log2
 
-from ..utils.latlon import epsg4326
+from .grid_task import GridRenderer, to_canvas_geometries
 from ..settings import settings
-from vgrid.utils.io import validate_coordinate
 from vgrid.utils.antimeridian import fix_polygon
 
 # EASE-DGGS helpers
@@ -37,60 +31,32 @@ class EASEGrid(QObject):
 
         # Auto-update toggle and debounced extent listener
         self.ease_enabled = False
-        self._extentTimer = QTimer(self)
-        self._extentTimer.setSingleShot(True)
-        self._extentTimer.setInterval(150)
-        self.canvas.extentsChanged.connect(self._onExtentsChanged)
-        self._extentTimer.timeout.connect(self._refreshEASEGridOnExtent)
+        self.vgridtools.overlay_manager.register(
+            lambda: self.ease_enabled, self._refreshEASEGridOnExtent
+        )
+        self.ease_renderer = GridRenderer(self.canvas, self.ease_marker, "EASE grid")
         self.removeMarker()
 
-    def _onExtentsChanged(self):
-        self._extentTimer.start()
-
     def ease_grid(self):
         try:
-            # Reset rubber band
-            self.removeMarker()
-            self.ease_marker.reset(QgsWkbTypes.PolygonGeometry)
-            self.ease_marker.setStrokeColor(settings.easeColor)
-            self.ease_marker.setWidth(settings.gridWidth)
-
-            canvas_extent = self.canvas.extent()
-            canvas_crs = QgsProject.instance().crs()
-
-            scale = self.canvas.scale()
-            resolution = self._get_ease_resolution(scale)
-            zoom = 29.1402 - log2(scale)
+            view = self.vgridtools.overlay_manager.frame()
+            resolution = view.resolution("ease", self._get_ease_resolution)
+            zoom = view.zoom
             if settings.zoomLevel:
                 self.iface.mainWindow().statusBar().showMessage(
-                    f"Zoom Level: {zoom:.2f} | EASE resolution: {resolution}"
-                )
-            if zoom >= 8:
-                # Extent in canvas CRS
-                min_lon, min_lat, max_lon, max_lat = (
-                    canvas_extent.xMinimum(),
-                    canvas_extent.yMinimum(),
-                    canvas_extent.xMaximum(),
-                    canvas_extent.yMaximum(),
+                    f"Zoom Level: {zoom:.2f} | EASE resolution: {resolution}{view.budget_note('ease')}"
                 )
+            if zoom < 8:
+                self.removeMarker()
+                return
 
-                # Transform to EPSG:4326 if needed
-                if epsg4326 != canvas_crs:
-                    trans_to_4326 = QgsCoordinateTransform(
-                        canvas_crs, epsg4326, QgsProject.instance()
-                    )
-                    transformed_extent = trans_to_4326.transform(canvas_extent)
-                    min_lon, min_lat, max_lon, max_lat = (
-                        transformed_extent.xMinimum(),
-                        transformed_extent.yMinimum(),
-                        transformed_extent.xMaximum(),
-                        transformed_extent.yMaximum(),
-                    )
-
-                # Validate and construct extent bbox
-                min_lon, min_lat, max_lon, max_lat = validate_coordinate(
-                    min_lon, min_lat, max_lon, max_lat
-                )
+            # Extent in canvas CRS
+            min_lon, min_lat, max_lon, max_lat = view.bbox_4326
+
+            split_antimeridian = settings.splitAntimeridian
+            trans_to_canvas = view.canvas_transform()
+
+            def build(task):
                 extent_bbox = box(min_lon, min_lat, max_lon, max_lat)
 
                 # Query EASE cell IDs intersecting bbox
@@ -106,10 +72,6 @@ class EASEGrid(QObject):
                 )
                 cells = (cells_bbox or {}).get("result", {}).get("data", [])
 
-                if not cells:
-                    self.canvas.refresh()
-                    return
-
                 # Cell dimensions at this level
                 level_spec = levels_specs[resolution]
                 n_row = level_spec["n_row"]
@@ -117,7 +79,10 @@ class EASEGrid(QObject):
                 half_cell_lat = 180 / (2 * n_row)
                 half_cell_lon = 360 / (2 * n_col)
 
+                cell_polygons = []
                 for cell_id in cells:
+                    if task.isCanceled():
+                        return None
                     try:
                         geo = grid_ids_to_geos([cell_id])
                         center_lon, center_lat = geo["result"]["data"][0]
@@ -137,20 +102,15 @@ class EASEGrid(QObject):
                             ]
                         )
 
-                        if settings.splitAntimeridian:
+                        if split_antimeridian:
                             poly = fix_polygon(poly)
 
-                        geom = QgsGeometry.fromWkt(poly.wkt)
-                        if epsg4326 != canvas_crs:
-                            trans_to_canvas = QgsCoordinateTransform(
-                                epsg4326, canvas_crs, QgsProject.instance()
-                            )
-                            geom.transform(trans_to_canvas)
-                        self.ease_marker.addGeometry(geom, None)
+                        cell_polygons.append(poly)
                     except Exception:
                         continue
+                return to_canvas_geometries(cell_polygons, trans_to_canvas)
 
-                self.canvas.refresh()
+            self.ease_renderer.submit(build, settings.easeColor)
 
         except Exception:
             return
@@ -185,20 +145,13 @@ class EASEGrid(QObject):
 
     @pyqtSlot()
     def removeMarker(self):
-        self.ease_marker.reset(QgsWkbTypes.PolygonGeometry)
+        self.ease_renderer.clear()
 
     def cleanup(self):
         # Disconnect signals and delete rubber band
         try:
-            self._extentTimer.stop()
-            try:
-                self._extentTimer.timeout.disconnect(self._refreshEASEGridOnExtent)
-            except Exception:
-                pass
-            try:
-                self.canvas.extentsChanged.disconnect(self._onExtentsChanged)
-            except Exception:
-                pass
+            self.vgridtools.overlay_manager.unregister(self._refreshEASEGridOnExtent)
+            self.ease_renderer.cleanup()
         except Exception:
             pass
 
@@ -1,19 +1,13 @@
 from shapely.geometry import Polygon
-from qgis.core import (
-    QgsWkbTypes,
-    QgsCoordinateTransform,
-    QgsGeometry,
-    QgsProject,
-)
-from qgis.PyQt.QtCore import QObject, QTimer
+from qgis.core import QgsWkbTypes
+from qgis.PyQt.QtCore import QObject
 from qgis.gui import QgsRubberBand
 from qgis.PyQt.QtCore import pyqtSlot
 
 from math import log2
 import numpy as np
-from ..utils.latlon import epsg4326
+from .grid_task import GridRenderer, to_canvas_geometries
 from ..settings import settings
-from vgrid.utils.io import validate_coordinate
 from vgrid.utils.constants import GARS_RESOLUTION_MINUTES
 from gars_field.garsgrid import GARSGrid as GARSGRID  # Ensure the correct import path
 
@@ -31,82 +25,47 @@ class GARSGrid(QObject):
 
         # GARS auto-update toggle and debounced extent listener
         self.gars_enabled = False
-        self._extentTimer = QTimer(self)
-        self._extentTimer.setSingleShot(True)
-        self._extentTimer.setInterval(150)
-        self.canvas.extentsChanged.connect(self._onExtentsChanged)
-        self._extentTimer.timeout.connect(self._refreshGARSGridOnExtent)
+        self.vgridtools.overlay_manager.register(
+            lambda: self.gars_enabled, self._refreshGARSGridOnExtent
+        )
+        self.gars_renderer = GridRenderer(self.canvas, self.gars_marker, "GARS grid")
         self.removeMarker()
 
-    def _onExtentsChanged(self):
-        self._extentTimer.start()
-
     def gars_grid(self):
-        self.removeMarker()
-        self.gars_marker.reset(QgsWkbTypes.PolygonGeometry)
-        self.gars_marker.setStrokeColor(settings.garsColor)
-        self.gars_marker.setWidth(settings.gridWidth)
-
-        canvas_extent = self.canvas.extent()
-        canvas_crs = QgsProject.instance().crs()
-
-        scale = self.canvas.scale()
-        resolution = self._get_gars_resolution(scale)
-        zoom = 29.1402 - log2(scale)
+        view = self.vgridtools.overlay_manager.frame()
+        resolution = view.resolution("gars", self._get_gars_resolution)
+        zoom = view.zoom
         if settings.zoomLevel:
             self.iface.mainWindow().statusBar().showMessage(
-                f"Zoom Level: {zoom:.2f} | GARS resolution: {resolution}"
+                f"Zoom Level: {zoom:.2f} | GARS resolution: {resolution}{view.budget_note('gars')}"
             )
 
         resolution_minutes = GARS_RESOLUTION_MINUTES.get(resolution)
         resolution_degrees = resolution_minutes / 60.0
 
-        if zoom >= 8:
-            min_lon, min_lat, max_lon, max_lat = (
-                canvas_extent.xMinimum(),
-                canvas_extent.yMinimum(),
-                canvas_extent.xMaximum(),
-                canvas_extent.yMaximum(),
-            )
+        if zoom < 8:
+            self.removeMarker()
+            return
 
-            # Transform to EPSG:4326 if needed
-            if epsg4326 != canvas_crs:
-                trans_to_4326 = QgsCoordinateTransform(
-                    canvas_crs, epsg4326, QgsProject.instance()
-                )
-                transformed_extent = trans_to_4326.transform(canvas_extent)
-                min_lon, min_lat, max_lon, max_lat = (
-                    transformed_extent.xMinimum(),
-                    transformed_extent.yMinimum(),
-                    transformed_extent.xMaximum(),
-                    transformed_extent.yMaximum(),
-                )
-
-            # Validate and construct extent bbox
-            min_lon, min_lat, max_lon, max_lat = validate_coordinate(
-                min_lon, min_lat, max_lon, max_lat
-            )
+        min_lon, min_lat, max_lon, max_lat = view.bbox_4326
+        trans_to_canvas = view.canvas_transform()
 
+        def build(task):
             longitudes = np.arange(min_lon, max_lon, resolution_degrees)
             latitudes = np.arange(min_lat, max_lat, resolution_degrees)
 
+            cell_polygons = []
             for lon in longitudes:
+                if task.isCanceled():
+                    return None
                 for lat in latitudes:
                     gars_cell = GARSGRID.from_latlon(lat, lon, resolution_minutes)
                     wkt_polygon = gars_cell.polygon
                     cell_polygon = Polygon(list(wkt_polygon.exterior.coords))
-                    try:
-                        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-                        if epsg4326 != canvas_crs:
-                            trans = QgsCoordinateTransform(
-                                epsg4326, canvas_crs, QgsProject.instance()
-                            )
-                            cell_geometry.transform(trans)
-                        self.gars_marker.addGeometry(cell_geometry, None)
-                    except Exception:
-                        continue
-
-            self.canvas.refresh()
+                    cell_polygons.append(cell_polygon)
+            return to_canvas_geometries(cell_polygons, trans_to_canvas)
+
+        self.gars_renderer.submit(build, settings.garsColor)
 
     def enable_gars(self, enabled: bool):
         self.gars_enabled = bool(enabled)
@@ -133,20 +92,13 @@ class GARSGrid(QObject):
 
     @pyqtSlot()
     def removeMarker(self):
-        self.gars_marker.reset(QgsWkbTypes.PolygonGeometry)
+        self.gars_renderer.clear()
 
     def cleanup(self):
         # Disconnect signals and delete rubber band
         try:
-            self._extentTimer.stop()
-            try:
-                self._extentTimer.timeout.disconnect(self._refreshGARSGridOnExtent)
-            except Exception:
-                pass
-            try:
-                self.canvas.extentsChanged.disconnect(self._onExtentsChanged)
-            except Exception:
-                pass
+            self.vgridtools.overlay_manager.unregister(self._refreshGARSGridOnExtent)
+            self.gars_renderer.cleanup()
         except Exception:
             pass
 
@@ -1,17 +1,12 @@
-from qgis.core import (
-    QgsWkbTypes,
-    QgsCoordinateTransform,
-    QgsGeometry,
-    QgsProject,
-)
-from qgis.PyQt.QtCore import QObject, QTimer
+from qgis.core import QgsWkbTypes
+from qgis.PyQt.QtCore import QObject
 from qgis.gui import QgsRubberBand
 from qgis.PyQt.QtCore import pyqtSlot
 
 from math import log2
 import numpy as np
 
-from ..utils.latlon import epsg4326
+from .grid_task import GridRenderer, to_canvas_geometries
 from ..settings import settings
 from vgrid.utils.io import validate_coordinate
 from vgrid.utils.constants import GEOREF_RESOLUTION_DEGREES
@@ -34,58 +29,30 @@ class GEOREFGrid(QObject):
 
         # GEOREF auto-update toggle and debounced extent listener
         self.georef_enabled = False
-        self._extentTimer = QTimer(self)
-        self._extentTimer.setSingleShot(True)
-        self._extentTimer.setInterval(150)
-        self.canvas.extentsChanged.connect(self._onExtentsChanged)
-        self._extentTimer.timeout.connect(self._refreshGeorefGridOnExtent)
+        self.vgridtools.overlay_manager.register(
+            lambda: self.georef_enabled, self._refreshGeorefGridOnExtent
+        )
+        self.georef_renderer = GridRenderer(
+            self.canvas, self.georef_marker, "GEOREF grid"
+        )
         self.removeMarker()
 
-    def _onExtentsChanged(self):
-        self._extentTimer.start()
-
     def georef_grid(self):
         try:
-            # Clear previous grid before drawing a new one
-            self.removeMarker()
-            self.georef_marker.reset(QgsWkbTypes.PolygonGeometry)
-            self.georef_marker.setStrokeColor(settings.georefColor)
-            self.georef_marker.setWidth(settings.gridWidth)
-
-            canvas_extent = self.canvas.extent()
-            canvas_crs = QgsProject.instance().crs()
-
-            scale = self.canvas.scale()
-            resolution = self._get_georef_resolution(scale)
+            view = self.vgridtools.overlay_manager.frame()
+            resolution = view.resolution("georef", self._get_georef_resolution)
             # resolution = get_georef_resolution_from_scale_denominator(scale,relative_depth=2,mm_per_pixel = 0.28)
             if settings.zoomLevel:
-                zoom = 29.1402 - log2(scale)
+                zoom = view.zoom
                 self.iface.mainWindow().statusBar().showMessage(
-                    f"Zoom Level: {zoom:.2f} | GEOREF resolution: {resolution}"
+                    f"Zoom Level: {zoom:.2f} | GEOREF resolution: {resolution}{view.budget_note('georef')}"
                 )
 
             # Determine processing extent in EPSG:4326
             if resolution == 0:
                 min_lon, min_lat, max_lon, max_lat = -180.0, -90.0, 180.0, 90.0
             else:
-                min_lon, min_lat, max_lon, max_lat = (
-                    canvas_extent.xMinimum(),
-                    canvas_extent.yMinimum(),
-                    canvas_extent.xMaximum(),
-                    canvas_extent.yMaximum(),
-                )
-                # Transform extent to EPSG:4326 if needed
-                if epsg4326 != canvas_crs:
-                    trans_to_4326 = QgsCoordinateTransform(
-                        canvas_crs, epsg4326, QgsProject.instance()
-                    )
-                    transformed_extent = trans_to_4326.transform(canvas_extent)
-                    min_lon, min_lat, max_lon, max_lat = (
-                        transformed_extent.xMinimum(),
-                        transformed_extent.yMinimum(),
-                        transformed_extent.xMaximum(),
-                        transformed_extent.yMaximum(),
-                    )
+                min_lon, min_lat, max_lon, max_lat = view.bbox_4326
 
             # Clamp to valid bounds
             min_lon, min_lat, max_lon, max_lat = validate_coordinate(
@@ -95,24 +62,26 @@ class GEOREFGrid(QObject):
             # Iterate GEOREF cells for the extent
             step_deg = GEOREF_RESOLUTION_DEGREES.get(resolution)
             if step_deg is None or step_deg <= 0:
+                self.removeMarker()
                 return
 
-            longitudes = np.arange(min_lon, max_lon, step_deg)
-            latitudes = np.arange(min_lat, max_lat, step_deg)
+            trans_to_canvas = view.canvas_transform()
+
+            def build(task):
+                longitudes = np.arange(min_lon, max_lon, step_deg)
+                latitudes = np.arange(min_lat, max_lat, step_deg)
 
-            for lon in longitudes:
-                for lat in latitudes:
-                    georef_id = latlon2georef(lat, lon, resolution)
-                    cell_polygon = georef2geo(georef_id)
-                    cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
-                    if epsg4326 != canvas_crs:
-                        trans_to_canvas = QgsCoordinateTransform(
-                            epsg4326, canvas_crs, QgsProject.instance()
-                        )
-                        cell_geom.transform(trans_to_canvas)
-                    self.georef_marker.addGeometry(cell_geom, None)
+                cell_polygons = []
+                for lon in longitudes:
+                    if task.isCanceled():
+                        return None
+                    for lat in latitudes:
+                        georef_id = latlon2georef(lat, lon, resolution)
+                        cell_polygon = georef2geo(georef_id)
+                        cell_polygons.append(cell_polygon)
+                return to_canvas_geometries(cell_polygons, trans_to_canvas)
 
-            self.canvas.refresh()
+            self.georef_renderer.submit(build, settings.georefColor)
 
         except Exception:
             return
@@ -153,20 +122,13 @@ class GEOREFGrid(QObject):
 
     @pyqtSlot()
     def removeMarker(self):
-        self.georef_marker.reset(QgsWkbTypes.PolygonGeometry)
+        self.georef_renderer.clear()
 
     def cleanup(self):
         # Disconnect signals and delete rubber band
         try:
-            self._extentTimer.stop()
-            try:
-                self._extentTimer.timeout.disconnect(self._refreshGeorefGridOnExtent)
-            except Exception:
-                pass
-            try:
-                self.canvas.extentsChanged.disconnect(self._onExtentsChanged)
-            except Exception:
-                pass
+            self.vgridtools.overlay_manager.unregister(self._refreshGeorefGridOnExtent)
+            self.georef_renderer.cleanup()
         except Exception:
             pass
 
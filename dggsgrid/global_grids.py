@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""On-disk cache of whole-world, low-resolution DGGS grids for the overlays.
+
+At coarse levels several overlays draw the entire globe; those grids never
+change, so the cell polygons (EPSG:4326) are built once, written to a compact
+``.npz`` file of cell ids plus one concatenated WKB buffer with offsets, and
+loaded from disk on later zoom-outs and QGIS sessions. File names carry a
+format version, the vgrid version and the build options, so an upgrade or a
+different antimeridian mode never reads stale geometries.
+"""
+
+import hashlib
+import os
+from importlib.metadata import PackageNotFoundError, version
+from threading import Lock, get_ident
+
+import numpy as np
+import shapely
+
+from .overlay_stats import count, timed
+
+_PLUGIN_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(_PLUGIN_ROOT, "cache")
+_GLOBAL_GRIDS_DIR = os.path.join(CACHE_DIR, "global_grids")
+
+# Bump when the file layout or the way cells are generated changes
+GLOBAL_GRIDS_FORMAT = 1
+
+_loaded = {}
+_lock = Lock()
+
+
+def vgrid_version():
+    try:
+        return version("vgrid")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def global_grid_path(key, resolution, options=()):
+    """Cache file for the global grid of *key* at *resolution* built with *options*."""
+    tag = repr((GLOBAL_GRIDS_FORMAT, vgrid_version(), key, resolution, options))
+    digest = hashlib.sha1(tag.encode("utf-8")).hexdigest()[:16]
+    name = key if isinstance(key, str) else "_".join(str(part) for part in key)
+    return os.path.join(_GLOBAL_GRIDS_DIR, f"{name.lower()}_r{resolution}_{digest}.npz")
+
+
+def save_cells(path, cell_ids, polygons):
+    """Write cell ids and EPSG:4326 polygons to *path* (.npz), atomically."""
+    wkbs = shapely.to_wkb(np.asarray(polygons, dtype=object))
+    sizes = np.fromiter((len(wkb) for wkb in wkbs), dtype=np.int64, count=len(wkbs))
+    offsets = np.concatenate(([0], np.cumsum(sizes)))
+    buffer = np.frombuffer(b"".join(wkbs), dtype=np.uint8)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Write next to the target and rename, so a reader never sees a partial file
+    tmp_path = f"{path}.{os.getpid()}.{get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, ids=np.asarray(cell_ids, dtype=str), offsets=offsets, wkb=buffer)
+    os.replace(tmp_path, path)
+
+
+def load_cells(path):
+    """Read ``{cell_id: polygon}`` written by ``save_cells``."""
+    with np.load(path, allow_pickle=False) as data:
+        cell_ids = data["ids"].tolist()
+        offsets = data["offsets"]
+        buffer = data["wkb"].tobytes()
+    wkbs = [buffer[offsets[i] : offsets[i + 1]] for i in range(len(cell_ids))]
+    return dict(zip(cell_ids, shapely.from_wkb(wkbs)))
+
+
+def global_cells(key, resolution, options, generate):
+    """Return ``{cell_id: polygon}`` for the whole-world grid of *key* at *resolution*.
+
+    Loaded from memory or disk when available; otherwise ``generate()`` is
+    called to yield ``(cell_id, polygon)`` pairs in EPSG:4326 and the result is
+    written to disk. Safe to call from render tasks.
+    """
+    path = global_grid_path(key, resolution, options)
+    with _lock:
+        cells = _loaded.get(path)
+    if cells is not None:
+        count("global_grid_hits")
+        return cells
+
+    cells = None
+    if os.path.exists(path):
+        try:
+            with timed("global_grid_load"):
+                cells = load_cells(path)
+            count("global_grid_hits")
+        except Exception:
+            cells = None
+    if cells is None:
+        count("global_grid_misses")
+        with timed("global_grid_build"):
+            cells = {
+                str(cell_id): polygon
+                for cell_id, polygon in generate()
+                if polygon is not None and not polygon.is_empty
+            }
+        try:
+            save_cells(path, list(cells.keys()), list(cells.values()))
+        except OSError:
+            # Read-only plugin folder: keep the grid in memory for this session
+            pass
+
+    with _lock:
+        _loaded[path] = cells
+    return cells
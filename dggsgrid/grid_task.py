@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""Background rendering for DGGS Viz canvas overlays.
+
+Cell enumeration and geometry building run in a ``QgsTask`` so the canvas stays
+interactive; the finished geometries are swapped into the overlay's rubber band
+in a single step on the GUI thread.
+"""
+
+from contextlib import nullcontext
+
+import numpy as np
+import shapely
+from pyproj import Transformer
+from qgis.core import (
+    Qgis,
+    QgsApplication,
+    QgsGeometry,
+    QgsMessageLog,
+    QgsTask,
+    QgsWkbTypes,
+)
+from qgis.PyQt.QtCore import QObject
+from qgis.utils import iface
+
+from ..settings import OverlayRenderer, settings
+from . import overlay_stats
+from .canvas_item import CellRingsItem, geometry_path
+from .overlay_stats import collecting, timed
+
+
+class CanvasTransform:
+    """Batched EPSG:4326 -> canvas CRS reprojection for one render task.
+
+    Called with an (N, 2) array of lon/lat vertices and returns the (N, 2)
+    array in canvas CRS. The pyproj transformer is created on first use, in the
+    worker thread; transformers are not thread-safe, so each task needs its own.
+    """
+
+    def __init__(self, canvas_crs):
+        self._target = canvas_crs.authid() or canvas_crs.toWkt()
+        self._transformer = None
+
+    def __call__(self, coords):
+        if self._transformer is None:
+            self._transformer = Transformer.from_crs(
+                "EPSG:4326", self._target, always_xy=True
+            )
+        x, y = self._transformer.transform(coords[:, 0], coords[:, 1])
+        return np.column_stack((x, y))
+
+
+def _from_wkb(wkb):
+    geometry = QgsGeometry()
+    geometry.fromWkb(wkb)
+    return geometry
+
+
+def to_canvas_geometries(cell_polygons, trans_to_canvas):
+    """Shapely polygons in EPSG:4326 -> list of QgsGeometry in canvas CRS.
+
+    The vertices of all polygons are reprojected in one batched call and the
+    QGIS geometries are read from WKB, without a WKT text round-trip.
+    """
+    if len(cell_polygons) == 0:
+        return []
+    polygons = np.asarray(cell_polygons, dtype=object)
+    if trans_to_canvas is not None:
+        with timed("reproject"):
+            polygons = shapely.transform(polygons, trans_to_canvas)
+    with timed("wkb"):
+        return [_from_wkb(wkb) for wkb in shapely.to_wkb(polygons)]
+
+
+class GridRenderTask(QgsTask):
+    """Run an overlay ``build_fn(task)`` off the GUI thread.
+
+    ``build_fn`` returns a list of ``QgsGeometry`` in canvas CRS, or None when it
+    noticed ``task.isCanceled()`` and stopped early. With ``as_path`` the
+    geometries are also turned into the ``QPainterPath`` a ``CellRingsItem``
+    draws, still in the worker thread. With diagnostics on, *stats* collects
+    the stage timings; "build" spans the whole ``build_fn`` call and the finer
+    stages reported from inside it.
+    """
+
+    def __init__(self, description, build_fn, as_path=False, stats=None):
+        super().__init__(description, QgsTask.Flag.CanCancel | QgsTask.Flag.Hidden)
+        self.build_fn = build_fn
+        self.as_path = as_path
+        self.stats = stats
+        self.geometries = None
+        self.path = None
+        self.exception = None
+
+    def run(self):
+        try:
+            with collecting(self.stats):
+                with timed("build"):
+                    self.geometries = self.build_fn(self)
+                if self.as_path and self.geometries is not None:
+                    with timed("path"):
+                        self.path = geometry_path(self.geometries)
+        except Exception as exc:
+            self.exception = exc
+            return False
+        return self.geometries is not None and not self.isCanceled()
+
+
+class GridRenderer(QObject):
+    """Own the in-flight render task of one overlay and draw its result.
+
+    Cells are drawn either into the overlay's rubber band or into a
+    ``CellRingsItem``. *backend* is an ``OverlayRenderer``; None follows the
+    "DGGS Viz Renderer" setting.
+    """
+
+    def __init__(self, canvas, marker, description, backend=None):
+        super().__init__()
+        self.canvas = canvas
+        self.marker = marker
+        self.description = description
+        self.backend = backend
+        self._item = None
+        self._task = None
+        self._generation = 0
+
+    def _backend(self):
+        if self.backend is not None:
+            return self.backend
+        return settings.overlayRenderer
+
+    def submit(self, build_fn, color, on_applied=None):
+        """Cancel any running task and start a new one for the current frame.
+
+        ``on_applied`` is called on the GUI thread once the result is drawn.
+        """
+        self.cancel()
+        self._generation += 1
+        generation = self._generation
+        task = GridRenderTask(
+            self.description,
+            build_fn,
+            as_path=self._backend() == OverlayRenderer.CanvasItem,
+            stats=overlay_stats.begin(self.description, self._status_prefix()),
+        )
+        task.taskCompleted.connect(
+            lambda: self._apply(task, generation, color, on_applied)
+        )
+        task.taskTerminated.connect(lambda: self._failed(task, generation))
+        # Keep a Python reference: the task manager owns the C++ object only.
+        self._task = task
+        QgsApplication.taskManager().addTask(task)
+
+    def cancel(self):
+        if self._task is None:
+            return
+        try:
+            self._task.cancel()
+        except RuntimeError:
+            # Already finished and deleted by the task manager
+            pass
+        self._task = None
+
+    def clear(self):
+        """Cancel pending work and remove the drawn grid."""
+        self.cancel()
+        self._generation += 1
+        self.marker.reset(QgsWkbTypes.PolygonGeometry)
+        if self._item is not None:
+            self._item.clear()
+
+    def cleanup(self):
+        """Cancel pending work and remove the canvas item, if any."""
+        self.cancel()
+        if self._item is not None:
+            try:
+                self.canvas.scene().removeItem(self._item)
+            except Exception:
+                pass
+            self._item = None
+
+    def _status_prefix(self):
+        # The zoom-level message the overlay has just shown, if enabled
+        if not (settings.zoomLevel and overlay_stats.enabled()):
+            return ""
+        return iface.mainWindow().statusBar().currentMessage()
+
+    def _apply(self, task, generation, color, on_applied=None):
+        if generation != self._generation:
+            # Superseded by a newer frame or cleared meanwhile
+            return
+        self._task = None
+        stats = task.stats
+        with stats.stage("draw") if stats is not None else nullcontext():
+            self._draw(task, color)
+        if on_applied is not None:
+            on_applied()
+        if stats is not None:
+            stats.count("cells", len(task.geometries))
+            overlay_stats.report(stats, iface.mainWindow().statusBar())
+
+    def _failed(self, task, generation):
+        if task.exception is None:
+            # Canceled for a newer frame: nothing to report
+            return
+        QgsMessageLog.logMessage(
+            f"{self.description} failed: {task.exception!r}",
+            "DGGS Viz",
+            level=Qgis.Warning,
+        )
+        if generation == self._generation:
+            # Don't leave the previous frame's grid on the canvas
+            self._task = None
+            self.marker.reset(QgsWkbTypes.PolygonGeometry)
+            if self._item is not None:
+                self._item.clear()
+
+    def _draw(self, task, color):
+        self.marker.reset(QgsWkbTypes.PolygonGeometry)
+        if task.path is not None:
+            if self._item is None:
+                self._item = CellRingsItem(self.canvas)
+            self._item.setPath(task.path, color, settings.gridWidth)
+        else:
+            if self._item is not None:
+                self._item.clear()
+            geometries = [
+                geom
+                for geom in task.geometries
+                if geom is not None and not geom.isEmpty()
+            ]
+            self.marker.setStrokeColor(color)
+            self.marker.setWidth(settings.gridWidth)
+            if geometries:
+                self.marker.addGeometry(QgsGeometry.collectGeometry(geometries), None)
+            self.canvas.refresh()
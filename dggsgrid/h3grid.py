@@ -1,20 +1,15 @@
 from shapely.geometry import box
-from qgis.core import (
-    QgsWkbTypes,
-    QgsCoordinateTransform,
-    QgsGeometry,
-    QgsProject,
-)
-from qgis.PyQt.QtCore import QObject, QTimer
+from qgis.core import QgsWkbTypes
+from qgis.PyQt.QtCore import QObject
 from qgis.gui import QgsRubberBand
 from qgis.PyQt.QtCore import pyqtSlot
 
 import h3
-from ..utils.latlon import epsg4326
+from .cell_cache import CellCache, frame_context
+from .grid_task import GridRenderer
 from ..settings import settings
 from vgrid.conversion.dggs2geo.h32geo import h32geo
 from math import log2, floor
-from vgrid.utils.io import validate_coordinate
 from vgrid.utils.geometry import get_h3_resolution_from_scale_denominator
 from vgrid.utils.constants import DGGS_TYPES
 
@@ -32,105 +27,69 @@ class H3Grid(QObject):
 
         # H3 auto-update toggle and debounced extent listener
         self.h3_enabled = False
-        self._extentTimer = QTimer(self)
-        self._extentTimer.setSingleShot(True)
-        self._extentTimer.setInterval(150)
-        self.canvas.extentsChanged.connect(self._onExtentsChanged)
-        self._extentTimer.timeout.connect(self._refreshH3GridOnExtent)
+        self.vgridtools.overlay_manager.register(
+            lambda: self.h3_enabled, self._refreshH3GridOnExtent
+        )
+        self.h3_renderer = GridRenderer(self.canvas, self.h3_marker, "H3 grid")
+        self.h3_cache = CellCache("h3")
         self.removeMarker()
 
-    def _onExtentsChanged(self):
-        self._extentTimer.start()
-
     def h3_grid(self):
         try:
-            # Clear previous grid before drawing a new one
-            self.removeMarker()
-            self.h3_marker.reset(QgsWkbTypes.PolygonGeometry)
-            self.h3_marker.setStrokeColor(settings.h3Color)
-            self.h3_marker.setWidth(settings.gridWidth)
-
-            canvas_extent = self.canvas.extent()
-            canvas_crs = QgsProject.instance().crs()
-
-            scale = self.canvas.scale()
+            view = self.vgridtools.overlay_manager.frame()
+            canvas_crs = view.canvas_crs
             # resolution = self._get_h3_resolution(scale)
-            resolution = get_h3_resolution_from_scale_denominator(
-                scale, relative_depth=6, mm_per_pixel=0.28
+            resolution = view.resolution(
+                "h3",
+                lambda scale: get_h3_resolution_from_scale_denominator(
+                    scale, relative_depth=6, mm_per_pixel=0.28
+                ),
             )
             if settings.zoomLevel:
-                zoom = 29.1402 - log2(scale)
+                zoom = view.zoom
                 self.iface.mainWindow().statusBar().showMessage(
-                    f"Zoom Level: {zoom:.2f} | H3 resolution: {resolution}"
+                    f"Zoom Level: {zoom:.2f} | H3 resolution: {resolution}{view.budget_note('h3')}"
                 )
 
+            if resolution > 0:
+                min_lon, min_lat, max_lon, max_lat = view.bbox_4326
+
+            fix_antimeridian = "split" if settings.splitAntimeridian else "shift_west"
+            trans_to_canvas = view.canvas_transform()
             if resolution == 0:
-                base_cells = h3.get_res0_cells()
-                for cell in base_cells:
-                    child_cells = h3.cell_to_children(cell, resolution)
-                    # Progress bar for child cells
-                    for child_cell in child_cells:
-                        if settings.splitAntimeridian:
-                            cell_polygon = h32geo(child_cell, fix_antimeridian="split")
-                        else:
-                            cell_polygon = h32geo(
-                                child_cell, fix_antimeridian="shift_west"
-                            )
-                        if epsg4326 != canvas_crs:
-                            trans_to_canvas = QgsCoordinateTransform(
-                                epsg4326, canvas_crs, QgsProject.instance()
-                            )
-                            cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-                            cell_geometry.transform(trans_to_canvas)
-                        else:
-                            cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-                        self.h3_marker.addGeometry(cell_geometry, None)
+                bbox = (-180.0, -90.0, 180.0, 90.0)
             else:
-                min_lon, min_lat, max_lon, max_lat = (
-                    canvas_extent.xMinimum(),
-                    canvas_extent.yMinimum(),
-                    canvas_extent.xMaximum(),
-                    canvas_extent.yMaximum(),
-                )
-                # Transform extent to EPSG:4326 if needed
-                if epsg4326 != canvas_crs:
-                    trans_to_4326 = QgsCoordinateTransform(
-                        canvas_crs, epsg4326, QgsProject.instance()
-                    )
-                    transformed_extent = trans_to_4326.transform(canvas_extent)
-                    min_lon, min_lat, max_lon, max_lat = (
-                        transformed_extent.xMinimum(),
-                        transformed_extent.yMinimum(),
-                        transformed_extent.xMaximum(),
-                        transformed_extent.yMaximum(),
-                    )
-
-                min_lon, min_lat, max_lon, max_lat = validate_coordinate(
-                    min_lon, min_lat, max_lon, max_lat
+                bbox = (min_lon, min_lat, max_lon, max_lat)
+            frame, strips = self.h3_cache.begin_frame(
+                frame_context(canvas_crs, fix_antimeridian), resolution, bbox
+            )
+
+            def cells_in_bbox(strip):
+                if resolution == 0:
+                    return [
+                        child_cell
+                        for cell in h3.get_res0_cells()
+                        for child_cell in h3.cell_to_children(cell, resolution)
+                    ]
+                # h3.geo_to_cells only returns the cells that are center_within the
+                # extent, so the exposed strips never share a cell with the last frame
+                return h3.geo_to_cells(box(*strip), resolution)
+
+            def build(task):
+                return self.h3_cache.fill(
+                    task,
+                    frame,
+                    strips,
+                    cells_in_bbox,
+                    lambda cell: h32geo(cell, fix_antimeridian=fix_antimeridian),
+                    trans_to_canvas,
                 )
 
-                # buffer the extent because the h3.geo_to_cells function only returns the
-                # cells that are center_within the extent
-                extent_bbox = box(min_lon, min_lat, max_lon, max_lat)
-                # distance = h3.average_hexagon_edge_length(resolution, unit="m")
-                # extent_bbox = geodesic_buffer(extent_bbox, distance)
-
-                bbox_cells = h3.geo_to_cells(extent_bbox, resolution)
-                for bbox_cell in bbox_cells:
-                    if settings.splitAntimeridian:
-                        cell_polygon = h32geo(bbox_cell, fix_antimeridian="split")
-                    else:
-                        cell_polygon = h32geo(bbox_cell, fix_antimeridian="shift_west")
-                    if epsg4326 != canvas_crs:
-                        trans_to_canvas = QgsCoordinateTransform(
-                            epsg4326, canvas_crs, QgsProject.instance()
-                        )
-                        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-                        cell_geometry.transform(trans_to_canvas)
-                    else:
-                        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-                    self.h3_marker.addGeometry(cell_geometry, None)
-            self.canvas.refresh()
+            self.h3_renderer.submit(
+                build,
+                settings.h3Color,
+                on_applied=lambda: self.h3_cache.commit(frame),
+            )
 
         except Exception:
             return
@@ -153,20 +112,14 @@ class H3Grid(QObject):
 
     @pyqtSlot()
     def removeMarker(self):
-        self.h3_marker.reset(QgsWkbTypes.PolygonGeometry)
+        self.h3_renderer.clear()
+        self.h3_cache.clear()
 
     def cleanup(self):
         # Disconnect signals and delete rubber band
         try:
-            self._extentTimer.stop()
-            try:
-                self._extentTimer.timeout.disconnect(self._refreshH3GridOnExtent)
-            except Exception:
-                pass
-            try:
-                self.canvas.extentsChanged.disconnect(self._onExtentsChanged)
-            except Exception:
-                pass
+            self.vgridtools.overlay_manager.unregister(self._refreshH3GridOnExtent)
+            self.h3_renderer.cleanup()
         except Exception:
             pass
 
@@ -1,20 +1,14 @@
 from shapely.geometry import box
-from qgis.core import (
-    QgsWkbTypes,
-    QgsCoordinateTransform,
-    QgsGeometry,
-    QgsProject,
-)
-from qgis.PyQt.QtCore import QObject, QTimer
+from qgis.core import QgsWkbTypes
+from qgis.PyQt.QtCore import QObject
 from qgis.gui import QgsRubberBand
 from qgis.PyQt.QtCore import pyqtSlot
 
 import platform
 from math import log2, floor
 
-from ..utils.latlon import epsg4326
+from .grid_task import GridRenderer, to_canvas_geometries
 from ..settings import settings
-from vgrid.utils.io import validate_coordinate
 from vgrid.utils.constants import DGGS_TYPES
 from vgrid.utils.geometry import get_isea3h_resolution_from_scale_denominator
 
@@ -46,120 +40,75 @@ class ISEA3HGrid(QObject):
 
         # isea3h auto-update toggle and debounced extent listener
         self.isea3h_enabled = False
-        self._extentTimer = QTimer(self)
-        self._extentTimer.setSingleShot(True)
-        self._extentTimer.setInterval(150)
-        self.canvas.extentsChanged.connect(self._onExtentsChanged)
-        self._extentTimer.timeout.connect(self._refreshISEA3HGridOnExtent)
+        self.vgridtools.overlay_manager.register(
+            lambda: self.isea3h_enabled, self._refreshISEA3HGridOnExtent
+        )
+        self.isea3h_renderer = GridRenderer(
+            self.canvas, self.isea3h_marker, "ISEA3H grid"
+        )
         self.removeMarker()
 
-    def _onExtentsChanged(self):
-        self._extentTimer.start()
-
     def isea3h_grid(self):
         if platform.system() != "Windows":
             return
         try:
-            # Clear previous grid before drawing a new one
-            self.removeMarker()
-            self.isea3h_marker.reset(QgsWkbTypes.PolygonGeometry)
-            self.isea3h_marker.setStrokeColor(settings.isea3hColor)
-            self.isea3h_marker.setWidth(settings.gridWidth)
-
-            canvas_extent = self.canvas.extent()
-            canvas_crs = QgsProject.instance().crs()
-
-            scale = self.canvas.scale()
+            view = self.vgridtools.overlay_manager.frame()
             # resolution = self._get_isea3h_resolution(scale)
-            resolution = get_isea3h_resolution_from_scale_denominator(
-                scale, relative_depth=10, mm_per_pixel=0.28
+            resolution = view.resolution(
+                "isea3h",
+                lambda scale: get_isea3h_resolution_from_scale_denominator(
+                    scale, relative_depth=10, mm_per_pixel=0.28
+                ),
             )
             if settings.zoomLevel:
-                zoom = 29.1402 - log2(scale)
+                zoom = view.zoom
                 self.iface.mainWindow().statusBar().showMessage(
-                    f"Zoom Level: {zoom:.2f} | isea3h resolution: {resolution}"
+                    f"Zoom Level: {zoom:.2f} | isea3h resolution: {resolution}{view.budget_note('isea3h')}"
                 )
 
-            if resolution <= 3:
-                isea3h_cells = get_isea3h_children_cells(ISEA3H_BASE_CELLS, resolution)
-                for child in isea3h_cells:
-                    isea3h_cell = DggsCell(child)
-                    isea3h_id = isea3h_cell.get_cell_id()
-                    if settings.splitAntimeridian:
-                        cell_polygon = isea3h2geo(isea3h_id, fix_antimeridian="split")
-                    else:
-                        cell_polygon = isea3h2geo(
-                            isea3h_id, fix_antimeridian="shift_west"
-                        )
-                    if epsg4326 != canvas_crs:
-                        trans_to_canvas = QgsCoordinateTransform(
-                            epsg4326, canvas_crs, QgsProject.instance()
-                        )
-                        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-                        cell_geometry.transform(trans_to_canvas)
-                    else:
-                        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-                    self.isea3h_marker.addGeometry(cell_geometry, None)
-            else:
+            if resolution > 3:
                 # Define bbox in canvas CRS
-                min_lon, min_lat, max_lon, max_lat = (
-                    canvas_extent.xMinimum(),
-                    canvas_extent.yMinimum(),
-                    canvas_extent.xMaximum(),
-                    canvas_extent.yMaximum(),
-                )
+                min_lon, min_lat, max_lon, max_lat = view.bbox_4326
 
-                # Transform extent to EPSG:4326 if needed
-                if epsg4326 != canvas_crs:
-                    trans_to_4326 = QgsCoordinateTransform(
-                        canvas_crs, epsg4326, QgsProject.instance()
+            fix_antimeridian = "split" if settings.splitAntimeridian else "shift_west"
+            trans_to_canvas = view.canvas_transform()
+
+            def build(task):
+                if resolution <= 3:
+                    cells_to_draw = [
+                        DggsCell(child).get_cell_id()
+                        for child in get_isea3h_children_cells(
+                            ISEA3H_BASE_CELLS, resolution
+                        )
+                    ]
+                else:
+                    extent_bbox = box(min_lon, min_lat, max_lon, max_lat)
+                    accuracy = ISEA3H_RES_ACCURACY_DICT.get(resolution)
+                    extent_bbox_wkt = extent_bbox.wkt  # Create a bounding box polygon
+                    shapes = isea3h_dggs.convert_shape_string_to_dggs_shapes(
+                        extent_bbox_wkt, ShapeStringFormat.WKT, accuracy
                     )
-                    transformed_extent = trans_to_4326.transform(canvas_extent)
-                    min_lon, min_lat, max_lon, max_lat = (
-                        transformed_extent.xMinimum(),
-                        transformed_extent.yMinimum(),
-                        transformed_extent.xMaximum(),
-                        transformed_extent.yMaximum(),
+                    shape = shapes[0]
+                    bbox_cells = shape.get_shape().get_outer_ring().get_cells()
+                    bounding_cell = isea3h_dggs.get_bounding_dggs_cell(bbox_cells)
+                    cells_to_draw = get_isea3h_children_cells_within_bbox(
+                        bounding_cell.get_cell_id(), extent_bbox, resolution
                     )
 
-                min_lon, min_lat, max_lon, max_lat = validate_coordinate(
-                    min_lon, min_lat, max_lon, max_lat
-                )
-                extent_bbox = box(min_lon, min_lat, max_lon, max_lat)
-
-                accuracy = ISEA3H_RES_ACCURACY_DICT.get(resolution)
-                extent_bbox_wkt = extent_bbox.wkt  # Create a bounding box polygon
-                shapes = isea3h_dggs.convert_shape_string_to_dggs_shapes(
-                    extent_bbox_wkt, ShapeStringFormat.WKT, accuracy
-                )
-                shape = shapes[0]
-                bbox_cells = shape.get_shape().get_outer_ring().get_cells()
-                bounding_cell = isea3h_dggs.get_bounding_dggs_cell(bbox_cells)
-                cells_to_draw = get_isea3h_children_cells_within_bbox(
-                    bounding_cell.get_cell_id(), extent_bbox, resolution
-                )
-                # Draw cells
+                cell_polygons = []
                 for cell_id in cells_to_draw:
+                    if task.isCanceled():
+                        return None
                     try:
-                        if settings.splitAntimeridian:
-                            cell_polygon = isea3h2geo(cell_id, fix_antimeridian="split")
-                        else:
-                            cell_polygon = isea3h2geo(
-                                cell_id, fix_antimeridian="shift_west"
-                            )
-                        if epsg4326 != canvas_crs:
-                            trans_to_canvas = QgsCoordinateTransform(
-                                epsg4326, canvas_crs, QgsProject.instance()
-                            )
-                            cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-                            cell_geometry.transform(trans_to_canvas)
-                        else:
-                            cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-                        self.isea3h_marker.addGeometry(cell_geometry, None)
+                        cell_polygon = isea3h2geo(
+                            cell_id, fix_antimeridian=fix_antimeridian
+                        )
+                        cell_polygons.append(cell_polygon)
                     except Exception:
                         continue
+                return to_canvas_geometries(cell_polygons, trans_to_canvas)
 
-            self.canvas.refresh()
+            self.isea3h_renderer.submit(build, settings.isea3hColor)
 
         except Exception:
             return
@@ -184,20 +133,13 @@ class ISEA3HGrid(QObject):
 
     @pyqtSlot()
     def removeMarker(self):
-        self.isea3h_marker.reset(QgsWkbTypes.PolygonGeometry)
+        self.isea3h_renderer.clear()
 
     def cleanup(self):
         # Disconnect signals and delete rubber band
         try:
-            self._extentTimer.stop()
-            try:
-                self._extentTimer.timeout.disconnect(self._refreshISEA3HGridOnExtent)
-            except Exception:
-                pass
-            try:
-                self.canvas.extentsChanged.disconnect(self._onExtentsChanged)
-            except Exception:
-                pass
+            self.vgridtools.overlay_manager.unregister(self._refreshISEA3HGridOnExtent)
+            self.isea3h_renderer.cleanup()
         except Exception:
             pass
 
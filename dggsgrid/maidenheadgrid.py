@@ -1,17 +1,12 @@
 from shapely.geometry import Polygon
-from qgis.core import (
-    QgsWkbTypes,
-    QgsCoordinateTransform,
-    QgsGeometry,
-    QgsProject,
-)
-from qgis.PyQt.QtCore import QObject, QTimer
+from qgis.core import QgsWkbTypes
+from qgis.PyQt.QtCore import QObject
 from qgis.gui import QgsRubberBand
 from qgis.PyQt.QtCore import pyqtSlot
 
 
 from math import log2, floor
-from ..utils.latlon import epsg4326
+from .grid_task import GridRenderer, to_canvas_geometries
 from ..settings import settings
 
 # Maidenhead imports
@@ -42,59 +37,34 @@ class MaidenheadGrid(QObject):
 
         # Maidenhead auto-update toggle and debounced extent listener
         self.maidenhead_enabled = False
-        self._extentTimer = QTimer(self)
-        self._extentTimer.setSingleShot(True)
-        self._extentTimer.setInterval(150)
-        self.canvas.extentsChanged.connect(self._onExtentsChanged)
-        self._extentTimer.timeout.connect(self._refreshMaidenheadGridOnExtent)
+        self.vgridtools.overlay_manager.register(
+            lambda: self.maidenhead_enabled, self._refreshMaidenheadGridOnExtent
+        )
+        self.maidenhead_renderer = GridRenderer(
+            self.canvas, self.maidenhead_marker, "Maidenhead grid"
+        )
         self.removeMarker()
 
-    def _onExtentsChanged(self):
-        self._extentTimer.start()
-
     def maidenhead_grid(self):
         try:
-            # Clear previous grid before drawing a new one
-            self.removeMarker()
-            self.maidenhead_marker.reset(QgsWkbTypes.PolygonGeometry)
-            self.maidenhead_marker.setStrokeColor(settings.maidenheadColor)
-            self.maidenhead_marker.setWidth(settings.gridWidth)
-
-            canvas_extent = self.canvas.extent()
-            canvas_crs = QgsProject.instance().crs()
-
-            scale = self.canvas.scale()
+            view = self.vgridtools.overlay_manager.frame()
             # resolution = self._get_maidenhead_resolution(scale)
-            resolution = get_maidenhead_resolution_from_scale_denominator(
-                scale, relative_depth=2, mm_per_pixel=0.28
+            resolution = view.resolution(
+                "maidenhead",
+                lambda scale: get_maidenhead_resolution_from_scale_denominator(
+                    scale, relative_depth=2, mm_per_pixel=0.28
+                ),
             )
             if settings.zoomLevel:
-                zoom = 29.1402 - log2(scale)
+                zoom = view.zoom
                 self.iface.mainWindow().statusBar().showMessage(
-                    f"Zoom Level: {zoom:.2f} | Maidenhead resolution: {resolution}"
+                    f"Zoom Level: {zoom:.2f} | Maidenhead resolution: {resolution}{view.budget_note('maidenhead')}"
                 )
 
             if resolution <= 1:
                 min_lon, min_lat, max_lon, max_lat = -180, -90, 180, 90
             else:
-                min_lon, min_lat, max_lon, max_lat = (
-                    canvas_extent.xMinimum(),
-                    canvas_extent.yMinimum(),
-                    canvas_extent.xMaximum(),
-                    canvas_extent.yMaximum(),
-                )
-                # Transform extent to EPSG:4326 if needed
-                if epsg4326 != canvas_crs:
-                    trans_to_4326 = QgsCoordinateTransform(
-                        canvas_crs, epsg4326, QgsProject.instance()
-                    )
-                    transformed_extent = trans_to_4326.transform(canvas_extent)
-                    min_lon, min_lat, max_lon, max_lat = (
-                        transformed_extent.xMinimum(),
-                        transformed_extent.yMinimum(),
-                        transformed_extent.xMaximum(),
-                        transformed_extent.yMaximum(),
-                    )
+                min_lon, min_lat, max_lon, max_lat = view.bbox_4326
 
             min_lon, min_lat, max_lon, max_lat = validate_coordinate(
                 min_lon, min_lat, max_lon, max_lat
@@ -109,50 +79,51 @@ class MaidenheadGrid(QObject):
             min_y = max(0, int((min_lat - base_lat) / lat_width))
             max_y = min(y_cells, int((max_lat - base_lat) / lat_width) + 1)
 
-            # Generate maidenhead cells within extent
-            for i in range(min_x, max_x):
-                for j in range(min_y, max_y):
-                    cell_min_lon = base_lon + i * lon_width
-                    cell_max_lon = cell_min_lon + lon_width
-                    cell_min_lat = base_lat + j * lat_width
-                    cell_max_lat = cell_min_lat + lat_width
-
-                    cell_center_lat = (cell_min_lat + cell_max_lat) / 2
-                    cell_center_lon = (cell_min_lon + cell_max_lon) / 2
-
-                    maidenhead_id = maidenhead.toMaiden(
-                        cell_center_lat, cell_center_lon, resolution
-                    )
-                    (
-                        _,
-                        _,
-                        min_lat_maiden,
-                        min_lon_maiden,
-                        max_lat_maiden,
-                        max_lon_maiden,
-                        _,
-                    ) = maidenhead.maidenGrid(maidenhead_id)
-
-                    # Define the polygon based on the bounding box
-                    cell_polygon = Polygon(
-                        [
-                            [min_lon_maiden, min_lat_maiden],  # Bottom-left corner
-                            [max_lon_maiden, min_lat_maiden],  # Bottom-right corner
-                            [max_lon_maiden, max_lat_maiden],  # Top-right corner
-                            [min_lon_maiden, max_lat_maiden],  # Top-left corner
-                            [min_lon_maiden, min_lat_maiden],  # Closing the polygon
-                        ]
-                    )
-
-                    cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
-                    if epsg4326 != canvas_crs:
-                        trans_to_canvas = QgsCoordinateTransform(
-                            epsg4326, canvas_crs, QgsProject.instance()
+            trans_to_canvas = view.canvas_transform()
+
+            def build(task):
+                cell_polygons = []
+                # Generate maidenhead cells within extent
+                for i in range(min_x, max_x):
+                    if task.isCanceled():
+                        return None
+                    for j in range(min_y, max_y):
+                        cell_min_lon = base_lon + i * lon_width
+                        cell_max_lon = cell_min_lon + lon_width
+                        cell_min_lat = base_lat + j * lat_width
+                        cell_max_lat = cell_min_lat + lat_width
+
+                        cell_center_lat = (cell_min_lat + cell_max_lat) / 2
+                        cell_center_lon = (cell_min_lon + cell_max_lon) / 2
+
+                        maidenhead_id = maidenhead.toMaiden(
+                            cell_center_lat, cell_center_lon, resolution
+                        )
+                        (
+                            _,
+                            _,
+                            min_lat_maiden,
+                            min_lon_maiden,
+                            max_lat_maiden,
+                            max_lon_maiden,
+                            _,
+                        ) = maidenhead.maidenGrid(maidenhead_id)
+
+                        # Define the polygon based on the bounding box
+                        cell_polygon = Polygon(
+                            [
+                                [min_lon_maiden, min_lat_maiden],  # Bottom-left corner
+                                [max_lon_maiden, min_lat_maiden],  # Bottom-right corner
+                                [max_lon_maiden, max_lat_maiden],  # Top-right corner
+                                [min_lon_maiden, max_lat_maiden],  # Top-left corner
+                                [min_lon_maiden, min_lat_maiden],  # Closing the polygon
+                            ]
                         )
-                        cell_geom.transform(trans_to_canvas)
-                    self.maidenhead_marker.addGeometry(cell_geom, None)
 
-            self.canvas.refresh()
+                        cell_polygons.append(cell_polygon)
+                return to_canvas_geometries(cell_polygons, trans_to_canvas)
+
+            self.maidenhead_renderer.submit(build, settings.maidenheadColor)
 
         except Exception:
             return
@@ -178,22 +149,15 @@ class MaidenheadGrid(QObject):
 
     @pyqtSlot()
     def removeMarker(self):
-        self.maidenhead_marker.reset(QgsWkbTypes.PolygonGeometry)
+        self.maidenhead_renderer.clear()
 
     def cleanup(self):
         # Disconnect signals and delete rubber band
         try:
-            self._extentTimer.stop()
-            try:
-                self._extentTimer.timeout.disconnect(
-                    self._refreshMaidenheadGridOnExtent
-                )
-            except Exception:
-                pass
-            try:
-                self.canvas.extentsChanged.disconnect(self._onExtentsChanged)
-            except Exception:
-                pass
+            self.vgridtools.overlay_manager.unregister(
+                self._refreshMaidenheadGridOnExtent
+            )
+            self.maidenhead_renderer.cleanup()
         except Exception:
             pass
 
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""Shared extent listener for the DGGS Viz canvas overlays.
+
+One debounced ``extentsChanged`` handler serves every overlay: it only calls
+back the overlays that are enabled, and the canvas extent, CRS, scale and
+EPSG:4326 bounding box are computed once per frame in a ``ViewFrame`` that all
+overlays share. Resolutions handed out by the frame are capped to the
+configured cell budget (see ``cell_budget``).
+"""
+
+from math import log2
+
+from qgis.core import QgsCoordinateTransform, QgsProject
+from qgis.PyQt.QtCore import QObject, QTimer
+
+from vgrid.utils.io import validate_coordinate
+
+from ..settings import settings
+from ..utils.latlon import epsg4326
+from .cell_budget import fit_resolution
+from .grid_task import CanvasTransform
+from .overlay_stats import note_resolution
+
+WORLD_BBOX = (-180.0, -90.0, 180.0, 90.0)
+
+
+class ViewFrame:
+    """Canvas state for one frame, shared by all overlays."""
+
+    def __init__(self, canvas):
+        self.canvas_extent = canvas.extent()
+        self.canvas_crs = canvas.mapSettings().destinationCrs()
+        self.scale = canvas.scale()
+        self.zoom = 29.1402 - log2(self.scale)
+
+        if epsg4326 != self.canvas_crs:
+            trans_to_4326 = QgsCoordinateTransform(
+                self.canvas_crs, epsg4326, QgsProject.instance()
+            )
+            rect = trans_to_4326.transformBoundingBox(self.canvas_extent)
+        else:
+            rect = self.canvas_extent
+        self.bbox_4326 = tuple(
+            validate_coordinate(
+                rect.xMinimum(), rect.yMinimum(), rect.xMaximum(), rect.yMaximum()
+            )
+        )
+        self._resolutions = {}
+        self._requested = {}
+
+    def resolution(self, key, resolve):
+        """Memoize ``resolve(scale)`` for this frame under *key*.
+
+        The resolution is stepped down while the overlay would draw more than
+        ``settings.overlayMaxCells`` cells in the current extent.
+        """
+        if key not in self._resolutions:
+            requested = resolve(self.scale)
+            resolution = fit_resolution(
+                key, requested, self.bbox_4326, settings.overlayMaxCells
+            )
+            self._resolutions[key] = resolution
+            if resolution != requested:
+                self._requested[key] = requested
+        resolution = self._resolutions[key]
+        note_resolution(
+            key, resolution, self._requested.get(key, resolution), self.zoom
+        )
+        return resolution
+
+    def budget_note(self, key):
+        """Status bar suffix when the resolution of *key* was lowered for the cell budget."""
+        if key not in self._requested:
+            return ""
+        return f" (reduced from {self._requested[key]}, cell budget)"
+
+    def canvas_transform(self):
+        """EPSG:4326 -> canvas CRS CanvasTransform for one render task, or None if not needed."""
+        if epsg4326 == self.canvas_crs:
+            return None
+        # Each task gets its own transform; the frame is shared between worker threads
+        return CanvasTransform(self.canvas_crs)
+
+
+class OverlayManager(QObject):
+    """Own the debounced extent listener and dispatch frames to enabled overlays."""
+
+    def __init__(self, canvas, interval=150):
+        super().__init__()
+        self.canvas = canvas
+        self._overlays = []
+        self._frame = None
+
+        self._extentTimer = QTimer(self)
+        self._extentTimer.setSingleShot(True)
+        self._extentTimer.setInterval(interval)
+        self.canvas.extentsChanged.connect(self._onExtentsChanged)
+        self.canvas.destinationCrsChanged.connect(self._onExtentsChanged)
+        self._extentTimer.timeout.connect(self._dispatch)
+
+    def register(self, is_enabled, refresh):
+        """Call ``refresh()`` after each extent change while ``is_enabled()`` is true."""
+        self._overlays.append((is_enabled, refresh))
+
+    def unregister(self, refresh):
+        self._overlays = [
+            (is_enabled, fn) for is_enabled, fn in self._overlays if fn != refresh
+        ]
+
+    def frame(self):
+        """Return the ViewFrame for the current canvas state."""
+        if self._frame is None:
+            self._frame = ViewFrame(self.canvas)
+        return self._frame
+
+    def _onExtentsChanged(self):
+        self._frame = None
+        self._extentTimer.start()
+
+    def _dispatch(self):
+        for is_enabled, refresh in list(self._overlays):
+            if is_enabled():
+                refresh()
+
+    def cleanup(self):
+        try:
+            self._extentTimer.stop()
+            try:
+                self._extentTimer.timeout.disconnect(self._dispatch)
+            except Exception:
+                pass
+            try:
+                self.canvas.extentsChanged.disconnect(self._onExtentsChanged)
+                self.canvas.destinationCrsChanged.disconnect(self._onExtentsChanged)
+            except Exception:
+                pass
+        except Exception:
+            pass
+        self._overlays = []
+        self._frame = None
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""Per-stage timing of DGGS Viz overlay refreshes.
+
+With the "DGGS Viz timing diagnostics" setting on, every render task carries a
+``FrameStats`` that the shared overlay code (cell cache, global grids, DGGRID
+tiles, reprojection, drawing) reports into: milliseconds per stage, cell
+counts and cache hits. The summary is appended to the zoom-level message in
+the status bar and logged, one JSON object per line, to a rolling
+``cache/overlay_stats.jsonl``.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+
+from ..settings import settings
+
+_PLUGIN_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATS_LOG_PATH = os.path.join(_PLUGIN_ROOT, "cache", "overlay_stats.jsonl")
+STATS_LOG_BYTES = 1_000_000
+STATS_LOG_BACKUPS = 3
+
+# (counter prefix, label) of the caches reported as hit rates
+CACHE_COUNTERS = (
+    ("cache", "cells"),
+    ("global_grid", "global"),
+    ("tile", "tiles"),
+)
+
+_local = threading.local()
+_pending = {}
+_logger = None
+
+
+class FrameStats:
+    """Timings and counters of one overlay refresh."""
+
+    def __init__(self, overlay):
+        self.overlay = overlay
+        self.info = {}
+        self.prefix = ""
+        self.stages = {}
+        self.counts = {}
+        self._start = time.perf_counter()
+        self.total_ms = None
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, (time.perf_counter() - start) * 1000.0)
+
+    def add_time(self, name, ms):
+        self.stages[name] = self.stages.get(name, 0.0) + ms
+
+    def count(self, name, n=1):
+        self.counts[name] = self.counts.get(name, 0) + n
+
+    def finish(self):
+        self.total_ms = (time.perf_counter() - self._start) * 1000.0
+
+    def hit_rates(self):
+        rates = {}
+        for prefix, label in CACHE_COUNTERS:
+            hits = self.counts.get(f"{prefix}_hits", 0)
+            misses = self.counts.get(f"{prefix}_misses", 0)
+            if hits + misses:
+                rates[label] = hits / (hits + misses)
+        return rates
+
+    def summary(self):
+        stages = ", ".join(f"{name} {ms:.0f}" for name, ms in self.stages.items())
+        text = (
+            f"{self.overlay}: {self.counts.get('cells', 0)} cells in "
+            f"{self.total_ms:.0f} ms ({stages})"
+        )
+        rates = self.hit_rates()
+        if rates:
+            text += " | hits " + ", ".join(
+                f"{label} {rate:.0%}" for label, rate in rates.items()
+            )
+        return text
+
+    def to_dict(self):
+        return {
+            "time": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "overlay": self.overlay,
+            **self.info,
+            "total_ms": round(self.total_ms, 2),
+            "stages_ms": {name: round(ms, 2) for name, ms in self.stages.items()},
+            "counts": self.counts,
+            "hit_rates": {
+                label: round(rate, 4) for label, rate in self.hit_rates().items()
+            },
+        }
+
+
+def enabled():
+    return bool(settings.overlayDiagnostics)
+
+
+def note_resolution(key, resolution, requested, zoom):
+    """Remember the resolution just resolved on the GUI thread for the next frame."""
+    if not enabled():
+        return
+    _pending.clear()
+    _pending.update(
+        {
+            "key": key if isinstance(key, str) else "_".join(key),
+            "resolution": resolution,
+            "requested_resolution": requested,
+            "zoom": round(zoom, 2),
+        }
+    )
+
+
+def begin(overlay, prefix=""):
+    """New ``FrameStats`` for *overlay*, or None when diagnostics are off."""
+    if not enabled():
+        return None
+    stats = FrameStats(overlay)
+    stats.info = dict(_pending)
+    stats.prefix = prefix
+    _pending.clear()
+    return stats
+
+
+@contextmanager
+def collecting(stats):
+    """Make *stats* the current stats of this thread (the render task's worker)."""
+    previous = getattr(_local, "stats", None)
+    _local.stats = stats
+    try:
+        yield
+    finally:
+        _local.stats = previous
+
+
+def current_stats():
+    return getattr(_local, "stats", None)
+
+
+def timed(name):
+    """Context manager adding the elapsed time to stage *name* of the current stats."""
+    stats = current_stats()
+    return stats.stage(name) if stats is not None else nullcontext()
+
+
+def count(name, n=1):
+    stats = current_stats()
+    if stats is not None:
+        stats.count(name, n)
+
+
+def _stats_logger():
+    global _logger
+    if _logger is None:
+        os.makedirs(os.path.dirname(STATS_LOG_PATH), exist_ok=True)
+        handler = RotatingFileHandler(
+            STATS_LOG_PATH,
+            maxBytes=STATS_LOG_BYTES,
+            backupCount=STATS_LOG_BACKUPS,
+            encoding="utf-8",
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger = logging.getLogger("vgrid.overlay_stats")
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        logger.addHandler(handler)
+        _logger = logger
+    return _logger
+
+
+def report(stats, status_bar=None):
+    """Show *stats* in *status_bar* and append it to the JSON log (GUI thread)."""
+    stats.finish()
+    if status_bar is not None:
+        summary = stats.summary()
+        status_bar.showMessage(
+            f"{stats.prefix} | {summary}" if stats.prefix else summary
+        )
+    try:
+        _stats_logger().info(json.dumps(stats.to_dict()))
+    except OSError:
+        pass
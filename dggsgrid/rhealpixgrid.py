@@ -2,21 +2,19 @@ from vgrid.utils.geometry import get_rhealpix_resolution_from_scale_denominator
 from vgrid.utils.constants import DGGS_TYPES
 from vgrid.conversion.dggs2geo import rhealpix2geo
 from ..settings import settings
-from ..utils.latlon import epsg4326
+from .cell_cache import CellCache, frame_context
+from .global_grids import global_cells
+from .grid_task import GridRenderer
+from .overlay_manager import WORLD_BBOX
 from shapely.geometry import box
 from collections import deque
-from qgis.core import (
-    QgsWkbTypes,
-    QgsCoordinateTransform,
-    QgsGeometry,
-    QgsProject,
-)
-from qgis.PyQt.QtCore import QObject, QTimer
+from qgis.core import QgsWkbTypes
+from qgis.PyQt.QtCore import QObject
 from qgis.gui import QgsRubberBand
 from qgis.PyQt.QtCore import pyqtSlot
 
 from pyproj import Geod
-from math import log2, floor
+from math import floor
 
 from vgrid.dggs.rhealpixdggs.dggs import RHEALPixDGGS
 
@@ -37,183 +35,145 @@ class RhealpixGrid(QObject):
 
         # rHEALPix auto-update toggle and debounced extent listener
         self.rhealpix_enabled = False
-        self._extentTimer = QTimer(self)
-        self._extentTimer.setSingleShot(True)
-        self._extentTimer.setInterval(150)
-        self.canvas.extentsChanged.connect(self._onExtentsChanged)
-        self._extentTimer.timeout.connect(self._refreshRhealpixGridOnExtent)
+        self.vgridtools.overlay_manager.register(
+            lambda: self.rhealpix_enabled, self._refreshRhealpixGridOnExtent
+        )
+        self.rhealpix_renderer = GridRenderer(
+            self.canvas, self.rhealpix_marker, "rHEALPix grid"
+        )
+        self.rhealpix_cache = CellCache("rhealpix")
         self.removeMarker()
 
         # Reuse one DGGS instance
         self._rhealpix_dggs = RHEALPixDGGS()
 
-    def _onExtentsChanged(self):
-        self._extentTimer.start()
-
     def rhealpix_grid(self):
         try:
-            # Clear previous grid before drawing a new one
-            self.removeMarker()
-            self.rhealpix_marker.reset(QgsWkbTypes.PolygonGeometry)
-
-            canvas_extent = self.canvas.extent()
-            scale = self.canvas.scale()
+            view = self.vgridtools.overlay_manager.frame()
             # resolution = self._get_rhealpix_resolution(scale)
-            resolution = get_rhealpix_resolution_from_scale_denominator(
-                scale, relative_depth=5, mm_per_pixel=0.28
+            resolution = view.resolution(
+                "rhealpix",
+                lambda scale: get_rhealpix_resolution_from_scale_denominator(
+                    scale, relative_depth=5, mm_per_pixel=0.28
+                ),
             )
             if settings.zoomLevel:
-                zoom = 29.1402 - log2(scale)
+                zoom = view.zoom
                 self.iface.mainWindow().statusBar().showMessage(
-                    f"Zoom Level: {zoom:.2f} | rHEALPix resolution: {resolution}"
+                    f"Zoom Level: {zoom:.2f} | rHEALPix resolution: {resolution}{view.budget_note('rhealpix')}"
                 )
-            canvas_crs = self.canvas.mapSettings().destinationCrs()
+            canvas_crs = view.canvas_crs
+
+            fix_antimeridian = "split" if settings.splitAntimeridian else "shift_east"
+            trans_to_canvas = view.canvas_transform()
             if resolution <= 2:
-                min_lon, min_lat, max_lon, max_lat = -180, -90, 180, 90
-                rhealpix_cells = rhealpix_dggs.grid(resolution)
-                for rhealpix_cell in rhealpix_cells:
-                    rhealpix_id = str(rhealpix_cell)
-                    # Apply antimeridian fix if requested
-                    if settings.splitAntimeridian:
-                        cell_polygon = rhealpix2geo(
-                            rhealpix_id, fix_antimeridian="split"
-                        )
-                    else:
-                        cell_polygon = rhealpix2geo(
-                            rhealpix_id, fix_antimeridian="shift_east"
-                        )
-                    # cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
-                    # if epsg4326 != canvas_crs:
-                    #     trans = QgsCoordinateTransform(
-                    #         epsg4326, canvas_crs, QgsProject.instance()
-                    #     )
-                    #     cell_geom.transform(trans)
-                    # self.rhealpix_marker.addGeometry(cell_geom, None)
-                    if epsg4326 != canvas_crs:
-                        trans_to_canvas = QgsCoordinateTransform(
-                            epsg4326, canvas_crs, QgsProject.instance()
-                        )
-                        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-                        cell_geometry.transform(trans_to_canvas)
-                    else:
-                        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-                    self.rhealpix_marker.addGeometry(cell_geometry, None)
+                bbox = WORLD_BBOX
             else:
-                # Define bbox in canvas CRS
-                canvas_extent_bbox = box(
-                    canvas_extent.xMinimum(),
-                    canvas_extent.yMinimum(),
-                    canvas_extent.xMaximum(),
-                    canvas_extent.yMaximum(),
-                )
+                bbox = view.bbox_4326
+            frame, strips = self.rhealpix_cache.begin_frame(
+                frame_context(canvas_crs, fix_antimeridian), resolution, bbox
+            )
 
-                # Transform extent to EPSG:4326 if needed
-                if epsg4326 != canvas_crs:
-                    extent_geom = QgsGeometry.fromWkt(canvas_extent_bbox.wkt)
-                    trans_to_4326 = QgsCoordinateTransform(
-                        canvas_crs, epsg4326, QgsProject.instance()
-                    )
-                    extent_geom.transform(trans_to_4326)
-                    rect = extent_geom.boundingBox()
-                    min_lon, min_lat, max_lon, max_lat = (
-                        rect.xMinimum(),
-                        rect.yMinimum(),
-                        rect.xMaximum(),
-                        rect.yMaximum(),
+            def build(task):
+                if resolution <= 2:
+                    # Whole-world grid: built once, then read from disk
+                    world = global_cells(
+                        "rhealpix",
+                        resolution,
+                        (fix_antimeridian,),
+                        lambda: (
+                            (
+                                str(rhealpix_cell),
+                                rhealpix2geo(
+                                    str(rhealpix_cell),
+                                    fix_antimeridian=fix_antimeridian,
+                                ),
+                            )
+                            for rhealpix_cell in rhealpix_dggs.grid(resolution)
+                        ),
                     )
-                else:
-                    min_lon, min_lat, max_lon, max_lat = (
-                        canvas_extent_bbox.bounds[0],
-                        canvas_extent_bbox.bounds[1],
-                        canvas_extent_bbox.bounds[2],
-                        canvas_extent_bbox.bounds[3],
+                    return self.rhealpix_cache.fill(
+                        task,
+                        frame,
+                        strips,
+                        lambda strip: world,
+                        world.get,
+                        trans_to_canvas,
                     )
 
-                extent_bbox = box(min_lon, min_lat, max_lon, max_lat)
-                # Seed cell from bbox center
-                bbox_center_lon = (min_lon + max_lon) / 2.0
-                bbox_center_lat = (min_lat + max_lat) / 2.0
-                seed_point = (bbox_center_lon, bbox_center_lat)
+                # Polygons computed while walking the grid, reused for drawing
+                polygons = {}
 
-                seed_cell = self._rhealpix_dggs.cell_from_point(
-                    resolution, seed_point, plane=False
-                )
-                seed_cell_id = str(seed_cell)
-                # Apply antimeridian fix if requested for intersection check
-                if settings.splitAntimeridian:
-                    seed_cell_polygon = rhealpix2geo(
-                        seed_cell_id, fix_antimeridian="split"
+                def cells_in_bbox(strip):
+                    extent_bbox = box(*strip)
+                    # Seed cell from bbox center
+                    bbox_center_lon = (strip[0] + strip[2]) / 2.0
+                    bbox_center_lat = (strip[1] + strip[3]) / 2.0
+                    seed_point = (bbox_center_lon, bbox_center_lat)
+
+                    seed_cell = self._rhealpix_dggs.cell_from_point(
+                        resolution, seed_point, plane=False
                     )
-                else:
+                    seed_cell_id = str(seed_cell)
                     seed_cell_polygon = rhealpix2geo(
-                        seed_cell_id, fix_antimeridian="shift_east"
+                        seed_cell_id, fix_antimeridian=fix_antimeridian
                     )
 
-                cells_to_draw_ids = set()
-
-                # Store intersecting cells with their polygons
-                intersecting_cells = {}  # {cell_id: polygon}
+                    # If one cell fully contains the bbox, just draw it
+                    if seed_cell_polygon.contains(extent_bbox):
+                        polygons[seed_cell_id] = seed_cell_polygon
+                        return [seed_cell_id]
 
-                # If one cell fully contains the bbox, just draw it
-                if seed_cell_polygon.contains(extent_bbox):
-                    cells_to_draw_ids.add(seed_cell_id)
-                    intersecting_cells[seed_cell_id] = seed_cell_polygon
-                else:
                     # BFS over neighbors to cover bbox extent
+                    intersecting_ids = []
                     covered_ids = set()
-                    queue = deque([seed_cell])  # Use deque for BFS
+                    queue = deque([seed_cell])
 
                     while queue:
-                        current_cell = queue.popleft()  # BFS: FIFO
+                        if task.isCanceled():
+                            return []
+                        current_cell = queue.popleft()
                         current_id = str(current_cell)
                         if current_id in covered_ids:
                             continue
                         covered_ids.add(current_id)
 
-                        # Apply antimeridian fix if requested for intersection check
-                        if settings.splitAntimeridian:
-                            cell_polygon = rhealpix2geo(
-                                current_id, fix_antimeridian="split"
-                            )
-                        else:
-                            cell_polygon = rhealpix2geo(
-                                current_id, fix_antimeridian="shift_east"
-                            )
+                        # Antimeridian fix already applied for the intersection check
+                        cell_polygon = rhealpix2geo(
+                            current_id, fix_antimeridian=fix_antimeridian
+                        )
 
                         if cell_polygon.intersects(extent_bbox):
-                            # Store for later drawing (no double conversion)
-                            intersecting_cells[current_id] = cell_polygon
-                            cells_to_draw_ids.add(current_id)
+                            intersecting_ids.append(current_id)
+                            polygons[current_id] = cell_polygon
 
                             neighbors = current_cell.neighbors(plane=False)
                             for _, neighbor in neighbors.items():
                                 neighbor_id = str(neighbor)
                                 if neighbor_id not in covered_ids:
                                     queue.append(neighbor)
+                    return intersecting_ids
+
+                def cell_polygon(cell_id):
+                    # No double conversion for cells found by the BFS
+                    if cell_id in polygons:
+                        return polygons[cell_id]
+                    return rhealpix2geo(cell_id, fix_antimeridian=fix_antimeridian)
+
+                return self.rhealpix_cache.fill(
+                    task,
+                    frame,
+                    strips,
+                    cells_in_bbox,
+                    cell_polygon,
+                    trans_to_canvas,
+                )
 
-                # Draw collected cells (no double conversion)
-                # Note: fix_antimeridian already applied when creating polygon in BFS loop
-                for cell_id in cells_to_draw_ids:
-                    # Use stored polygon (should always be available)
-                    cell_polygon = intersecting_cells[cell_id]
-                    # cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
-                    # if epsg4326 != canvas_crs:
-                    #     trans = QgsCoordinateTransform(
-                    #         epsg4326, canvas_crs, QgsProject.instance()
-                    #     )
-                    #     cell_geom.transform(trans)
-                    # self.rhealpix_marker.addGeometry(cell_geom, None)
-                    if epsg4326 != canvas_crs:
-                        trans_to_canvas = QgsCoordinateTransform(
-                            epsg4326, canvas_crs, QgsProject.instance()
-                        )
-                        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-                        cell_geometry.transform(trans_to_canvas)
-                    else:
-                        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-                    self.rhealpix_marker.addGeometry(cell_geometry, None)
-
-            self.canvas.refresh()
+            self.rhealpix_renderer.submit(
+                build,
+                settings.rhealpixColor,
+                on_applied=lambda: self.rhealpix_cache.commit(frame),
+            )
 
         except Exception:
             return
@@ -239,20 +199,16 @@ class RhealpixGrid(QObject):
 
     @pyqtSlot()
     def removeMarker(self):
-        self.rhealpix_marker.reset(QgsWkbTypes.PolygonGeometry)
+        self.rhealpix_renderer.clear()
+        self.rhealpix_cache.clear()
 
     def cleanup(self):
         # Disconnect signals and delete rubber band
         try:
-            self._extentTimer.stop()
-            try:
-                self._extentTimer.timeout.disconnect(self._refreshRhealpixGridOnExtent)
-            except Exception:
-                pass
-            try:
-                self.canvas.extentsChanged.disconnect(self._onExtentsChanged)
-            except Exception:
-                pass
+            self.vgridtools.overlay_manager.unregister(
+                self._refreshRhealpixGridOnExtent
+            )
+            self.rhealpix_renderer.cleanup()
         except Exception:
             pass
 
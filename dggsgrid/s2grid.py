@@ -1,17 +1,12 @@
-from shapely.geometry import box
-from qgis.core import (
-    QgsWkbTypes,
-    QgsCoordinateTransform,
-    QgsGeometry,
-    QgsProject,
-)
-from qgis.PyQt.QtCore import QObject, QTimer
+from qgis.core import QgsWkbTypes
+from qgis.PyQt.QtCore import QObject
 from qgis.gui import QgsRubberBand
 from qgis.PyQt.QtCore import pyqtSlot
 
 from math import log2, floor
 
-from ..utils.latlon import epsg4326
+from .cell_cache import CellCache, frame_context
+from .grid_task import GridRenderer
 from ..settings import settings
 from vgrid.utils.constants import DGGS_TYPES
 from vgrid.conversion.dggs2geo.s22geo import s22geo
@@ -34,97 +29,81 @@ class S2Grid(QObject):
 
         # S2 auto-update toggle and debounced extent listener
         self.s2_enabled = False
-        self._extentTimer = QTimer(self)
-        self._extentTimer.setSingleShot(True)
-        self._extentTimer.setInterval(150)
-        self.canvas.extentsChanged.connect(self._onExtentsChanged)
-        self._extentTimer.timeout.connect(self._refreshS2GridOnExtent)
+        self.vgridtools.overlay_manager.register(
+            lambda: self.s2_enabled, self._refreshS2GridOnExtent
+        )
+        self.s2_renderer = GridRenderer(self.canvas, self.s2_marker, "S2 grid")
+        self.s2_cache = CellCache("s2")
         self.removeMarker()
 
-    def _onExtentsChanged(self):
-        self._extentTimer.start()
-
     def s2_grid(self):
         try:
-            # Clear previous grid before drawing a new one
-            self.removeMarker()
-            self.s2_marker.reset(QgsWkbTypes.PolygonGeometry)
-            self.s2_marker.setStrokeColor(settings.s2Color)
-            self.s2_marker.setWidth(settings.gridWidth)
-
-            canvas_extent = self.canvas.extent()
-            scale = self.canvas.scale()
+            view = self.vgridtools.overlay_manager.frame()
             # resolution = self._get_s2_resolution(scale)
-            resolution = get_s2_resolution_from_scale_denominator(
-                scale, relative_depth=8, mm_per_pixel=0.28
+            resolution = view.resolution(
+                "s2",
+                lambda scale: get_s2_resolution_from_scale_denominator(
+                    scale, relative_depth=8, mm_per_pixel=0.28
+                ),
             )
             if settings.zoomLevel:
-                zoom = 29.1402 - log2(scale)
+                zoom = view.zoom
                 self.iface.mainWindow().statusBar().showMessage(
-                    f"Zoom Level: {zoom:.2f} | S2 resolution: {resolution}"
+                    f"Zoom Level: {zoom:.2f} | S2 resolution: {resolution}{view.budget_note('s2')}"
                 )
-            canvas_crs = self.canvas.mapSettings().destinationCrs()
-            coverer = s2.RegionCoverer()
-            coverer.min_level = resolution
-            coverer.max_level = resolution
+            canvas_crs = view.canvas_crs
+
             if resolution <= 3:
                 min_lon, min_lat, max_lon, max_lat = -180, -90, 180, 90
-                region = s2.LatLngRect(
-                    s2.LatLng.from_degrees(min_lat, min_lon),
-                    s2.LatLng.from_degrees(max_lat, max_lon),
-                )
             else:
-                canvas_extent_bbox = box(
-                    canvas_extent.xMinimum(),
-                    canvas_extent.yMinimum(),
-                    canvas_extent.xMaximum(),
-                    canvas_extent.yMaximum(),
-                )
+                min_lon, min_lat, max_lon, max_lat = view.bbox_4326
+
+            fix_antimeridian = "split" if settings.splitAntimeridian else "shift_east"
+            trans_to_canvas = view.canvas_transform()
+            frame, strips = self.s2_cache.begin_frame(
+                frame_context(canvas_crs, fix_antimeridian),
+                resolution,
+                (min_lon, min_lat, max_lon, max_lat),
+            )
 
-                # Transform extent to EPSG:4326 if needed
-                if epsg4326 != canvas_crs:
-                    extent_geom = QgsGeometry.fromWkt(canvas_extent_bbox.wkt)
-                    trans_to_4326 = QgsCoordinateTransform(
-                        canvas_crs, epsg4326, QgsProject.instance()
-                    )
-                    extent_geom.transform(trans_to_4326)
-                    rect = extent_geom.boundingBox()
-                    min_lon, min_lat, max_lon, max_lat = (
-                        rect.xMinimum(),
-                        rect.yMinimum(),
-                        rect.xMaximum(),
-                        rect.yMaximum(),
+            def cells_in_bbox(strip):
+                strip_min_lon, strip_min_lat, strip_max_lon, strip_max_lat = strip
+                coverer = s2.RegionCoverer()
+                coverer.min_level = resolution
+                coverer.max_level = resolution
+                if resolution <= 3:
+                    region = s2.LatLngRect(
+                        s2.LatLng.from_degrees(strip_min_lat, strip_min_lon),
+                        s2.LatLng.from_degrees(strip_max_lat, strip_max_lon),
                     )
                 else:
-                    min_lon, min_lat, max_lon, max_lat = (
-                        canvas_extent_bbox.bounds[0],
-                        canvas_extent_bbox.bounds[1],
-                        canvas_extent_bbox.bounds[2],
-                        canvas_extent_bbox.bounds[3],
+                    # Build S2 covering for the extent at the chosen resolution
+                    region = s2.LatLngRect.from_point_pair(
+                        s2.LatLng.from_degrees(strip_min_lat, strip_min_lon),
+                        s2.LatLng.from_degrees(strip_max_lat, strip_max_lon),
                     )
-
-                # Build S2 covering for the extent at the chosen resolution
-                region = s2.LatLngRect.from_point_pair(
-                    s2.LatLng.from_degrees(min_lat, min_lon),
-                    s2.LatLng.from_degrees(max_lat, max_lon),
+                return [
+                    s2.CellId.to_token(cell_id)
+                    for cell_id in coverer.get_covering(region)
+                ]
+
+            def build(task):
+                return self.s2_cache.fill(
+                    task,
+                    frame,
+                    strips,
+                    cells_in_bbox,
+                    lambda s2_token: s22geo(
+                        s2_token, fix_antimeridian=fix_antimeridian
+                    ),
+                    trans_to_canvas,
                 )
 
-            cells = coverer.get_covering(region)
-            for cell_id in cells:
-                s2_token = s2.CellId.to_token(cell_id)
-                if settings.splitAntimeridian:
-                    cell_polygon = s22geo(s2_token, fix_antimeridian="split")
-                else:
-                    cell_polygon = s22geo(s2_token, fix_antimeridian="shift_east")
-                cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
-                if epsg4326 != canvas_crs:
-                    trans = QgsCoordinateTransform(
-                        epsg4326, canvas_crs, QgsProject.instance()
-                    )
-                    cell_geom.transform(trans)
-                self.s2_marker.addGeometry(cell_geom, None)
-
-            self.canvas.refresh()
+            self.s2_renderer.submit(
+                build,
+                settings.s2Color,
+                on_applied=lambda: self.s2_cache.commit(frame),
+            )
 
         except Exception:
             return
@@ -148,20 +127,14 @@ class S2Grid(QObject):
 
     @pyqtSlot()
     def removeMarker(self):
-        self.s2_marker.reset(QgsWkbTypes.PolygonGeometry)
+        self.s2_renderer.clear()
+        self.s2_cache.clear()
 
     def cleanup(self):
         # Disconnect signals and delete rubber band
         try:
-            self._extentTimer.stop()
-            try:
-                self._extentTimer.timeout.disconnect(self._refreshS2GridOnExtent)
-            except Exception:
-                pass
-            try:
-                self.canvas.extentsChanged.disconnect(self._onExtentsChanged)
-            except Exception:
-                pass
+            self.vgridtools.overlay_manager.unregister(self._refreshS2GridOnExtent)
+            self.s2_renderer.cleanup()
         except Exception:
             pass
 
@@ -1,18 +1,13 @@
-from shapely.geometry import box, Polygon
-from qgis.core import (
-    QgsWkbTypes,
-    QgsCoordinateTransform,
-    QgsGeometry,
-    QgsProject,
-)
-from qgis.PyQt.QtCore import QObject, QTimer
+from shapely.geometry import Polygon
+from qgis.core import QgsWkbTypes
+from qgis.PyQt.QtCore import QObject
 from qgis.gui import QgsRubberBand
 from qgis.PyQt.QtCore import pyqtSlot
 
 import traceback
 from math import log2, floor
 
-from ..utils.latlon import epsg4326
+from .grid_task import GridRenderer, to_canvas_geometries
 from ..settings import settings
 
 # Tilecode imports
@@ -35,34 +30,29 @@ class TilecodeGrid(QObject):
 
         # Tilecode auto-update toggle and debounced extent listener
         self.tilecode_enabled = False
-        self._extentTimer = QTimer(self)
-        self._extentTimer.setSingleShot(True)
-        self._extentTimer.setInterval(150)
-        self.canvas.extentsChanged.connect(self._onExtentsChanged)
-        self._extentTimer.timeout.connect(self._refreshTilecodeGridOnExtent)
+        self.vgridtools.overlay_manager.register(
+            lambda: self.tilecode_enabled, self._refreshTilecodeGridOnExtent
+        )
+        self.tilecode_renderer = GridRenderer(
+            self.canvas, self.tilecode_marker, "Tilecode grid"
+        )
         self.removeMarker()
 
-    def _onExtentsChanged(self):
-        self._extentTimer.start()
-
     def tilecode_grid(self):
         try:
-            # Clear previous grid before drawing a new one
-            self.removeMarker()
-            self.tilecode_marker.reset(QgsWkbTypes.PolygonGeometry)
-
-            canvas_extent = self.canvas.extent()
-            scale = self.canvas.scale()
+            view = self.vgridtools.overlay_manager.frame()
             # resolution = self._get_tilecode_resolution(scale)
-            resolution = get_tilecode_resolution_from_scale_denominator(
-                scale, relative_depth=8, mm_per_pixel=0.28
+            resolution = view.resolution(
+                "tilecode",
+                lambda scale: get_tilecode_resolution_from_scale_denominator(
+                    scale, relative_depth=8, mm_per_pixel=0.28
+                ),
             )
             if settings.zoomLevel:
-                zoom = 29.1402 - log2(scale)
+                zoom = view.zoom
                 self.iface.mainWindow().statusBar().showMessage(
-                    f"Zoom Level: {zoom:.2f} | Tilecode resolution: {resolution}"
+                    f"Zoom Level: {zoom:.2f} | Tilecode resolution: {resolution}{view.budget_note('tilecode')}"
                 )
-            canvas_crs = self.canvas.mapSettings().destinationCrs()
             if resolution <= 4:
                 min_lon, min_lat, max_lon, max_lat = (
                     -180.0,
@@ -71,65 +61,36 @@ class TilecodeGrid(QObject):
                     85.051128780,
                 )
             else:
-                # Define bbox in canvas CRS
-                extent_polygon_canvas = box(
-                    canvas_extent.xMinimum(),
-                    canvas_extent.yMinimum(),
-                    canvas_extent.xMaximum(),
-                    canvas_extent.yMaximum(),
-                )
-
-                # Transform extent to EPSG:4326 if needed
-                if epsg4326 != canvas_crs:
-                    extent_geom = QgsGeometry.fromWkt(extent_polygon_canvas.wkt)
-                    trans_to_4326 = QgsCoordinateTransform(
-                        canvas_crs, epsg4326, QgsProject.instance()
-                    )
-                    extent_geom.transform(trans_to_4326)
-                    rect = extent_geom.boundingBox()
-                    min_lon, min_lat, max_lon, max_lat = (
-                        rect.xMinimum(),
-                        rect.yMinimum(),
-                        rect.xMaximum(),
-                        rect.yMaximum(),
+                min_lon, min_lat, max_lon, max_lat = view.bbox_4326
+
+            trans_to_canvas = view.canvas_transform()
+
+            def build(task):
+                cell_polygons = []
+                # Iterate over each tile to create features
+                for tile in mercantile.tiles(
+                    min_lon, min_lat, max_lon, max_lat, resolution
+                ):
+                    if task.isCanceled():
+                        return None
+                    # Get the tile's bounding box in geographic coordinates
+                    bounds = mercantile.bounds(tile)
+
+                    # Create a Shapely polygon
+                    cell_polygon = Polygon(
+                        [
+                            (bounds.west, bounds.south),
+                            (bounds.east, bounds.south),
+                            (bounds.east, bounds.north),
+                            (bounds.west, bounds.north),
+                            (bounds.west, bounds.south),  # Closing the polygon
+                        ]
                     )
-                else:
-                    min_lon, min_lat, max_lon, max_lat = (
-                        extent_polygon_canvas.bounds[0],
-                        extent_polygon_canvas.bounds[1],
-                        extent_polygon_canvas.bounds[2],
-                        extent_polygon_canvas.bounds[3],
-                    )
-
-            tiles = list(
-                mercantile.tiles(min_lon, min_lat, max_lon, max_lat, resolution)
-            )
-            # Iterate over each tile to create features
-            for tile in tiles:
-                # Get the tile's bounding box in geographic coordinates
-                bounds = mercantile.bounds(tile)
-
-                # Create a Shapely polygon
-                cell_polygon = Polygon(
-                    [
-                        (bounds.west, bounds.south),
-                        (bounds.east, bounds.south),
-                        (bounds.east, bounds.north),
-                        (bounds.west, bounds.north),
-                        (bounds.west, bounds.south),  # Closing the polygon
-                    ]
-                )
 
-                cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
-                if epsg4326 != canvas_crs:
-                    cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
-                    trans = QgsCoordinateTransform(
-                        epsg4326, canvas_crs, QgsProject.instance()
-                    )
-                    cell_geom.transform(trans)
-                self.tilecode_marker.addGeometry(cell_geom, None)
+                    cell_polygons.append(cell_polygon)
+                return to_canvas_geometries(cell_polygons, trans_to_canvas)
 
-            self.canvas.refresh()
+            self.tilecode_renderer.submit(build, settings.tilecodeColor)
 
         except Exception as e:
             print(e)
@@ -160,20 +121,15 @@ class TilecodeGrid(QObject):
 
     @pyqtSlot()
     def removeMarker(self):
-        self.tilecode_marker.reset(QgsWkbTypes.PolygonGeometry)
+        self.tilecode_renderer.clear()
 
     def cleanup(self):
         # Disconnect signals and delete rubber band
         try:
-            self._extentTimer.stop()
-            try:
-                self._extentTimer.timeout.disconnect(self._refreshTilecodeGridOnExtent)
-            except Exception:
-                pass
-            try:
-                self.canvas.extentsChanged.disconnect(self._onExtentsChanged)
-            except Exception:
-                pass
+            self.vgridtools.overlay_manager.unregister(
+                self._refreshTilecodeGridOnExtent
+            )
+            self.tilecode_renderer.cleanup()
         except Exception:
             pass
 
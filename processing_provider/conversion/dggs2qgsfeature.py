@@ -28,7 +28,6 @@ from qgis.core import (
     QgsFeatureSink,
     QgsField,
     QgsFields,
-    QgsWkbTypes,
     QgsCoordinateReferenceSystem,
 )
 
@@ -40,6 +39,8 @@ import platform
 
 from ...utils.help_footer import social_links_footer
 from ...utils.conversion.dggs2qgsfeature import (
+    GRATICULE_TYPES,
+    CellIDDecoder,
     a52qgsfeature,
     dggal2qgsfeature,
     digipin2qgsfeature,
@@ -59,6 +60,13 @@ from ...utils.conversion.dggs2qgsfeature import (
     s22qgsfeature,
     tilecode2qgsfeature,
 )
+from ...utils.conversion.cell_batch import (
+    OUTPUT_FULL,
+    OUTPUT_MODES,
+    SINK_BATCH_SIZE,
+    output_mode,
+    output_wkb_type,
+)
 from ...settings import settings
 
 
@@ -72,6 +80,7 @@ class CellID2DGGS(QgsProcessingFeatureBasedAlgorithm):
     CELL_ID = "CELL_ID"
     DGGS_TYPE = "DGGS_TYPE"
     RESOLUTION = "RESOLUTION"
+    OUTPUT_MODE = "OUTPUT_MODE"
     DGGS_TYPES = [
         "H3",
         "S2",
@@ -206,7 +215,7 @@ class CellID2DGGS(QgsProcessingFeatureBasedAlgorithm):
         return QgsCoordinateReferenceSystem("EPSG:4326")
 
     def outputWkbType(self, input_wkb_type):
-        return QgsWkbTypes.Polygon
+        return output_wkb_type(getattr(self, "output_mode", OUTPUT_FULL))
 
     def supportInPlaceEdit(self, layer):
         return False
@@ -249,6 +258,14 @@ class CellID2DGGS(QgsProcessingFeatureBasedAlgorithm):
             )
         )
 
+        param = QgsProcessingParameterEnum(
+            self.OUTPUT_MODE,
+            self.tr("Output"),
+            options=OUTPUT_MODES,
+            defaultValue=OUTPUT_FULL,
+        )
+        self.addParameter(param)
+
     def checkParameterValues(self, parameters, context):
         selected_dggs = self.DGGS_TYPES[
             self.parameterAsEnum(parameters, self.DGGS_TYPE, context)
@@ -277,6 +294,7 @@ class CellID2DGGS(QgsProcessingFeatureBasedAlgorithm):
         self.cell_id_field = self.parameterAsString(parameters, self.CELL_ID, context)
         self.DGGS_TYPE_index = self.parameterAsEnum(parameters, self.DGGS_TYPE, context)
         self.resolution = self.parameterAsInt(parameters, self.RESOLUTION, context)
+        self.output_mode = self.parameterAsEnum(parameters, self.OUTPUT_MODE, context)
         self.DGGS_TYPE_functions = {
             "h3": h32qgsfeature,
             "s2": s22qgsfeature,
@@ -422,40 +440,46 @@ class CellID2DGGS(QgsProcessingFeatureBasedAlgorithm):
                 ),
                 QVariant.Double,
             ),
-            QgsField(get_unique_name("cell_height"), QVariant.Double)
-            if dggs_type
-            not in (
-                "h3",
-                "s2",
-                "a5",
-                "rhealpix",
-                "isea4t",
-                "isea3h",
-                "dggal_gnosis",
-                "dggal_isea4r",
-                "dggal_isea9r",
-                "dggal_isea7h",
-                "dggal_isea7h_z7",
-                "dggal_ivea4r",
-                "dggal_ivea9r",
-                "dggal_ivea3h",
-                "dggal_ivea7h",
-                "dggal_ivea7h_z7",
-                "dggal_rtea4r",
-                "dggal_rtea9r",
-                "dggal_rtea3h",
-                "dggal_rtea7h",
-                "dggal_rtea7h_z7",
-                "dggal_healpix",
-                "dggal_rhealpix",
-                "qtm",
-            )
-            and not dggs_type.startswith("dggrid_")
-            else None,
+            (
+                QgsField(get_unique_name("cell_height"), QVariant.Double)
+                if dggs_type
+                not in (
+                    "h3",
+                    "s2",
+                    "a5",
+                    "rhealpix",
+                    "isea4t",
+                    "isea3h",
+                    "dggal_gnosis",
+                    "dggal_isea4r",
+                    "dggal_isea9r",
+                    "dggal_isea7h",
+                    "dggal_isea7h_z7",
+                    "dggal_ivea4r",
+                    "dggal_ivea9r",
+                    "dggal_ivea3h",
+                    "dggal_ivea7h",
+                    "dggal_ivea7h_z7",
+                    "dggal_rtea4r",
+                    "dggal_rtea9r",
+                    "dggal_rtea3h",
+                    "dggal_rtea7h",
+                    "dggal_rtea7h_z7",
+                    "dggal_healpix",
+                    "dggal_rhealpix",
+                    "qtm",
+                )
+                and not dggs_type.startswith("dggrid_")
+                else None
+            ),
             QgsField(get_unique_name("cell_area"), QVariant.Double),
             QgsField(get_unique_name("cell_perimeter"), QVariant.Double),
         ]
 
+        # Cell id and resolution only unless the metrics are requested
+        if getattr(self, "output_mode", OUTPUT_FULL) != OUTPUT_FULL:
+            new_fields = new_fields[:2]
+
         # Append the fields to output_fields
         for field in new_fields:
             if field:
@@ -468,7 +492,8 @@ class CellID2DGGS(QgsProcessingFeatureBasedAlgorithm):
             cell_id = feature[self.cell_id_field]
             DGGS_TYPE_key = self.DGGS_TYPES[self.DGGS_TYPE_index].lower()
             conversion_function = self.DGGS_TYPE_functions.get(DGGS_TYPE_key)
-            cell_feature = conversion_function(feature, cell_id)
+            with output_mode(self.output_mode):
+                cell_feature = conversion_function(feature, cell_id)
             if cell_feature:
                 return [cell_feature]
 
@@ -480,7 +505,7 @@ class CellID2DGGS(QgsProcessingFeatureBasedAlgorithm):
     def processAlgorithm(self, parameters, context, feedback):
         dggs_index = self.parameterAsEnum(parameters, self.DGGS_TYPE, context)
         if not self.DGGS_TYPES[dggs_index].startswith("DGGRID_"):
-            return super().processAlgorithm(parameters, context, feedback)
+            return self._decode_cell_ids(parameters, context, feedback)
 
         if not self.prepareAlgorithm(parameters, context, feedback):
             raise QgsProcessingException(self.invalidParameterTypes())
@@ -504,14 +529,15 @@ class CellID2DGGS(QgsProcessingFeatureBasedAlgorithm):
                 f"cell ID field: {self.cell_id_field!r}."
             )
 
-        out_features, batch_bad = dggrid_batch2qgsfeatures(
-            input_features,
-            cell_ids,
-            self._dggrid_type_name,
-            self.resolution,
-            out_fields,
-            feedback=feedback,
-        )
+        with output_mode(self.output_mode):
+            out_features, batch_bad = dggrid_batch2qgsfeatures(
+                input_features,
+                cell_ids,
+                self._dggrid_type_name,
+                self.resolution,
+                out_fields,
+                feedback=feedback,
+            )
         self.num_bad += batch_bad
 
         if feedback:
@@ -525,7 +551,7 @@ class CellID2DGGS(QgsProcessingFeatureBasedAlgorithm):
             self.OUTPUT,
             context,
             out_fields,
-            QgsWkbTypes.Polygon,
+            output_wkb_type(self.output_mode),
             QgsCoordinateReferenceSystem("EPSG:4326"),
         )
 
@@ -537,6 +563,64 @@ class CellID2DGGS(QgsProcessingFeatureBasedAlgorithm):
         feedback.setProgress(100)
         return {self.OUTPUT: dest_id}
 
+    def _decode_cell_ids(self, parameters, context, feedback):
+        """Join every row to its cell, decoding each distinct cell ID once."""
+        source = self.parameterAsSource(parameters, self.INPUT, context)
+        out_fields = self.outputFields(source.fields())
+        sink, dest_id = self.parameterAsSink(
+            parameters,
+            self.OUTPUT,
+            context,
+            out_fields,
+            output_wkb_type(self.output_mode),
+            QgsCoordinateReferenceSystem("EPSG:4326"),
+        )
+        if sink is None:
+            raise QgsProcessingException(self.invalidSinkError(parameters, self.OUTPUT))
+
+        DGGS_TYPE_key = self.DGGS_TYPES[self.DGGS_TYPE_index].lower()
+        with output_mode(self.output_mode):
+            decoder = CellIDDecoder(
+                self.DGGS_TYPE_functions.get(DGGS_TYPE_key),
+                out_fields,
+                DGGS_TYPE_key in GRATICULE_TYPES,
+            )
+            features, cell_ids = [], []
+            for done, feature in enumerate(source.getFeatures(), 1):
+                if feedback.isCanceled():
+                    break
+                try:
+                    cell_ids.append(feature[self.cell_id_field])
+                except Exception as e:
+                    self.num_bad += 1
+                    feedback.reportError(
+                        f"Error processing feature {feature.id()}: {str(e)}"
+                    )
+                    continue
+                features.append(feature)
+                if len(features) >= SINK_BATCH_SIZE:
+                    self._write_decoded(decoder, features, cell_ids, sink, feedback)
+                    features, cell_ids = [], []
+                if self.total_features:
+                    feedback.setProgress(int(100 * done / self.total_features))
+            if not feedback.isCanceled():
+                self._write_decoded(decoder, features, cell_ids, sink, feedback)
+
+        feedback.pushInfo(f"Decoded {decoder.decoded} cell ID(s).")
+        return {self.OUTPUT: dest_id}
+
+    def _write_decoded(self, decoder, features, cell_ids, sink, feedback):
+        out_features = []
+        for feature, out_feature, error in decoder.features(features, cell_ids):
+            if error is not None:
+                self.num_bad += 1
+                feedback.reportError(
+                    f"Error processing feature {feature.id()}: {str(error)}"
+                )
+            elif out_feature:
+                out_features.append(out_feature)
+        sink.addFeatures(out_features, QgsFeatureSink.FastInsert)
+
     def postProcessAlgorithm(self, context, feedback):
         if self.num_bad:
             feedback.pushInfo(
@@ -25,7 +25,6 @@ from qgis.core import (
     QgsProcessingParameterField,
     QgsProcessingFeatureBasedAlgorithm,
     QgsProcessingException,
-    QgsWkbTypes,
     QgsApplication,
     QgsVectorLayer,
     QgsFeatureSink,
@@ -36,12 +35,19 @@ from qgis.PyQt.QtCore import QCoreApplication
 
 from ...utils.help_footer import social_links_footer
 from ...utils.conversion.dggscompact import *
+from ...utils.conversion.cell_batch import (
+    OUTPUT_FULL,
+    OUTPUT_MODES,
+    output_mode,
+    output_wkb_type,
+)
 
 
 class DGGSCompact(QgsProcessingFeatureBasedAlgorithm):
     INPUT = "INPUT"
     DGGS_FIELD = "DGGS_FIELD"
     DGGS_TYPE = "DGGS_TYPE"
+    OUTPUT_MODE = "OUTPUT_MODE"
     OUTPUT = "OUTPUT"
 
     DGGS_TYPES = [
@@ -135,7 +141,7 @@ class DGGSCompact(QgsProcessingFeatureBasedAlgorithm):
         return self.tr("DGGS_compacted")
 
     def outputWkbType(self, input_wkb_type):
-        return QgsWkbTypes.Polygon
+        return output_wkb_type(getattr(self, "output_mode", OUTPUT_FULL))
 
     def supportInPlaceEdit(self, layer):
         return False
@@ -165,10 +171,20 @@ class DGGSCompact(QgsProcessingFeatureBasedAlgorithm):
             )
         )
 
+        self.addParameter(
+            QgsProcessingParameterEnum(
+                self.OUTPUT_MODE,
+                "Output",
+                options=OUTPUT_MODES,
+                defaultValue=OUTPUT_FULL,
+            )
+        )
+
     def prepareAlgorithm(self, parameters, context, feedback):
         self.DGGS_TYPE_index = self.parameterAsEnum(parameters, self.DGGS_TYPE, context)
         self.dggs_type = self.DGGS_TYPES[self.DGGS_TYPE_index].lower()
         self.dggs_field = self.parameterAsString(parameters, self.DGGS_FIELD, context)
+        self.output_mode = self.parameterAsEnum(parameters, self.OUTPUT_MODE, context)
         self.DGGS_TYPE_functions = {
             "h3": h3compact,
             "s2": s2compact,
@@ -251,7 +267,8 @@ class DGGSCompact(QgsProcessingFeatureBasedAlgorithm):
 
         feedback.pushInfo(f"Compacting {self.dggs_type.upper()}")
 
-        memory_layer = conversion_function(dggs_layer, self.dggs_field, feedback)
+        with output_mode(self.output_mode):
+            memory_layer = conversion_function(dggs_layer, self.dggs_field, feedback)
 
         if not isinstance(memory_layer, QgsVectorLayer) or not memory_layer.isValid():
             raise QgsProcessingException(
@@ -13,7 +13,6 @@ from qgis.core import (
     QgsProcessingParameterNumber,
     QgsProcessingFeatureBasedAlgorithm,
     QgsProcessingException,
-    QgsWkbTypes,
     QgsApplication,
     QgsVectorLayer,
     QgsFeatureSink,
@@ -24,12 +23,19 @@ from qgis.PyQt.QtCore import QCoreApplication
 
 from ...utils.help_footer import social_links_footer
 from ...utils.conversion.dggsexpand import *
+from ...utils.conversion.cell_batch import (
+    OUTPUT_FULL,
+    OUTPUT_MODES,
+    output_mode,
+    output_wkb_type,
+)
 
 
 class DGGSExpand(QgsProcessingFeatureBasedAlgorithm):
     INPUT = "INPUT"
     DGGS_FIELD = "DGGS_FIELD"
     DGGS_TYPE = "DGGS_TYPE"
+    OUTPUT_MODE = "OUTPUT_MODE"
     RESOLUTION = "RESOLUTION"
     OUTPUT = "OUTPUT"
 
@@ -122,7 +128,7 @@ class DGGSExpand(QgsProcessingFeatureBasedAlgorithm):
         return self.tr("DGGS_expanded")
 
     def outputWkbType(self, input_wkb_type):
-        return QgsWkbTypes.Polygon
+        return output_wkb_type(getattr(self, "output_mode", OUTPUT_FULL))
 
     def supportInPlaceEdit(self, layer):
         return False
@@ -163,6 +169,15 @@ class DGGSExpand(QgsProcessingFeatureBasedAlgorithm):
             )
         )
 
+        self.addParameter(
+            QgsProcessingParameterEnum(
+                self.OUTPUT_MODE,
+                "Output",
+                options=OUTPUT_MODES,
+                defaultValue=OUTPUT_FULL,
+            )
+        )
+
     def prepareAlgorithm(self, parameters, context, feedback):
         self.parameterAsEnum(parameters, self.DGGS_TYPE, context)
         self.resolution = self.parameterAsInt(parameters, self.RESOLUTION, context)
@@ -170,6 +185,7 @@ class DGGSExpand(QgsProcessingFeatureBasedAlgorithm):
         self.DGGS_TYPE_index = self.parameterAsEnum(parameters, self.DGGS_TYPE, context)
         self.dggs_type = self.DGGS_TYPES[self.DGGS_TYPE_index].lower()
         self.dggs_field = self.parameterAsString(parameters, self.DGGS_FIELD, context)
+        self.output_mode = self.parameterAsEnum(parameters, self.OUTPUT_MODE, context)
 
         self.DGGS_TYPE_functions = {
             "h3": h3expand,
@@ -263,9 +279,10 @@ class DGGSExpand(QgsProcessingFeatureBasedAlgorithm):
             f"Expanding {self.dggs_type.upper()} at resolution {self.resolution}"
         )
 
-        memory_layer = conversion_function(
-            dggs_layer, self.resolution, self.dggs_field, feedback
-        )
+        with output_mode(self.output_mode):
+            memory_layer = conversion_function(
+                dggs_layer, self.resolution, self.dggs_field, feedback
+            )
 
         if not isinstance(memory_layer, QgsVectorLayer) or not memory_layer.isValid():
             raise QgsProcessingException(
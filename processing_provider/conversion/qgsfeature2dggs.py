@@ -8,12 +8,12 @@ import os
 from qgis.core import (
     QgsProcessing,
     QgsProcessingParameterFeatureSource,
-    QgsProcessingFeatureBasedAlgorithm,
+    QgsProcessingParameterFeatureSink,
+    QgsProcessingAlgorithm,
     QgsProcessingParameterEnum,
     QgsProcessingParameterNumber,
     QgsProcessingParameterBoolean,
     QgsProcessingException,
-    QgsWkbTypes,
 )
 
 from qgis.core import QgsApplication
@@ -24,10 +24,25 @@ import platform
 from ...utils.help_footer import social_links_footer
 from ...utils.conversion.qgsfeature2dggs import *
 from ...utils.conversion.crs_helper import wgs84_transform_if_needed
+from ...utils.conversion.cell_batch import (
+    OUTPUT_FULL,
+    OUTPUT_MODES,
+    output_mode,
+    output_wkb_type,
+    streaming,
+)
+from ...utils.conversion.cell_coverage import AGGREGATES, CellCoverage
+from ...utils.conversion.parallel import (
+    converted_features,
+    failure_message,
+    max_workers,
+    report_converted_features,
+    sink_writer,
+)
 from ...settings import settings
 
 
-class Vector2DGGS(QgsProcessingFeatureBasedAlgorithm):
+class Vector2DGGS(QgsProcessingAlgorithm):
     """
     convert Vector Layer to H3, S2, rHEALPix, ISEA4T, ISEA3H, QTM, OLC, Geohash, MGRS, Tilecode, Maidenhead, GARS
     """
@@ -38,6 +53,10 @@ class Vector2DGGS(QgsProcessingFeatureBasedAlgorithm):
     COMPACT = "COMPACT"
     PREDICATE = "PREDICATE"
     PREDICATES = ["intersects", "within", "centroid_within", "largest_overlap"]
+    OUTPUT_MODE = "OUTPUT_MODE"
+    WORKERS = "WORKERS"
+    COVERAGE = "COVERAGE"
+    AGGREGATE = "AGGREGATE"
     DGGS_TYPES = [
         "H3",
         "S2",
@@ -157,19 +176,10 @@ class Vector2DGGS(QgsProcessingFeatureBasedAlgorithm):
         )
         return self.tr(self.txt_en, self.txt_vi) + footer
 
-    def inputLayerTypes(self):
-        return [QgsProcessing.TypeVector]
-
     def outputName(self):
         return self.tr("Vector2DGGS")
 
-    def outputWkbType(self, input_wkb_type):
-        return QgsWkbTypes.Polygon
-
-    def supportInPlaceEdit(self, layer):
-        return False
-
-    def initParameters(self, config=None):
+    def initAlgorithm(self, config=None):
         # Input vector layer
         self.addParameter(
             QgsProcessingParameterFeatureSource(
@@ -212,6 +222,51 @@ class Vector2DGGS(QgsProcessingFeatureBasedAlgorithm):
             QgsProcessingParameterBoolean(self.COMPACT, "Compact", defaultValue=False)
         )
 
+        self.addParameter(
+            QgsProcessingParameterEnum(
+                self.OUTPUT_MODE,
+                "Output",
+                options=OUTPUT_MODES,
+                defaultValue=OUTPUT_FULL,
+            )
+        )
+
+        # Unique cells of the whole layer instead of cells per feature
+        self.addParameter(
+            QgsProcessingParameterBoolean(
+                self.COVERAGE,
+                "Unique cells (merge all features)",
+                defaultValue=False,
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterEnum(
+                self.AGGREGATE,
+                "Unique cell attributes",
+                options=AGGREGATES,
+                defaultValue=0,
+            )
+        )
+
+        # Worker processes; 1 converts the features inside QGIS, one at a time
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.WORKERS,
+                "Worker processes",
+                QgsProcessingParameterNumber.Integer,
+                1,
+                minValue=1,
+                maxValue=max_workers(),
+            )
+        )
+
+        self.addParameter(
+            QgsProcessingParameterFeatureSink(
+                self.OUTPUT, self.outputName(), QgsProcessing.TypeVectorAnyGeometry
+            )
+        )
+
     def checkParameterValues(self, parameters, context):
         """Dynamically update resolution limits before execution"""
         selected_dggs_index = self.parameterAsEnum(parameters, self.DGGS_TYPE, context)
@@ -274,16 +329,22 @@ class Vector2DGGS(QgsProcessingFeatureBasedAlgorithm):
                 ),
                 QVariant.Double,
             ),
-            QgsField(get_unique_name("cell_height"), QVariant.Double)
-            if dggs_type
-            not in ("h3", "s2", "a5", "rhealpix", "isea4t", "isea3h", "ease", "qtm")
-            and not dggs_type.startswith("dggal_")
-            and not dggs_type.startswith("dggrid_")
-            else None,
+            (
+                QgsField(get_unique_name("cell_height"), QVariant.Double)
+                if dggs_type
+                not in ("h3", "s2", "a5", "rhealpix", "isea4t", "isea3h", "ease", "qtm")
+                and not dggs_type.startswith("dggal_")
+                and not dggs_type.startswith("dggrid_")
+                else None
+            ),
             QgsField(get_unique_name("cell_area"), QVariant.Double),
             QgsField(get_unique_name("cell_perimeter"), QVariant.Double),
         ]
 
+        # Cell id and resolution only unless the metrics are requested
+        if getattr(self, "output_mode", OUTPUT_FULL) != OUTPUT_FULL:
+            new_fields = new_fields[:2]
+
         # Append the fields to output_fields
         for field in new_fields:
             if field:
@@ -305,217 +366,129 @@ class Vector2DGGS(QgsProcessingFeatureBasedAlgorithm):
         self.resolution = self.parameterAsInt(parameters, self.RESOLUTION, context)
         self.compact = self.parameterAsBool(parameters, self.COMPACT, context)
         self.predicate = self.parameterAsEnum(parameters, self.PREDICATE, context)
+        self.output_mode = self.parameterAsEnum(parameters, self.OUTPUT_MODE, context)
 
         self.total_features = source.featureCount()
         self.num_bad = 0
 
         self.DGGS_TYPE_index = self.parameterAsEnum(parameters, self.DGGS_TYPE, context)
-        self.DGGS_TYPE_functions = {
-            "h3": qgsfeature2h3,
-            "s2": qgsfeature2s2,
-            "a5": qgsfeature2a5,
-            "rhealpix": qgsfeature2rhealpix,
-            "isea4t": qgsfeature2isea4t,
-            "isea3h": qgsfeature2isea3h,
-            "qtm": qgsfeature2qtm,
-            "olc": qgsfeature2olc,
-            "geohash": qgsfeature2geohash,
-            "tilecode": qgsfeature2tilecode,
-            "quadkey": qgsfeature2quadkey,
-            "digipin": qgsfeature2digipin,
-            "dggal_gnosis": lambda feature, resolution, predicate, compact, feedback: (
-                qgsfeature2dggal(
-                    "gnosis", feature, resolution, predicate, compact, feedback
-                )
-            ),
-            "dggal_isea4r": lambda feature, resolution, predicate, compact, feedback: (
-                qgsfeature2dggal(
-                    "isea4r", feature, resolution, predicate, compact, feedback
-                )
-            ),
-            "dggal_isea9r": lambda feature, resolution, predicate, compact, feedback: (
-                qgsfeature2dggal(
-                    "isea9r", feature, resolution, predicate, compact, feedback
-                )
-            ),
-            "dggal_isea3h": lambda feature, resolution, predicate, compact, feedback: (
-                qgsfeature2dggal(
-                    "isea3h", feature, resolution, predicate, compact, feedback
-                )
-            ),
-            "dggal_isea7h": lambda feature, resolution, predicate, compact, feedback: (
-                qgsfeature2dggal(
-                    "isea7h", feature, resolution, predicate, compact, feedback
-                )
-            ),
-            "dggal_isea7h_z7": lambda feature, resolution, predicate, compact, feedback: (
-                qgsfeature2dggal(
-                    "isea7h_z7", feature, resolution, predicate, compact, feedback
-                )
-            ),
-            "dggal_ivea4r": lambda feature, resolution, predicate, compact, feedback: (
-                qgsfeature2dggal(
-                    "ivea4r", feature, resolution, predicate, compact, feedback
-                )
-            ),
-            "dggal_ivea9r": lambda feature, resolution, predicate, compact, feedback: (
-                qgsfeature2dggal(
-                    "ivea9r", feature, resolution, predicate, compact, feedback
-                )
-            ),
-            "dggal_ivea3h": lambda feature, resolution, predicate, compact, feedback: (
-                qgsfeature2dggal(
-                    "ivea3h", feature, resolution, predicate, compact, feedback
-                )
-            ),
-            "dggal_ivea7h": lambda feature, resolution, predicate, compact, feedback: (
-                qgsfeature2dggal(
-                    "ivea7h", feature, resolution, predicate, compact, feedback
-                )
-            ),
-            "dggal_ivea7h_z7": lambda feature, resolution, predicate, compact, feedback: (
-                qgsfeature2dggal(
-                    "ivea7h_z7", feature, resolution, predicate, compact, feedback
-                )
-            ),
-            "dggal_rtea4r": lambda feature, resolution, predicate, compact, feedback: (
-                qgsfeature2dggal(
-                    "rtea4r", feature, resolution, predicate, compact, feedback
-                )
-            ),
-            "dggal_rtea9r": lambda feature, resolution, predicate, compact, feedback: (
-                qgsfeature2dggal(
-                    "rtea9r", feature, resolution, predicate, compact, feedback
-                )
-            ),
-            "dggal_rtea3h": lambda feature, resolution, predicate, compact, feedback: (
-                qgsfeature2dggal(
-                    "rtea3h", feature, resolution, predicate, compact, feedback
-                )
-            ),
-            "dggal_rtea7h": lambda feature, resolution, predicate, compact, feedback: (
-                qgsfeature2dggal(
-                    "rtea7h", feature, resolution, predicate, compact, feedback
-                )
-            ),
-            "dggal_rtea7h_z7": lambda feature, resolution, predicate, compact, feedback: (
-                qgsfeature2dggal(
-                    "rtea7h_z7", feature, resolution, predicate, compact, feedback
-                )
-            ),
-            "dggal_healpix": lambda feature, resolution, predicate, compact, feedback: (
-                qgsfeature2dggal(
-                    "healpix", feature, resolution, predicate, compact, feedback
-                )
-            ),
-            "dggal_rhealpix": lambda feature, resolution, predicate, compact, feedback: (
-                qgsfeature2dggal(
-                    "rhealpix", feature, resolution, predicate, compact, feedback
-                )
-            ),
-        }
-        for dggrid_name in (
-            "SUPERFUND",
-            "PLANETRISK",
-            "ISEA3H",
-            "ISEA4H",
-            "ISEA4T",
-            "ISEA4D",
-            "ISEA43H",
-            "ISEA7H",
-            "IGEO7",
-            "FULLER3H",
-            "FULLER4H",
-            "FULLER4T",
-            "FULLER4D",
-            "FULLER43H",
-            "FULLER7H",
-        ):
-            key = f"dggrid_{dggrid_name.lower()}"
-            self.DGGS_TYPE_functions[key] = (
-                lambda feature, resolution, predicate, compact, feedback, t=dggrid_name: (
-                    qgsfeature2dggrid(
-                        t, feature, resolution, predicate, compact, feedback
-                    )
-                )
-            )
+        self.dggs_type = self.DGGS_TYPES[self.DGGS_TYPE_index].lower()
+        self.conversion_function = dggs_conversion_function(self.dggs_type)
+        self.workers = self.parameterAsInt(parameters, self.WORKERS, context)
+        self.coverage = self.parameterAsBool(parameters, self.COVERAGE, context)
+        self.aggregate = self.parameterAsEnum(parameters, self.AGGREGATE, context)
         return True
 
-    def processFeature(self, feature, context, feedback):
-        try:
-            feature = prepare_feature_for_dggs_conversion(
+    def processAlgorithm(self, parameters, context, feedback):
+        # DGGRID converts the whole layer in one run of its executable, in QGIS
+        dggrid = self.dggs_type.startswith("dggrid_")
+        workers = 1 if dggrid else self.workers
+
+        source = self.parameterAsSource(parameters, self.INPUT, context)
+        if self.coverage:
+            coverage = CellCoverage(
+                self.dggs_type,
+                source.fields(),
+                self.aggregate,
+                self.output_mode,
+                cell_polygon_function(self.dggs_type),
+            )
+            fields = coverage.fields()
+        else:
+            fields = self.outputFields(source.fields())
+        sink, dest_id = self.parameterAsSink(
+            parameters,
+            self.OUTPUT,
+            context,
+            fields,
+            output_wkb_type(self.output_mode),
+            source.sourceCrs(),
+        )
+        if sink is None:
+            raise QgsProcessingException(self.invalidSinkError(parameters, self.OUTPUT))
+
+        if workers <= 1 and not self.coverage and not dggrid:
+            # Cells reach the sink in chunks while each feature is converted
+            with output_mode(self.output_mode), streaming(sink, feedback) as stream:
+                for done, feature in enumerate(source.getFeatures(), 1):
+                    if feedback.isCanceled():
+                        break
+                    stream.reset()
+                    try:
+                        stream.addFeatures(self._process_feature(feature, feedback))
+                    except Exception as e:
+                        self.num_bad += 1
+                        feedback.reportError(
+                            failure_message(feature.id(), e, stream.written)
+                        )
+                    if self.total_features:
+                        feedback.setProgress(int(100 * done / self.total_features))
+            return {self.OUTPUT: dest_id}
+
+        features = (
+            prepare_feature_for_dggs_conversion(
                 feature, getattr(self, "_to_wgs84", None)
             )
-            self.dggs_type = self.DGGS_TYPES[self.DGGS_TYPE_index].lower()
-            conversion_function = self.DGGS_TYPE_functions.get(self.dggs_type)
-
-            if conversion_function is None:
-                return []
-
-            feature_geom = feature.geometry()
-            flat_type = QgsWkbTypes.flatType(feature_geom.wkbType())
-
-            cell_polygons = []
-            multi_cell_polygons = []
-
-            # Handle MultiPoint geometry
-            if flat_type == QgsWkbTypes.MultiPoint:
-                for point in feature_geom.asMultiPoint():
-                    point_feature = QgsFeature(feature)
-                    point_feature.setGeometry(QgsGeometry.fromPointXY(point))
-                    cell_polygons = conversion_function(
-                        point_feature,
-                        self.resolution,
-                        self.predicate,
-                        self.compact,
-                        feedback,
-                    )
-                    if cell_polygons:
-                        multi_cell_polygons.extend(cell_polygons)
-                return multi_cell_polygons
-
-            # Handle MultiLineString geometry
-            elif flat_type == QgsWkbTypes.MultiLineString:
-                for line in feature_geom.asMultiPolyline():
-                    line_feature = QgsFeature(feature)
-                    line_feature.setGeometry(QgsGeometry.fromPolylineXY(line))
-                    cell_polygons = conversion_function(
-                        line_feature,
-                        self.resolution,
-                        self.predicate,
-                        self.compact,
-                        feedback,
-                    )
-                    if cell_polygons:
-                        multi_cell_polygons.extend(cell_polygons)
-                return multi_cell_polygons
-
-            # Handle MultiPolygon geometry
-            elif flat_type == QgsWkbTypes.MultiPolygon:
-                for polygon in feature_geom.asMultiPolygon():
-                    polygon_feature = QgsFeature(feature)
-                    polygon_feature.setGeometry(QgsGeometry.fromPolygonXY(polygon))
-                    cell_polygons = conversion_function(
-                        polygon_feature,
-                        self.resolution,
-                        self.predicate,
-                        self.compact,
-                        feedback,
-                    )
-                    if cell_polygons:
-                        multi_cell_polygons.extend(cell_polygons)
-                return multi_cell_polygons
+            for feature in source.getFeatures()
+        )
+        if workers > 1:
+            feedback.pushInfo(f"Converting features in {workers} worker processes")
+        if not self.coverage:
+            results = converted_features(
+                features,
+                self.dggs_type,
+                self.resolution,
+                self.predicate,
+                self.compact,
+                self.output_mode,
+                sink_writer(sink, fields),
+                workers,
+                feedback,
+            )
+            self.num_bad += report_converted_features(
+                results, feedback, self.total_features
+            )
+            return {self.OUTPUT: dest_id}
+
+        # Unique cells: merge the cells of all features, then write each once
+        if self.compact:
+            feedback.pushInfo("Compact is not applied to unique cells.")
+        results = converted_features(
+            features,
+            self.dggs_type,
+            self.resolution,
+            self.predicate,
+            False,
+            coverage.row_mode,
+            coverage.add,
+            workers,
+            feedback,
+        )
+        self.num_bad += report_converted_features(
+            results, feedback, self.total_features
+        )
+        if feedback.isCanceled():
+            return {self.OUTPUT: dest_id}
 
-            else:  # Single part features
-                result = conversion_function(
-                    feature, self.resolution, self.predicate, self.compact, feedback
-                )
-                return result if result is not None else []
+        feedback.pushInfo(f"Writing {len(coverage)} unique cells")
+        coverage.write(sink, feedback)
+        return {self.OUTPUT: dest_id}
 
-        except Exception as e:
-            self.num_bad += 1
-            feedback.reportError(f"Error processing feature {feature.id()}: {str(e)}")
+    def _process_feature(self, feature, feedback):
+        """Output features of one input feature that did not stream to the sink."""
+        feature = prepare_feature_for_dggs_conversion(
+            feature, getattr(self, "_to_wgs84", None)
+        )
+        if self.conversion_function is None:
             return []
+        return convert_feature_parts(
+            self.conversion_function,
+            feature,
+            self.resolution,
+            self.predicate,
+            self.compact,
+            feedback,
+        )
 
     def postProcessAlgorithm(self, context, feedback):
         if self.num_bad:
@@ -19,19 +19,15 @@ __copyright__ = "(L) 2024, Thang Quach"
 from qgis.core import (
     QgsApplication,
     QgsProject,
-    QgsFeatureSink,
     QgsProcessingLayerPostProcessorInterface,
     QgsProcessingParameterExtent,
     QgsProcessingParameterNumber,
     QgsProcessingException,
     QgsProcessingParameterFeatureSink,
+    QgsProcessingParameterEnum,
     QgsProcessingParameterBoolean,
     QgsProcessingAlgorithm,
     QgsFields,
-    QgsField,
-    QgsFeature,
-    QgsGeometry,
-    QgsWkbTypes,
     QgsCoordinateReferenceSystem,
     QgsVectorLayer,
     QgsPalLayerSettings,
@@ -40,19 +36,25 @@ from qgis.core import (
 from qgis.PyQt.QtGui import QIcon, QColor
 from qgis.PyQt.QtCore import QCoreApplication, Qt
 from qgis.utils import iface
-from qgis.PyQt.QtCore import QVariant
 import os
 from ...utils.help_footer import social_links_footer
-from vgrid.utils.geometry import geodesic_dggs_metrics
 from ...settings import settings
 from vgrid.utils.io import validate_coordinate
 from qgis.core import QgsCoordinateTransform
 from ...utils.latlon import epsg4326
+from ...utils.conversion.cell_batch import (
+    OUTPUT_FULL,
+    OUTPUT_MODES,
+    CellBatch,
+    cell_fields,
+    output_metric_fields,
+    output_wkb_type,
+)
 from vgrid.utils.constants import DGGS_TYPES
-from collections import deque
 from shapely.geometry import box
 import a5
 from vgrid.conversion.dggs2geo.a52geo import a52geo_u64
+from ...utils.conversion.qgsfeature2dggs import a5_cells
 
 
 class A5Gen(QgsProcessingAlgorithm):
@@ -60,6 +62,7 @@ class A5Gen(QgsProcessingAlgorithm):
     RESOLUTION = "RESOLUTION"
     SEGMENTS = "SEGMENTS"
     SPLIT_ANTIMERIDIAN = "SPLIT_ANTIMERIDIAN"
+    OUTPUT_MODE = "OUTPUT_MODE"
     OUTPUT = "OUTPUT"
 
     LOC = QgsApplication.locale()[:2]
@@ -164,10 +167,19 @@ class A5Gen(QgsProcessingAlgorithm):
         )
         self.addParameter(param)
 
+        param = QgsProcessingParameterEnum(
+            self.OUTPUT_MODE,
+            self.tr("Output"),
+            options=OUTPUT_MODES,
+            defaultValue=OUTPUT_FULL,
+        )
+        self.addParameter(param)
+
         param = QgsProcessingParameterFeatureSink(self.OUTPUT, "A5")
         self.addParameter(param)
 
     def prepareAlgorithm(self, parameters, context, feedback):
+        self.output_mode = self.parameterAsEnum(parameters, self.OUTPUT_MODE, context)
         self.resolution = self.parameterAsInt(parameters, self.RESOLUTION, context)
         # Get the extent parameter
         self.canvas_extent = self.parameterAsExtent(parameters, self.EXTENT, context)
@@ -187,16 +199,9 @@ class A5Gen(QgsProcessingAlgorithm):
         return True
 
     def outputFields(self):
-        output_fields = QgsFields()
-        output_fields.append(QgsField("a5", QVariant.String))
-        output_fields.append(QgsField("resolution", QVariant.Int))
-        output_fields.append(QgsField("center_lat", QVariant.Double))
-        output_fields.append(QgsField("center_lon", QVariant.Double))
-        output_fields.append(QgsField("avg_edge_len", QVariant.Double))
-        output_fields.append(QgsField("cell_area", QVariant.Double))
-        output_fields.append(QgsField("cell_perimeter", QVariant.Double))
-
-        return output_fields
+        return cell_fields(
+            QgsFields(), "a5", output_metric_fields(False, self.output_mode)
+        )
 
     def processAlgorithm(self, parameters, context, feedback):
         """
@@ -208,13 +213,15 @@ class A5Gen(QgsProcessingAlgorithm):
             self.OUTPUT,
             context,
             fields,
-            QgsWkbTypes.Polygon,
+            output_wkb_type(self.output_mode),
             QgsCoordinateReferenceSystem("EPSG:4326"),
         )
 
         if not sink:
             raise QgsProcessingException(self.invalidSinkError(parameters, self.OUTPUT))
 
+        batch = CellBatch(None, "a5", mode=self.output_mode)
+
         canvas_crs = QgsProject.instance().crs()
 
         if self.canvas_extent is None or self.canvas_extent.isEmpty():
@@ -248,53 +255,21 @@ class A5Gen(QgsProcessingAlgorithm):
         )
 
         bbox_polygon = box(min_lon, min_lat, max_lon, max_lat)
-        bbox_center_lon = bbox_polygon.centroid.x
-        bbox_center_lat = bbox_polygon.centroid.y
-
-        # Centroid-seed BFS: expand neighbors until no intersecting cells remain.
-        seed_cell_id = a5.lonlat_to_cell(
-            (bbox_center_lon, bbox_center_lat), self.resolution
-        )
-        seed_cell_polygon = a52geo_u64(
-            seed_cell_id,
-            options=self.a5_options,
-            split_antimeridian=self.split_antimeridian,
-        )
-        if seed_cell_polygon is None:
-            raise QgsProcessingException("Failed to generate seed A5 cell polygon.")
 
-        intersecting_cells = {}  # {cell_u64: shapely_polygon}
-        if seed_cell_polygon.contains(bbox_polygon):
-            intersecting_cells[seed_cell_id] = seed_cell_polygon
-        else:
-            covered_cells = set()
-            queue = deque([seed_cell_id])
-
-            while queue:
-                if feedback.isCanceled():
-                    break
-
-                current_cell_id = queue.popleft()
-                if current_cell_id in covered_cells:
-                    continue
-                covered_cells.add(current_cell_id)
-
-                cell_polygon = a52geo_u64(
-                    current_cell_id,
-                    options=self.a5_options,
-                    split_antimeridian=self.split_antimeridian,
-                )
-                if cell_polygon is None:
-                    continue
+        def a5_polygon(cell_u64):
+            return a52geo_u64(
+                cell_u64,
+                options=self.a5_options,
+                split_antimeridian=self.split_antimeridian,
+            )
 
-                if cell_polygon.intersects(bbox_polygon):
-                    intersecting_cells[current_cell_id] = cell_polygon
-                    neighbors = a5.uncompact(
-                        a5.grid_disk_vertex(current_cell_id, 1), self.resolution
-                    )
-                    for neighbor_id in neighbors:
-                        if neighbor_id not in covered_cells:
-                            queue.append(neighbor_id)
+        # Boundary cells are walked and tested, interior cells come from the
+        # A5 polygon fill and get their polygon when written
+        intersecting_cells = a5_cells(
+            bbox_polygon, self.resolution, polygon=a5_polygon, feedback=feedback
+        )
+        if intersecting_cells is None:
+            return {self.OUTPUT: dest_id}
 
         if not intersecting_cells:
             raise QgsProcessingException(
@@ -310,36 +285,18 @@ class A5Gen(QgsProcessingAlgorithm):
                 break
 
             feedback.setProgress(int((idx / max(total_cells, 1)) * 100))
+            if cell_polygon is None:
+                cell_polygon = a5_polygon(cell_u64)
             cell_resolution = a5.get_resolution(cell_u64)
             num_edges = 5
             if cell_resolution == 1:
                 num_edges = 3
 
             a5_hex = a5.u64_to_hex(cell_u64)
-            (
-                center_lat,
-                center_lon,
-                avg_edge_len,
-                cell_area,
-                cell_perimeter,
-            ) = geodesic_dggs_metrics(cell_polygon, num_edges)
-
-            cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-            a5_feature = QgsFeature()
-            a5_feature.setGeometry(cell_geometry)
-            a5_feature.setAttributes(
-                [
-                    a5_hex,
-                    self.resolution,
-                    center_lat,
-                    center_lon,
-                    avg_edge_len,
-                    cell_area,
-                    cell_perimeter,
-                ]
-            )
-            sink.addFeature(a5_feature, QgsFeatureSink.FastInsert)
+            batch.add(a5_hex, cell_polygon, self.resolution, num_edges)
+            batch.flush(sink, feedback)
 
+        batch.flush(sink, feedback, 0)
         feedback.pushInfo("A5 DGGS generation completed.")
         if context.willLoadLayerOnCompletion(dest_id):
             lineColor = settings.a5Color
@@ -362,7 +319,7 @@ class StylePostProcessor(QgsProcessingLayerPostProcessorInterface):
         super().__init__()
 
     def postProcessLayer(self, layer, context, feedback):
-        if not isinstance(layer, QgsVectorLayer):
+        if not isinstance(layer, QgsVectorLayer) or not layer.isSpatial():
             return
         sym = layer.renderer().symbol().symbolLayer(0)
         sym.setBrushStyle(Qt.BrushStyle.NoBrush)
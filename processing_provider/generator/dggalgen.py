@@ -16,9 +16,17 @@ from vgrid.utils.antimeridian import fix_polygon
 from vgrid.utils.io import validate_coordinate
 from vgrid.utils.io import validate_dggal_resolution
 from vgrid.utils.constants import DGGAL_TYPES
-from vgrid.utils.geometry import geodesic_dggs_metrics, dggal_to_geo
+from vgrid.utils.geometry import dggal_to_geo
 from ...utils.latlon import epsg4326
 from ...utils.help_footer import social_links_footer
+from ...utils.conversion.cell_batch import (
+    OUTPUT_FULL,
+    OUTPUT_MODES,
+    CellBatch,
+    cell_fields,
+    output_metric_fields,
+    output_wkb_type,
+)
 
 __author__ = "Thang Quach"
 __date__ = "2024-11-20"
@@ -27,7 +35,6 @@ __copyright__ = "(L) 2024, Thang Quach"
 from qgis.core import (
     QgsApplication,
     QgsProject,
-    QgsFeatureSink,
     QgsProcessingLayerPostProcessorInterface,
     QgsProcessingParameterExtent,
     QgsProcessingParameterNumber,
@@ -35,10 +42,6 @@ from qgis.core import (
     QgsProcessingParameterFeatureSink,
     QgsProcessingAlgorithm,
     QgsFields,
-    QgsField,
-    QgsFeature,
-    QgsGeometry,
-    QgsWkbTypes,
     QgsCoordinateReferenceSystem,
     QgsVectorLayer,
     QgsPalLayerSettings,
@@ -49,7 +52,6 @@ from qgis.core import (
 from qgis.PyQt.QtGui import QIcon, QColor
 from qgis.PyQt.QtCore import QCoreApplication, Qt
 from qgis.utils import iface
-from qgis.PyQt.QtCore import QVariant
 from qgis.core import QgsCoordinateTransform
 import os
 from ...settings import settings
@@ -65,6 +67,7 @@ class DGGALGen(QgsProcessingAlgorithm):
     DGGS_TYPE = "DGGS_TYPE"
     RESOLUTION = "RESOLUTION"
     SPLIT_ANTIMERIDIAN = "SPLIT_ANTIMERIDIAN"
+    OUTPUT_MODE = "OUTPUT_MODE"
     OUTPUT = "OUTPUT"
 
     LOC = QgsApplication.locale()[:2]
@@ -164,10 +167,19 @@ class DGGALGen(QgsProcessingAlgorithm):
         )
         self.addParameter(param)
 
+        param = QgsProcessingParameterEnum(
+            self.OUTPUT_MODE,
+            self.tr("Output"),
+            options=OUTPUT_MODES,
+            defaultValue=OUTPUT_FULL,
+        )
+        self.addParameter(param)
+
         param = QgsProcessingParameterFeatureSink(self.OUTPUT, self.tr("DGGAL"))
         self.addParameter(param)
 
     def prepareAlgorithm(self, parameters, context, feedback):
+        self.output_mode = self.parameterAsEnum(parameters, self.OUTPUT_MODE, context)
         dggs_type_index = self.parameterAsEnum(parameters, self.DGGS_TYPE, context)
         self.dggs_type = list(DGGAL_TYPES.keys())[dggs_type_index]
         self.resolution = self.parameterAsInt(parameters, self.RESOLUTION, context)
@@ -190,15 +202,11 @@ class DGGALGen(QgsProcessingAlgorithm):
         return True
 
     def outputFields(self):
-        output_fields = QgsFields()
-        output_fields.append(QgsField(f"dggal_{self.dggs_type}", QVariant.String))
-        output_fields.append(QgsField("resolution", QVariant.Int))
-        output_fields.append(QgsField("center_lat", QVariant.Double))
-        output_fields.append(QgsField("center_lon", QVariant.Double))
-        output_fields.append(QgsField("avg_edge_len", QVariant.Double))
-        output_fields.append(QgsField("cell_area", QVariant.Double))
-        output_fields.append(QgsField("cell_perimeter", QVariant.Double))
-        return output_fields
+        return cell_fields(
+            QgsFields(),
+            f"dggal_{self.dggs_type}",
+            output_metric_fields(False, self.output_mode),
+        )
 
     def processAlgorithm(self, parameters, context, feedback):
         fields = self.outputFields()
@@ -208,7 +216,7 @@ class DGGALGen(QgsProcessingAlgorithm):
             self.OUTPUT,
             context,
             fields,
-            QgsWkbTypes.Polygon,
+            output_wkb_type(self.output_mode),
             QgsCoordinateReferenceSystem("EPSG:4326"),
         )
 
@@ -217,6 +225,8 @@ class DGGALGen(QgsProcessingAlgorithm):
 
         if not sink:
             raise QgsProcessingException(self.invalidSinkError(parameters, self.OUTPUT))
+
+        batch = CellBatch(None, f"dggal_{self.dggs_type}", mode=self.output_mode)
         canvas_crs = QgsProject.instance().crs()
 
         if self.canvas_extent is None or self.canvas_extent.isEmpty():
@@ -266,28 +276,13 @@ class DGGALGen(QgsProcessingAlgorithm):
             # Apply antimeridian fix if requested
             if self.split_antimeridian:
                 cell_polygon = fix_polygon(cell_polygon)
-            cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-            dggal_feature = QgsFeature()
-            dggal_feature.setGeometry(cell_geometry)
-            center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-                geodesic_dggs_metrics(cell_polygon, num_edges)
-            )
-            dggal_feature.setAttributes(
-                [
-                    zone_id,
-                    cell_resolution,
-                    center_lat,
-                    center_lon,
-                    avg_edge_len,
-                    cell_area,
-                    cell_perimeter,
-                ]
-            )
-            sink.addFeature(dggal_feature, QgsFeatureSink.FastInsert)
+            batch.add(zone_id, cell_polygon, cell_resolution, num_edges)
+            batch.flush(sink, feedback)
 
             if feedback.isCanceled():
                 break
 
+        batch.flush(sink, feedback, 0)
         feedback.pushInfo(f"{self.dggs_type} DGGS generation completed.")
         if context.willLoadLayerOnCompletion(dest_id):
             lineColor = settings.dggal_gnosisColor
@@ -313,7 +308,7 @@ class StylePostProcessor(QgsProcessingLayerPostProcessorInterface):
         super().__init__()
 
     def postProcessLayer(self, layer, context, feedback):
-        if not isinstance(layer, QgsVectorLayer):
+        if not isinstance(layer, QgsVectorLayer) or not layer.isSpatial():
             return
         sym = layer.renderer().symbol().symbolLayer(0)
         sym.setBrushStyle(Qt.BrushStyle.NoBrush)
@@ -20,7 +20,6 @@ import os
 from qgis.core import (
     QgsApplication,
     QgsProject,
-    QgsFeatureSink,
     QgsProcessingLayerPostProcessorInterface,
     QgsProcessingParameterExtent,
     QgsProcessingParameterNumber,
@@ -28,10 +27,6 @@ from qgis.core import (
     QgsProcessingParameterFeatureSink,
     QgsProcessingAlgorithm,
     QgsFields,
-    QgsField,
-    QgsFeature,
-    QgsGeometry,
-    QgsWkbTypes,
     QgsCoordinateReferenceSystem,
     QgsVectorLayer,
     QgsPalLayerSettings,
@@ -41,7 +36,7 @@ from qgis.core import (
     QgsCoordinateTransform,
 )
 from qgis.PyQt.QtGui import QIcon, QColor
-from qgis.PyQt.QtCore import QCoreApplication, Qt, QVariant
+from qgis.PyQt.QtCore import QCoreApplication, Qt
 from qgis.utils import iface
 from dggrid4py import DGGRIDv8
 from vgrid.utils.io import (
@@ -59,11 +54,18 @@ from ...utils.dggrid_instance import (
     get_plugin_dggrid_instance,
 )
 from vgrid.utils.constants import DGGRID_TYPES
-from vgrid.utils.geometry import geodesic_dggs_metrics
 
 from ...settings import settings
 from ...utils.help_footer import social_links_footer
 from ...utils.latlon import epsg4326
+from ...utils.conversion.cell_batch import (
+    OUTPUT_FULL,
+    OUTPUT_MODES,
+    CellBatch,
+    cell_fields,
+    output_metric_fields,
+    output_wkb_type,
+)
 
 # Must match DGGRIDv8 (not deprecated dggrid_runner.output_address_types v7 list).
 _DGGS_TYPE_OPTIONS = list(DGGRID_TYPES.keys())
@@ -87,6 +89,7 @@ class DGGRIDGen(QgsProcessingAlgorithm):
     SPLIT_ANTIMERIDIAN = "SPLIT_ANTIMERIDIAN"
     AGGREGATE = "AGGREGATE"
     DENSIFICATION = "DENSIFICATION"
+    OUTPUT_MODE = "OUTPUT_MODE"
     OUTPUT = "OUTPUT"
 
     LOC = QgsApplication.locale()[:2]
@@ -219,6 +222,15 @@ class DGGRIDGen(QgsProcessingAlgorithm):
             )
         )
 
+        self.addParameter(
+            QgsProcessingParameterEnum(
+                self.OUTPUT_MODE,
+                self.tr("Output"),
+                options=OUTPUT_MODES,
+                defaultValue=OUTPUT_FULL,
+            )
+        )
+
         self.addParameter(
             QgsProcessingParameterFeatureSink(self.OUTPUT, self.tr("DGGRID"))
         )
@@ -230,6 +242,7 @@ class DGGRIDGen(QgsProcessingAlgorithm):
         return options[index]
 
     def prepareAlgorithm(self, parameters, context, feedback):
+        self.output_mode = self.parameterAsEnum(parameters, self.OUTPUT_MODE, context)
         self.dggs_type = validate_dggrid_type(
             self._enum_choice(
                 parameters,
@@ -291,15 +304,9 @@ class DGGRIDGen(QgsProcessingAlgorithm):
         return True
 
     def outputFields(self):
-        output_fields = QgsFields()
-        output_fields.append(QgsField(self.id_field, QVariant.String))
-        output_fields.append(QgsField("resolution", QVariant.Int))
-        output_fields.append(QgsField("center_lat", QVariant.Double))
-        output_fields.append(QgsField("center_lon", QVariant.Double))
-        output_fields.append(QgsField("avg_edge_len", QVariant.Double))
-        output_fields.append(QgsField("cell_area", QVariant.Double))
-        output_fields.append(QgsField("cell_perimeter", QVariant.Double))
-        return output_fields
+        return cell_fields(
+            QgsFields(), self.id_field, output_metric_fields(False, self.output_mode)
+        )
 
     def processAlgorithm(self, parameters, context, feedback):
         fields = self.outputFields()
@@ -308,7 +315,7 @@ class DGGRIDGen(QgsProcessingAlgorithm):
             self.OUTPUT,
             context,
             fields,
-            QgsWkbTypes.Polygon,
+            output_wkb_type(self.output_mode),
             QgsCoordinateReferenceSystem("EPSG:4326"),
         )
 
@@ -371,6 +378,7 @@ class DGGRIDGen(QgsProcessingAlgorithm):
         total_cells = len(dggrid_gdf)
         feedback.pushInfo(f"Total cells to be generated: {total_cells}.")
         num_edges = dggrid_num_edges(self.dggs_type)
+        batch = CellBatch(None, self.id_field, mode=self.output_mode)
 
         for idx, row in dggrid_gdf.iterrows():
             if feedback.isCanceled():
@@ -387,24 +395,10 @@ class DGGRIDGen(QgsProcessingAlgorithm):
             if cell_id is None:
                 continue
 
-            center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-                geodesic_dggs_metrics(cell_polygon, num_edges)
-            )
+            batch.add(cell_id, cell_polygon, self.resolution, num_edges)
+            batch.flush(sink, feedback)
 
-            feature = QgsFeature()
-            feature.setGeometry(QgsGeometry.fromWkt(cell_polygon.wkt))
-            feature.setAttributes(
-                [
-                    str(cell_id),
-                    self.resolution,
-                    center_lat,
-                    center_lon,
-                    avg_edge_len,
-                    cell_area,
-                    cell_perimeter,
-                ]
-            )
-            sink.addFeature(feature, QgsFeatureSink.FastInsert)
+        batch.flush(sink, feedback, 0)
 
         feedback.pushInfo(f"{self.dggs_type} DGGRID generation completed.")
 
@@ -431,7 +425,7 @@ class StylePostProcessor(QgsProcessingLayerPostProcessorInterface):
         super().__init__()
 
     def postProcessLayer(self, layer, context, feedback):
-        if not isinstance(layer, QgsVectorLayer):
+        if not isinstance(layer, QgsVectorLayer) or not layer.isSpatial():
             return
         sym = layer.renderer().symbol().symbolLayer(0)
         sym.setBrushStyle(Qt.BrushStyle.NoBrush)
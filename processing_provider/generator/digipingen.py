@@ -18,18 +18,14 @@ __copyright__ = "(L) 2024, Thang Quach"
 from qgis.core import (
     QgsApplication,
     QgsProject,
-    QgsFeatureSink,  # type: ignore
     QgsProcessingLayerPostProcessorInterface,
     QgsProcessingParameterExtent,
     QgsProcessingParameterNumber,
     QgsProcessingException,
     QgsProcessingParameterFeatureSink,
+    QgsProcessingParameterEnum,
     QgsProcessingAlgorithm,
     QgsFields,
-    QgsField,
-    QgsFeature,
-    QgsGeometry,
-    QgsWkbTypes,
     QgsCoordinateReferenceSystem,
     QgsVectorLayer,
     QgsPalLayerSettings,
@@ -38,7 +34,6 @@ from qgis.core import (
 from qgis.PyQt.QtGui import QIcon, QColor
 from qgis.PyQt.QtCore import QCoreApplication, Qt
 from qgis.utils import iface
-from qgis.PyQt.QtCore import QVariant
 from qgis.core import QgsCoordinateTransform
 import os
 
@@ -46,17 +41,25 @@ from vgrid.conversion.latlon2dggs import latlon2digipin
 from vgrid.conversion.dggs2geo.digipin2geo import digipin2geo
 from vgrid.utils.io import validate_digipin_coordinate
 from vgrid.dggs.digipin import BOUNDS
-from vgrid.utils.geometry import graticule_dggs_metrics
 
 from ...utils.help_footer import social_links_footer
 from ...settings import settings
 from ...utils.latlon import epsg4326
+from ...utils.conversion.cell_batch import (
+    OUTPUT_FULL,
+    OUTPUT_MODES,
+    CellBatch,
+    cell_fields,
+    output_metric_fields,
+    output_wkb_type,
+)
 from vgrid.utils.constants import DGGS_TYPES
 
 
 class DIGIPINGen(QgsProcessingAlgorithm):
     EXTENT = "EXTENT"
     RESOLUTION = "RESOLUTION"
+    OUTPUT_MODE = "OUTPUT_MODE"
     OUTPUT = "OUTPUT"
 
     LOC = QgsApplication.locale()[:2]
@@ -143,10 +146,19 @@ class DIGIPINGen(QgsProcessingAlgorithm):
         )
         self.addParameter(param)
 
+        param = QgsProcessingParameterEnum(
+            self.OUTPUT_MODE,
+            self.tr("Output"),
+            options=OUTPUT_MODES,
+            defaultValue=OUTPUT_FULL,
+        )
+        self.addParameter(param)
+
         param = QgsProcessingParameterFeatureSink(self.OUTPUT, "DIGIPIN")
         self.addParameter(param)
 
     def prepareAlgorithm(self, parameters, context, feedback):
+        self.output_mode = self.parameterAsEnum(parameters, self.OUTPUT_MODE, context)
         self.resolution = self.parameterAsInt(parameters, self.RESOLUTION, context)
         self.canvas_extent = self.parameterAsExtent(parameters, self.EXTENT, context)
         if self.resolution > 4 and (
@@ -160,16 +172,9 @@ class DIGIPINGen(QgsProcessingAlgorithm):
         return True
 
     def outputFields(self):
-        output_fields = QgsFields()
-        output_fields.append(QgsField("digipin", QVariant.String))
-        output_fields.append(QgsField("resolution", QVariant.Int))
-        output_fields.append(QgsField("center_lat", QVariant.Double))
-        output_fields.append(QgsField("center_lon", QVariant.Double))
-        output_fields.append(QgsField("cell_width", QVariant.Double))
-        output_fields.append(QgsField("cell_height", QVariant.Double))
-        output_fields.append(QgsField("cell_area", QVariant.Double))
-        output_fields.append(QgsField("cell_perimeter", QVariant.Double))
-        return output_fields
+        return cell_fields(
+            QgsFields(), "digipin", output_metric_fields(True, self.output_mode)
+        )
 
     def processAlgorithm(self, parameters, context, feedback):
         fields = self.outputFields()
@@ -179,12 +184,14 @@ class DIGIPINGen(QgsProcessingAlgorithm):
             self.OUTPUT,
             context,
             fields,
-            QgsWkbTypes.Polygon,
+            output_wkb_type(self.output_mode),
             QgsCoordinateReferenceSystem("EPSG:4326"),
         )
 
         if not sink:
             raise QgsProcessingException(self.invalidSinkError(parameters, self.OUTPUT))
+
+        batch = CellBatch(None, "digipin", graticule=True, mode=self.output_mode)
         canvas_crs = QgsProject.instance().crs()
 
         if self.canvas_extent is None or self.canvas_extent.isEmpty():
@@ -272,36 +279,8 @@ class DIGIPINGen(QgsProcessingAlgorithm):
                         lat += sample_width
                         continue
 
-                    # Convert to QgsGeometry
-                    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-
-                    # Calculate cell metrics
-                    (
-                        center_lat,
-                        center_lon,
-                        cell_width,
-                        cell_height,
-                        cell_area,
-                        cell_perimeter,
-                    ) = graticule_dggs_metrics(cell_polygon)
-
-                    # Create QgsFeature
-                    digipin_feature = QgsFeature()
-                    digipin_feature.setGeometry(cell_geometry)
-                    digipin_feature.setAttributes(
-                        [
-                            digipin_id,
-                            self.resolution,
-                            center_lat,
-                            center_lon,
-                            cell_width,
-                            cell_height,
-                            cell_area,
-                            cell_perimeter,
-                        ]
-                    )
-
-                    sink.addFeature(digipin_feature, QgsFeatureSink.FastInsert)
+                    batch.add(digipin_id, cell_polygon, self.resolution)
+                    batch.flush(sink, feedback)
                     cell_count += 1
 
                     # Update progress
@@ -320,6 +299,7 @@ class DIGIPINGen(QgsProcessingAlgorithm):
                 lat += sample_width
             lon += sample_width
 
+        batch.flush(sink, feedback, 0)
         feedback.pushInfo(
             f"DIGIPIN DGGS generation completed. Generated {cell_count} cells."
         )
@@ -349,7 +329,7 @@ class StylePostProcessor(QgsProcessingLayerPostProcessorInterface):
         super().__init__()
 
     def postProcessLayer(self, layer, context, feedback):
-        if not isinstance(layer, QgsVectorLayer):
+        if not isinstance(layer, QgsVectorLayer) or not layer.isSpatial():
             return
         sym = layer.renderer().symbol().symbolLayer(0)
         sym.setBrushStyle(Qt.BrushStyle.NoBrush)
@@ -19,18 +19,14 @@ __copyright__ = "(L) 2024, Thang Quach"
 from qgis.core import (
     QgsApplication,
     QgsProject,
-    QgsFeatureSink,
     QgsProcessingLayerPostProcessorInterface,
     QgsProcessingParameterExtent,
     QgsProcessingParameterNumber,
     QgsProcessingException,
     QgsProcessingParameterFeatureSink,
+    QgsProcessingParameterEnum,
     QgsProcessingAlgorithm,
     QgsFields,
-    QgsField,
-    QgsFeature,
-    QgsGeometry,
-    QgsWkbTypes,
     QgsCoordinateReferenceSystem,
     QgsVectorLayer,
     QgsPalLayerSettings,
@@ -39,13 +35,19 @@ from qgis.core import (
 from qgis.PyQt.QtGui import QIcon, QColor
 from qgis.PyQt.QtCore import QCoreApplication, Qt
 from qgis.utils import iface
-from qgis.PyQt.QtCore import QVariant
 from qgis.core import QgsCoordinateTransform
 import os
 from ...utils.help_footer import social_links_footer
+from ...utils.conversion.cell_batch import (
+    OUTPUT_FULL,
+    OUTPUT_MODES,
+    CellBatch,
+    cell_fields,
+    output_metric_fields,
+    output_wkb_type,
+)
 import numpy as np
 from gars_field.garsgrid import GARSGrid
-from vgrid.utils.geometry import graticule_dggs_metrics
 from ...settings import settings
 from ...utils.latlon import epsg4326
 from vgrid.utils.io import validate_coordinate
@@ -56,6 +58,7 @@ from vgrid.utils.constants import GARS_RESOLUTION_MINUTES
 class GARSGen(QgsProcessingAlgorithm):
     EXTENT = "EXTENT"
     RESOLUTION = "RESOLUTION"
+    OUTPUT_MODE = "OUTPUT_MODE"
     OUTPUT = "OUTPUT"
 
     LOC = QgsApplication.locale()[:2]
@@ -141,10 +144,19 @@ class GARSGen(QgsProcessingAlgorithm):
         )
         self.addParameter(param)
 
+        param = QgsProcessingParameterEnum(
+            self.OUTPUT_MODE,
+            self.tr("Output"),
+            options=OUTPUT_MODES,
+            defaultValue=OUTPUT_FULL,
+        )
+        self.addParameter(param)
+
         param = QgsProcessingParameterFeatureSink(self.OUTPUT, "GARS")
         self.addParameter(param)
 
     def prepareAlgorithm(self, parameters, context, feedback):
+        self.output_mode = self.parameterAsEnum(parameters, self.OUTPUT_MODE, context)
         self.resolution = self.parameterAsInt(parameters, self.RESOLUTION, context)
         if self.resolution < 1 or self.resolution > 4:
             feedback.reportError("Resolution must be in range [1..4]")
@@ -164,16 +176,9 @@ class GARSGen(QgsProcessingAlgorithm):
         return True
 
     def outputFields(self):
-        output_fields = QgsFields()
-        output_fields.append(QgsField("gars", QVariant.String))
-        output_fields.append(QgsField("resolution", QVariant.Int))
-        output_fields.append(QgsField("center_lat", QVariant.Double))
-        output_fields.append(QgsField("center_lon", QVariant.Double))
-        output_fields.append(QgsField("cell_width", QVariant.Double))
-        output_fields.append(QgsField("cell_height", QVariant.Double))
-        output_fields.append(QgsField("cell_area", QVariant.Double))
-        output_fields.append(QgsField("cell_perimeter", QVariant.Double))
-        return output_fields
+        return cell_fields(
+            QgsFields(), "gars", output_metric_fields(True, self.output_mode)
+        )
 
     def processAlgorithm(self, parameters, context, feedback):
         fields = self.outputFields()
@@ -183,13 +188,15 @@ class GARSGen(QgsProcessingAlgorithm):
             self.OUTPUT,
             context,
             fields,
-            QgsWkbTypes.Polygon,
+            output_wkb_type(self.output_mode),
             QgsCoordinateReferenceSystem("EPSG:4326"),
         )
 
         if sink is None:
             raise QgsProcessingException("Failed to create output sink")
 
+        batch = CellBatch(None, "gars", graticule=True, mode=self.output_mode)
+
         canvas_crs = QgsProject.instance().crs()
 
         resolution_minutes = GARS_RESOLUTION_MINUTES.get(self.resolution)
@@ -240,34 +247,13 @@ class GARSGen(QgsProcessingAlgorithm):
                 gars_cell = GARSGrid.from_latlon(lat, lon, resolution_minutes)
                 gars_id = gars_cell.gars_id
                 cell_polygon = gars_cell.polygon
-                cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-                gars_feature = QgsFeature()
-                gars_feature.setGeometry(cell_geometry)
-                (
-                    center_lat,
-                    center_lon,
-                    cell_width,
-                    cell_height,
-                    cell_area,
-                    cell_perimeter,
-                ) = graticule_dggs_metrics(cell_polygon)
-                gars_feature.setAttributes(
-                    [
-                        gars_id,
-                        self.resolution,
-                        center_lat,
-                        center_lon,
-                        cell_width,
-                        cell_height,
-                        cell_area,
-                        cell_perimeter,
-                    ]
-                )
-                sink.addFeature(gars_feature, QgsFeatureSink.FastInsert)
+                batch.add(gars_id, cell_polygon, self.resolution)
+                batch.flush(sink, feedback)
                 # Update progress and feedback message
                 cell_count += 1
                 feedback.setProgress(int((cell_count / total_cells) * 100))
 
+        batch.flush(sink, feedback, 0)
         feedback.pushInfo("GARS DGGS generation completed.")
         # Set styling if loading the layer
         if context.willLoadLayerOnCompletion(dest_id):
@@ -291,7 +277,7 @@ class StylePostProcessor(QgsProcessingLayerPostProcessorInterface):
         super().__init__()
 
     def postProcessLayer(self, layer, context, feedback):
-        if not isinstance(layer, QgsVectorLayer):
+        if not isinstance(layer, QgsVectorLayer) or not layer.isSpatial():
             return
         sym = layer.renderer().symbol().symbolLayer(0)
         sym.setBrushStyle(Qt.BrushStyle.NoBrush)
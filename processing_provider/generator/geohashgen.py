@@ -23,12 +23,9 @@ from qgis.core import (
     QgsProcessingParameterNumber,
     QgsProcessingException,
     QgsProcessingParameterFeatureSink,
+    QgsProcessingParameterEnum,
     QgsProcessingAlgorithm,
     QgsFields,
-    QgsField,
-    QgsFeature,
-    QgsGeometry,
-    QgsWkbTypes,
     QgsCoordinateReferenceSystem,
     QgsVectorLayer,
     QgsPalLayerSettings,
@@ -37,13 +34,19 @@ from qgis.core import (
 from qgis.PyQt.QtGui import QIcon, QColor
 from qgis.PyQt.QtCore import QCoreApplication, Qt
 from qgis.utils import iface
-from qgis.PyQt.QtCore import QVariant
 from qgis.core import QgsCoordinateTransform
 import os
 
 from ...utils.geohash_alphabet import geohash_child_chars
 from ...utils.help_footer import social_links_footer
-from vgrid.utils.geometry import graticule_dggs_metrics
+from ...utils.conversion.cell_batch import (
+    OUTPUT_FULL,
+    OUTPUT_MODES,
+    CellBatch,
+    cell_fields,
+    output_metric_fields,
+    output_wkb_type,
+)
 from shapely.geometry import box
 from vgrid.conversion.dggs2geo.geohash2geo import geohash2geo
 from ...settings import settings
@@ -56,6 +59,7 @@ from vgrid.utils.constants import DGGS_TYPES
 class GeohashGen(QgsProcessingAlgorithm):
     EXTENT = "EXTENT"
     RESOLUTION = "RESOLUTION"
+    OUTPUT_MODE = "OUTPUT_MODE"
     OUTPUT = "OUTPUT"
 
     LOC = QgsApplication.locale()[:2]
@@ -142,10 +146,19 @@ class GeohashGen(QgsProcessingAlgorithm):
         )
         self.addParameter(param)
 
+        param = QgsProcessingParameterEnum(
+            self.OUTPUT_MODE,
+            self.tr("Output"),
+            options=OUTPUT_MODES,
+            defaultValue=OUTPUT_FULL,
+        )
+        self.addParameter(param)
+
         param = QgsProcessingParameterFeatureSink(self.OUTPUT, "Geohash")
         self.addParameter(param)
 
     def prepareAlgorithm(self, parameters, context, feedback):
+        self.output_mode = self.parameterAsEnum(parameters, self.OUTPUT_MODE, context)
         self.resolution = self.parameterAsInt(parameters, self.RESOLUTION, context)
         # Get the extent parameter
         self.canvas_extent = self.parameterAsExtent(parameters, self.EXTENT, context)
@@ -161,95 +174,40 @@ class GeohashGen(QgsProcessingAlgorithm):
         return True
 
     def outputFields(self):
-        output_fields = QgsFields()
-        output_fields.append(QgsField("geohash", QVariant.String))
-        output_fields.append(QgsField("resolution", QVariant.Int))
-        output_fields.append(QgsField("center_lat", QVariant.Double))
-        output_fields.append(QgsField("center_lon", QVariant.Double))
-        output_fields.append(QgsField("cell_width", QVariant.Double))
-        output_fields.append(QgsField("cell_height", QVariant.Double))
-        output_fields.append(QgsField("cell_area", QVariant.Double))
-        output_fields.append(QgsField("cell_perimeter", QVariant.Double))
-        return output_fields
-
-    def expand_geohash(self, gh, target_length, writer, fields, feedback):
+        return cell_fields(
+            QgsFields(), "geohash", output_metric_fields(True, self.output_mode)
+        )
+
+    def expand_geohash(self, gh, target_length, writer, batch, feedback):
         """Recursive function to expand geohashes to target RESOLUTION and write them."""
         if len(gh) == target_length:
             cell_polygon = geohash2geo(gh)
-            cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-            geohash_feature = QgsFeature(fields)
-            geohash_feature.setGeometry(cell_geometry)
-
-            (
-                center_lat,
-                center_lon,
-                cell_width,
-                cell_height,
-                cell_area,
-                cell_perimeter,
-            ) = graticule_dggs_metrics(cell_polygon)
-            geohash_feature.setAttributes(
-                [
-                    gh,
-                    self.resolution,
-                    center_lat,
-                    center_lon,
-                    cell_width,
-                    cell_height,
-                    cell_area,
-                    cell_perimeter,
-                ]
-            )
-
-            writer.addFeature(geohash_feature)
+            batch.add(gh, cell_polygon, self.resolution)
+            batch.flush(writer, feedback)
             return
 
         # pragma: allowlist secret — public geohash base32 alphabet, not credentials
         for char in geohash_child_chars():
-            self.expand_geohash(gh + char, target_length, writer, fields, feedback)
+            self.expand_geohash(gh + char, target_length, writer, batch, feedback)
             if feedback.isCanceled():
                 return
 
     def expand_geohash_within_bbox(
-        self, gh, target_length, writer, fields, extent_bbox, feedback
+        self, gh, target_length, writer, batch, extent_bbox, feedback
     ):
         cell_polygon = geohash2geo(gh)
         if not cell_polygon.intersects(extent_bbox):
             return
 
         if len(gh) == target_length:
-            cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-            geohash_feature = QgsFeature(fields)
-            geohash_feature.setGeometry(cell_geometry)
-
-            (
-                center_lat,
-                center_lon,
-                cell_width,
-                cell_height,
-                cell_area,
-                cell_perimeter,
-            ) = graticule_dggs_metrics(cell_polygon)
-            geohash_feature.setAttributes(
-                [
-                    gh,
-                    self.resolution,
-                    center_lat,
-                    center_lon,
-                    cell_width,
-                    cell_height,
-                    cell_area,
-                    cell_perimeter,
-                ]
-            )
-
-            writer.addFeature(geohash_feature)
+            batch.add(gh, cell_polygon, self.resolution)
+            batch.flush(writer, feedback)
             return
 
         # pragma: allowlist secret — public geohash base32 alphabet, not credentials
         for char in geohash_child_chars():
             self.expand_geohash_within_bbox(
-                gh + char, target_length, writer, fields, extent_bbox, feedback
+                gh + char, target_length, writer, batch, extent_bbox, feedback
             )
             if feedback.isCanceled():
                 return
@@ -263,13 +221,15 @@ class GeohashGen(QgsProcessingAlgorithm):
             self.OUTPUT,
             context,
             fields,
-            QgsWkbTypes.Polygon,
+            output_wkb_type(self.output_mode),
             QgsCoordinateReferenceSystem("EPSG:4326"),
         )
 
         if sink is None:
             raise QgsProcessingException("Failed to create output sink")
 
+        batch = CellBatch(None, "geohash", graticule=True, mode=self.output_mode)
+
         canvas_crs = QgsProject.instance().crs()
 
         if self.canvas_extent is None or self.canvas_extent.isEmpty():
@@ -277,7 +237,7 @@ class GeohashGen(QgsProcessingAlgorithm):
             total_cells = 32**self.resolution
             feedback.pushInfo(f"Total cells to be generated: {total_cells}.")
             for idx, gh in enumerate(INITIAL_GEOHASHES):
-                self.expand_geohash(gh, self.resolution, sink, fields, feedback)
+                self.expand_geohash(gh, self.resolution, sink, batch, feedback)
                 feedback.setProgress(int((idx / total_cells) * 100))
                 if feedback.isCanceled():
                     break
@@ -318,11 +278,12 @@ class GeohashGen(QgsProcessingAlgorithm):
             for idx, gh in enumerate(intersected_geohashes):
                 feedback.setProgress(int((idx / total_geohashes) * 100))
                 self.expand_geohash_within_bbox(
-                    gh, self.resolution, sink, fields, extent_bbox, feedback
+                    gh, self.resolution, sink, batch, extent_bbox, feedback
                 )
                 if feedback.isCanceled():
                     break
 
+        batch.flush(sink, feedback, 0)
         feedback.pushInfo("Geohash DGGS generation completed.")
 
         if context.willLoadLayerOnCompletion(dest_id):
@@ -345,7 +306,7 @@ class StylePostProcessor(QgsProcessingLayerPostProcessorInterface):
         super().__init__()
 
     def postProcessLayer(self, layer, context, feedback):
-        if not isinstance(layer, QgsVectorLayer):
+        if not isinstance(layer, QgsVectorLayer) or not layer.isSpatial():
             return
         sym = layer.renderer().symbol().symbolLayer(0)
         sym.setBrushStyle(Qt.BrushStyle.NoBrush)
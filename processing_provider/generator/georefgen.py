@@ -18,18 +18,14 @@ __copyright__ = "(L) 2024, Thang Quach"
 from qgis.core import (
     QgsApplication,
     QgsProject,
-    QgsFeatureSink,
     QgsProcessingLayerPostProcessorInterface,
     QgsProcessingParameterExtent,
     QgsProcessingParameterNumber,
     QgsProcessingException,
     QgsProcessingParameterFeatureSink,
+    QgsProcessingParameterEnum,
     QgsProcessingAlgorithm,
     QgsFields,
-    QgsField,
-    QgsFeature,
-    QgsGeometry,
-    QgsWkbTypes,
     QgsCoordinateReferenceSystem,
     QgsVectorLayer,
     QgsPalLayerSettings,
@@ -39,16 +35,22 @@ from qgis.PyQt.QtGui import QIcon, QColor
 from qgis.PyQt.QtCore import QCoreApplication, Qt
 from qgis.utils import iface
 from qgis.core import QgsCoordinateTransform
-from qgis.PyQt.QtCore import QVariant
 import os
 
 from vgrid.utils.io import validate_coordinate
 from vgrid.utils.constants import GEOREF_RESOLUTION_DEGREES
 from ...utils.help_footer import social_links_footer
+from ...utils.conversion.cell_batch import (
+    OUTPUT_FULL,
+    OUTPUT_MODES,
+    CellBatch,
+    cell_fields,
+    output_metric_fields,
+    output_wkb_type,
+)
 from ...utils.latlon import epsg4326
 from ...settings import settings
 import numpy as np
-from vgrid.utils.geometry import graticule_dggs_metrics
 from vgrid.conversion.latlon2dggs import latlon2georef
 from vgrid.conversion.dggs2geo import georef2geo
 
@@ -56,6 +58,7 @@ from vgrid.conversion.dggs2geo import georef2geo
 class GEOREFGen(QgsProcessingAlgorithm):
     EXTENT = "EXTENT"
     RESOLUTION = "RESOLUTION"
+    OUTPUT_MODE = "OUTPUT_MODE"
     OUTPUT = "OUTPUT"
 
     LOC = QgsApplication.locale()[:2]
@@ -141,10 +144,19 @@ class GEOREFGen(QgsProcessingAlgorithm):
         )
         self.addParameter(param)
 
+        param = QgsProcessingParameterEnum(
+            self.OUTPUT_MODE,
+            self.tr("Output"),
+            options=OUTPUT_MODES,
+            defaultValue=OUTPUT_FULL,
+        )
+        self.addParameter(param)
+
         param = QgsProcessingParameterFeatureSink(self.OUTPUT, "GEOREF")
         self.addParameter(param)
 
     def prepareAlgorithm(self, parameters, context, feedback):
+        self.output_mode = self.parameterAsEnum(parameters, self.OUTPUT_MODE, context)
         self.resolution = self.parameterAsInt(parameters, self.RESOLUTION, context)
         if self.resolution < 0 or self.resolution > 10:
             feedback.reportError("Resolution must be in range [0..10]")
@@ -163,16 +175,9 @@ class GEOREFGen(QgsProcessingAlgorithm):
         return True
 
     def outputFields(self):
-        output_fields = QgsFields()
-        output_fields.append(QgsField("georef", QVariant.String))
-        output_fields.append(QgsField("resolution", QVariant.Int))
-        output_fields.append(QgsField("center_lat", QVariant.Double))
-        output_fields.append(QgsField("center_lon", QVariant.Double))
-        output_fields.append(QgsField("cell_width", QVariant.Double))
-        output_fields.append(QgsField("cell_height", QVariant.Double))
-        output_fields.append(QgsField("cell_area", QVariant.Double))
-        output_fields.append(QgsField("cell_perimeter", QVariant.Double))
-        return output_fields
+        return cell_fields(
+            QgsFields(), "georef", output_metric_fields(True, self.output_mode)
+        )
 
     def processAlgorithm(self, parameters, context, feedback):
         fields = self.outputFields()
@@ -182,13 +187,15 @@ class GEOREFGen(QgsProcessingAlgorithm):
             self.OUTPUT,
             context,
             fields,
-            QgsWkbTypes.Polygon,
+            output_wkb_type(self.output_mode),
             QgsCoordinateReferenceSystem("EPSG:4326"),
         )
 
         if sink is None:
             raise QgsProcessingException("Failed to create output sink")
 
+        batch = CellBatch(None, "georef", graticule=True, mode=self.output_mode)
+
         canvas_crs = QgsProject.instance().crs()
 
         resolution_degrees = GEOREF_RESOLUTION_DEGREES.get(self.resolution)
@@ -235,34 +242,13 @@ class GEOREFGen(QgsProcessingAlgorithm):
                     break
                 georef_id = latlon2georef(lat, lon, self.resolution)
                 cell_polygon = georef2geo(georef_id)
-                cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-                georef_feature = QgsFeature()
-                georef_feature.setGeometry(cell_geometry)
-                (
-                    center_lat,
-                    center_lon,
-                    cell_width,
-                    cell_height,
-                    cell_area,
-                    cell_perimeter,
-                ) = graticule_dggs_metrics(cell_polygon)
-                georef_feature.setAttributes(
-                    [
-                        georef_id,
-                        self.resolution,
-                        center_lat,
-                        center_lon,
-                        cell_width,
-                        cell_height,
-                        cell_area,
-                        cell_perimeter,
-                    ]
-                )
-                sink.addFeature(georef_feature, QgsFeatureSink.FastInsert)
+                batch.add(georef_id, cell_polygon, self.resolution)
+                batch.flush(sink, feedback)
                 # Update progress and feedback message
                 cell_count += 1
                 feedback.setProgress(int((cell_count / total_cells) * 100))
 
+        batch.flush(sink, feedback, 0)
         feedback.pushInfo("GEOREF DGGS generation completed.")
         # Set styling if loading the layer
         if context.willLoadLayerOnCompletion(dest_id):
@@ -286,7 +272,7 @@ class StylePostProcessor(QgsProcessingLayerPostProcessorInterface):
         super().__init__()
 
     def postProcessLayer(self, layer, context, feedback):
-        if not isinstance(layer, QgsVectorLayer):
+        if not isinstance(layer, QgsVectorLayer) or not layer.isSpatial():
             return
         sym = layer.renderer().symbol().symbolLayer(0)
         sym.setBrushStyle(Qt.BrushStyle.NoBrush)
@@ -19,19 +19,15 @@ __copyright__ = "(L) 2024, Thang Quach"
 from qgis.core import (
     QgsApplication,
     QgsProject,
-    QgsFeatureSink,  # type: ignore
     QgsProcessingLayerPostProcessorInterface,
     QgsProcessingParameterExtent,
     QgsProcessingParameterNumber,
     QgsProcessingException,
     QgsProcessingParameterFeatureSink,
+    QgsProcessingParameterEnum,
     QgsProcessingParameterBoolean,
     QgsProcessingAlgorithm,
     QgsFields,
-    QgsField,
-    QgsFeature,
-    QgsGeometry,
-    QgsWkbTypes,
     QgsCoordinateReferenceSystem,
     QgsVectorLayer,
     QgsPalLayerSettings,
@@ -40,7 +36,6 @@ from qgis.core import (
 from qgis.PyQt.QtGui import QIcon, QColor
 from qgis.PyQt.QtCore import QCoreApplication, Qt
 from qgis.utils import iface
-from qgis.PyQt.QtCore import QVariant
 from qgis.core import QgsCoordinateTransform
 import os
 
@@ -48,7 +43,14 @@ import h3
 
 from ...utils.help_footer import social_links_footer
 from shapely.geometry import box
-from vgrid.utils.geometry import geodesic_dggs_metrics
+from ...utils.conversion.cell_batch import (
+    OUTPUT_FULL,
+    OUTPUT_MODES,
+    CellBatch,
+    cell_fields,
+    output_metric_fields,
+    output_wkb_type,
+)
 from ...settings import settings
 from ...utils.latlon import epsg4326
 from vgrid.utils.io import validate_coordinate
@@ -61,6 +63,7 @@ class H3Gen(QgsProcessingAlgorithm):
     RESOLUTION = "RESOLUTION"
     SPLIT_ANTIMERIDIAN = "SPLIT_ANTIMERIDIAN"
     SHIFT_ANTIMERIDIAN = "SHIFT_ANTIMERIDIAN"
+    OUTPUT_MODE = "OUTPUT_MODE"
     OUTPUT = "OUTPUT"
 
     LOC = QgsApplication.locale()[:2]
@@ -162,10 +165,19 @@ class H3Gen(QgsProcessingAlgorithm):
         )
         self.addParameter(param)
 
+        param = QgsProcessingParameterEnum(
+            self.OUTPUT_MODE,
+            self.tr("Output"),
+            options=OUTPUT_MODES,
+            defaultValue=OUTPUT_FULL,
+        )
+        self.addParameter(param)
+
         param = QgsProcessingParameterFeatureSink(self.OUTPUT, "H3")
         self.addParameter(param)
 
     def prepareAlgorithm(self, parameters, context, feedback):
+        self.output_mode = self.parameterAsEnum(parameters, self.OUTPUT_MODE, context)
         self.resolution = self.parameterAsInt(parameters, self.RESOLUTION, context)
         self.canvas_extent = self.parameterAsExtent(parameters, self.EXTENT, context)
         self.split_antimeridian = self.parameterAsBoolean(
@@ -185,15 +197,9 @@ class H3Gen(QgsProcessingAlgorithm):
         return True
 
     def outputFields(self):
-        output_fields = QgsFields()
-        output_fields.append(QgsField("h3", QVariant.String))
-        output_fields.append(QgsField("resolution", QVariant.Int))
-        output_fields.append(QgsField("center_lat", QVariant.Double))
-        output_fields.append(QgsField("center_lon", QVariant.Double))
-        output_fields.append(QgsField("avg_edge_len", QVariant.Double))
-        output_fields.append(QgsField("cell_area", QVariant.Double))
-        output_fields.append(QgsField("cell_perimeter", QVariant.Double))
-        return output_fields
+        return cell_fields(
+            QgsFields(), "h3", output_metric_fields(False, self.output_mode)
+        )
 
     def processAlgorithm(self, parameters, context, feedback):
         fields = self.outputFields()
@@ -203,7 +209,7 @@ class H3Gen(QgsProcessingAlgorithm):
             self.OUTPUT,
             context,
             fields,
-            QgsWkbTypes.Polygon,
+            output_wkb_type(self.output_mode),
             QgsCoordinateReferenceSystem("EPSG:4326"),
         )
 
@@ -241,6 +247,7 @@ class H3Gen(QgsProcessingAlgorithm):
             )
             extent_bbox = box(min_lon, min_lat, max_lon, max_lat)
 
+        batch = CellBatch(None, "h3", mode=self.output_mode)
         if extent_bbox:
             feedback.pushInfo(f"Generating cells within extent: {extent_bbox}.")
             bbox_cells = h3.geo_to_cells(extent_bbox, self.resolution)
@@ -259,30 +266,11 @@ class H3Gen(QgsProcessingAlgorithm):
                     cell_polygon = h32geo(bbox_cell, fix_antimeridian="split")
                 else:
                     cell_polygon = h32geo(bbox_cell)
-                cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-                # if not cell_geometry.intersects(QgsGeometry.fromRect(self.canvas_extent)):
-                #     continue
-                h3_feature = QgsFeature()
-                h3_feature.setGeometry(cell_geometry)
-
                 num_edges = 6
                 if h3.is_pentagon(bbox_cell):
                     num_edges = 5
-                center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-                    geodesic_dggs_metrics(cell_polygon, num_edges)
-                )
-                h3_feature.setAttributes(
-                    [
-                        bbox_cell,
-                        self.resolution,
-                        center_lat,
-                        center_lon,
-                        avg_edge_len,
-                        cell_area,
-                        cell_perimeter,
-                    ]
-                )
-                sink.addFeature(h3_feature, QgsFeatureSink.FastInsert)
+                batch.add(bbox_cell, cell_polygon, self.resolution, num_edges)
+                batch.flush(sink, feedback)
 
         else:
             base_cells = h3.get_res0_cells()
@@ -305,30 +293,13 @@ class H3Gen(QgsProcessingAlgorithm):
                         cell_polygon = h32geo(child_cell, fix_antimeridian="split")
                     else:
                         cell_polygon = h32geo(child_cell)
-                    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-                    h3_feature = QgsFeature()
-                    h3_feature.setGeometry(cell_geometry)
-
                     num_edges = 6
                     if h3.is_pentagon(child_cell):
                         num_edges = 5
+                    batch.add(child_cell, cell_polygon, self.resolution, num_edges)
+                    batch.flush(sink, feedback)
 
-                    center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-                        geodesic_dggs_metrics(cell_polygon, num_edges)
-                    )
-                    h3_feature.setAttributes(
-                        [
-                            child_cell,
-                            self.resolution,
-                            center_lat,
-                            center_lon,
-                            avg_edge_len,
-                            cell_area,
-                            cell_perimeter,
-                        ]
-                    )
-                    sink.addFeature(h3_feature, QgsFeatureSink.FastInsert)
-
+        batch.flush(sink, feedback, 0)
         feedback.pushInfo("H3 DGGS generation completed.")
 
         if context.willLoadLayerOnCompletion(dest_id):
@@ -352,7 +323,7 @@ class StylePostProcessor(QgsProcessingLayerPostProcessorInterface):
         super().__init__()
 
     def postProcessLayer(self, layer, context, feedback):
-        if not isinstance(layer, QgsVectorLayer):
+        if not isinstance(layer, QgsVectorLayer) or not layer.isSpatial():
             return
         sym = layer.renderer().symbol().symbolLayer(0)
         sym.setBrushStyle(Qt.BrushStyle.NoBrush)
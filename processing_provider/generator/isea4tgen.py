@@ -20,18 +20,14 @@ from qgis.core import (
     QgsApplication,
     QgsProject,
     QgsCoordinateTransform,
-    QgsFeatureSink,
     QgsProcessingLayerPostProcessorInterface,
     QgsProcessingParameterExtent,
     QgsProcessingParameterNumber,
     QgsProcessingParameterFeatureSink,
+    QgsProcessingParameterEnum,
     QgsProcessingParameterBoolean,
     QgsProcessingAlgorithm,
     QgsFields,
-    QgsField,
-    QgsFeature,
-    QgsGeometry,
-    QgsWkbTypes,
     QgsCoordinateReferenceSystem,
     QgsVectorLayer,
     QgsPalLayerSettings,
@@ -40,7 +36,6 @@ from qgis.core import (
 from qgis.PyQt.QtGui import QIcon, QColor
 from qgis.PyQt.QtCore import QCoreApplication, Qt
 from qgis.utils import iface
-from qgis.PyQt.QtCore import QVariant
 import os
 import platform
 
@@ -59,10 +54,17 @@ if platform.system() == "Windows":
     isea4t_dggs = Eaggr(Model.ISEA4T)
 
 from ...utils.help_footer import social_links_footer
+from ...utils.conversion.cell_batch import (
+    OUTPUT_FULL,
+    OUTPUT_MODES,
+    CellBatch,
+    cell_fields,
+    output_metric_fields,
+    output_wkb_type,
+)
 from shapely.geometry import box
 from ...settings import settings
 from vgrid.utils.constants import ISEA4T_RES_ACCURACY_DICT
-from vgrid.utils.geometry import geodesic_dggs_metrics
 from vgrid.utils.io import validate_coordinate
 from ...utils.latlon import epsg4326
 
@@ -72,6 +74,7 @@ class ISEA4TGen(QgsProcessingAlgorithm):
     RESOLUTION = "RESOLUTION"
     SHIFT_ANTIMERIDIAN = "SHIFT_ANTIMERIDIAN"
     SPLIT_ANTIMERIDIAN = "SPLIT_ANTIMERIDIAN"
+    OUTPUT_MODE = "OUTPUT_MODE"
     OUTPUT = "OUTPUT"
 
     LOC = QgsApplication.locale()[:2]
@@ -171,10 +174,19 @@ class ISEA4TGen(QgsProcessingAlgorithm):
         )
         self.addParameter(param)
 
+        param = QgsProcessingParameterEnum(
+            self.OUTPUT_MODE,
+            self.tr("Output"),
+            options=OUTPUT_MODES,
+            defaultValue=OUTPUT_FULL,
+        )
+        self.addParameter(param)
+
         param = QgsProcessingParameterFeatureSink(self.OUTPUT, "ISEA4T")
         self.addParameter(param)
 
     def prepareAlgorithm(self, parameters, context, feedback):
+        self.output_mode = self.parameterAsEnum(parameters, self.OUTPUT_MODE, context)
         self.resolution = self.parameterAsInt(parameters, self.RESOLUTION, context)
         # Get the extent parameter
         self.canvas_extent = self.parameterAsExtent(parameters, self.EXTENT, context)
@@ -195,15 +207,9 @@ class ISEA4TGen(QgsProcessingAlgorithm):
         return True
 
     def outputFields(self):
-        output_fields = QgsFields()
-        output_fields.append(QgsField("isea4t", QVariant.String))
-        output_fields.append(QgsField("resolution", QVariant.Int))
-        output_fields.append(QgsField("center_lat", QVariant.Double))
-        output_fields.append(QgsField("center_lon", QVariant.Double))
-        output_fields.append(QgsField("avg_edge_len", QVariant.Double))
-        output_fields.append(QgsField("cell_area", QVariant.Double))
-        output_fields.append(QgsField("cell_perimeter", QVariant.Double))
-        return output_fields
+        return cell_fields(
+            QgsFields(), "isea4t", output_metric_fields(False, self.output_mode)
+        )
 
     def processAlgorithm(self, parameters, context, feedback):
         fields = self.outputFields()
@@ -213,10 +219,12 @@ class ISEA4TGen(QgsProcessingAlgorithm):
             self.OUTPUT,
             context,
             fields,
-            QgsWkbTypes.Polygon,
+            output_wkb_type(self.output_mode),
             QgsCoordinateReferenceSystem("EPSG:4326"),
         )
 
+        batch = CellBatch(None, "isea4t", mode=self.output_mode)
+
         canvas_crs = QgsProject.instance().crs()
 
         if self.canvas_extent is None or self.canvas_extent.isEmpty():
@@ -282,26 +290,10 @@ class ISEA4TGen(QgsProcessingAlgorithm):
                         cell_polygon = isea4t2geo(isea4t_id, fix_antimeridian="split")
                     else:
                         cell_polygon = isea4t2geo(isea4t_id)
-                    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-                    isea4t_feature = QgsFeature()
-                    isea4t_feature.setGeometry(cell_geometry)
 
                     num_edges = 3
-                    center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-                        geodesic_dggs_metrics(cell_polygon, num_edges)
-                    )
-                    isea4t_feature.setAttributes(
-                        [
-                            isea4t_id,
-                            self.resolution,
-                            center_lat,
-                            center_lon,
-                            avg_edge_len,
-                            cell_area,
-                            cell_perimeter,
-                        ]
-                    )
-                    sink.addFeature(isea4t_feature, QgsFeatureSink.FastInsert)
+                    batch.add(isea4t_id, cell_polygon, self.resolution, num_edges)
+                    batch.flush(sink, feedback)
 
                     if feedback.isCanceled():
                         break
@@ -325,30 +317,15 @@ class ISEA4TGen(QgsProcessingAlgorithm):
                         cell_polygon = isea4t2geo(isea4t_id, fix_antimeridian="split")
                     else:
                         cell_polygon = isea4t2geo(isea4t_id)
-                    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-                    isea4t_feature = QgsFeature()
-                    isea4t_feature.setGeometry(cell_geometry)
 
                     num_edges = 3
-                    center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-                        geodesic_dggs_metrics(cell_polygon, num_edges)
-                    )
-                    isea4t_feature.setAttributes(
-                        [
-                            isea4t_id,
-                            self.resolution,
-                            center_lat,
-                            center_lon,
-                            avg_edge_len,
-                            cell_area,
-                            cell_perimeter,
-                        ]
-                    )
-                    sink.addFeature(isea4t_feature, QgsFeatureSink.FastInsert)
+                    batch.add(isea4t_id, cell_polygon, self.resolution, num_edges)
+                    batch.flush(sink, feedback)
 
                     if feedback.isCanceled():
                         break
 
+            batch.flush(sink, feedback, 0)
             feedback.pushInfo("ISEA4T DGGS generation completed.")
             if context.willLoadLayerOnCompletion(dest_id):
                 lineColor = settings.isea4tColor
@@ -373,7 +350,7 @@ class StylePostProcessor(QgsProcessingLayerPostProcessorInterface):
         super().__init__()
 
     def postProcessLayer(self, layer, context, feedback):
-        if not isinstance(layer, QgsVectorLayer):
+        if not isinstance(layer, QgsVectorLayer) or not layer.isSpatial():
             return
         sym = layer.renderer().symbol().symbolLayer(0)
         sym.setBrushStyle(Qt.BrushStyle.NoBrush)
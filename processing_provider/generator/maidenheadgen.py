@@ -20,18 +20,14 @@ from qgis.core import (
     QgsApplication,
     QgsProject,
     QgsCoordinateTransform,
-    QgsFeatureSink,
     QgsProcessingLayerPostProcessorInterface,
     QgsProcessingParameterExtent,
     QgsProcessingParameterNumber,
     QgsProcessingException,
     QgsProcessingParameterFeatureSink,
+    QgsProcessingParameterEnum,
     QgsProcessingAlgorithm,
     QgsFields,
-    QgsField,
-    QgsFeature,
-    QgsGeometry,
-    QgsWkbTypes,
     QgsCoordinateReferenceSystem,
     QgsVectorLayer,
     QgsPalLayerSettings,
@@ -40,15 +36,21 @@ from qgis.core import (
 from qgis.PyQt.QtGui import QIcon, QColor
 from qgis.PyQt.QtCore import QCoreApplication, Qt
 from qgis.utils import iface
-from qgis.PyQt.QtCore import QVariant
 import os
 
 from vgrid.dggs import maidenhead
 from ...utils.help_footer import social_links_footer
+from ...utils.conversion.cell_batch import (
+    OUTPUT_FULL,
+    OUTPUT_MODES,
+    CellBatch,
+    cell_fields,
+    output_metric_fields,
+    output_wkb_type,
+)
 from shapely.geometry import Polygon
 from vgrid.utils.io import validate_coordinate
 from ...utils.latlon import epsg4326
-from vgrid.utils.geometry import graticule_dggs_metrics
 from ...settings import settings
 
 grid_params = {
@@ -62,6 +64,7 @@ grid_params = {
 class MaidenheadGen(QgsProcessingAlgorithm):
     EXTENT = "EXTENT"
     RESOLUTION = "RESOLUTION"
+    OUTPUT_MODE = "OUTPUT_MODE"
     OUTPUT = "OUTPUT"
 
     LOC = QgsApplication.locale()[:2]
@@ -147,10 +150,19 @@ class MaidenheadGen(QgsProcessingAlgorithm):
         )
         self.addParameter(param)
 
+        param = QgsProcessingParameterEnum(
+            self.OUTPUT_MODE,
+            self.tr("Output"),
+            options=OUTPUT_MODES,
+            defaultValue=OUTPUT_FULL,
+        )
+        self.addParameter(param)
+
         param = QgsProcessingParameterFeatureSink(self.OUTPUT, "Maidenhead")
         self.addParameter(param)
 
     def prepareAlgorithm(self, parameters, context, feedback):
+        self.output_mode = self.parameterAsEnum(parameters, self.OUTPUT_MODE, context)
         self.resolution = self.parameterAsInt(parameters, self.RESOLUTION, context)
         # Get the extent parameter
         self.canvas_extent = self.parameterAsExtent(parameters, self.EXTENT, context)
@@ -165,16 +177,9 @@ class MaidenheadGen(QgsProcessingAlgorithm):
         return True
 
     def outputFields(self):
-        output_fields = QgsFields()
-        output_fields.append(QgsField("maidenhead", QVariant.String))
-        output_fields.append(QgsField("resolution", QVariant.Int))
-        output_fields.append(QgsField("center_lat", QVariant.Double))
-        output_fields.append(QgsField("center_lon", QVariant.Double))
-        output_fields.append(QgsField("cell_width", QVariant.Double))
-        output_fields.append(QgsField("cell_height", QVariant.Double))
-        output_fields.append(QgsField("cell_area", QVariant.Double))
-        output_fields.append(QgsField("cell_perimeter", QVariant.Double))
-        return output_fields
+        return cell_fields(
+            QgsFields(), "maidenhead", output_metric_fields(True, self.output_mode)
+        )
 
     def processAlgorithm(self, parameters, context, feedback):
         fields = self.outputFields()
@@ -184,13 +189,15 @@ class MaidenheadGen(QgsProcessingAlgorithm):
             self.OUTPUT,
             context,
             fields,
-            QgsWkbTypes.Polygon,
+            output_wkb_type(self.output_mode),
             QgsCoordinateReferenceSystem("EPSG:4326"),
         )
 
         if sink is None:
             raise QgsProcessingException("Failed to create output sink")
 
+        batch = CellBatch(None, "maidenhead", graticule=True, mode=self.output_mode)
+
         canvas_crs = QgsProject.instance().crs()
 
         x_cells, y_cells, lon_width, lat_width = grid_params[self.resolution]
@@ -236,32 +243,8 @@ class MaidenheadGen(QgsProcessingAlgorithm):
                         ]
                     )
 
-                    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-                    maidenhead_feature = QgsFeature()
-                    maidenhead_feature.setGeometry(cell_geometry)
-
-                    (
-                        center_lat,
-                        center_lon,
-                        cell_width,
-                        cell_height,
-                        cell_area,
-                        cell_perimeter,
-                    ) = graticule_dggs_metrics(cell_polygon)
-                    maidenhead_feature.setAttributes(
-                        [
-                            maidenhead_id,
-                            self.resolution,
-                            center_lat,
-                            center_lon,
-                            cell_width,
-                            cell_height,
-                            cell_area,
-                            cell_perimeter,
-                        ]
-                    )
-
-                    sink.addFeature(maidenhead_feature, QgsFeatureSink.FastInsert)
+                    batch.add(maidenhead_id, cell_polygon, self.resolution)
+                    batch.flush(sink, feedback)
 
                     # Update progress and feedback message
                     cell_count += 1
@@ -342,32 +325,8 @@ class MaidenheadGen(QgsProcessingAlgorithm):
                         ]
                     )
 
-                    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-                    maidenhead_feature = QgsFeature()
-                    maidenhead_feature.setGeometry(cell_geometry)
-
-                    (
-                        center_lat,
-                        center_lon,
-                        cell_width,
-                        cell_height,
-                        cell_area,
-                        cell_perimeter,
-                    ) = graticule_dggs_metrics(cell_polygon)
-                    maidenhead_feature.setAttributes(
-                        [
-                            maidenhead_id,
-                            self.resolution,
-                            center_lat,
-                            center_lon,
-                            cell_width,
-                            cell_height,
-                            cell_area,
-                            cell_perimeter,
-                        ]
-                    )
-
-                    sink.addFeature(maidenhead_feature, QgsFeatureSink.FastInsert)
+                    batch.add(maidenhead_id, cell_polygon, self.resolution)
+                    batch.flush(sink, feedback)
 
                     # Update progress and feedback message
                     cell_count += 1
@@ -376,6 +335,7 @@ class MaidenheadGen(QgsProcessingAlgorithm):
                     if feedback.isCanceled():
                         break
 
+        batch.flush(sink, feedback, 0)
         feedback.pushInfo("Maidenhead DGGS generation completed.")
         if context.willLoadLayerOnCompletion(dest_id):
             lineColor = settings.maidenheadColor
@@ -398,7 +358,7 @@ class StylePostProcessor(QgsProcessingLayerPostProcessorInterface):
         super().__init__()
 
     def postProcessLayer(self, layer, context, feedback):
-        if not isinstance(layer, QgsVectorLayer):
+        if not isinstance(layer, QgsVectorLayer) or not layer.isSpatial():
             return
         sym = layer.renderer().symbol().symbolLayer(0)
         sym.setBrushStyle(Qt.BrushStyle.NoBrush)
@@ -18,18 +18,15 @@ __copyright__ = "(L) 2024, Thang Quach"
 
 from qgis.core import (
     QgsApplication,
-    QgsFeatureSink,
     QgsProcessingLayerPostProcessorInterface,
     QgsProcessingParameterString,
     QgsProcessingParameterNumber,
     QgsProcessingParameterFeatureSink,
+    QgsProcessingParameterEnum,
     QgsProcessingAlgorithm,
     QgsProcessingException,
     QgsFields,
-    QgsField,
-    QgsFeature,
     QgsGeometry,
-    QgsWkbTypes,
     QgsCoordinateReferenceSystem,
     QgsVectorLayer,
     QgsPalLayerSettings,
@@ -41,7 +38,6 @@ from qgis.core import (
 from qgis.PyQt.QtGui import QIcon, QColor
 from qgis.PyQt.QtCore import QCoreApplication, Qt
 from qgis.utils import iface
-from qgis.PyQt.QtCore import QVariant
 import os
 from vgrid.dggs import mgrs
 from ...utils.help_footer import social_links_footer
@@ -51,12 +47,20 @@ import json
 from shapely.geometry import shape, Polygon
 from shapely.wkt import loads
 import numpy as np
-from vgrid.utils.geometry import graticule_dggs_metrics
+from ...utils.conversion.cell_batch import (
+    OUTPUT_FULL,
+    OUTPUT_MODES,
+    CellBatch,
+    cell_fields,
+    output_metric_fields,
+    output_wkb_type,
+)
 
 
 class MGRSGen(QgsProcessingAlgorithm):
     GZD = "GZD"
     RESOLUTION = "RESOLUTION"
+    OUTPUT_MODE = "OUTPUT_MODE"
     OUTPUT = "OUTPUT"
 
     LOC = QgsApplication.locale()[:2]
@@ -143,10 +147,19 @@ class MGRSGen(QgsProcessingAlgorithm):
         )
         self.addParameter(param)
 
+        param = QgsProcessingParameterEnum(
+            self.OUTPUT_MODE,
+            self.tr("Output"),
+            options=OUTPUT_MODES,
+            defaultValue=OUTPUT_FULL,
+        )
+        self.addParameter(param)
+
         param = QgsProcessingParameterFeatureSink(self.OUTPUT, "MGRS")
         self.addParameter(param)
 
     def prepareAlgorithm(self, parameters, context, feedback):
+        self.output_mode = self.parameterAsEnum(parameters, self.OUTPUT_MODE, context)
         self.resolution = self.parameterAsInt(parameters, self.RESOLUTION, context)
         self.gzd = self.parameterAsString(parameters, self.GZD, context).upper()
         if self.resolution > 2:
@@ -162,15 +175,9 @@ class MGRSGen(QgsProcessingAlgorithm):
         return True
 
     def outputFields(self):
-        output_fields = QgsFields()
-        output_fields.append(QgsField("mgrs", QVariant.String))
-        output_fields.append(QgsField("resolution", QVariant.Int))
-        output_fields.append(QgsField("center_lat", QVariant.Double))
-        output_fields.append(QgsField("center_lon", QVariant.Double))
-        output_fields.append(QgsField("avg_edge_len", QVariant.Double))
-        output_fields.append(QgsField("cell_area", QVariant.Double))
-        output_fields.append(QgsField("cell_perimeter", QVariant.Double))
-        return output_fields
+        return cell_fields(
+            QgsFields(), "mgrs", output_metric_fields(True, self.output_mode)
+        )
 
     def processAlgorithm(self, parameters, context, feedback):
         fields = self.outputFields()
@@ -180,13 +187,15 @@ class MGRSGen(QgsProcessingAlgorithm):
             self.OUTPUT,
             context,
             fields,
-            QgsWkbTypes.Polygon,
+            output_wkb_type(self.output_mode),
             QgsCoordinateReferenceSystem("EPSG:4326"),
         )
 
         if not sink:
             raise QgsProcessingException(self.invalidSinkError(parameters, self.OUTPUT))
 
+        batch = CellBatch(None, "mgrs", graticule=True, mode=self.output_mode)
+
         cell_size = 100_000 // (10**self.resolution)
         north_bands = "NPQRSTUVWX"
         south_bands = "MLKJHGFEDC"
@@ -255,30 +264,6 @@ class MGRSGen(QgsProcessingAlgorithm):
                         cell_polygon.centroid.x,
                     )
                     mgrs_id = mgrs.toMgrs(centroid_lat, centroid_lon, self.resolution)
-                    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-
-                    mgrs_feature = QgsFeature()
-                    mgrs_feature.setGeometry(cell_geometry)
-                    (
-                        center_lat,
-                        center_lon,
-                        cell_width,
-                        cell_height,
-                        cell_area,
-                        cell_perimeter,
-                    ) = graticule_dggs_metrics(cell_polygon)
-                    mgrs_feature.setAttributes(
-                        [
-                            mgrs_id,
-                            self.resolution,
-                            center_lat,
-                            center_lon,
-                            cell_width,
-                            cell_height,
-                            cell_area,
-                            cell_perimeter,
-                        ]
-                    )
                     if not gzd_geom.contains(cell_polygon):
                         intersected_polygon = cell_polygon.intersection(gzd_geom)
                         if intersected_polygon:
@@ -286,39 +271,20 @@ class MGRSGen(QgsProcessingAlgorithm):
                                 intersected_polygon.centroid.y,
                                 intersected_polygon.centroid.x,
                             )
-                            interescted_mgrs_id = mgrs.toMgrs(
+                            mgrs_id = mgrs.toMgrs(
                                 intersected_centroid_lat,
                                 intersected_centroid_lon,
                                 self.resolution,
                             )
-                            (
-                                center_lat,
-                                center_lon,
-                                cell_width,
-                                cell_height,
-                                cell_area,
-                                cell_perimeter,
-                            ) = graticule_dggs_metrics(intersected_polygon)
-                            cell_geometry = QgsGeometry.fromWkt(intersected_polygon.wkt)
-                            mgrs_feature.setGeometry(cell_geometry)
-                            mgrs_feature.setAttributes(
-                                [
-                                    interescted_mgrs_id,
-                                    self.resolution,
-                                    center_lat,
-                                    center_lon,
-                                    cell_width,
-                                    cell_height,
-                                    cell_area,
-                                    cell_perimeter,
-                                ]
-                            )
+                            cell_polygon = intersected_polygon
 
-                    sink.addFeature(mgrs_feature, QgsFeatureSink.FastInsert)
+                    batch.add(mgrs_id, cell_polygon, self.resolution)
+                    batch.flush(sink, feedback)
 
                 if feedback.isCanceled():
                     break
 
+        batch.flush(sink, feedback, 0)
         feedback.pushInfo("MGRS DGGS generation completed.")
         # Apply styling (optional)
         if context.willLoadLayerOnCompletion(dest_id):
@@ -342,7 +308,7 @@ class StylePostProcessor(QgsProcessingLayerPostProcessorInterface):
         super().__init__()
 
     def postProcessLayer(self, layer, context, feedback):
-        if not isinstance(layer, QgsVectorLayer):
+        if not isinstance(layer, QgsVectorLayer) or not layer.isSpatial():
             return
         sym = layer.renderer().symbol().symbolLayer(0)
         sym.setBrushStyle(Qt.BrushStyle.NoBrush)
@@ -19,18 +19,14 @@ from qgis.core import (
     QgsApplication,
     QgsProject,
     QgsCoordinateTransform,
-    QgsFeatureSink,
     QgsProcessingLayerPostProcessorInterface,
     QgsProcessingParameterExtent,
     QgsProcessingParameterNumber,
     QgsProcessingException,
     QgsProcessingParameterFeatureSink,
+    QgsProcessingParameterEnum,
     QgsProcessingAlgorithm,
     QgsFields,
-    QgsField,
-    QgsFeature,
-    QgsGeometry,
-    QgsWkbTypes,
     QgsCoordinateReferenceSystem,
     QgsVectorLayer,
     QgsPalLayerSettings,
@@ -40,12 +36,18 @@ from qgis.core import (
 from qgis.PyQt.QtGui import QIcon, QColor
 from qgis.PyQt.QtCore import QCoreApplication, Qt
 from qgis.utils import iface
-from qgis.PyQt.QtCore import QVariant
 import os
 
 from vgrid.dggs import olc
 from vgrid.generator.olcgrid import olc_grid, olc_refine_cell
-from vgrid.utils.geometry import graticule_dggs_metrics
+from ...utils.conversion.cell_batch import (
+    OUTPUT_FULL,
+    OUTPUT_MODES,
+    CellBatch,
+    cell_fields,
+    output_metric_fields,
+    output_wkb_type,
+)
 
 from ...utils.help_footer import social_links_footer
 from ...settings import settings
@@ -57,6 +59,7 @@ from ...utils.latlon import epsg4326
 class OLCGen(QgsProcessingAlgorithm):
     EXTENT = "EXTENT"
     RESOLUTION = "RESOLUTION"
+    OUTPUT_MODE = "OUTPUT_MODE"
     OUTPUT = "OUTPUT"
 
     LOC = QgsApplication.locale()[:2]
@@ -142,10 +145,19 @@ class OLCGen(QgsProcessingAlgorithm):
         )
         self.addParameter(param)
 
+        param = QgsProcessingParameterEnum(
+            self.OUTPUT_MODE,
+            self.tr("Output"),
+            options=OUTPUT_MODES,
+            defaultValue=OUTPUT_FULL,
+        )
+        self.addParameter(param)
+
         param = QgsProcessingParameterFeatureSink(self.OUTPUT, "OLC")
         self.addParameter(param)
 
     def prepareAlgorithm(self, parameters, context, feedback):
+        self.output_mode = self.parameterAsEnum(parameters, self.OUTPUT_MODE, context)
         self.resolution = self.parameterAsInt(parameters, self.RESOLUTION, context)
 
         if self.resolution not in [2, 4, 6, 8, 10, 11, 12, 13, 14, 15]:
@@ -174,16 +186,9 @@ class OLCGen(QgsProcessingAlgorithm):
         return True
 
     def outputFields(self):
-        output_fields = QgsFields()
-        output_fields.append(QgsField("olc", QVariant.String))
-        output_fields.append(QgsField("resolution", QVariant.Int))
-        output_fields.append(QgsField("center_lat", QVariant.Double))
-        output_fields.append(QgsField("center_lon", QVariant.Double))
-        output_fields.append(QgsField("cell_width", QVariant.Double))
-        output_fields.append(QgsField("cell_height", QVariant.Double))
-        output_fields.append(QgsField("cell_area", QVariant.Double))
-        output_fields.append(QgsField("cell_perimeter", QVariant.Double))
-        return output_fields
+        return cell_fields(
+            QgsFields(), "olc", output_metric_fields(True, self.output_mode)
+        )
 
     def processAlgorithm(self, parameters, context, feedback):
         fields = self.outputFields()
@@ -193,13 +198,15 @@ class OLCGen(QgsProcessingAlgorithm):
             self.OUTPUT,
             context,
             fields,
-            QgsWkbTypes.Polygon,
+            output_wkb_type(self.output_mode),
             QgsCoordinateReferenceSystem("EPSG:4326"),
         )
 
         if not sink:
             raise QgsProcessingException(self.invalidSinkError(parameters, self.OUTPUT))
 
+        batch = CellBatch(None, "olc", graticule=True, mode=self.output_mode)
+
         canvas_crs = QgsProject.instance().crs()
 
         if self.canvas_extent is None or self.canvas_extent.isEmpty():
@@ -241,33 +248,8 @@ class OLCGen(QgsProcessingAlgorithm):
                         ]
                     )
 
-                    # Create QgsFeature directly
-                    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-                    olc_feature = QgsFeature()
-                    olc_feature.setGeometry(cell_geometry)
-
-                    (
-                        center_lat,
-                        center_lon,
-                        cell_width,
-                        cell_height,
-                        cell_area,
-                        cell_perimeter,
-                    ) = graticule_dggs_metrics(cell_polygon)
-
-                    olc_feature.setAttributes(
-                        [
-                            olc_id,
-                            self.resolution,
-                            center_lat,
-                            center_lon,
-                            cell_width,
-                            cell_height,
-                            cell_area,
-                            cell_perimeter,
-                        ]
-                    )
-                    sink.addFeature(olc_feature, QgsFeatureSink.FastInsert)
+                    batch.add(olc_id, cell_polygon, self.resolution)
+                    batch.flush(sink, feedback)
 
                     lng += lng_step
                     current_step += 1
@@ -371,32 +353,11 @@ class OLCGen(QgsProcessingAlgorithm):
 
                 cell_polygon = record["geometry"]
                 olc_id = record["olc"]
-                cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-
-                olc_feature = QgsFeature()
-                olc_feature.setGeometry(cell_geometry)
-                (
-                    center_lat,
-                    center_lon,
-                    cell_width,
-                    cell_height,
-                    cell_area,
-                    cell_perimeter,
-                ) = graticule_dggs_metrics(cell_polygon)
-                olc_feature.setAttributes(
-                    [
-                        olc_id,
-                        self.resolution,
-                        center_lat,
-                        center_lon,
-                        cell_width,
-                        cell_height,
-                        cell_area,
-                        cell_perimeter,
-                    ]
-                )
-                sink.addFeature(olc_feature, QgsFeatureSink.FastInsert)
 
+                batch.add(olc_id, cell_polygon, self.resolution)
+                batch.flush(sink, feedback)
+
+        batch.flush(sink, feedback, 0)
         feedback.pushInfo("OLC DGGS generation completed.")
         if context.willLoadLayerOnCompletion(dest_id):
             lineColor = settings.olcColor
@@ -419,7 +380,7 @@ class StylePostProcessor(QgsProcessingLayerPostProcessorInterface):
         super().__init__()
 
     def postProcessLayer(self, layer, context, feedback):
-        if not isinstance(layer, QgsVectorLayer):
+        if not isinstance(layer, QgsVectorLayer) or not layer.isSpatial():
             return
         sym = layer.renderer().symbol().symbolLayer(0)
         sym.setBrushStyle(Qt.BrushStyle.NoBrush)
@@ -18,19 +18,15 @@ __copyright__ = "(L) 2024, Thang Quach"
 from qgis.core import (
     QgsApplication,
     QgsProject,
-    QgsFeatureSink,
     QgsCoordinateTransform,
     QgsProcessingLayerPostProcessorInterface,
     QgsProcessingParameterExtent,
     QgsProcessingParameterNumber,
     QgsProcessingException,
     QgsProcessingParameterFeatureSink,
+    QgsProcessingParameterEnum,
     QgsProcessingAlgorithm,
     QgsFields,
-    QgsField,
-    QgsFeature,
-    QgsGeometry,
-    QgsWkbTypes,
     QgsCoordinateReferenceSystem,
     QgsVectorLayer,
     QgsPalLayerSettings,
@@ -39,11 +35,17 @@ from qgis.core import (
 from qgis.PyQt.QtGui import QIcon, QColor
 from qgis.PyQt.QtCore import QCoreApplication, Qt
 from qgis.utils import iface
-from qgis.PyQt.QtCore import QVariant
 import os
 from vgrid.dggs import qtm
 from vgrid.dggs.qtm import QTM_INITIAL_FACETS
-from vgrid.utils.geometry import geodesic_dggs_metrics
+from ...utils.conversion.cell_batch import (
+    OUTPUT_FULL,
+    OUTPUT_MODES,
+    CellBatch,
+    cell_fields,
+    output_metric_fields,
+    output_wkb_type,
+)
 from shapely.geometry import box
 from ...utils.help_footer import social_links_footer
 from ...settings import settings
@@ -54,6 +56,7 @@ from ...utils.latlon import epsg4326
 class QTMGen(QgsProcessingAlgorithm):
     EXTENT = "EXTENT"
     RESOLUTION = "RESOLUTION"
+    OUTPUT_MODE = "OUTPUT_MODE"
     OUTPUT = "OUTPUT"
 
     LOC = QgsApplication.locale()[:2]
@@ -139,10 +142,19 @@ class QTMGen(QgsProcessingAlgorithm):
         )
         self.addParameter(param)
 
+        param = QgsProcessingParameterEnum(
+            self.OUTPUT_MODE,
+            self.tr("Output"),
+            options=OUTPUT_MODES,
+            defaultValue=OUTPUT_FULL,
+        )
+        self.addParameter(param)
+
         param = QgsProcessingParameterFeatureSink(self.OUTPUT, "QTM")
         self.addParameter(param)
 
     def prepareAlgorithm(self, parameters, context, feedback):
+        self.output_mode = self.parameterAsEnum(parameters, self.OUTPUT_MODE, context)
         self.resolution = self.parameterAsInt(parameters, self.RESOLUTION, context)
         # Get the extent parameter
         self.canvas_extent = self.parameterAsExtent(parameters, self.EXTENT, context)
@@ -157,16 +169,9 @@ class QTMGen(QgsProcessingAlgorithm):
         return True
 
     def outputFields(self):
-        output_fields = QgsFields()
-        # Append DGGS fields
-        output_fields.append(QgsField("qtm", QVariant.String))
-        output_fields.append(QgsField("resolution", QVariant.Int))
-        output_fields.append(QgsField("center_lat", QVariant.Double))
-        output_fields.append(QgsField("center_lon", QVariant.Double))
-        output_fields.append(QgsField("avg_edge_len", QVariant.Double))
-        output_fields.append(QgsField("cell_area", QVariant.Double))
-        output_fields.append(QgsField("cell_perimeter", QVariant.Double))
-        return output_fields
+        return cell_fields(
+            QgsFields(), "qtm", output_metric_fields(False, self.output_mode)
+        )
 
     def processAlgorithm(self, parameters, context, feedback):
         fields = self.outputFields()
@@ -176,7 +181,7 @@ class QTMGen(QgsProcessingAlgorithm):
             self.OUTPUT,
             context,
             fields,
-            QgsWkbTypes.Polygon,
+            output_wkb_type(self.output_mode),
             QgsCoordinateReferenceSystem("EPSG:4326"),
         )
 
@@ -217,6 +222,7 @@ class QTMGen(QgsProcessingAlgorithm):
 
         QTMID = {}
         levelFacets = {}
+        batch = CellBatch(None, "qtm", mode=self.output_mode)
         if extent_bbox:
             for lvl in range(self.resolution):
                 levelFacets[lvl] = []
@@ -228,30 +234,8 @@ class QTMGen(QgsProcessingAlgorithm):
                         facet_geom = qtm.constructGeometry(facet)
                         levelFacets[0].append(facet)
                         if facet_geom.intersects(extent_bbox) and self.resolution == 1:
-                            cell_geometry = QgsGeometry.fromWkt(facet_geom.wkt)
-                            qtm_feature = QgsFeature()
-                            qtm_feature.setGeometry(cell_geometry)
-                            qtm_id = QTMID[0][i]
-                            num_edges = 3
-                            (
-                                center_lat,
-                                center_lon,
-                                avg_edge_len,
-                                cell_area,
-                                cell_perimeter,
-                            ) = geodesic_dggs_metrics(facet_geom, num_edges)
-                            qtm_feature.setAttributes(
-                                [
-                                    qtm_id,
-                                    self.resolution,
-                                    center_lat,
-                                    center_lon,
-                                    avg_edge_len,
-                                    cell_area,
-                                    cell_perimeter,
-                                ]
-                            )
-                            sink.addFeature(qtm_feature, QgsFeatureSink.FastInsert)
+                            batch.add(QTMID[0][i], facet_geom, self.resolution, 3)
+                            batch.flush(sink, feedback)
                         if feedback.isCanceled():
                             break
                 else:
@@ -262,38 +246,14 @@ class QTMGen(QgsProcessingAlgorithm):
                             if subfacet_geom.intersects(
                                 extent_bbox
                             ):  # Only keep intersecting facets
-                                cell_geometry = QgsGeometry.fromWkt(subfacet_geom.wkt)
                                 new_id = QTMID[lvl - 1][i] + str(j)
                                 QTMID[lvl].append(new_id)
                                 levelFacets[lvl].append(subfacet)
                                 if (
                                     lvl == self.resolution - 1
                                 ):  # Only store final resolution
-                                    qtm_feature = QgsFeature()
-                                    qtm_feature.setGeometry(cell_geometry)
-                                    qtm_id = new_id
-                                    num_edges = 3
-                                    (
-                                        center_lat,
-                                        center_lon,
-                                        avg_edge_len,
-                                        cell_area,
-                                        cell_perimeter,
-                                    ) = geodesic_dggs_metrics(subfacet_geom, num_edges)
-                                    qtm_feature.setAttributes(
-                                        [
-                                            qtm_id,
-                                            self.resolution,
-                                            center_lat,
-                                            center_lon,
-                                            avg_edge_len,
-                                            cell_area,
-                                            cell_perimeter,
-                                        ]
-                                    )
-                                    sink.addFeature(
-                                        qtm_feature, QgsFeatureSink.FastInsert
-                                    )
+                                    batch.add(new_id, subfacet_geom, self.resolution, 3)
+                                    batch.flush(sink, feedback)
                             if feedback.isCanceled():
                                 break
 
@@ -311,30 +271,8 @@ class QTMGen(QgsProcessingAlgorithm):
                         QTMID[0].append(str(i + 1))
                         levelFacets[0].append(facet)
                         if self.resolution == 1:
-                            qtm_id = QTMID[0][i]
-                            num_edges = 3
-                            (
-                                center_lat,
-                                center_lon,
-                                avg_edge_len,
-                                cell_area,
-                                cell_perimeter,
-                            ) = geodesic_dggs_metrics(facet_geom, num_edges)
-                            cell_geometry = QgsGeometry.fromWkt(facet_geom.wkt)
-                            qtm_feature = QgsFeature()
-                            qtm_feature.setGeometry(cell_geometry)
-                            qtm_feature.setAttributes(
-                                [
-                                    qtm_id,
-                                    self.resolution,
-                                    center_lat,
-                                    center_lon,
-                                    avg_edge_len,
-                                    cell_area,
-                                    cell_perimeter,
-                                ]
-                            )
-                            sink.addFeature(qtm_feature, QgsFeatureSink.FastInsert)
+                            batch.add(QTMID[0][i], facet_geom, self.resolution, 3)
+                            batch.flush(sink, feedback)
                             # Update progress
                             processed_cells += 1
                             feedback.setProgress(
@@ -351,31 +289,8 @@ class QTMGen(QgsProcessingAlgorithm):
                             levelFacets[lvl].append(subfacet)
                             if lvl == self.resolution - 1:
                                 subfacet_geom = qtm.constructGeometry(subfacet)
-                                qtm_id = new_id
-                                num_edges = 3
-                                (
-                                    center_lat,
-                                    center_lon,
-                                    avg_edge_len,
-                                    cell_area,
-                                    cell_perimeter,
-                                ) = geodesic_dggs_metrics(subfacet_geom, num_edges)
-
-                                cell_geometry = QgsGeometry.fromWkt(subfacet_geom.wkt)
-                                qtm_feature = QgsFeature()
-                                qtm_feature.setGeometry(cell_geometry)
-                                qtm_feature.setAttributes(
-                                    [
-                                        qtm_id,
-                                        self.resolution,
-                                        center_lat,
-                                        center_lon,
-                                        avg_edge_len,
-                                        cell_area,
-                                        cell_perimeter,
-                                    ]
-                                )
-                                sink.addFeature(qtm_feature, QgsFeatureSink.FastInsert)
+                                batch.add(new_id, subfacet_geom, self.resolution, 3)
+                                batch.flush(sink, feedback)
                                 # Update progress
                                 processed_cells += 1
                                 feedback.setProgress(
@@ -385,6 +300,7 @@ class QTMGen(QgsProcessingAlgorithm):
                             if feedback.isCanceled():
                                 break
 
+        batch.flush(sink, feedback, 0)
         feedback.pushInfo("QTM DGGS generation completed.")
         if context.willLoadLayerOnCompletion(dest_id):
             lineColor = settings.qtmColor
@@ -407,7 +323,7 @@ class StylePostProcessor(QgsProcessingLayerPostProcessorInterface):
         super().__init__()
 
     def postProcessLayer(self, layer, context, feedback):
-        if not isinstance(layer, QgsVectorLayer):
+        if not isinstance(layer, QgsVectorLayer) or not layer.isSpatial():
             return
         sym = layer.renderer().symbol().symbolLayer(0)
         sym.setBrushStyle(Qt.BrushStyle.NoBrush)
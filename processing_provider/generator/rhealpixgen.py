@@ -20,19 +20,15 @@ from qgis.core import (  # type: ignore
     QgsApplication,
     QgsProject,
     QgsCoordinateTransform,
-    QgsFeatureSink,
     QgsProcessingLayerPostProcessorInterface,
     QgsProcessingParameterExtent,
     QgsProcessingParameterNumber,
     QgsProcessingException,
     QgsProcessingParameterFeatureSink,
+    QgsProcessingParameterEnum,
     QgsProcessingParameterBoolean,
     QgsProcessingAlgorithm,
     QgsFields,
-    QgsField,
-    QgsFeature,
-    QgsGeometry,
-    QgsWkbTypes,
     QgsCoordinateReferenceSystem,
     QgsVectorLayer,
     QgsPalLayerSettings,
@@ -41,17 +37,23 @@ from qgis.core import (  # type: ignore
 from qgis.PyQt.QtGui import QIcon, QColor  # type: ignore
 from qgis.PyQt.QtCore import QCoreApplication, Qt
 from qgis.utils import iface
-from qgis.PyQt.QtCore import QVariant  # type: ignore
 import os
 
 from collections import deque
-from vgrid.utils.geometry import geodesic_dggs_metrics
 from vgrid.dggs.rhealpixdggs.dggs import RHEALPixDGGS
 from ...utils.help_footer import social_links_footer  # type: ignore
 from shapely.geometry import box
 from ...settings import settings  # type: ignore
 from vgrid.utils.io import validate_coordinate
 from ...utils.latlon import epsg4326
+from ...utils.conversion.cell_batch import (
+    OUTPUT_FULL,
+    OUTPUT_MODES,
+    CellBatch,
+    cell_fields,
+    output_metric_fields,
+    output_wkb_type,
+)
 from vgrid.conversion.dggs2geo import rhealpix2geo
 
 rhealpix_dggs = RHEALPixDGGS()  # type: ignore
@@ -62,6 +64,7 @@ class rHEALPixGen(QgsProcessingAlgorithm):
     RESOLUTION = "RESOLUTION"
     SHIFT_ANTIMERIDIAN = "SHIFT_ANTIMERIDIAN"
     SPLIT_ANTIMERIDIAN = "SPLIT_ANTIMERIDIAN"
+    OUTPUT_MODE = "OUTPUT_MODE"
     OUTPUT = "OUTPUT"
 
     LOC = QgsApplication.locale()[:2]
@@ -161,10 +164,19 @@ class rHEALPixGen(QgsProcessingAlgorithm):
         )
         self.addParameter(param)
 
+        param = QgsProcessingParameterEnum(
+            self.OUTPUT_MODE,
+            self.tr("Output"),
+            options=OUTPUT_MODES,
+            defaultValue=OUTPUT_FULL,
+        )
+        self.addParameter(param)
+
         param = QgsProcessingParameterFeatureSink(self.OUTPUT, "rHEALPix")
         self.addParameter(param)
 
     def prepareAlgorithm(self, parameters, context, feedback):
+        self.output_mode = self.parameterAsEnum(parameters, self.OUTPUT_MODE, context)
         self.resolution = self.parameterAsInt(parameters, self.RESOLUTION, context)
         # Get the extent parameter
         self.canvas_extent = self.parameterAsExtent(parameters, self.EXTENT, context)
@@ -185,15 +197,9 @@ class rHEALPixGen(QgsProcessingAlgorithm):
         return True
 
     def outputFields(self):
-        output_fields = QgsFields()
-        output_fields.append(QgsField("rhealpix", QVariant.String))
-        output_fields.append(QgsField("resolution", QVariant.Int))
-        output_fields.append(QgsField("center_lat", QVariant.Double))
-        output_fields.append(QgsField("center_lon", QVariant.Double))
-        output_fields.append(QgsField("avg_edge_len", QVariant.Double))
-        output_fields.append(QgsField("cell_area", QVariant.Double))
-        output_fields.append(QgsField("cell_perimeter", QVariant.Double))
-        return output_fields
+        return cell_fields(
+            QgsFields(), "rhealpix", output_metric_fields(False, self.output_mode)
+        )
 
     def processAlgorithm(self, parameters, context, feedback):
         fields = self.outputFields()
@@ -203,13 +209,15 @@ class rHEALPixGen(QgsProcessingAlgorithm):
             self.OUTPUT,
             context,
             fields,
-            QgsWkbTypes.Polygon,
+            output_wkb_type(self.output_mode),
             QgsCoordinateReferenceSystem("EPSG:4326"),
         )
 
         if not sink:
             raise QgsProcessingException(self.invalidSinkError(parameters, self.OUTPUT))
 
+        batch = CellBatch(None, "rhealpix", mode=self.output_mode)
+
         canvas_crs = QgsProject.instance().crs()
         if self.canvas_extent is None or self.canvas_extent.isEmpty():
             min_lon, min_lat, max_lon, max_lat = -180, -90, 180, 90
@@ -266,26 +274,8 @@ class rHEALPixGen(QgsProcessingAlgorithm):
                 if seed_cell.ellipsoidal_shape() == "dart":
                     num_edges = 3
 
-                seed_cell_geometry = QgsGeometry.fromWkt(seed_cell_polygon.wkt)
-
-                rhealpix_feature = QgsFeature()
-                rhealpix_feature.setGeometry(seed_cell_geometry)
-
-                center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-                    geodesic_dggs_metrics(seed_cell_polygon, num_edges)
-                )
-                rhealpix_feature.setAttributes(
-                    [
-                        seed_cell_id,
-                        self.resolution,
-                        center_lat,
-                        center_lon,
-                        avg_edge_len,
-                        cell_area,
-                        cell_perimeter,
-                    ]
-                )
-                sink.addFeature(rhealpix_feature, QgsFeatureSink.FastInsert)
+                batch.add(seed_cell_id, seed_cell_polygon, self.resolution, num_edges)
+                batch.flush(sink, feedback)
 
             else:
                 # Store intersecting cells with their polygons and cell objects
@@ -346,33 +336,12 @@ class rHEALPixGen(QgsProcessingAlgorithm):
                     progress = int((idx / len(intersecting_cells)) * 100)
                     feedback.setProgress(progress)
 
-                    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-                    rhealpix_feature = QgsFeature()
-                    rhealpix_feature.setGeometry(cell_geometry)
-
                     num_edges = 4
                     if cell.ellipsoidal_shape() == "dart":
                         num_edges = 3
 
-                    (
-                        center_lat,
-                        center_lon,
-                        avg_edge_len,
-                        cell_area,
-                        cell_perimeter,
-                    ) = geodesic_dggs_metrics(cell_polygon, num_edges)
-                    rhealpix_feature.setAttributes(
-                        [
-                            cell_id,
-                            self.resolution,
-                            center_lat,
-                            center_lon,
-                            avg_edge_len,
-                            cell_area,
-                            cell_perimeter,
-                        ]
-                    )
-                    sink.addFeature(rhealpix_feature, QgsFeatureSink.FastInsert)
+                    batch.add(cell_id, cell_polygon, self.resolution, num_edges)
+                    batch.flush(sink, feedback)
 
                     if feedback.isCanceled():
                         break
@@ -396,32 +365,15 @@ class rHEALPixGen(QgsProcessingAlgorithm):
                 else:
                     cell_polygon = rhealpix2geo(rhealpix_id)
 
-                cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-
-                rhealpix_feature = QgsFeature()
-                rhealpix_feature.setGeometry(cell_geometry)
-
                 num_edges = 4
                 if cell.ellipsoidal_shape() == "dart":
                     num_edges = 3
-                center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-                    geodesic_dggs_metrics(cell_polygon, num_edges)
-                )
-                rhealpix_feature.setAttributes(
-                    [
-                        rhealpix_id,
-                        self.resolution,
-                        center_lat,
-                        center_lon,
-                        avg_edge_len,
-                        cell_area,
-                        cell_perimeter,
-                    ]
-                )
-                sink.addFeature(rhealpix_feature, QgsFeatureSink.FastInsert)
+                batch.add(rhealpix_id, cell_polygon, self.resolution, num_edges)
+                batch.flush(sink, feedback)
                 if feedback.isCanceled():
                     break
 
+        batch.flush(sink, feedback, 0)
         feedback.pushInfo("rHEALPix DGGS generation completed.")
         if context.willLoadLayerOnCompletion(dest_id):
             lineColor = settings.rhealpixColor
@@ -444,7 +396,7 @@ class StylePostProcessor(QgsProcessingLayerPostProcessorInterface):
         super().__init__()
 
     def postProcessLayer(self, layer, context, feedback):
-        if not isinstance(layer, QgsVectorLayer):
+        if not isinstance(layer, QgsVectorLayer) or not layer.isSpatial():
             return
         sym = layer.renderer().symbol().symbolLayer(0)
         sym.setBrushStyle(Qt.BrushStyle.NoBrush)
@@ -20,18 +20,14 @@ from qgis.core import (
     QgsApplication,  # type: ignore
     QgsProject,
     QgsCoordinateTransform,
-    QgsFeatureSink,
     QgsProcessingLayerPostProcessorInterface,  # type: ignore
     QgsProcessingParameterExtent,
     QgsProcessingParameterNumber,
     QgsProcessingException,
     QgsProcessingParameterFeatureSink,
+    QgsProcessingParameterEnum,
     QgsProcessingAlgorithm,
     QgsFields,
-    QgsField,
-    QgsFeature,
-    QgsGeometry,
-    QgsWkbTypes,
     QgsCoordinateReferenceSystem,
     QgsVectorLayer,
     QgsPalLayerSettings,
@@ -40,12 +36,18 @@ from qgis.core import (
 from qgis.PyQt.QtGui import QIcon, QColor
 from qgis.PyQt.QtCore import QCoreApplication, Qt
 from qgis.utils import iface
-from qgis.PyQt.QtCore import QVariant
 import os
 from ...utils.help_footer import social_links_footer
+from ...utils.conversion.cell_batch import (
+    OUTPUT_FULL,
+    OUTPUT_MODES,
+    CellBatch,
+    cell_fields,
+    output_metric_fields,
+    output_wkb_type,
+)
 from shapely.geometry import Polygon
 from vgrid.dggs import mercantile
-from vgrid.utils.geometry import graticule_dggs_metrics
 from ...settings import settings
 from vgrid.utils.io import validate_coordinate
 from ...utils.latlon import epsg4326
@@ -54,6 +56,7 @@ from ...utils.latlon import epsg4326
 class TilecodeGen(QgsProcessingAlgorithm):
     EXTENT = "EXTENT"
     RESOLUTION = "RESOLUTION"
+    OUTPUT_MODE = "OUTPUT_MODE"
     OUTPUT = "OUTPUT"
 
     LOC = QgsApplication.locale()[:2]
@@ -139,10 +142,19 @@ class TilecodeGen(QgsProcessingAlgorithm):
         )
         self.addParameter(param)
 
+        param = QgsProcessingParameterEnum(
+            self.OUTPUT_MODE,
+            self.tr("Output"),
+            options=OUTPUT_MODES,
+            defaultValue=OUTPUT_FULL,
+        )
+        self.addParameter(param)
+
         param = QgsProcessingParameterFeatureSink(self.OUTPUT, "Tilecode")
         self.addParameter(param)
 
     def prepareAlgorithm(self, parameters, context, feedback):
+        self.output_mode = self.parameterAsEnum(parameters, self.OUTPUT_MODE, context)
         self.resolution = self.parameterAsInt(parameters, self.RESOLUTION, context)
         # Get the extent parameter
         self.canvas_extent = self.parameterAsExtent(parameters, self.EXTENT, context)
@@ -157,16 +169,9 @@ class TilecodeGen(QgsProcessingAlgorithm):
         return True
 
     def outputFields(self):
-        output_fields = QgsFields()
-        output_fields.append(QgsField("tilecode", QVariant.String))
-        output_fields.append(QgsField("resolution", QVariant.Int))
-        output_fields.append(QgsField("center_lat", QVariant.Double))
-        output_fields.append(QgsField("center_lon", QVariant.Double))
-        output_fields.append(QgsField("cell_width", QVariant.Double))
-        output_fields.append(QgsField("cell_height", QVariant.Double))
-        output_fields.append(QgsField("cell_area", QVariant.Double))
-        output_fields.append(QgsField("cell_perimeter", QVariant.Double))
-        return output_fields
+        return cell_fields(
+            QgsFields(), "tilecode", output_metric_fields(True, self.output_mode)
+        )
 
     def processAlgorithm(self, parameters, context, feedback):
         fields = self.outputFields()
@@ -175,13 +180,15 @@ class TilecodeGen(QgsProcessingAlgorithm):
             self.OUTPUT,
             context,
             fields,
-            QgsWkbTypes.Polygon,
+            output_wkb_type(self.output_mode),
             QgsCoordinateReferenceSystem("EPSG:4326"),
         )
 
         if sink is None:
             raise QgsProcessingException("Failed to create output sink")
 
+        batch = CellBatch(None, "tilecode", graticule=True, mode=self.output_mode)
+
         canvas_crs = QgsProject.instance().crs()
         if self.canvas_extent is None or self.canvas_extent.isEmpty():
             # min_lon, min_lat, max_lon, max_lat =  -180.0, -85.05112878, 180.0, 85.05112878
@@ -240,33 +247,12 @@ class TilecodeGen(QgsProcessingAlgorithm):
                     (bounds.west, bounds.south),  # Closing the polygon
                 ]
             )
-            cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-            tilecode_feature = QgsFeature()
-            tilecode_feature.setGeometry(cell_geometry)
 
             tilecode_id = f"z{tile.z}x{tile.x}y{tile.y}"
-            (
-                center_lat,
-                center_lon,
-                cell_width,
-                cell_height,
-                cell_area,
-                cell_perimeter,
-            ) = graticule_dggs_metrics(cell_polygon)
-            tilecode_feature.setAttributes(
-                [
-                    tilecode_id,
-                    self.resolution,
-                    center_lat,
-                    center_lon,
-                    cell_width,
-                    cell_height,
-                    cell_area,
-                    cell_perimeter,
-                ]
-            )
-            sink.addFeature(tilecode_feature, QgsFeatureSink.FastInsert)
+            batch.add(tilecode_id, cell_polygon, self.resolution)
+            batch.flush(sink, feedback)
 
+        batch.flush(sink, feedback, 0)
         feedback.pushInfo("Tilecode DGGS generation completed.")
         if context.willLoadLayerOnCompletion(dest_id):
             lineColor = settings.tilecodeColor
@@ -289,7 +275,7 @@ class StylePostProcessor(QgsProcessingLayerPostProcessorInterface):
         super().__init__()
 
     def postProcessLayer(self, layer, context, feedback):
-        if not isinstance(layer, QgsVectorLayer):
+        if not isinstance(layer, QgsVectorLayer) or not layer.isSpatial():
             return
         sym = layer.renderer().symbol().symbolLayer(0)
         sym.setBrushStyle(Qt.BrushStyle.NoBrush)
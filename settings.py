@@ -39,6 +39,12 @@ class CoordOrder(enum.IntEnum):
     OrderXY = 1
 
 
+@enum.unique
+class OverlayRenderer(enum.IntEnum):
+    RubberBand = 0
+    CanvasItem = 1
+
+
 class Settings:
     def __init__(self):
         self.readSettings()
@@ -72,6 +78,14 @@ class Settings:
         self.dggridDensificationSpinBox = int(
             qset.value("/vgrid/dggridDensificationSpinBox", 30)
         )
+        self.overlayCacheSize = int(qset.value("/vgrid/overlayCacheSize", 50000))
+        self.overlayMaxCells = int(qset.value("/vgrid/overlayMaxCells", 20000))
+        self.overlayRenderer = int(
+            qset.value("/vgrid/overlayRenderer", OverlayRenderer.CanvasItem)
+        )
+        self.overlayDiagnostics = int(
+            qset.value("/vgrid/overlayDiagnostics", Qt.CheckState.Unchecked)
+        )
 
         ### Other DGGS Settings ###
         self.h3Res = int(qset.value("/vgrid/h3Res", 10))
@@ -621,6 +635,7 @@ class SettingsWidget(QDialog, FORM_CLASS):
         self.coordOrderComboBox.addItems(
             [tr("Lat, Lon (Y,X) - Google Map Order"), tr("Lon, Lat (X,Y) Order")]
         )
+        self.overlayRendererComboBox.addItems([tr("Rubber band"), tr("Canvas item")])
         self.buttonBox.button(
             QDialogButtonBox.StandardButton.RestoreDefaults
         ).clicked.connect(self.restoreDefaults)
@@ -662,6 +677,12 @@ class SettingsWidget(QDialog, FORM_CLASS):
         settings.A5SgementsSpinBox = 30
         settings.dggridDensificationSpinBox = 30
 
+        # DGGS Viz overlay options
+        self.overlayCacheSizeSpinBox.setValue(50000)
+        self.overlayMaxCellsSpinBox.setValue(20000)
+        self.overlayRendererComboBox.setCurrentIndex(OverlayRenderer.CanvasItem)
+        self.overlayDiagnosticsCheckBox.setCheckState(Qt.CheckState.Unchecked)
+
         # Other DGGS settings
 
         # H3
@@ -1055,6 +1076,21 @@ class SettingsWidget(QDialog, FORM_CLASS):
             int(self.dggridDensificationSpinBox.value()),
         )
 
+        ## DGGS Viz Overlay Options ##
+        qset.setValue(
+            "/vgrid/overlayCacheSize", int(self.overlayCacheSizeSpinBox.value())
+        )
+        qset.setValue(
+            "/vgrid/overlayMaxCells", int(self.overlayMaxCellsSpinBox.value())
+        )
+        qset.setValue(
+            "/vgrid/overlayRenderer", int(self.overlayRendererComboBox.currentIndex())
+        )
+        qset.setValue(
+            "/vgrid/overlayDiagnostics",
+            int(self.overlayDiagnosticsCheckBox.checkState()),
+        )
+
         ### Other DGGS Settings ###
         qset.setValue("/vgrid/h3Res", int(self.h3ResSpinBox.value()))
         qset.setValue("/vgrid/h3Color", self.h3ColorButton.color().name())
@@ -1707,6 +1743,12 @@ class SettingsWidget(QDialog, FORM_CLASS):
         self.gridWidthSpinBox.setValue(settings.gridWidth)
         self.A5SgementsSpinBox.setValue(settings.A5SgementsSpinBox)
         self.dggridDensificationSpinBox.setValue(settings.dggridDensificationSpinBox)
+        self.overlayCacheSizeSpinBox.setValue(settings.overlayCacheSize)
+        self.overlayMaxCellsSpinBox.setValue(settings.overlayMaxCells)
+        self.overlayRendererComboBox.setCurrentIndex(settings.overlayRenderer)
+        self.overlayDiagnosticsCheckBox.setCheckState(
+            Qt.CheckState(settings.overlayDiagnostics)
+        )
 
         ### Other DGGS Settings ###
         self.h3ResSpinBox.setValue(settings.h3Res)
@@ -1,2 +1,21 @@
 # import qgis libs so that ve set the correct sip api version
-import qgis   # pylint: disable=W0611  # NOQA
\ No newline at end of file
+import os
+import sys
+
+try:
+    import qgis   # pylint: disable=W0611  # NOQA
+except ImportError:
+    # Tests of the QGIS-free modules run without it
+    pass
+
+# The plugin root is on the path while testing, where the plugin's vgrid.py
+# would shadow the vgrid library the plugin modules import
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_PATH = sys.path[:]
+sys.path[:] = [path for path in _PATH if os.path.abspath(path or os.curdir) != _ROOT]
+try:
+    import vgrid   # pylint: disable=W0611  # NOQA
+except ImportError:
+    pass
+finally:
+    sys.path[:] = _PATH
@@ -0,0 +1,66 @@
+# coding=utf-8
+"""Tests for the DGGS Viz cell budget."""
+
+import unittest
+
+from .utilities import plugin_module
+
+cell_budget = plugin_module("dggsgrid", "cell_budget")
+
+WORLD = (-180.0, -90.0, 180.0, 90.0)
+HANOI = (105.7, 20.9, 105.95, 21.1)
+
+
+class CellBudgetTest(unittest.TestCase):
+    """Test estimate_cells and fit_resolution."""
+
+    def test_world_estimates(self):
+        """The whole globe holds every cell of the resolution."""
+        self.assertEqual(cell_budget.estimate_cells("h3", 3, WORLD), 2 + 120 * 7**3)
+        self.assertEqual(cell_budget.estimate_cells("geohash", 2, WORLD), 32**2)
+        self.assertEqual(cell_budget.estimate_cells("tilecode", 5, WORLD), 4**5)
+        self.assertEqual(cell_budget.estimate_cells("olc", 4, WORLD), 162 * 400)
+        self.assertIsNone(cell_budget.estimate_cells("unknown", 3, WORLD))
+
+    def test_digipin_domain(self):
+        """DIGIPIN cells only cover their own extent."""
+        self.assertEqual(
+            cell_budget.estimate_cells("digipin", 2, cell_budget.DIGIPIN_BOUNDS),
+            16**2,
+        )
+        self.assertEqual(cell_budget.estimate_cells("digipin", 6, (0, 0, 10, 10)), 0)
+
+    def test_fit_resolution(self):
+        """The finest resolution whose cells fit the budget is kept."""
+        for key, resolution in [("h3", 12), ("s2", 20), ("geohash", 8), ("a5", 16)]:
+            fitted = cell_budget.fit_resolution(key, resolution, HANOI, 5000)
+            self.assertLess(fitted, resolution, key)
+            self.assertLessEqual(
+                cell_budget.estimate_cells(key, fitted, HANOI), 5000, key
+            )
+            self.assertGreater(
+                cell_budget.estimate_cells(key, fitted + 1, HANOI), 5000, key
+            )
+
+    def test_fit_resolution_within_budget(self):
+        """A resolution that fits the budget, or no budget, is left alone."""
+        self.assertEqual(cell_budget.fit_resolution("h3", 5, HANOI, 5000), 5)
+        self.assertEqual(cell_budget.fit_resolution("h3", 15, WORLD, 0), 15)
+        self.assertEqual(cell_budget.fit_resolution("unknown", 9, WORLD, 10), 9)
+
+    def test_fit_resolution_minimum(self):
+        """Steps down stop at the grid's minimum resolution."""
+        self.assertEqual(cell_budget.fit_resolution("h3", 6, WORLD, 1), 0)
+        self.assertEqual(cell_budget.fit_resolution("olc", 10, WORLD, 1), 2)
+
+    def test_fit_resolution_olc_steps(self):
+        """OLC steps down by pairs of digits, then by grid refinement digits."""
+        self.assertEqual(cell_budget.fit_resolution("olc", 10, HANOI, 5000) % 2, 0)
+        fitted = cell_budget.fit_resolution("olc", 15, HANOI, 10**9)
+        self.assertEqual(fitted, 11)
+        self.assertLessEqual(cell_budget.estimate_cells("olc", 11, HANOI), 10**9)
+        self.assertGreater(cell_budget.estimate_cells("olc", 12, HANOI), 10**9)
+
+
+if __name__ == "__main__":
+    unittest.main()
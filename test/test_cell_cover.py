@@ -0,0 +1,100 @@
+# coding=utf-8
+"""Tests for the array spatial predicates of the cell covers."""
+
+import unittest
+
+import h3
+from shapely.geometry import LineString, MultiPolygon, Point, Polygon, box
+from vgrid.conversion.dggs2geo.h32geo import h32geo
+from vgrid.utils.geometry import check_predicate
+
+from .utilities import plugin_module
+
+cell_cover = plugin_module("utils/conversion", "cell_cover")
+
+# Every predicate form check_predicate accepts, and unknown ones
+PREDICATES = [
+    None,
+    0,
+    1,
+    2,
+    3,
+    7,
+    "intersects",
+    "intersect",
+    "within",
+    "centroid_within",
+    "centroid",
+    "largest_overlap",
+    "overlap",
+    "majority",
+    "Within",
+    "unknown",
+]
+
+
+def geometries():
+    """Input geometries around Hanoi: polygons with and without holes, lines, points."""
+    outline = box(105.75, 20.95, 105.95, 21.1)
+    holed = Polygon(
+        outline.exterior.coords, [box(105.82, 21.0, 105.88, 21.05).exterior.coords]
+    )
+    return [
+        outline,
+        holed,
+        MultiPolygon(
+            [box(105.78, 20.97, 105.8, 20.99), box(105.9, 21.05, 105.93, 21.08)]
+        ),
+        LineString([(105.76, 20.96), (105.85, 21.09), (105.94, 20.97)]),
+        Point(105.85, 21.02),
+    ]
+
+
+def cells():
+    """H3 polygons covering the input geometries and their surroundings."""
+    disk = h3.grid_disk(h3.latlng_to_cell(21.02, 105.85, 8), 14)
+    return [h32geo(cell) for cell in sorted(disk)]
+
+
+class PredicateMaskTest(unittest.TestCase):
+    """Test predicate_mask against vgrid's check_predicate."""
+
+    def test_predicate_mask(self):
+        """Same cells as check_predicate, for every predicate and geometry."""
+        polygons = cells()
+        for geometry in geometries():
+            for predicate in PREDICATES:
+                mask = cell_cover.predicate_mask(polygons, geometry, predicate)
+                expected = [
+                    check_predicate(polygon, geometry, predicate)
+                    for polygon in polygons
+                ]
+                self.assertEqual(
+                    mask.tolist(), expected, f"{geometry.geom_type} {predicate!r}"
+                )
+
+    def test_empty(self):
+        """No cells, an empty mask."""
+        mask = cell_cover.predicate_mask([], box(0, 0, 1, 1), "within")
+        self.assertEqual(mask.tolist(), [])
+
+    def test_matching_cells(self):
+        """matching_cells keeps the matching pairs, across chunks and in order."""
+        polygons = cells()
+        geometry = geometries()[1]
+        pairs = list(enumerate(polygons))
+        expected = [
+            (index, polygon)
+            for index, polygon in pairs
+            if check_predicate(polygon, geometry, "largest_overlap")
+        ]
+        matches = list(
+            cell_cover.matching_cells(
+                iter(pairs), geometry, "largest_overlap", chunk_size=50
+            )
+        )
+        self.assertEqual([index for index, _ in matches], [i for i, _ in expected])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+# coding=utf-8
+"""Tests for the batched DGGS cell metrics."""
+
+import unittest
+
+import h3
+import numpy as np
+from shapely.geometry import MultiPolygon, Polygon, box
+from vgrid.conversion.dggs2geo.h32geo import h32geo
+from vgrid.conversion.dggs2geo.olc2geo import olc2geo
+from vgrid.dggs import olc
+from vgrid.utils.geometry import geodesic_dggs_metrics, graticule_dggs_metrics
+
+from .utilities import plugin_module
+
+cell_metrics = plugin_module("utils", "cell_metrics")
+
+
+def h3_cells():
+    """H3 cells around Hanoi and a pentagon, with their number of edges."""
+    cells = list(h3.grid_disk(h3.latlng_to_cell(21.03, 105.85, 6), 2))
+    cells.append(h3.get_pentagons(4)[0])
+    polygons = [h32geo(cell) for cell in cells]
+    num_edges = [5 if h3.is_pentagon(cell) else 6 for cell in cells]
+    return polygons, num_edges
+
+
+class CellMetricsTest(unittest.TestCase):
+    """Test the batched metrics against vgrid's per-cell metrics."""
+
+    def assertSameRows(self, rows, expected):
+        self.assertEqual(len(rows), len(expected))
+        for row, expected_row in zip(rows, expected):
+            np.testing.assert_allclose(row, expected_row, rtol=1e-9)
+
+    def test_geodesic(self):
+        """Same values as geodesic_dggs_metrics, for hexagons and a pentagon."""
+        polygons, num_edges = h3_cells()
+        rows = cell_metrics.metric_rows(
+            cell_metrics.geodesic_cell_metrics(polygons, num_edges)
+        )
+        expected = [
+            geodesic_dggs_metrics(polygon, edges)
+            for polygon, edges in zip(polygons, num_edges)
+        ]
+        self.assertSameRows(rows, expected)
+
+    def test_graticule(self):
+        """Same values as graticule_dggs_metrics, for OLC cells."""
+        codes = [
+            olc.encode(lat, lon, resolution)
+            for lat, lon in [(21.03, 105.85), (-33.9, 151.2), (64.1, -21.9)]
+            for resolution in (4, 8, 11)
+        ]
+        polygons = [olc2geo(code) for code in codes]
+        rows = cell_metrics.metric_rows(cell_metrics.graticule_cell_metrics(polygons))
+        self.assertSameRows(rows, [graticule_dggs_metrics(p) for p in polygons])
+
+    def test_holes_and_parts(self):
+        """Holes are subtracted and every part of a multipolygon counts."""
+        square = box(105.0, 20.0, 106.0, 21.0)
+        holed = Polygon(
+            square.exterior.coords, [box(105.4, 20.4, 105.6, 20.6).exterior.coords]
+        )
+        parts = MultiPolygon([square, box(107.0, 20.0, 107.5, 20.5)])
+        polygons = [square, holed, parts]
+        rows = cell_metrics.metric_rows(cell_metrics.geodesic_cell_metrics(polygons, 4))
+        self.assertSameRows(rows, [geodesic_dggs_metrics(p, 4) for p in polygons])
+
+    def test_single_cell(self):
+        """The single-cell helpers return the row of the batched metrics."""
+        polygons, num_edges = h3_cells()
+        np.testing.assert_allclose(
+            cell_metrics.geodesic_metrics(polygons[0], num_edges[0]),
+            geodesic_dggs_metrics(polygons[0], num_edges[0]),
+            rtol=1e-9,
+        )
+        cell = olc2geo(olc.encode(21.03, 105.85, 10))
+        np.testing.assert_allclose(
+            cell_metrics.graticule_metrics(cell),
+            graticule_dggs_metrics(cell),
+            rtol=1e-9,
+        )
+
+    def test_empty(self):
+        """No cells, no metric rows."""
+        self.assertEqual(
+            cell_metrics.metric_rows(cell_metrics.geodesic_cell_metrics([], 6)), []
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
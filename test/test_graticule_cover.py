@@ -0,0 +1,112 @@
+# coding=utf-8
+"""Tests for graticule_cover on the OLC and DIGIPIN grids."""
+
+import unittest
+
+import numpy as np
+from shapely.geometry import Polygon
+from vgrid.conversion.dggs2geo.digipin2geo import digipin2geo
+from vgrid.conversion.dggs2geo.olc2geo import olc2geo
+from vgrid.utils.geometry import check_predicate
+
+from .utilities import plugin_module
+
+cell_cover = plugin_module("utils/conversion", "cell_cover")
+graticules = plugin_module("utils/conversion", "graticules")
+
+PREDICATES = ["intersects", "within", "centroid_within", "largest_overlap"]
+
+
+def l_shape(lon, lat, width, height):
+    """L-shaped polygon whose edges all lie on grid lines of the given cells."""
+    return Polygon(
+        [
+            (lon, lat),
+            (lon + 6 * width, lat),
+            (lon + 6 * width, lat + 2 * height),
+            (lon + 3 * width, lat + 2 * height),
+            (lon + 3 * width, lat + 6 * height),
+            (lon, lat + 6 * height),
+        ]
+    )
+
+
+def per_cell_cover(grid, decode, geometry, predicate):
+    """``{cell_id: polygon}`` of every cell around *geometry* matching it.
+
+    The cells are decoded and tested one by one with ``check_predicate``, as
+    the conversion did before ``graticule_cover``.
+    """
+    min_x, min_y, max_x, max_y = geometry.bounds
+    first_column, last_column = grid.column_range(min_x, max_x)
+    first_row, last_row = grid.row_range(min_y, max_y)
+    columns, rows = np.meshgrid(
+        np.arange(first_column - 1, last_column + 2),
+        np.arange(first_row - 1, last_row + 2),
+    )
+    cells = {}
+    for cell_id in grid.cell_ids(columns.ravel(), rows.ravel()):
+        polygon = decode(cell_id)
+        if check_predicate(polygon, geometry, predicate):
+            cells[cell_id] = polygon
+    return cells
+
+
+class GraticuleCoverTest(unittest.TestCase):
+    """Test graticule_cover against the per-cell conversion."""
+
+    def assertSameCover(self, grid, decode, geometry):
+        for predicate in PREDICATES:
+            expected = per_cell_cover(grid, decode, geometry, predicate)
+            cells = dict(cell_cover.graticule_cover(grid, geometry, predicate))
+            self.assertEqual(sorted(cells), sorted(expected), predicate)
+            for cell_id, polygon in cells.items():
+                self.assertTrue(polygon.equals_exact(expected[cell_id], 0), cell_id)
+
+    def test_olc_grid_lines(self):
+        """Cells touching an edge on an OLC grid line are kept."""
+        geometry = l_shape(105.0, 20.0, 0.05, 0.05)
+        self.assertSameCover(graticules.OLCGrid(6), olc2geo, geometry)
+        cells = dict(cell_cover.graticule_cover(graticules.OLCGrid(6), geometry))
+        # Bounds 105.3..105.35, touching the edge at 105.3
+        self.assertIn("7PG72800+", cells)
+
+    def test_olc_grid_refinement(self):
+        """Cells of the 4 x 5 grid refinement digits."""
+        geometry = l_shape(105.0, 20.0, 0.000125 / 4, 0.000125 / 5)
+        self.assertSameCover(graticules.OLCGrid(11), olc2geo, geometry)
+
+    def test_digipin_grid_lines(self):
+        """Cells touching an edge on a DIGIPIN grid line are kept."""
+        size = 36 / 4**4
+        geometry = l_shape(77.0, 20.0, size, size)
+        self.assertSameCover(graticules.DigipinGrid(4), digipin2geo, geometry)
+
+    def test_polygons_match_decoders(self):
+        """Cell polygons are the ones olc2geo and digipin2geo decode."""
+        for grid, decode in [
+            (graticules.OLCGrid(4), olc2geo),
+            (graticules.OLCGrid(8), olc2geo),
+            (graticules.OLCGrid(13), olc2geo),
+            (graticules.DigipinGrid(6), digipin2geo),
+        ]:
+            columns = np.linspace(0, grid.columns - 1, 50).astype(np.int64)
+            rows = np.linspace(0, grid.rows - 1, 50).astype(np.int64)
+            cell_ids = grid.cell_ids(columns, rows)
+            for cell_id, polygon in zip(cell_ids, grid.polygons(columns, rows)):
+                self.assertTrue(polygon.equals_exact(decode(cell_id), 0), cell_id)
+
+    def test_line(self):
+        """Cells crossed by a line, including one running along a grid line."""
+        grid = graticules.OLCGrid(6)
+        for line in [
+            Polygon([(105.0, 20.0), (105.33, 20.41), (105.71, 20.02)]).exterior,
+            Polygon([(105.3, 20.0), (105.3, 20.3), (105.6, 20.3)]).exterior,
+        ]:
+            expected = per_cell_cover(grid, olc2geo, line, "intersects")
+            cells = dict(cell_cover.graticule_cover(grid, line))
+            self.assertEqual(sorted(cells), sorted(expected))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,11 @@
 # coding=utf-8
 """Common functionality used by regression tests."""
 
+import importlib
+import os
 import sys
 import logging
+import types
 
 
 LOGGER = logging.getLogger('QGIS')
@@ -59,3 +62,29 @@ def get_qgis_app():
         IFACE = QgisInterface(CANVAS)
 
     return QGIS_APP, CANVAS, IFACE, PARENT
+
+
+def plugin_module(package, name):
+    """Import the plugin module *name* from the *package* directory.
+
+    For modules that do not need QGIS: the plugin packages import QGIS in
+    their ``__init__``, so the directory is registered as a bare package
+    instead. Modules may still import their siblings relatively.
+
+    :param package: Package directory relative to the plugin root, e.g.
+        ``utils/conversion``.
+    :type package: str
+
+    :param name: Module name.
+    :type name: str
+
+    :returns: The imported module.
+    """
+    package_name = "_vgridtools_" + package.replace("/", "_")
+    if package_name not in sys.modules:
+        module = types.ModuleType(package_name)
+        module.__path__ = [
+            os.path.join(os.path.dirname(os.path.dirname(__file__)), package)
+        ]
+        sys.modules[package_name] = module
+    return importlib.import_module(package_name + "." + name)
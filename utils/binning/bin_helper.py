@@ -20,9 +20,14 @@ from qgis.core import (
 from shapely import wkt as shapely_wkt
 from shapely.geometry import box
 
-from vgrid.utils.geometry import geodesic_dggs_metrics, graticule_dggs_metrics
 from vgrid.utils.io import aggregate_joined, stat_column_name
 
+from ..cell_metrics import (
+    geodesic_cell_metrics,
+    geodesic_metrics,
+    graticule_metrics,
+    metric_rows,
+)
 from ..conversion.crs_helper import ensure_wgs84_source
 
 _WGS84 = QgsCoordinateReferenceSystem("EPSG:4326")
@@ -151,8 +156,8 @@ def _shapely_polygon(geom):
 
 def geodesic_cell_props(geom, resolution, num_edges):
     poly = _shapely_polygon(geom)
-    center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-        geodesic_dggs_metrics(poly, num_edges)
+    center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = geodesic_metrics(
+        poly, num_edges
     )
     return {
         "resolution": resolution,
@@ -167,7 +172,7 @@ def geodesic_cell_props(geom, resolution, num_edges):
 def graticule_cell_props(geom, resolution):
     poly = _shapely_polygon(geom)
     center_lat, center_lon, cell_width, cell_height, cell_area, cell_perimeter = (
-        graticule_dggs_metrics(poly)
+        graticule_metrics(poly)
     )
     return {
         "resolution": resolution,
@@ -493,36 +498,28 @@ def dggrid_gdf_to_memory_layer(
             "DGGRID grid output has no cell ID column (global_id, name, seqnum)."
         )
 
-    features = []
-    total = len(dggrid_gdf)
-    for idx, row in dggrid_gdf.iterrows():
-        cell_polygon = row.geometry
+    cell_ids = []
+    polygons = []
+    for cell_polygon, raw_id in zip(dggrid_gdf.geometry, dggrid_gdf[id_source]):
         if cell_polygon is None or cell_polygon.is_empty:
             continue
-
-        cell_id = normalize_dggrid_cell_id(row.get(id_source))
+        cell_id = normalize_dggrid_cell_id(raw_id)
         if cell_id is None:
             continue
+        cell_ids.append(cell_id)
+        polygons.append(cell_polygon)
 
-        center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-            geodesic_dggs_metrics(cell_polygon, num_edges)
-        )
+    # Metrics for all cells in one pass
+    rows = metric_rows(geodesic_cell_metrics(polygons, num_edges))
 
+    features = []
+    total = len(cell_ids)
+    for idx, (cell_id, cell_polygon, row) in enumerate(zip(cell_ids, polygons, rows)):
         feat = QgsFeature(fields)
         feat.setGeometry(QgsGeometry.fromWkt(cell_polygon.wkt))
-        feat.setAttributes(
-            [
-                cell_id,
-                resolution,
-                center_lat,
-                center_lon,
-                avg_edge_len,
-                cell_area,
-                cell_perimeter,
-            ]
-        )
+        feat.setAttributes([cell_id, resolution, *row])
         features.append(feat)
-        if feedback and total and idx % 500 == 0:
+        if feedback and idx % 500 == 0:
             feedback.setProgress(int(15 * idx / total))
 
     if features:
@@ -0,0 +1,125 @@
+"""Batched geodesic metrics for DGGS cells.
+
+Same values as ``vgrid.utils.geometry.geodesic_dggs_metrics`` and
+``graticule_dggs_metrics``, computed for N cells at once: the cell outlines
+are flattened into one ragged coordinate array, all edge lengths come from a
+single vectorized ``Geod.inv`` call and centroids/bounds from shapely's array
+functions. Only the ellipsoidal ring area is still evaluated ring by ring,
+on slices of the shared arrays.
+"""
+
+import numpy as np
+import shapely
+from pyproj import Geod
+
+geod = Geod(ellps="WGS84")
+
+
+def _as_array(polygons):
+    polygons = np.asarray(polygons, dtype=object)
+    return polygons.reshape(-1)
+
+
+def ragged_rings(polygons):
+    """Flatten the rings of *polygons* (Polygon or MultiPolygon) into ragged arrays.
+
+    Returns ``(lons, lats, offsets, ring_cells, exterior)``: ring ``i`` has
+    coordinates ``lons[offsets[i]:offsets[i + 1]]``, belongs to cell
+    ``ring_cells[i]`` and is an exterior ring if ``exterior[i]``.
+    """
+    parts, part_cells = shapely.get_parts(polygons, return_index=True)
+    rings, ring_parts = shapely.get_rings(parts, return_index=True)
+    coords, coord_rings = shapely.get_coordinates(rings, return_index=True)
+    offsets = np.searchsorted(coord_rings, np.arange(len(rings) + 1))
+    # The first ring of each polygon part is its exterior
+    exterior = np.ones(len(rings), dtype=bool)
+    exterior[1:] = ring_parts[1:] != ring_parts[:-1]
+    return coords[:, 0], coords[:, 1], offsets, part_cells[ring_parts], exterior
+
+
+def ragged_area_perimeter(lons, lats, offsets, ring_cells, exterior, count):
+    """Absolute geodesic area (m2) and perimeter (m) of *count* cells.
+
+    The rings of a cell are given as in ``ragged_rings``. Like
+    ``Geod.geometry_area_perimeter``, signed ring areas are summed per cell
+    and only exterior rings count towards the perimeter.
+    """
+    if not count:
+        return np.zeros(0), np.zeros(0)
+    ring_index = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    same_ring = ring_index[1:] == ring_index[:-1]
+    _, _, edge_lengths = geod.inv(
+        lons[:-1][same_ring],
+        lats[:-1][same_ring],
+        lons[1:][same_ring],
+        lats[1:][same_ring],
+    )
+    ring_perimeters = np.bincount(
+        ring_index[:-1][same_ring], weights=edge_lengths, minlength=len(offsets) - 1
+    )
+
+    ring_areas = np.empty(len(offsets) - 1)
+    for i in range(len(ring_areas)):
+        start, end = offsets[i], offsets[i + 1]
+        ring_areas[i], _ = geod.polygon_area_perimeter(lons[start:end], lats[start:end])
+
+    areas = np.bincount(ring_cells, weights=ring_areas, minlength=count)
+    perimeters = np.bincount(
+        ring_cells, weights=np.where(exterior, ring_perimeters, 0.0), minlength=count
+    )
+    return np.abs(areas), perimeters
+
+
+def geodesic_cell_metrics(polygons, num_edges):
+    """Metric columns of EPSG:4326 cell *polygons* with *num_edges* edges each.
+
+    *num_edges* is a number or one value per cell. Returns NumPy arrays
+    ``(center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter)``.
+    """
+    polygons = _as_array(polygons)
+    centroids = shapely.centroid(polygons)
+    areas, perimeters = ragged_area_perimeter(*ragged_rings(polygons), len(polygons))
+    avg_edge_lens = perimeters / np.asarray(num_edges, dtype=float)
+    return (
+        shapely.get_y(centroids),
+        shapely.get_x(centroids),
+        avg_edge_lens,
+        areas,
+        perimeters,
+    )
+
+
+def graticule_cell_metrics(polygons):
+    """Metric columns of EPSG:4326 lat/lon-aligned cell *polygons*.
+
+    Returns NumPy arrays ``(center_lat, center_lon, cell_width, cell_height,
+    cell_area, cell_perimeter)``.
+    """
+    polygons = _as_array(polygons)
+    min_lon, min_lat, max_lon, max_lat = shapely.bounds(polygons).T
+    _, _, widths = geod.inv(min_lon, min_lat, max_lon, min_lat)
+    _, _, heights = geod.inv(min_lon, min_lat, min_lon, max_lat)
+    areas, perimeters = ragged_area_perimeter(*ragged_rings(polygons), len(polygons))
+    return (
+        (min_lat + max_lat) / 2,
+        (min_lon + max_lon) / 2,
+        np.asarray(widths, dtype=float),
+        np.asarray(heights, dtype=float),
+        areas,
+        perimeters,
+    )
+
+
+def metric_rows(columns):
+    """Per-cell tuples of plain Python floats from metric *columns*."""
+    return list(zip(*(np.asarray(column).tolist() for column in columns)))
+
+
+def geodesic_metrics(polygon, num_edges):
+    """``geodesic_cell_metrics`` row of a single cell."""
+    return metric_rows(geodesic_cell_metrics([polygon], num_edges))[0]
+
+
+def graticule_metrics(polygon):
+    """``graticule_cell_metrics`` row of a single cell."""
+    return metric_rows(graticule_cell_metrics([polygon]))[0]
@@ -0,0 +1,336 @@
+"""Columnar builder for the DGGS cell features written by Vector2DGGS."""
+
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+import shapely
+from qgis.core import (
+    QgsFeature,
+    QgsFeatureSink,
+    QgsField,
+    QgsFields,
+    QgsGeometry,
+    QgsVectorLayer,
+    QgsWkbTypes,
+)
+from qgis.PyQt.QtCore import QVariant
+
+from ..cell_metrics import geodesic_cell_metrics, graticule_cell_metrics, metric_rows
+
+GEODESIC_FIELDS = (
+    "center_lat",
+    "center_lon",
+    "avg_edge_len",
+    "cell_area",
+    "cell_perimeter",
+)
+GRATICULE_FIELDS = (
+    "center_lat",
+    "center_lon",
+    "cell_width",
+    "cell_height",
+    "cell_area",
+    "cell_perimeter",
+)
+
+# Output modes of the conversion tools and generators
+OUTPUT_FULL = 0  # cell polygons and metric fields
+OUTPUT_GEOMETRY = 1  # cell polygons, no metric fields
+OUTPUT_ID = 2  # cell id and resolution only, no geometry
+OUTPUT_MODES = [
+    "Full (geometry and cell metrics)",
+    "Geometry only (no cell metrics)",
+    "Cell ID only (no geometry)",
+]
+# Internal modes for layer-level coverage: batches return plain
+# (cell_id, polygon, resolution, num_edges) rows instead of features; with
+# OUTPUT_CELL_IDS only the polygons built anyway (for a predicate test) are
+# kept and the others are None, for the coverage to decode once per cell
+OUTPUT_CELLS = 3
+OUTPUT_CELL_IDS = 4
+CELL_ROW_MODES = (OUTPUT_CELLS, OUTPUT_CELL_IDS)
+
+# Output schemas by (input fields, id field, metric fields); one per algorithm run
+_SCHEMAS: dict = {}
+_SCHEMAS_MAX = 32
+
+# Cells per sink write for algorithms that stream cells (generators)
+SINK_BATCH_SIZE = 10000
+
+
+_local = threading.local()
+
+
+@contextmanager
+def output_mode(mode):
+    """Make *mode* the output mode of the batches created in this thread."""
+    previous = getattr(_local, "mode", OUTPUT_FULL)
+    _local.mode = mode
+    try:
+        yield
+    finally:
+        _local.mode = previous
+
+
+class CellStream:
+    """Sink wrapper the batches created inside ``streaming`` write chunks to.
+
+    Chunks go straight to *sink*. ``written`` counts the cells written since
+    the last ``reset``, so a feature that fails partway can tell how many of
+    its cells already reached the output.
+    """
+
+    def __init__(self, sink):
+        self.sink = sink
+        self.written = 0
+
+    def addFeatures(self, features, flags=QgsFeatureSink.FastInsert):
+        self.written += len(features)
+        return self.sink.addFeatures(features, flags)
+
+    def reset(self):
+        self.written = 0
+
+
+@contextmanager
+def streaming(sink, feedback=None):
+    """Stream the cells of the batches created in this thread to *sink*.
+
+    Such batches write every ``SINK_BATCH_SIZE`` cells to *sink* as they are
+    added, and ``features`` writes the rest and returns [], so a feature's
+    cells never pile up as one list. In the cell row modes *sink* receives
+    the cell rows. Yields the ``CellStream`` wrapping *sink*.
+    """
+    previous = getattr(_local, "stream", None)
+    stream = CellStream(sink)
+    _local.stream = (stream, feedback)
+    try:
+        yield stream
+    finally:
+        _local.stream = previous
+
+
+def current_output_mode():
+    return getattr(_local, "mode", OUTPUT_FULL)
+
+
+def geometry_needed():
+    """Whether the current output mode writes cell geometries."""
+    return current_output_mode() not in (OUTPUT_ID, OUTPUT_CELL_IDS)
+
+
+def output_metric_fields(graticule=False, mode=OUTPUT_FULL):
+    """Metric field names written in *mode* (none unless it is ``OUTPUT_FULL``)."""
+    if mode != OUTPUT_FULL:
+        return ()
+    return GRATICULE_FIELDS if graticule else GEODESIC_FIELDS
+
+
+def output_wkb_type(mode, wkb_type=QgsWkbTypes.Polygon):
+    """Sink geometry type for *mode*: no geometry for ``OUTPUT_ID``."""
+    return QgsWkbTypes.NoGeometry if mode == OUTPUT_ID else wkb_type
+
+
+def _field_key(field):
+    # Definition of an input field as it reaches the output layer
+    return (
+        field.name(),
+        field.type(),
+        field.subType(),
+        field.typeName(),
+        field.length(),
+        field.precision(),
+        field.alias(),
+        field.comment(),
+    )
+
+
+def unique_field_name(fields, base_name):
+    """*base_name*, or *base_name* with the first free ``_1``, ``_2``... suffix."""
+    if fields.indexOf(base_name) == -1:
+        return base_name
+    i = 1
+    while fields.indexOf(f"{base_name}_{i}") != -1:
+        i += 1
+    return f"{base_name}_{i}"
+
+
+def cell_fields(input_fields, id_field, metric_fields=GEODESIC_FIELDS):
+    """Input fields followed by the DGGS id, resolution and metric fields.
+
+    Cell field names already taken by an input field get a ``_1``, ``_2``...
+    suffix, as in the Vector2DGGS output fields, since ``QgsFields`` drops
+    duplicate names. The combined ``QgsFields`` is built once per input
+    schema and reused for every cell of every feature.
+    """
+    key = (tuple(_field_key(field) for field in input_fields), id_field, metric_fields)
+    fields = _SCHEMAS.get(key)
+    if fields is None:
+        fields = QgsFields(input_fields)
+        for name, field_type in [
+            (id_field, QVariant.String),
+            ("resolution", QVariant.Int),
+            *((name, QVariant.Double) for name in metric_fields),
+        ]:
+            fields.append(QgsField(unique_field_name(fields, name), field_type))
+        if len(_SCHEMAS) >= _SCHEMAS_MAX:
+            _SCHEMAS.pop(next(iter(_SCHEMAS)))
+        _SCHEMAS[key] = fields
+    return fields
+
+
+def cell_memory_layer(crs, name, id_field, graticule=False):
+    """Empty memory layer (*crs* as WKT) for the cells of one ``CellBatch`` schema.
+
+    The geometry type and fields follow the current output mode.
+    """
+    mode = current_output_mode()
+    geometry = "None" if mode == OUTPUT_ID else "Polygon"
+    mem_layer = QgsVectorLayer(f"{geometry}?crs={crs}", name, "memory")
+    mem_layer.dataProvider().addAttributes(
+        cell_fields(
+            QgsFields(), id_field, output_metric_fields(graticule, mode)
+        ).toList()
+    )
+    mem_layer.updateFields()
+    return mem_layer
+
+
+class CellBatch:
+    """Cells of one input feature, turned into output features in one pass.
+
+    Conversion functions ``add`` cell ids, EPSG:4326 shapely polygons and
+    resolutions. ``features`` then computes the metric columns for the whole
+    batch, builds the QGIS geometries from one WKB array and returns features
+    that share a single output schema and the input feature's attributes.
+    Without an input *feature* (grid generators) the features only carry the
+    cell attributes.
+
+    *mode* (default: the current ``output_mode``) drops the metric columns
+    (``OUTPUT_GEOMETRY``) or the geometry as well (``OUTPUT_ID``); the skipped
+    stages are never computed and, without geometry, cells may be added with
+    ``None`` polygons. In ``OUTPUT_CELLS`` and ``OUTPUT_CELL_IDS`` mode
+    ``features`` returns the queued ``(cell_id, polygon, resolution,
+    num_edges)`` rows instead.
+
+    Without a *feature*, *input_fields* may describe leading attributes that
+    are then passed per cell to ``add`` (layer-level coverage).
+
+    Inside ``streaming`` the batch writes its cells to the stream's sink in
+    chunks; pass ``stream=False`` for batches whose cells are compacted
+    after they were all added.
+    """
+
+    def __init__(
+        self,
+        feature,
+        id_field,
+        graticule=False,
+        mode=None,
+        input_fields=None,
+        stream=True,
+    ):
+        self.feature = feature
+        self.id_field = id_field
+        self.graticule = graticule
+        self.mode = current_output_mode() if mode is None else mode
+        self.geometry = self.mode not in (OUTPUT_ID, OUTPUT_CELL_IDS)
+        if feature is not None:
+            input_fields = feature.fields()
+        self.input_fields = input_fields if input_fields is not None else QgsFields()
+        self.fields = cell_fields(
+            self.input_fields, id_field, output_metric_fields(graticule, self.mode)
+        )
+        self.attributes = feature.attributes() if feature is not None else []
+        self.ids = []
+        self.polygons = []
+        self.resolutions = []
+        self.num_edges = []
+        self.cell_attributes = []
+        self.stream = None
+        if stream:
+            self.stream = getattr(_local, "stream", None)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def empty(self):
+        """New, empty batch for the same input feature and schema (compaction)."""
+        return CellBatch(
+            self.feature, self.id_field, self.graticule, self.mode, self.input_fields
+        )
+
+    def add(self, cell_id, cell_polygon, resolution, num_edges=4, attributes=None):
+        """Queue one cell; *num_edges* is ignored for graticule grids.
+
+        *attributes* replace the input feature's attributes for this cell.
+        """
+        self.ids.append(str(cell_id))
+        self.polygons.append(cell_polygon)
+        self.resolutions.append(resolution)
+        self.num_edges.append(num_edges)
+        self.cell_attributes.append(attributes)
+        if self.stream is not None and len(self.ids) >= SINK_BATCH_SIZE:
+            self.flush(*self.stream)
+
+    def metrics(self):
+        """Metric attribute rows of all queued cells."""
+        if self.mode != OUTPUT_FULL:
+            return [()] * len(self.ids)
+        if self.graticule:
+            return metric_rows(graticule_cell_metrics(self.polygons))
+        return metric_rows(geodesic_cell_metrics(self.polygons, self.num_edges))
+
+    def features(self, feedback=None):
+        """Output ``QgsFeature`` list for the queued cells ([] if canceled).
+
+        A streaming batch writes them to its sink instead and returns [].
+        """
+        if self.stream is not None:
+            sink, stream_feedback = self.stream
+            self.flush(sink, feedback or stream_feedback, size=0)
+            return []
+        return self._features(feedback)
+
+    def _features(self, feedback=None):
+        if not self.ids:
+            return []
+        if self.mode in CELL_ROW_MODES:
+            return list(zip(self.ids, self.polygons, self.resolutions, self.num_edges))
+        metrics = self.metrics()
+        if self.geometry:
+            wkbs = shapely.to_wkb(np.asarray(self.polygons, dtype=object))
+        else:
+            wkbs = [None] * len(self.ids)
+
+        features = []
+        for cell_id, resolution, wkb, row, attributes in zip(
+            self.ids, self.resolutions, wkbs, metrics, self.cell_attributes
+        ):
+            if feedback and feedback.isCanceled():
+                return []
+            cell_feature = QgsFeature(self.fields)
+            if wkb is not None:
+                geometry = QgsGeometry()
+                geometry.fromWkb(wkb)
+                cell_feature.setGeometry(geometry)
+            if attributes is None:
+                attributes = self.attributes
+            cell_feature.setAttributes(attributes + [cell_id, resolution, *row])
+            features.append(cell_feature)
+        return features
+
+    def flush(self, sink, feedback=None, size=SINK_BATCH_SIZE):
+        """Write the queued cells to *sink* once at least *size* are queued.
+
+        Pass ``size=0`` to write whatever is left at the end of a run.
+        """
+        if not self.ids or len(self.ids) < size:
+            return
+        sink.addFeatures(self._features(feedback), QgsFeatureSink.FastInsert)
+        self.ids = []
+        self.polygons = []
+        self.resolutions = []
+        self.num_edges = []
+        self.cell_attributes = []
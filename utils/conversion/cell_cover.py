@@ -0,0 +1,453 @@
+"""Cell selection against an input geometry.
+
+``predicate_mask`` evaluates a spatial predicate for a whole array of
+candidate cells against one prepared geometry.
+
+``line_cells`` walks along a line from cell to neighbouring cell, so its
+cost grows with the length of the line rather than with its bounding box.
+
+``region_cells`` combines such a walk along a polygon's boundary with the
+native polygon fill of a grid library, whose interior cells need one point
+test each.
+
+``graticule_cover`` scan-converts a geometry on a regular lon/lat grid: the
+cells crossed by its edges are found per row from the edge segments, the
+spans between them are classified with one point test each, and cell ids
+come from the row and column indices.
+
+``hierarchical_cover`` walks a grid from its root cells down to the target
+resolution. Cells that miss the polygon are dropped with their whole
+subtree, cells lying inside it are emitted at once (or expanded to the
+target resolution by id arithmetic, without any geometry), and only the
+cells along the polygon boundary are subdivided and finally tested with the
+spatial predicate.
+"""
+
+from itertools import product
+
+import numpy as np
+import shapely
+
+# Spatial predicates by the names and indices accepted by check_predicate
+PREDICATES = {
+    None: "intersects",
+    0: "intersects",
+    1: "within",
+    2: "centroid_within",
+    3: "largest_overlap",
+    "intersect": "intersects",
+    "centroid": "centroid_within",
+    "overlap": "largest_overlap",
+    "majority": "largest_overlap",
+}
+
+
+def predicate_mask(polygons, geometry, predicate=None):
+    """Boolean array: which cell *polygons* match *predicate* against *geometry*.
+
+    Same result as ``vgrid.utils.geometry.check_predicate`` per cell, but
+    evaluated with shapely's array predicates against *geometry*, which is
+    prepared once (unknown predicates fall back to intersects, as there).
+    """
+    polygons = np.asarray(polygons, dtype=object).reshape(-1)
+    if not len(polygons):
+        return np.zeros(0, dtype=bool)
+    shapely.prepare(geometry)
+    if isinstance(predicate, str):
+        predicate = predicate.lower()
+    name = PREDICATES.get(predicate, predicate)
+
+    if name == "within":
+        return shapely.contains(geometry, polygons)
+    if name == "centroid_within":
+        return shapely.contains(geometry, shapely.centroid(polygons))
+    mask = shapely.intersects(geometry, polygons)
+    if name == "largest_overlap":
+        hits = np.flatnonzero(mask)
+        overlap = shapely.area(shapely.intersection(polygons[hits], geometry))
+        mask[hits] = (overlap > 0) & (overlap >= 0.5 * shapely.area(polygons[hits]))
+    return mask
+
+
+def matching_cells(cells, geometry, predicate=None, chunk_size=10000):
+    """Yield the ``(cell_id, polygon)`` pairs of *cells* that match *predicate*.
+
+    *cells* may be a lazy iterable; it is filtered with ``predicate_mask``
+    in chunks of *chunk_size* cells.
+    """
+    chunk = []
+    for cell in cells:
+        chunk.append(cell)
+        if len(chunk) >= chunk_size:
+            yield from _matching_chunk(chunk, geometry, predicate)
+            chunk = []
+    if chunk:
+        yield from _matching_chunk(chunk, geometry, predicate)
+
+
+def _matching_chunk(chunk, geometry, predicate):
+    matches = predicate_mask([polygon for _, polygon in chunk], geometry, predicate)
+    return [cell for cell, match in zip(chunk, matches) if match]
+
+
+def line_cells(geometry, seeds, neighbors, polygon, feedback=None):
+    """``{cell_id: polygon}`` of the cells intersecting the line *geometry*.
+
+    Starting from *seeds* (cells holding one vertex of each line part), the
+    search moves ring by ring to the ``neighbors(cell_id)`` of every cell that
+    intersects *geometry*; ``polygon(cell_id)`` gives a cell's EPSG:4326
+    polygon. The cells crossed by a connected line are connected through
+    shared edges, so only the cells along the line and their immediate
+    neighbours are ever built. Returns None if canceled.
+    """
+    shapely.prepare(geometry)
+    cells = {}
+    visited = set(seeds)
+    frontier = list(visited)
+    expand_all = True  # Seeds are expanded even if rounding misses the line
+    while frontier:
+        if feedback and feedback.isCanceled():
+            return None
+        polygons = np.asarray([polygon(cell_id) for cell_id in frontier], dtype=object)
+        hits = shapely.intersects(geometry, polygons)
+        next_frontier = []
+        for cell_id, cell_polygon, hit in zip(frontier, polygons, hits):
+            if hit:
+                cells[cell_id] = cell_polygon
+            elif not expand_all:
+                continue
+            for neighbor_id in neighbors(cell_id):
+                if neighbor_id not in visited:
+                    visited.add(neighbor_id)
+                    next_frontier.append(neighbor_id)
+        frontier = next_frontier
+        expand_all = False
+    return cells
+
+
+def region_cells(
+    geometry, interior, seeds, neighbors, polygon, center, predicate=None, feedback=None
+):
+    """``{cell_id: polygon}`` of the cells matching *predicate* against *geometry*.
+
+    For grids whose library fills a polygon natively: the cells along the
+    boundary of polygonal *geometry* are walked with ``line_cells`` (from
+    *seeds*, with *neighbors* and *polygon*) and tested with the predicate.
+    The other *interior* cells, the library's fill, lie entirely inside or
+    outside *geometry*; those whose ``center(cell_id)`` is inside are
+    accepted without a test and map to None. Returns None if canceled.
+    """
+    boundary = line_cells(geometry.boundary, seeds, neighbors, polygon, feedback)
+    if boundary is None:
+        return None
+    polygons = list(boundary.values())
+    matches = predicate_mask(polygons, geometry, predicate)
+    cells = {
+        cell_id: cell_polygon
+        for cell_id, cell_polygon, match in zip(boundary, polygons, matches)
+        if match
+    }
+
+    interior = [cell_id for cell_id in interior if cell_id not in boundary]
+    if feedback and feedback.isCanceled():
+        return None
+    centers = np.asarray([center(cell_id) for cell_id in interior]).reshape(-1, 2)
+    inside = shapely.contains_xy(geometry, centers[:, 0], centers[:, 1])
+    cells.update(
+        (cell_id, None) for cell_id, is_inside in zip(interior, inside) if is_inside
+    )
+    return cells
+
+
+def line_vertices(geometry):
+    """``(lon, lat)`` of the first vertex of each part of line *geometry*."""
+    return [
+        tuple(shapely.get_coordinates(part)[0])
+        for part in shapely.get_parts(geometry)
+        if not part.is_empty
+    ]
+
+
+class NestedGrid:
+    """A DGGS whose cells are exactly tiled by their children.
+
+    Subclasses define the cell objects they walk (anything carrying enough
+    state to subdivide) and how to get their id, resolution and EPSG:4326
+    polygon.
+    """
+
+    # Characters appended to a cell id for each child, for grids whose child
+    # ids are the parent id plus one character
+    child_digits = None
+
+    def roots(self):
+        raise NotImplementedError
+
+    def children(self, cell):
+        raise NotImplementedError
+
+    def resolution(self, cell):
+        raise NotImplementedError
+
+    def cell_id(self, cell):
+        raise NotImplementedError
+
+    def polygon(self, cell):
+        raise NotImplementedError
+
+    def descendant_ids(self, cell, resolution):
+        """Ids of the descendants of *cell* at *resolution*."""
+        depth = resolution - self.resolution(cell)
+        if self.child_digits is not None:
+            cell_id = self.cell_id(cell)
+            return [
+                cell_id + "".join(digits)
+                for digits in product(self.child_digits, repeat=depth)
+            ]
+        cells = [cell]
+        for _ in range(depth):
+            cells = [child for parent in cells for child in self.children(parent)]
+        return [self.cell_id(child) for child in cells]
+
+
+def hierarchical_cover(
+    grid, geometry, resolution, predicate=None, compact=False, feedback=None
+):
+    """Cells of *grid* at *resolution* matching *predicate* against *geometry*.
+
+    Returns ``(cell_id, polygon)`` pairs, with the cell's EPSG:4326 polygon
+    if it was built for a test and None for cells accepted without one. With
+    *compact*, cells lying inside *geometry* and cells whose children all
+    match are returned at their own, coarser resolution instead of as
+    descendants. Returns [] if canceled.
+    """
+    shapely.prepare(geometry)
+
+    def cover(cells):
+        """Matching pairs under sibling *cells*, and whether all of them match."""
+        polygons = np.asarray([grid.polygon(cell) for cell in cells], dtype=object)
+        if grid.resolution(cells[0]) >= resolution:
+            matches = predicate_mask(polygons, geometry, predicate)
+            pairs = [
+                (grid.cell_id(cell), polygon)
+                for cell, polygon, match in zip(cells, polygons, matches)
+                if match
+            ]
+            return pairs, bool(matches.all())
+
+        hits = shapely.intersects(geometry, polygons)
+        inside = np.zeros(len(cells), dtype=bool)
+        inside[hits] = shapely.contains(geometry, polygons[hits])
+        pairs = []
+        complete = bool(hits.all())
+        for cell, polygon, hit, interior in zip(cells, polygons, hits, inside):
+            if feedback and feedback.isCanceled():
+                return [], False
+            if not hit:
+                continue
+            if interior:
+                if compact:
+                    pairs.append((grid.cell_id(cell), polygon))
+                else:
+                    pairs.extend(
+                        (cell_id, None)
+                        for cell_id in grid.descendant_ids(cell, resolution)
+                    )
+                continue
+            child_pairs, child_complete = cover(grid.children(cell))
+            if compact and child_complete:
+                pairs.append((grid.cell_id(cell), polygon))
+            else:
+                pairs.extend(child_pairs)
+            complete = complete and child_complete
+        return pairs, complete
+
+    pairs, _ = cover(list(grid.roots()))
+    if feedback and feedback.isCanceled():
+        return []
+    return pairs
+
+
+class Graticule:
+    """A regular lon/lat grid of *columns* x *rows* cells.
+
+    Cells are *width* x *height* units, counted from (*min_lon*, *min_lat*),
+    all of them integers in units of 1 / *lon_scale* and 1 / *lat_scale*
+    degrees. Cell edges are then divided out exactly once, so the edge two
+    neighbouring cells share is the same number in both and a grid line
+    lying on an input edge stays on it. Subclasses turn integer column and
+    row indices into ids, and may override ``bounds`` to reproduce how their
+    library decodes a cell.
+    """
+
+    def __init__(
+        self, min_lon, min_lat, width, height, columns, rows, lon_scale=1, lat_scale=1
+    ):
+        self.min_lon = min_lon
+        self.min_lat = min_lat
+        self.width = width
+        self.height = height
+        self.columns = columns
+        self.rows = rows
+        self.lon_scale = lon_scale
+        self.lat_scale = lat_scale
+
+    def cell_ids(self, columns, rows):
+        """Ids of the cells at the integer arrays *columns* and *rows*."""
+        raise NotImplementedError
+
+    def lons(self, columns):
+        """Longitudes of the western edges of *columns*, which may be fractional."""
+        return (self.min_lon + np.asarray(columns) * self.width) / self.lon_scale
+
+    def lats(self, rows):
+        """Latitudes of the southern edges of *rows*, which may be fractional."""
+        return (self.min_lat + np.asarray(rows) * self.height) / self.lat_scale
+
+    def bounds(self, columns, rows):
+        """``(min_x, min_y, max_x, max_y)`` arrays of the cells at *columns* and *rows*."""
+        return (
+            self.lons(columns),
+            self.lats(rows),
+            self.lons(columns + 1),
+            self.lats(rows + 1),
+        )
+
+    def polygons(self, columns, rows):
+        """EPSG:4326 polygons of the cells at *columns* and *rows*."""
+        min_x, min_y, max_x, max_y = self.bounds(columns, rows)
+        rings = np.stack(
+            [
+                np.stack([min_x, min_y], axis=-1),
+                np.stack([max_x, min_y], axis=-1),
+                np.stack([max_x, max_y], axis=-1),
+                np.stack([min_x, max_y], axis=-1),
+            ],
+            axis=1,
+        )
+        return shapely.polygons(rings)
+
+    def column_range(self, min_x, max_x):
+        return self._index_range(
+            min_x, max_x, self.min_lon, self.width, self.lon_scale, self.columns
+        )
+
+    def row_range(self, min_y, max_y):
+        return self._index_range(
+            min_y, max_y, self.min_lat, self.height, self.lat_scale, self.rows
+        )
+
+    @staticmethod
+    def _index_range(low, high, origin, size, scale, count):
+        # Cells touching [low, high], erring towards the neighbours of exact
+        # grid lines; those are tested exactly anyway
+        low = (np.asarray(low) * scale - origin) / size
+        high = (np.asarray(high) * scale - origin) / size
+        first = np.floor(low - 1e-9).astype(np.int64)
+        last = np.floor(high + 1e-9).astype(np.int64)
+        return np.clip(first, 0, count - 1), np.clip(last, 0, count - 1)
+
+
+def _edge_segments(edges):
+    """``(x0, y0, x1, y1)`` arrays of the segments of linear *edges*."""
+    coords, index = shapely.get_coordinates(shapely.get_parts(edges), return_index=True)
+    same = index[1:] == index[:-1]
+    return (
+        coords[:-1, 0][same],
+        coords[:-1, 1][same],
+        coords[1:, 0][same],
+        coords[1:, 1][same],
+    )
+
+
+def _edge_cells(grid, edges):
+    """Sorted unique ``row * columns + column`` keys of the cells touching *edges*."""
+    x0, y0, x1, y1 = _edge_segments(edges)
+    if not len(x0):
+        x0, y0 = shapely.get_coordinates(edges).T
+        x1, y1 = x0, y0
+    first_rows, last_rows = grid.row_range(np.minimum(y0, y1), np.maximum(y0, y1))
+
+    # One entry per (segment, row band) it crosses
+    counts = last_rows - first_rows + 1
+    segments = np.repeat(np.arange(len(x0)), counts)
+    starts = np.repeat(np.cumsum(counts) - counts, counts)
+    rows = first_rows[segments] + np.arange(counts.sum()) - starts
+    x0, y0, x1, y1 = x0[segments], y0[segments], x1[segments], y1[segments]
+
+    # X extent of each segment inside its (slightly widened) row band
+    band_low = grid.lats(rows - 1e-9)
+    band_high = grid.lats(rows + 1 + 1e-9)
+    dy = y1 - y0
+    flat = dy == 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_low = np.where(flat, 0.0, (band_low - y0) / dy)
+        t_high = np.where(flat, 1.0, (band_high - y0) / dy)
+    t0 = np.clip(np.minimum(t_low, t_high), 0.0, 1.0)
+    t1 = np.clip(np.maximum(t_low, t_high), 0.0, 1.0)
+    xa = x0 + t0 * (x1 - x0)
+    xb = x0 + t1 * (x1 - x0)
+    first_columns, last_columns = grid.column_range(
+        np.minimum(xa, xb), np.maximum(xa, xb)
+    )
+
+    counts = last_columns - first_columns + 1
+    pairs = np.repeat(np.arange(len(rows)), counts)
+    starts = np.repeat(np.cumsum(counts) - counts, counts)
+    columns = first_columns[pairs] + np.arange(counts.sum()) - starts
+    return np.unique(rows[pairs] * grid.columns + columns)
+
+
+def graticule_cover(grid, geometry, predicate=None, polygons=True, feedback=None):
+    """Yield ``(cell_id, polygon)`` for the cells of *grid* matching *geometry*.
+
+    Only the cells crossed by the edges of *geometry* (its boundary, or the
+    lines themselves) are tested with *predicate*. For polygons, the spans
+    of cells between them in each row are inside or outside as a whole and
+    are classified by the center of their first cell. Polygons are None
+    unless *polygons* or tested. Cells come row by row; stops if canceled.
+    """
+    shapely.prepare(geometry)
+    polygonal = shapely.get_dimensions(geometry) == 2
+    edges = shapely.boundary(geometry) if polygonal else geometry
+    keys = _edge_cells(grid, edges)
+    edge_rows = keys // grid.columns
+    edge_columns = keys % grid.columns
+
+    row_starts = np.flatnonzero(np.r_[True, edge_rows[1:] != edge_rows[:-1]])
+    row_ends = np.r_[row_starts[1:], len(keys)]
+    for start, end in zip(row_starts, row_ends):
+        if feedback and feedback.isCanceled():
+            return
+        row = edge_rows[start]
+        columns = edge_columns[start:end]
+        rows = np.full(len(columns), row)
+        cell_polygons = grid.polygons(columns, rows)
+        matches = predicate_mask(cell_polygons, geometry, predicate)
+
+        if polygonal:
+            # Spans of untouched cells between two edge cells of the row
+            gaps = np.flatnonzero(np.diff(columns) > 1)
+            span_starts = columns[gaps] + 1
+            span_ends = columns[gaps + 1]
+            center_y = grid.lats(row + 0.5)
+            centers_x = grid.lons(span_starts + 0.5)
+            inside = shapely.contains_xy(geometry, centers_x, center_y)
+            span_columns = [
+                np.arange(first, last)
+                for first, last, keep in zip(span_starts, span_ends, inside)
+                if keep
+            ]
+            if span_columns:
+                inner = np.concatenate(span_columns)
+                inner_rows = np.full(len(inner), row)
+                inner_polygons = (
+                    grid.polygons(inner, inner_rows)
+                    if polygons
+                    else [None] * len(inner)
+                )
+                yield from zip(grid.cell_ids(inner, inner_rows), inner_polygons)
+
+        yield from zip(
+            grid.cell_ids(columns[matches], rows[matches]), cell_polygons[matches]
+        )
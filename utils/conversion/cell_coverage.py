@@ -0,0 +1,210 @@
+"""Layer-level coverage: the unique cells of all input features.
+
+Every feature is converted into cell rows and its cells are merged, chunk
+by chunk, into one cell id -> contributing features index. Each unique cell
+is then written once, with its polygon decoded (unless a predicate test
+already built it) and its metrics computed once, and the attributes of its
+contributing features aggregated.
+"""
+
+import numpy as np
+import shapely
+from qgis.core import QgsField, QgsFields
+from qgis.PyQt.QtCore import QVariant
+
+from .cell_batch import (
+    OUTPUT_CELL_IDS,
+    OUTPUT_CELLS,
+    OUTPUT_ID,
+    CellBatch,
+    cell_fields,
+    output_metric_fields,
+    unique_field_name,
+)
+
+# Attribute aggregation of the unique cells
+AGGREGATE_COUNT = 0  # number of contributing features only
+AGGREGATE_FIRST = 1  # attributes of the first contributing feature
+AGGREGATE_LIST = 2  # comma-separated values of all contributing features
+AGGREGATE_SHARE = 3  # numeric fields apportioned by the feature's share in the cell
+AGGREGATES = [
+    "Feature count",
+    "First feature's attributes",
+    "List of feature values",
+    "Area-weighted share of numeric fields",
+]
+
+# Vector2DGGS types with lat/lon-aligned cells
+GRATICULE_DGGS_TYPES = ("olc", "geohash", "tilecode", "quadkey", "digipin")
+
+
+def feature_shares(geometry, polygons):
+    """Share of *geometry* (EPSG:4326 shapely) falling in each cell polygon.
+
+    Area shares for polygons, length shares for lines and an equal split
+    for points. Cells without a polygon get no share of areas and lengths.
+    """
+    polygons = np.asarray(polygons, dtype=object)
+    shares = np.zeros(len(polygons))
+    if not len(polygons):
+        return shares
+    if geometry.area > 0 or geometry.length > 0:
+        present = ~shapely.is_missing(polygons)
+        parts = shapely.intersection(polygons[present], geometry)
+        if geometry.area > 0:
+            shares[present] = shapely.area(parts) / geometry.area
+        else:
+            shares[present] = shapely.length(parts) / geometry.length
+        return shares
+    return np.full(len(polygons), 1.0 / len(polygons))
+
+
+class CellCoverage:
+    """Unique cells of a layer and the features that contribute to each of them.
+
+    ``add`` the cell rows of every input feature, converted in ``row_mode``,
+    then ``write`` the cells to a sink created with ``fields``.
+    *cell_polygon* decodes a cell id to its EPSG:4326 polygon, for the cells
+    that arrive without one.
+    """
+
+    def __init__(self, dggs_type, input_fields, aggregate, mode, cell_polygon=None):
+        self.id_field = dggs_type
+        self.graticule = dggs_type in GRATICULE_DGGS_TYPES
+        self.aggregate = aggregate
+        self.mode = mode
+        self.cell_polygon = cell_polygon
+        # Area shares need every polygon of every feature; otherwise polygons
+        # are decoded once per unique cell when it is written
+        if aggregate == AGGREGATE_SHARE or cell_polygon is None:
+            self.row_mode = OUTPUT_CELLS
+        else:
+            self.row_mode = OUTPUT_CELL_IDS
+        self.input_fields = input_fields
+        self.numeric_fields = [
+            i for i, field in enumerate(input_fields) if field.isNumeric()
+        ]
+        self.aggregate_fields = self._aggregate_fields()
+        # cell_id -> [polygon, resolution, num_edges, feature indices, shares]
+        self.cells = {}
+        self.attributes = []  # input attributes by feature index
+        self.feature_index = {}  # input feature id -> feature index
+
+    def _aggregate_fields(self):
+        fields = QgsFields()
+        if self.aggregate == AGGREGATE_FIRST:
+            fields = QgsFields(self.input_fields)
+        elif self.aggregate == AGGREGATE_LIST:
+            for field in self.input_fields:
+                fields.append(QgsField(field.name(), QVariant.String))
+        elif self.aggregate == AGGREGATE_SHARE:
+            for i in self.numeric_fields:
+                fields.append(QgsField(self.input_fields.at(i).name(), QVariant.Double))
+        fields.append(
+            QgsField(unique_field_name(fields, "feature_count"), QVariant.Int)
+        )
+        return fields
+
+    def fields(self):
+        """Output fields: aggregated attributes, then the cell fields."""
+        return cell_fields(
+            self.aggregate_fields,
+            self.id_field,
+            output_metric_fields(self.graticule, self.mode),
+        )
+
+    def __len__(self):
+        return len(self.cells)
+
+    def add(self, feature, cells):
+        """Merge a chunk of the cell rows of *feature* into the index.
+
+        The rows of a feature may arrive in several chunks, interleaved with
+        other features. A cell reached more than once by the same feature
+        (several parts of a multipart feature) counts once.
+        """
+        if not cells:
+            return
+        index = self.feature_index.get(feature.id())
+        if index is None:
+            index = self.feature_index[feature.id()] = len(self.attributes)
+            if self.aggregate == AGGREGATE_COUNT:
+                self.attributes.append(None)
+            else:
+                self.attributes.append(feature.attributes())
+
+        unique = {}
+        for cell in cells:
+            entry = self.cells.get(cell[0])
+            if entry is None or index not in entry[3]:
+                unique.setdefault(cell[0], cell)
+        cells = list(unique.values())
+
+        shares = [None] * len(cells)
+        if self.aggregate == AGGREGATE_SHARE and cells:
+            geometry = shapely.from_wkb(bytes(feature.geometry().asWkb()))
+            shares = feature_shares(geometry, [cell[1] for cell in cells]).tolist()
+
+        for (cell_id, polygon, resolution, num_edges), share in zip(cells, shares):
+            entry = self.cells.get(cell_id)
+            if entry is None:
+                if self.mode == OUTPUT_ID:
+                    polygon = None  # written without geometry
+                entry = self.cells[cell_id] = [polygon, resolution, num_edges, [], []]
+            entry[3].append(index)
+            entry[4].append(share)
+
+    def _aggregated_attributes(self, indices, shares):
+        if self.aggregate == AGGREGATE_FIRST:
+            values = list(self.attributes[indices[0]])
+        elif self.aggregate == AGGREGATE_LIST:
+            values = [
+                ", ".join(
+                    str(self.attributes[index][i])
+                    for index in indices
+                    if self.attributes[index][i] not in (None, "")
+                    and str(self.attributes[index][i]) != "NULL"
+                )
+                for i in range(self.input_fields.count())
+            ]
+        elif self.aggregate == AGGREGATE_SHARE:
+            values = []
+            for i in self.numeric_fields:
+                total = 0.0
+                for index, share in zip(indices, shares):
+                    value = self.attributes[index][i]
+                    if isinstance(value, (int, float)):
+                        total += share * value
+                values.append(total)
+        else:
+            values = []
+        return values + [len(indices)]
+
+    def write(self, sink, feedback=None):
+        """Write the unique cells to *sink*, in batches; False if canceled."""
+        batch = CellBatch(
+            None,
+            self.id_field,
+            self.graticule,
+            self.mode,
+            input_fields=self.aggregate_fields,
+        )
+        total_cells = len(self.cells)
+        for i, (cell_id, entry) in enumerate(self.cells.items()):
+            if feedback and feedback.isCanceled():
+                return False
+            polygon, resolution, num_edges, indices, shares = entry
+            if polygon is None and batch.geometry and self.cell_polygon:
+                polygon = self.cell_polygon(cell_id)
+            batch.add(
+                cell_id,
+                polygon,
+                resolution,
+                num_edges,
+                self._aggregated_attributes(indices, shares),
+            )
+            batch.flush(sink, feedback)
+            if feedback and i % 1000 == 0:
+                feedback.setProgress(int(100 * i / total_cells))
+        batch.flush(sink, feedback, size=0)
+        return not (feedback and feedback.isCanceled())
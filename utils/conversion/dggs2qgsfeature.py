@@ -4,8 +4,6 @@ from qgis.core import (
     QgsProject,
     QgsFeature,
     QgsGeometry,
-    QgsField,
-    QgsFields,
 )
 from qgis.PyQt.QtCore import QVariant
 from pyproj import Geod
@@ -22,10 +20,6 @@ from vgrid.conversion.dggs2geo.rhealpix2geo import rhealpix2geo
 from vgrid.conversion.dggs2geo.s22geo import s22geo
 from vgrid.conversion.dggs2geo.h32geo import h32geo
 from vgrid.utils.constants import ISEA3H_ACCURACY_RES_DICT
-from vgrid.utils.geometry import (
-    graticule_dggs_metrics,
-    geodesic_dggs_metrics,
-)
 import a5
 import h3
 from vgrid.dggs import mercantile
@@ -37,6 +31,18 @@ import re
 import os
 from shapely.geometry import Polygon, shape
 import json
+from collections import OrderedDict
+
+from .cell_batch import (
+    OUTPUT_CELLS,
+    OUTPUT_ID,
+    SINK_BATCH_SIZE,
+    CellBatch,
+    current_output_mode,
+    geometry_needed,
+    output_metric_fields,
+    output_mode,
+)
 
 from vgrid.dggs import s2, olc, georef, mgrs
 from gars_field.garsgrid import GARSGrid
@@ -62,163 +68,37 @@ if platform.system() == "Windows":
 geod = Geod(ellps="WGS84")
 
 
+def _cell_feature(
+    feature, id_field, cell_id, cell_polygon, resolution, num_edges=4, graticule=False
+):
+    """Output feature of one cell in the current output mode."""
+    batch = CellBatch(feature, id_field, graticule, stream=False)
+    batch.add(cell_id, cell_polygon if batch.geometry else None, resolution, num_edges)
+    return batch.features()[0]
+
+
 def h32qgsfeature(feature, h3_id):
-    cell_polygon = h32geo(h3_id)
     num_edges = 6
     if h3.is_pentagon(h3_id):
         num_edges = 5
     resolution = h3.get_resolution(h3_id)
-
-    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-
-    h3_feature = QgsFeature()
-    h3_feature.setGeometry(cell_geometry)
-
-    # Get all attributes from the input feature
-    original_attributes = feature.attributes()
-    original_fields = feature.fields()
-
-    # Define new H3-related attributes
-    new_fields = QgsFields()
-    new_fields.append(QgsField("h3", QVariant.String))
-    new_fields.append(QgsField("resolution", QVariant.Int))
-    new_fields.append(QgsField("center_lat", QVariant.Double))
-    new_fields.append(QgsField("center_lon", QVariant.Double))
-    new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-    new_fields.append(QgsField("cell_area", QVariant.Double))
-    new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-
-    # Combine original fields and new fields
-    all_fields = QgsFields()
-    for field in original_fields:
-        all_fields.append(field)
-    for field in new_fields:
-        all_fields.append(field)
-
-    h3_feature.setFields(all_fields)
-
-    # Combine original attributes with new attributes
-    center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-        geodesic_dggs_metrics(cell_polygon, num_edges)
-    )
-
-    new_attributes = [
-        h3_id,
-        resolution,
-        center_lat,
-        center_lon,
-        avg_edge_len,
-        cell_area,
-        cell_perimeter,
-    ]
-    all_attributes = original_attributes + new_attributes
-
-    h3_feature.setAttributes(all_attributes)
-    return h3_feature
+    cell_polygon = h32geo(h3_id) if geometry_needed() else None
+    return _cell_feature(feature, "h3", h3_id, cell_polygon, resolution, num_edges)
 
 
 def s22qgsfeature(feature, s2_token):
     cell_id = s2.CellId.from_token(s2_token)
-    cell_polygon = s22geo(s2_token)
     resolution = cell_id.level()
-    num_edges = 4
-    center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-        geodesic_dggs_metrics(cell_polygon, num_edges)
-    )
-
-    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-
-    s2_feature = QgsFeature()
-    s2_feature.setGeometry(cell_geometry)
-
-    # Get all attributes from the input feature
-    original_attributes = feature.attributes()
-    original_fields = feature.fields()
-
-    # Define new H3-related attributes
-    new_fields = QgsFields()
-    new_fields.append(QgsField("s2", QVariant.String))
-    new_fields.append(QgsField("resolution", QVariant.Int))
-    new_fields.append(QgsField("center_lat", QVariant.Double))
-    new_fields.append(QgsField("center_lon", QVariant.Double))
-    new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-    new_fields.append(QgsField("cell_area", QVariant.Double))
-    new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-    # Combine original fields and new fields
-    all_fields = QgsFields()
-    for field in original_fields:
-        all_fields.append(field)
-    for field in new_fields:
-        all_fields.append(field)
-
-    s2_feature.setFields(all_fields)
-
-    # Combine original attributes with new attributes
-    new_attributes = [
-        s2_token,
-        resolution,
-        center_lat,
-        center_lon,
-        avg_edge_len,
-        cell_area,
-        cell_perimeter,
-    ]
-    all_attributes = original_attributes + new_attributes
-
-    s2_feature.setAttributes(all_attributes)
-    return s2_feature
+    cell_polygon = s22geo(s2_token) if geometry_needed() else None
+    return _cell_feature(feature, "s2", s2_token, cell_polygon, resolution, 4)
 
 
 def a52qgsfeature(feature, a5_hex):
-    cell_polygon = a52geo(a5_hex)
     num_edges = 5
     cell_bigint = a5.hex_to_u64(a5_hex)
     resolution = a5.get_resolution(cell_bigint)
-
-    center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-        geodesic_dggs_metrics(cell_polygon, num_edges)
-    )
-    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-
-    a5_feature = QgsFeature()
-    a5_feature.setGeometry(cell_geometry)
-
-    # Get all attributes from the input feature
-    original_attributes = feature.attributes()
-    original_fields = feature.fields()
-
-    # Define new H3-related attributes
-    new_fields = QgsFields()
-    new_fields.append(QgsField("a5", QVariant.String))
-    new_fields.append(QgsField("resolution", QVariant.Int))
-    new_fields.append(QgsField("center_lat", QVariant.Double))
-    new_fields.append(QgsField("center_lon", QVariant.Double))
-    new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-    new_fields.append(QgsField("cell_area", QVariant.Double))
-    new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-    # Combine original fields and new fields
-    all_fields = QgsFields()
-    for field in original_fields:
-        all_fields.append(field)
-    for field in new_fields:
-        all_fields.append(field)
-
-    a5_feature.setFields(all_fields)
-
-    # Combine original attributes with new attributes
-    new_attributes = [
-        a5_hex,
-        resolution,
-        center_lat,
-        center_lon,
-        avg_edge_len,
-        cell_area,
-        cell_perimeter,
-    ]
-    all_attributes = original_attributes + new_attributes
-
-    a5_feature.setAttributes(all_attributes)
-    return a5_feature
+    cell_polygon = a52geo(a5_hex) if geometry_needed() else None
+    return _cell_feature(feature, "a5", a5_hex, cell_polygon, resolution, num_edges)
 
 
 def rhealpix2qgsfeature(feature, rhealpix_id):
@@ -226,130 +106,40 @@ def rhealpix2qgsfeature(feature, rhealpix_id):
     rhealpix_uids = (rhealpix_id[0],) + tuple(map(int, rhealpix_id[1:]))
     rhealpix_cell = rhealpix_dggs.cell(rhealpix_uids)
     resolution = rhealpix_cell.resolution
-    cell_polygon = rhealpix2geo(rhealpix_id)
 
     num_edges = 4
     if rhealpix_cell.ellipsoidal_shape() == "dart":
         num_edges = 3
 
-    center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-        geodesic_dggs_metrics(cell_polygon, num_edges)
+    cell_polygon = rhealpix2geo(rhealpix_id) if geometry_needed() else None
+    return _cell_feature(
+        feature, "rhealpix", rhealpix_id, cell_polygon, resolution, num_edges
     )
 
-    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-
-    rhealpix_feature = QgsFeature()
-    rhealpix_feature.setGeometry(cell_geometry)
-
-    # Get all attributes from the input feature
-    original_attributes = feature.attributes()
-    original_fields = feature.fields()
-
-    # Define new H3-related attributes
-    new_fields = QgsFields()
-    new_fields.append(QgsField("rhealpix", QVariant.String))
-    new_fields.append(QgsField("resolution", QVariant.Int))
-    new_fields.append(QgsField("resolution", QVariant.Int))
-    new_fields.append(QgsField("center_lat", QVariant.Double))
-    new_fields.append(QgsField("center_lon", QVariant.Double))
-    new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-    new_fields.append(QgsField("cell_area", QVariant.Double))
-    new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-    # Combine original fields and new fields
-    all_fields = QgsFields()
-    for field in original_fields:
-        all_fields.append(field)
-    for field in new_fields:
-        all_fields.append(field)
-
-    rhealpix_feature.setFields(all_fields)
-
-    # Combine original attributes with new attributes
-    new_attributes = [
-        rhealpix_id,
-        resolution,
-        center_lat,
-        center_lon,
-        avg_edge_len,
-        cell_area,
-        cell_perimeter,
-    ]
-    all_attributes = original_attributes + new_attributes
-
-    rhealpix_feature.setAttributes(all_attributes)
-    return rhealpix_feature
-
 
 def isea4t2qgsfeature(feature, isea4t_id):
     if platform.system() == "Windows":
         resolution = len(isea4t_id) - 2
-        cell_polygon = isea4t2geo(isea4t_id)
-
-        num_edges = 3
-        center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-            geodesic_dggs_metrics(cell_polygon, num_edges)
-        )
-
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-        isea4t_feature = QgsFeature()
-        isea4t_feature.setGeometry(cell_geometry)
-
-        # Get all attributes from the input feature
-        original_attributes = feature.attributes()
-        original_fields = feature.fields()
-
-        # Define new H3-related attributes
-        new_fields = QgsFields()
-        new_fields.append(QgsField("isea4t", QVariant.String))
-        new_fields.append(QgsField("resolution", QVariant.Int))
-        new_fields.append(QgsField("center_lat", QVariant.Double))
-        new_fields.append(QgsField("center_lon", QVariant.Double))
-        new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-        new_fields.append(QgsField("cell_area", QVariant.Double))
-        new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-        # Combine original fields and new fields
-        all_fields = QgsFields()
-        for field in original_fields:
-            all_fields.append(field)
-        for field in new_fields:
-            all_fields.append(field)
-
-        isea4t_feature.setFields(all_fields)
-        # Combine original attributes with new attributes
-        new_attributes = [
-            isea4t_id,
-            resolution,
-            center_lat,
-            center_lon,
-            avg_edge_len,
-            cell_area,
-            cell_perimeter,
-        ]
-        all_attributes = original_attributes + new_attributes
-
-        isea4t_feature.setAttributes(all_attributes)
-        return isea4t_feature
+        cell_polygon = isea4t2geo(isea4t_id) if geometry_needed() else None
+        return _cell_feature(feature, "isea4t", isea4t_id, cell_polygon, resolution, 3)
 
 
 def isea3h2qgsfeature(feature, isea3h_id):
     if platform.system() == "Windows":
         DggsCell(isea3h_id)
         cell_polygon = isea3h2geo(isea3h_id)
-        cell_centroid = cell_polygon.centroid
-        center_lat = round(cell_centroid.y, 7)
-        center_lon = round(cell_centroid.x, 7)
-
-        cell_area = abs(geod.geometry_area_perimeter(cell_polygon)[0])
         cell_perimeter = abs(geod.geometry_area_perimeter(cell_polygon)[1])
         isea3h2point = isea3h_dggs.convert_dggs_cell_to_point(DggsCell(isea3h_id))
 
         accuracy = isea3h2point._accuracy
 
+        num_edges = 6
         avg_edge_len = cell_perimeter / 6
 
         resolution = ISEA3H_ACCURACY_RES_DICT.get(accuracy)
 
         if resolution == 0:  # icosahedron faces at resolution = 0
+            num_edges = 3
             avg_edge_len = cell_perimeter / 3
 
         if accuracy == 0.0:
@@ -371,98 +161,15 @@ def isea3h2qgsfeature(feature, isea3h_id):
             elif round(avg_edge_len, 3) <= 0.001:
                 resolution = 40
 
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-        isea3h_feature = QgsFeature()
-        isea3h_feature.setGeometry(cell_geometry)
-
-        # Get all attributes from the input feature
-        original_attributes = feature.attributes()
-        original_fields = feature.fields()
-
-        # Define new H3-related attributes
-        new_fields = QgsFields()
-        new_fields.append(QgsField("isea3h", QVariant.String))
-        new_fields.append(QgsField("resolution", QVariant.Int))
-        new_fields.append(QgsField("center_lat", QVariant.Double))
-        new_fields.append(QgsField("center_lon", QVariant.Double))
-        new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-        new_fields.append(QgsField("cell_area", QVariant.Double))
-        new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-        # Combine original fields and new fields
-        all_fields = QgsFields()
-        for field in original_fields:
-            all_fields.append(field)
-        for field in new_fields:
-            all_fields.append(field)
-
-        isea3h_feature.setFields(all_fields)
-
-        # Combine original attributes with new attributes
-        new_attributes = [
-            isea3h_id,
-            resolution,
-            center_lat,
-            center_lon,
-            round(avg_edge_len, 3),
-            round(cell_area, 3),
-            round(cell_perimeter, 3),
-        ]
-        all_attributes = original_attributes + new_attributes
-
-        isea3h_feature.setAttributes(all_attributes)
-        return isea3h_feature
+        return _cell_feature(
+            feature, "isea3h", isea3h_id, cell_polygon, resolution, num_edges
+        )
 
 
 def ease2qgsfeature(feature, ease_id):
     resolution = int(ease_id[1])  # Get the level (e.g., 'L0' -> 0)
-    cell_polygon = ease2geo(ease_id)
-
-    num_edges = 4
-    center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-        geodesic_dggs_metrics(cell_polygon, num_edges)
-    )
-
-    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-    ease_feature = QgsFeature()
-    ease_feature.setGeometry(cell_geometry)
-
-    # Get all attributes from the input feature
-    original_attributes = feature.attributes()
-    original_fields = feature.fields()
-
-    # Define new H3-related attributes
-    new_fields = QgsFields()
-    new_fields.append(QgsField("ease", QVariant.String))
-    new_fields.append(QgsField("resolution", QVariant.Int))
-    new_fields.append(QgsField("center_lat", QVariant.Double))
-    new_fields.append(QgsField("center_lon", QVariant.Double))
-    new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-    new_fields.append(QgsField("cell_area", QVariant.Double))
-    new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-    # Combine original fields and new fields
-    all_fields = QgsFields()
-    for field in original_fields:
-        all_fields.append(field)
-    for field in new_fields:
-        all_fields.append(field)
-
-    ease_feature.setFields(all_fields)
-
-    # Combine original attributes with new attributes
-    new_attributes = [
-        ease_id,
-        resolution,
-        center_lat,
-        center_lon,
-        avg_edge_len,
-        cell_area,
-        cell_perimeter,
-    ]
-    all_attributes = original_attributes + new_attributes
-
-    ease_feature.setAttributes(all_attributes)
-
-    return ease_feature
+    cell_polygon = ease2geo(ease_id) if geometry_needed() else None
+    return _cell_feature(feature, "ease", ease_id, cell_polygon, resolution, 4)
 
 
 def dggal2qgsfeature(feature, zone_id, dggs_type):
@@ -484,160 +191,32 @@ def dggal2qgsfeature(feature, zone_id, dggs_type):
     zone = dggrs.getZoneFromTextID(zone_id)
     resolution = dggrs.getZoneLevel(zone)
     num_edges = dggrs.countZoneEdges(zone)
-    cell_polygon = dggal_to_geo(dggs_type, zone_id)
-    center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-        geodesic_dggs_metrics(cell_polygon, num_edges)
+    cell_polygon = dggal_to_geo(dggs_type, zone_id) if geometry_needed() else None
+    return _cell_feature(
+        feature, f"dggal_{dggs_type}", zone_id, cell_polygon, resolution, num_edges
     )
 
-    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-    dggal_feature = QgsFeature()
-    dggal_feature.setGeometry(cell_geometry)
-
-    # Get all attributes from the input feature
-    original_attributes = feature.attributes()
-    original_fields = feature.fields()
-
-    # Define new DGGSAL-related attributes
-    new_fields = QgsFields()
-    new_fields.append(QgsField(f"dggal_{dggs_type}", QVariant.String))
-    new_fields.append(QgsField("resolution", QVariant.Int))
-    new_fields.append(QgsField("center_lat", QVariant.Double))
-    new_fields.append(QgsField("center_lon", QVariant.Double))
-    new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-    new_fields.append(QgsField("cell_area", QVariant.Double))
-    new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-
-    # Combine original fields and new fields
-    all_fields = QgsFields()
-    for field in original_fields:
-        all_fields.append(field)
-    for field in new_fields:
-        all_fields.append(field)
-
-    dggal_feature.setFields(all_fields)
-
-    # Combine original attributes with new attributes
-    new_attributes = [
-        zone_id,
-        resolution,
-        center_lat,
-        center_lon,
-        avg_edge_len,
-        cell_area,
-        cell_perimeter,
-    ]
-    all_attributes = original_attributes + new_attributes
-
-    dggal_feature.setAttributes(all_attributes)
-
-    return dggal_feature
-
 
 def qtm2qgsfeature(feature, qtm_id):
-    cell_polygon = qtm2geo(qtm_id)
     resolution = len(qtm_id)
-    num_edges = 3
-    center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-        geodesic_dggs_metrics(cell_polygon, num_edges)
-    )
-    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-
-    qtm_feature = QgsFeature()
-    qtm_feature.setGeometry(cell_geometry)
-
-    # Get all attributes from the input feature
-    original_attributes = feature.attributes()
-    original_fields = feature.fields()
-
-    # Define new s2-related attributes
-    new_fields = QgsFields()
-    new_fields.append(QgsField("qtm", QVariant.String))
-    new_fields.append(QgsField("resolution", QVariant.Int))
-    new_fields.append(QgsField("center_lat", QVariant.Double))
-    new_fields.append(QgsField("center_lon", QVariant.Double))
-    new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-    new_fields.append(QgsField("cell_area", QVariant.Double))
-    new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-    # Combine original fields and new fields
-    all_fields = QgsFields()
-    for field in original_fields:
-        all_fields.append(field)
-    for field in new_fields:
-        all_fields.append(field)
-
-    qtm_feature.setFields(all_fields)
-
-    # Combine original attributes with new attributes
-    new_attributes = [
-        qtm_id,
-        resolution,
-        center_lat,
-        center_lon,
-        avg_edge_len,
-        cell_area,
-        cell_perimeter,
-    ]
-    all_attributes = original_attributes + new_attributes
-
-    qtm_feature.setAttributes(all_attributes)
-
-    return qtm_feature
+    cell_polygon = qtm2geo(qtm_id) if geometry_needed() else None
+    return _cell_feature(feature, "qtm", qtm_id, cell_polygon, resolution, 3)
 
 
 def olc2qgsfeature(feature, olc_id):
-    cell_polygon = olc2geo(olc_id)
     coord = olc.decode(olc_id)
     resolution = coord.codeLength
-    center_lat, center_lon, cell_width, cell_height, cell_area, cell_perimeter = (
-        graticule_dggs_metrics(cell_polygon)
+    cell_polygon = olc2geo(olc_id) if geometry_needed() else None
+    return _cell_feature(
+        feature, "olc", olc_id, cell_polygon, resolution, graticule=True
     )
 
-    # Get all attributes from the input feature
-    original_attributes = feature.attributes()
-    original_fields = feature.fields()
-
-    # Define new H3-related attributes
-    new_fields = QgsFields()
-    new_fields.append(QgsField("olc", QVariant.String))
-    new_fields.append(QgsField("resolution", QVariant.Int))
-    new_fields.append(QgsField("center_lat", QVariant.Double))
-    new_fields.append(QgsField("center_lon", QVariant.Double))
-    new_fields.append(QgsField("cell_width", QVariant.Double))
-    new_fields.append(QgsField("cell_height", QVariant.Double))
-    new_fields.append(QgsField("cell_area", QVariant.Double))
-    new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-    # Combine original fields and new fields
-    all_fields = QgsFields()
-    for field in original_fields:
-        all_fields.append(field)
-    for field in new_fields:
-        all_fields.append(field)
-
-    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-    olc_feature = QgsFeature()
-    olc_feature.setGeometry(cell_geometry)
-    olc_feature.setFields(all_fields)
-
-    # Combine original attributes with new attributes
-    new_attributes = [
-        olc_id,
-        resolution,
-        center_lat,
-        center_lon,
-        cell_width,
-        cell_height,
-        cell_area,
-        cell_perimeter,
-    ]
-    all_attributes = original_attributes + new_attributes
-
-    olc_feature.setAttributes(all_attributes)
-
-    return olc_feature
-
 
 def mgrs2qgsfeature(feature, mgrs_id):
     resolution, grid_size = mgrs.get_precision_and_grid_size(mgrs_id)
+    if not geometry_needed():
+        return _cell_feature(feature, "mgrs", mgrs_id, None, resolution, graticule=True)
+
     zone, hemisphere, easting, northing = mgrs._mgrsToUtm(mgrs_id)
 
     min_x, min_y = easting, northing
@@ -673,11 +252,6 @@ def mgrs2qgsfeature(feature, mgrs_id):
         ]
     )
 
-    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-    center_lat, center_lon, cell_width, cell_height, cell_area, cell_perimeter = (
-        graticule_dggs_metrics(cell_polygon)
-    )
-
     try:
         gzd_json_path = os.path.join(os.path.dirname(__file__), "gzd.geojson")
 
@@ -698,111 +272,22 @@ def mgrs2qgsfeature(feature, mgrs_id):
             ):
                 intersected_polygon = cell_polygon.intersection(gzd_geom)
                 if intersected_polygon:
-                    cell_geometry = QgsGeometry.fromWkt(intersected_polygon.wkt)
-                    (
-                        center_lat,
-                        center_lon,
-                        cell_width,
-                        cell_height,
-                        cell_area,
-                        cell_perimeter,
-                    ) = graticule_dggs_metrics(intersected_polygon)
+                    cell_polygon = intersected_polygon
     except BaseException:
         pass
 
-    # Get all attributes from the input feature
-    original_attributes = feature.attributes()
-    original_fields = feature.fields()
-
-    # Define new H3-related attributes
-    new_fields = QgsFields()
-    new_fields.append(QgsField("mgrs", QVariant.String))
-    new_fields.append(QgsField("resolution", QVariant.Int))
-    new_fields.append(QgsField("center_lat", QVariant.Double))
-    new_fields.append(QgsField("center_lon", QVariant.Double))
-    new_fields.append(QgsField("cell_width", QVariant.Double))
-    new_fields.append(QgsField("cell_height", QVariant.Double))
-    new_fields.append(QgsField("cell_area", QVariant.Double))
-    new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-    # Combine original fields and new fields
-    all_fields = QgsFields()
-    for field in original_fields:
-        all_fields.append(field)
-    for field in new_fields:
-        all_fields.append(field)
-
-    mgrs_feature = QgsFeature()
-    mgrs_feature.setGeometry(cell_geometry)
-    mgrs_feature.setFields(all_fields)
-
-    # Combine original attributes with new attributes
-    new_attributes = [
-        mgrs_id,
-        resolution,
-        center_lat,
-        center_lon,
-        cell_width,
-        cell_height,
-        cell_area,
-        cell_perimeter,
-    ]
-    all_attributes = original_attributes + new_attributes
-
-    mgrs_feature.setAttributes(all_attributes)
-
-    return mgrs_feature
+    return _cell_feature(
+        feature, "mgrs", mgrs_id, cell_polygon, resolution, graticule=True
+    )
 
 
 def geohash2qgsfeature(feature, geohash_id):
-    cell_polygon = geohash2geo(geohash_id)
     resolution = len(geohash_id)
-    center_lat, center_lon, cell_width, cell_height, cell_area, cell_perimeter = (
-        graticule_dggs_metrics(cell_polygon)
+    cell_polygon = geohash2geo(geohash_id) if geometry_needed() else None
+    return _cell_feature(
+        feature, "geohash", geohash_id, cell_polygon, resolution, graticule=True
     )
 
-    # Get all attributes from the input feature
-    original_attributes = feature.attributes()
-    original_fields = feature.fields()
-
-    # Define new H3-related attributes
-    new_fields = QgsFields()
-    new_fields.append(QgsField("geohash", QVariant.String))
-    new_fields.append(QgsField("resolution", QVariant.Int))
-    new_fields.append(QgsField("center_lat", QVariant.Double))
-    new_fields.append(QgsField("center_lon", QVariant.Double))
-    new_fields.append(QgsField("cell_width", QVariant.Double))
-    new_fields.append(QgsField("cell_height", QVariant.Double))
-    new_fields.append(QgsField("cell_area", QVariant.Double))
-    new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-    # Combine original fields and new fields
-    all_fields = QgsFields()
-    for field in original_fields:
-        all_fields.append(field)
-    for field in new_fields:
-        all_fields.append(field)
-
-    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-    geohash_feature = QgsFeature()
-    geohash_feature.setGeometry(cell_geometry)
-    geohash_feature.setFields(all_fields)
-
-    # Combine original attributes with new attributes
-    new_attributes = [
-        geohash_id,
-        resolution,
-        center_lat,
-        center_lon,
-        cell_width,
-        cell_height,
-        cell_area,
-        cell_perimeter,
-    ]
-    all_attributes = original_attributes + new_attributes
-
-    geohash_feature.setAttributes(all_attributes)
-
-    return geohash_feature
-
 
 def georef2qgsfeature(feature, georef_id):
     center_lat, center_lon, min_lat, min_lon, max_lat, max_lon, resolution = (
@@ -818,54 +303,10 @@ def georef2qgsfeature(feature, georef_id):
                 [min_lon, min_lat],  # Closing the polygon (same as the first point)
             ]
         )
-
-        center_lat, center_lon, cell_width, cell_height, cell_area, cell_perimeter = (
-            graticule_dggs_metrics(cell_polygon)
+        return _cell_feature(
+            feature, "georef", georef_id, cell_polygon, resolution, graticule=True
         )
 
-        # Get all attributes from the input feature
-        original_attributes = feature.attributes()
-        original_fields = feature.fields()
-
-        # Define new H3-related attributes
-        new_fields = QgsFields()
-        new_fields.append(QgsField("georef", QVariant.String))
-        new_fields.append(QgsField("resolution", QVariant.Int))
-        new_fields.append(QgsField("center_lat", QVariant.Double))
-        new_fields.append(QgsField("center_lon", QVariant.Double))
-        new_fields.append(QgsField("cell_width", QVariant.Double))
-        new_fields.append(QgsField("cell_height", QVariant.Double))
-        new_fields.append(QgsField("cell_area", QVariant.Double))
-        new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-        # Combine original fields and new fields
-        all_fields = QgsFields()
-        for field in original_fields:
-            all_fields.append(field)
-        for field in new_fields:
-            all_fields.append(field)
-
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-        georef_feature = QgsFeature()
-        georef_feature.setGeometry(cell_geometry)
-        georef_feature.setFields(all_fields)
-
-        # Combine original attributes with new attributes
-        new_attributes = [
-            georef_id,
-            resolution,
-            center_lat,
-            center_lon,
-            cell_width,
-            cell_height,
-            cell_area,
-            cell_perimeter,
-        ]
-        all_attributes = original_attributes + new_attributes
-
-        georef_feature.setAttributes(all_attributes)
-
-        return georef_feature
-
 
 def tilecode2qgsfeature(feature, tilecode_id):
     # Extract z, x, y from the tilecode using regex
@@ -894,54 +335,10 @@ def tilecode2qgsfeature(feature, tilecode_id):
                 [min_lon, min_lat],  # Closing the polygon (same as the first point)
             ]
         )
-
-        center_lat, center_lon, cell_width, cell_height, cell_area, cell_perimeter = (
-            graticule_dggs_metrics(cell_polygon)
+        return _cell_feature(
+            feature, "tilecode", tilecode_id, cell_polygon, z, graticule=True
         )
 
-        # Get all attributes from the input feature
-        original_attributes = feature.attributes()
-        original_fields = feature.fields()
-
-        # Define new H3-related attributes
-        new_fields = QgsFields()
-        new_fields.append(QgsField("tilecode", QVariant.String))
-        new_fields.append(QgsField("resolution", QVariant.Int))
-        new_fields.append(QgsField("center_lat", QVariant.Double))
-        new_fields.append(QgsField("center_lon", QVariant.Double))
-        new_fields.append(QgsField("cell_width", QVariant.Double))
-        new_fields.append(QgsField("cell_height", QVariant.Double))
-        new_fields.append(QgsField("cell_area", QVariant.Double))
-        new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-        # Combine original fields and new fields
-        all_fields = QgsFields()
-        for field in original_fields:
-            all_fields.append(field)
-        for field in new_fields:
-            all_fields.append(field)
-
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-        tilecode_feature = QgsFeature()
-        tilecode_feature.setGeometry(cell_geometry)
-        tilecode_feature.setFields(all_fields)
-
-        # Combine original attributes with new attributes
-        new_attributes = [
-            tilecode_id,
-            z,
-            center_lat,
-            center_lon,
-            cell_width,
-            cell_height,
-            cell_area,
-            cell_perimeter,
-        ]
-        all_attributes = original_attributes + new_attributes
-
-        tilecode_feature.setAttributes(all_attributes)
-
-        return tilecode_feature
-
 
 def quadkey2qgsfeature(feature, quadkey_id):
     tile = mercantile.quadkey_to_tile(quadkey_id)
@@ -963,106 +360,18 @@ def quadkey2qgsfeature(feature, quadkey_id):
                 [min_lon, min_lat],  # Closing the polygon (same as the first point)
             ]
         )
-
-        center_lat, center_lon, cell_width, cell_height, cell_area, cell_perimeter = (
-            graticule_dggs_metrics(cell_polygon)
+        return _cell_feature(
+            feature, "quadkey", quadkey_id, cell_polygon, z, graticule=True
         )
 
-        # Get all attributes from the input feature
-        original_attributes = feature.attributes()
-        original_fields = feature.fields()
-
-        # Define new H3-related attributes
-        new_fields = QgsFields()
-        new_fields.append(QgsField("quadkey", QVariant.String))
-        new_fields.append(QgsField("resolution", QVariant.Int))
-        new_fields.append(QgsField("center_lat", QVariant.Double))
-        new_fields.append(QgsField("center_lon", QVariant.Double))
-        new_fields.append(QgsField("cell_width", QVariant.Double))
-        new_fields.append(QgsField("cell_height", QVariant.Double))
-        new_fields.append(QgsField("cell_area", QVariant.Double))
-        new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-        # Combine original fields and new fields
-        all_fields = QgsFields()
-        for field in original_fields:
-            all_fields.append(field)
-        for field in new_fields:
-            all_fields.append(field)
-
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-        quadkey_feature = QgsFeature()
-        quadkey_feature.setGeometry(cell_geometry)
-        quadkey_feature.setFields(all_fields)
-
-        # Combine original attributes with new attributes
-        new_attributes = [
-            quadkey_id,
-            z,
-            center_lat,
-            center_lon,
-            cell_width,
-            cell_height,
-            cell_area,
-            cell_perimeter,
-        ]
-        all_attributes = original_attributes + new_attributes
-
-        quadkey_feature.setAttributes(all_attributes)
-
-        return quadkey_feature
-
 
 def maidenhead2qgsfeature(feature, maidenhead_id):
-    cell_polygon = maidenhead2geo(maidenhead_id)
     resolution = int(len(maidenhead_id) / 2)
-
-    center_lat, center_lon, cell_width, cell_height, cell_area, cell_perimeter = (
-        graticule_dggs_metrics(cell_polygon)
+    cell_polygon = maidenhead2geo(maidenhead_id) if geometry_needed() else None
+    return _cell_feature(
+        feature, "maidenhead", maidenhead_id, cell_polygon, resolution, graticule=True
     )
 
-    # Get all attributes from the input feature
-    original_attributes = feature.attributes()
-    original_fields = feature.fields()
-
-    # Define new H3-related attributes
-    new_fields = QgsFields()
-    new_fields.append(QgsField("maidenhead", QVariant.String))
-    new_fields.append(QgsField("resolution", QVariant.Int))
-    new_fields.append(QgsField("center_lat", QVariant.Double))
-    new_fields.append(QgsField("center_lon", QVariant.Double))
-    new_fields.append(QgsField("cell_width", QVariant.Double))
-    new_fields.append(QgsField("cell_height", QVariant.Double))
-    new_fields.append(QgsField("cell_area", QVariant.Double))
-    new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-    # Combine original fields and new fields
-    all_fields = QgsFields()
-    for field in original_fields:
-        all_fields.append(field)
-    for field in new_fields:
-        all_fields.append(field)
-
-    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-    maidenhead_feature = QgsFeature()
-    maidenhead_feature.setGeometry(cell_geometry)
-    maidenhead_feature.setFields(all_fields)
-
-    # Combine original attributes with new attributes
-    new_attributes = [
-        maidenhead_id,
-        resolution,
-        center_lat,
-        center_lon,
-        cell_width,
-        cell_height,
-        cell_area,
-        cell_perimeter,
-    ]
-    all_attributes = original_attributes + new_attributes
-
-    maidenhead_feature.setAttributes(all_attributes)
-
-    return maidenhead_feature
-
 
 def gars2qgsfeature(feature, gars_id):
     # Create a GARS grid object and retrieve the polygon
@@ -1098,110 +407,138 @@ def gars2qgsfeature(feature, gars_id):
                 [min_lon, min_lat],  # Closing the polygon (same as the first point)
             ]
         )
-
-        center_lat, center_lon, cell_width, cell_height, cell_area, cell_perimeter = (
-            graticule_dggs_metrics(cell_polygon)
+        return _cell_feature(
+            feature, "gars", gars_id, cell_polygon, resolution, graticule=True
         )
 
-        # Get all attributes from the input feature
-        original_attributes = feature.attributes()
-        original_fields = feature.fields()
-
-        # Define new H3-related attributes
-        new_fields = QgsFields()
-        new_fields.append(QgsField("gars", QVariant.String))
-        new_fields.append(QgsField("resolution", QVariant.Int))
-        new_fields.append(QgsField("center_lat", QVariant.Double))
-        new_fields.append(QgsField("center_lon", QVariant.Double))
-        new_fields.append(QgsField("cell_width", QVariant.Double))
-        new_fields.append(QgsField("cell_height", QVariant.Double))
-        new_fields.append(QgsField("cell_area", QVariant.Double))
-        new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-        # Combine original fields and new fields
-        all_fields = QgsFields()
-        for field in original_fields:
-            all_fields.append(field)
-        for field in new_fields:
-            all_fields.append(field)
-
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-        gars_feature = QgsFeature()
-        gars_feature.setGeometry(cell_geometry)
-        gars_feature.setFields(all_fields)
-
-        # Combine original attributes with new attributes
-        new_attributes = [
-            gars_id,
-            resolution,
-            center_lat,
-            center_lon,
-            cell_width,
-            cell_height,
-            cell_area,
-            cell_perimeter,
-        ]
-        all_attributes = original_attributes + new_attributes
-
-        gars_feature.setAttributes(all_attributes)
-
-        return gars_feature
-
 
 def digipin2qgsfeature(feature, digipin_id):
-    cell_polygon = digipin2geo(digipin_id)
     clean_id = digipin_id.replace("-", "")
     resolution = len(clean_id)
-
-    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-
-    digipin_feature = QgsFeature()
-    digipin_feature.setGeometry(cell_geometry)
-
-    # Get all attributes from the input feature
-    original_attributes = feature.attributes()
-    original_fields = feature.fields()
-
-    # Define new DIGIPIN-related attributes
-    new_fields = QgsFields()
-    new_fields.append(QgsField("digipin", QVariant.String))
-    new_fields.append(QgsField("resolution", QVariant.Int))
-    new_fields.append(QgsField("center_lat", QVariant.Double))
-    new_fields.append(QgsField("center_lon", QVariant.Double))
-    new_fields.append(QgsField("cell_width", QVariant.Double))
-    new_fields.append(QgsField("cell_height", QVariant.Double))
-    new_fields.append(QgsField("cell_area", QVariant.Double))
-    new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-
-    # Combine original fields and new fields
-    all_fields = QgsFields()
-    for field in original_fields:
-        all_fields.append(field)
-    for field in new_fields:
-        all_fields.append(field)
-
-    digipin_feature.setFields(all_fields)
-
-    # Calculate metrics
-    center_lat, center_lon, cell_width, cell_height, cell_area, cell_perimeter = (
-        graticule_dggs_metrics(cell_polygon)
+    cell_polygon = digipin2geo(digipin_id) if geometry_needed() else None
+    return _cell_feature(
+        feature, "digipin", digipin_id, cell_polygon, resolution, graticule=True
     )
 
-    # Combine original attributes with new attributes
-    new_attributes = [
-        digipin_id,
-        resolution,
-        center_lat,
-        center_lon,
-        cell_width,
-        cell_height,
-        cell_area,
-        cell_perimeter,
-    ]
-    all_attributes = original_attributes + new_attributes
 
-    digipin_feature.setAttributes(all_attributes)
+# Converters that build graticule (width/height) metrics
+GRATICULE_TYPES = (
+    "olc",
+    "mgrs",
+    "geohash",
+    "georef",
+    "tilecode",
+    "quadkey",
+    "maidenhead",
+    "gars",
+    "digipin",
+)
+
+# Decoded cells kept across chunks; at least one chunk of distinct IDs
+DECODED_CELLS_MAX = 5 * SINK_BATCH_SIZE
 
-    return digipin_feature
+
+class CellIDDecoder:
+    """Output features for the cell ids of input rows, decoding each id once.
+
+    Rows are joined a chunk at a time: the distinct ids of a chunk that are
+    not cached yet are decoded together, their metrics computed in one
+    columnar ``CellBatch``, and the result kept in an LRU of
+    ``DECODED_CELLS_MAX`` cells, so rows sharing a cell id (event tables keyed
+    by H3 and the like) reuse it without the cache growing with the table.
+    *conversion_function* is one of the ``*2qgsfeature`` functions above;
+    *graticule* tells whether it writes graticule metrics.
+    """
+
+    def __init__(self, conversion_function, out_fields, graticule=False, mode=None):
+        self.conversion_function = conversion_function
+        self.out_fields = out_fields
+        self.graticule = graticule
+        self.mode = current_output_mode() if mode is None else mode
+        # (type, id) -> (geometry, cell attributes), None or the decoding error
+        self.cells = OrderedDict()
+        self.decoded = 0
+
+    def __len__(self):
+        return len(self.cells)
+
+    def _remember(self, key, cell):
+        self.cells[key] = cell
+        self.cells.move_to_end(key)
+        while len(self.cells) > DECODED_CELLS_MAX:
+            self.cells.popitem(last=False)
+
+    def _decode(self, cell_ids):
+        """Decode the *cell_ids* (``{key: cell_id}``) missing from the cache."""
+        self.decoded += len(cell_ids)
+        # Cells rows first, metrics for all of them at once; no input attributes
+        batch = CellBatch(None, "cell_id", self.graticule, self.mode, stream=False)
+        keys = []
+        rows = []
+        for key, cell_id in cell_ids.items():
+            try:
+                if self.mode == OUTPUT_ID:
+                    cell_feature = self.conversion_function(QgsFeature(), cell_id)
+                    cell = (None, cell_feature.attributes()) if cell_feature else None
+                else:
+                    with output_mode(OUTPUT_CELLS):
+                        row = self.conversion_function(QgsFeature(), cell_id)
+                    if row:
+                        batch.add(*row)
+                        keys.append(key)
+                        rows.append(row)
+                        continue
+                    cell = None
+            except Exception as e:
+                cell = e
+            self._remember(key, cell)
+        try:
+            cell_features = batch.features()
+        except Exception:
+            # One bad cell fails the whole batch: redo the cells one by one
+            cell_features = []
+            for row in rows:
+                single = batch.empty()
+                single.add(*row)
+                try:
+                    cell_features.append(single.features()[0])
+                except Exception as e:
+                    cell_features.append(e)
+        for key, cell_feature in zip(keys, cell_features):
+            if not isinstance(cell_feature, Exception):
+                geometry = (
+                    cell_feature.geometry() if cell_feature.hasGeometry() else None
+                )
+                cell_feature = (geometry, cell_feature.attributes())
+            self._remember(key, cell_feature)
+
+    def features(self, features, cell_ids):
+        """Yield ``(feature, out_feature, error)`` for a chunk of input rows.
+
+        *out_feature* is *feature* joined to the cell of its id in *cell_ids*,
+        or None for ids the DGGS does not decode or that raised *error*.
+        """
+        keys = [(type(cell_id).__name__, str(cell_id)) for cell_id in cell_ids]
+        missing = {}
+        for key, cell_id in zip(keys, cell_ids):
+            if key in self.cells:
+                self.cells.move_to_end(key)
+            else:
+                missing[key] = cell_id
+        if missing:
+            self._decode(missing)
+
+        for feature, key in zip(features, keys):
+            cell = self.cells[key]
+            if cell is None or isinstance(cell, Exception):
+                yield feature, None, cell
+                continue
+            geometry, attributes = cell
+            out_feature = QgsFeature(self.out_fields)
+            if geometry is not None:
+                out_feature.setGeometry(geometry)
+            out_feature.setAttributes(list(feature.attributes()) + attributes)
+            yield feature, out_feature, None
 
 
 def dggrid_join_qgsfeature(feature, cell_id, lookup, dggs_type, out_fields):
@@ -1217,19 +554,14 @@ def dggrid_join_qgsfeature(feature, cell_id, lookup, dggs_type, out_fields):
     if not cell_info:
         raise ValueError(f"DGGRID cell not found: {cell_id_str}")
 
+    mode = current_output_mode()
     out_feature = QgsFeature(out_fields)
-    out_feature.setGeometry(QgsGeometry.fromWkt(cell_info["geometry"].wkt))
+    if mode != OUTPUT_ID:
+        out_feature.setGeometry(QgsGeometry.fromWkt(cell_info["geometry"].wkt))
     out_feature.setAttributes(
         list(feature.attributes())
-        + [
-            cell_info["cell_id"],
-            cell_info["resolution"],
-            cell_info["center_lat"],
-            cell_info["center_lon"],
-            cell_info["avg_edge_len"],
-            cell_info["cell_area"],
-            cell_info["cell_perimeter"],
-        ]
+        + [cell_info["cell_id"], cell_info["resolution"]]
+        + [cell_info[name] for name in output_metric_fields(mode=mode)]
     )
     return out_feature
 
@@ -1318,14 +650,8 @@ def dggrid2qgsfeature(feature, cell_id, dggs_type, resolution):
     out_fields = QgsFields()
     for fld in feature.fields():
         out_fields.append(fld)
-    for name, qtype in (
-        (field_name, QVariant.String),
-        ("resolution", QVariant.Int),
-        ("center_lat", QVariant.Double),
-        ("center_lon", QVariant.Double),
-        ("avg_edge_len", QVariant.Double),
-        ("cell_area", QVariant.Double),
-        ("cell_perimeter", QVariant.Double),
-    ):
-        out_fields.append(QgsField(name, qtype))
+    out_fields.append(QgsField(field_name, QVariant.String))
+    out_fields.append(QgsField("resolution", QVariant.Int))
+    for name in output_metric_fields(mode=current_output_mode()):
+        out_fields.append(QgsField(name, QVariant.Double))
     return dggrid_join_qgsfeature(feature, cell_id, lookup, dggs_type, out_fields)
@@ -1,10 +1,5 @@
-from qgis.PyQt.QtCore import QVariant
 from qgis.core import (
     QgsVectorLayer,
-    QgsFeature,
-    QgsGeometry,
-    QgsField,
-    QgsFields,
     QgsProcessingException,
 )
 from vgrid.dggs import s2
@@ -30,10 +25,6 @@ if platform.system() == "Windows":
     isea3h_dggs = Eaggr(Model.ISEA3H)
     isea4t_dggs = Eaggr(Model.ISEA4T)
 
-from vgrid.utils.geometry import (
-    graticule_dggs_metrics,
-    geodesic_dggs_metrics,
-)
 from vgrid.conversion.dggs2geo.h32geo import h32geo
 from vgrid.conversion.dggs2geo.s22geo import s22geo
 from vgrid.conversion.dggs2geo.a52geo import a52geo
@@ -61,6 +52,8 @@ from vgrid.conversion.dggscompact.digipincompact import digipin_compact
 from vgrid.conversion.dggscompact import *
 from pyproj import Geod
 
+from .cell_batch import CellBatch, cell_memory_layer
+
 geod = Geod(ellps="WGS84")
 E = WGS84_ELLIPSOID
 
@@ -74,20 +67,9 @@ def h3compact(
     if not H3ID_field:
         H3ID_field = "h3"
 
-    fields = QgsFields()
-    fields.append(QgsField("h3", QVariant.String))
-    fields.append(QgsField("resolution", QVariant.Int))
-    fields.append(QgsField("center_lat", QVariant.Double))
-    fields.append(QgsField("center_lon", QVariant.Double))
-    fields.append(QgsField("avg_edge_len", QVariant.Double))
-    fields.append(QgsField("cell_area", QVariant.Double))
-    fields.append(QgsField("cell_perimeter", QVariant.Double))
-
     crs = h3_layer.crs().toWkt()
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "h3_compacted", "memory")
+    mem_layer = cell_memory_layer(crs, "h3_compacted", "h3")
     mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
 
     h3_ids = [
         feature[H3ID_field] for feature in h3_layer.getFeatures() if feature[H3ID_field]
@@ -104,6 +86,7 @@ def h3compact(
 
         total_cells = len(h3_ids_compact)
 
+        batch = CellBatch(None, "h3")
         for i, h3_id_compact in enumerate(h3_ids_compact):
             if feedback:
                 feedback.setProgress(int((i / total_cells) * 100))
@@ -117,25 +100,10 @@ def h3compact(
 
             resolution = h3.get_resolution(h3_id_compact)
             num_edges = 5 if h3.is_pentagon(h3_id_compact) else 6
-            center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-                geodesic_dggs_metrics(cell_polygon, num_edges)
-            )
 
-            cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
-            h3_feature = QgsFeature(fields)
-            h3_feature.setGeometry(cell_geom)
-
-            attributes = {
-                "h3": h3_id_compact,
-                "resolution": resolution,
-                "center_lat": center_lat,
-                "center_lon": center_lon,
-                "avg_edge_len": avg_edge_len,
-                "cell_area": cell_area,
-                "cell_perimeter": cell_perimeter,
-            }
-            h3_feature.setAttributes([attributes[field.name()] for field in fields])
-            mem_provider.addFeatures([h3_feature])
+            batch.add(h3_id_compact, cell_polygon, resolution, num_edges)
+            batch.flush(mem_provider, feedback)
+        batch.flush(mem_provider, feedback, 0)
 
         if feedback:
             feedback.setProgress(100)
@@ -153,19 +121,9 @@ def s2compact(
     if not S2ID_field:
         S2ID_field = "s2"
 
-    fields = QgsFields()
-    fields.append(QgsField("s2", QVariant.String))
-    fields.append(QgsField("resolution", QVariant.Int))
-    fields.append(QgsField("center_lat", QVariant.Double))
-    fields.append(QgsField("center_lon", QVariant.Double))
-    fields.append(QgsField("avg_edge_len", QVariant.Double))
-    fields.append(QgsField("cell_area", QVariant.Double))
-    fields.append(QgsField("cell_perimeter", QVariant.Double))
     crs = s2_layer.crs().toWkt()
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "s2_compacted", "memory")
+    mem_layer = cell_memory_layer(crs, "s2_compacted", "s2")
     mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
 
     s2_tokens = [
         feature[S2ID_field] for feature in s2_layer.getFeatures() if feature[S2ID_field]
@@ -185,6 +143,7 @@ def s2compact(
 
     total_cells = len(s2_tokens_compact)
 
+    batch = CellBatch(None, "s2")
     for i, s2_token_compact in enumerate(s2_tokens_compact):
         if feedback:
             feedback.setProgress(int((i / total_cells) * 100))
@@ -198,25 +157,10 @@ def s2compact(
 
         resolution = s2.CellId.from_token(s2_token_compact).level()
         num_edges = 4
-        center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-            geodesic_dggs_metrics(cell_polygon, num_edges)
-        )
 
-        cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
-        s2_feature = QgsFeature(fields)
-        s2_feature.setGeometry(cell_geom)
-
-        attributes = {
-            "s2": s2_token_compact,
-            "resolution": resolution,
-            "center_lat": center_lat,
-            "center_lon": center_lon,
-            "avg_edge_len": avg_edge_len,
-            "cell_area": cell_area,
-            "cell_perimeter": cell_perimeter,
-        }
-        s2_feature.setAttributes([attributes[field.name()] for field in fields])
-        mem_provider.addFeatures([s2_feature])
+        batch.add(s2_token_compact, cell_polygon, resolution, num_edges)
+        batch.flush(mem_provider, feedback)
+    batch.flush(mem_provider, feedback, 0)
 
     if feedback:
         feedback.setProgress(100)
@@ -234,19 +178,9 @@ def a5compact(
     if not A5ID_field:
         A5ID_field = "a5"
 
-    fields = QgsFields()
-    fields.append(QgsField("a5", QVariant.String))
-    fields.append(QgsField("resolution", QVariant.Int))
-    fields.append(QgsField("center_lat", QVariant.Double))
-    fields.append(QgsField("center_lon", QVariant.Double))
-    fields.append(QgsField("avg_edge_len", QVariant.Double))
-    fields.append(QgsField("cell_area", QVariant.Double))
-    fields.append(QgsField("cell_perimeter", QVariant.Double))
     crs = a5_layer.crs().toWkt()
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "a5_compacted", "memory")
+    mem_layer = cell_memory_layer(crs, "a5_compacted", "a5")
     mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
 
     a5_hexes = [
         feature[A5ID_field] for feature in a5_layer.getFeatures() if feature[A5ID_field]
@@ -263,6 +197,7 @@ def a5compact(
 
         total_cells = len(a5_hexes_compact)
 
+        batch = CellBatch(None, "a5")
         for i, a5_hex_compact in enumerate(a5_hexes_compact):
             if feedback:
                 feedback.setProgress(int((i / total_cells) * 100))
@@ -281,25 +216,10 @@ def a5compact(
 
             resolution = a5.get_resolution(a5.hex_to_u64(a5_hex_compact))
             num_edges = 5  # A5 cells are pentagons
-            center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-                geodesic_dggs_metrics(cell_polygon, num_edges)
-            )
 
-            cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
-            a5_feature = QgsFeature(fields)
-            a5_feature.setGeometry(cell_geom)
-
-            attributes = {
-                "a5": a5_hex_compact,
-                "resolution": resolution,
-                "center_lat": center_lat,
-                "center_lon": center_lon,
-                "avg_edge_len": avg_edge_len,
-                "cell_area": cell_area,
-                "cell_perimeter": cell_perimeter,
-            }
-            a5_feature.setAttributes([attributes[field.name()] for field in fields])
-            mem_provider.addFeatures([a5_feature])
+            batch.add(a5_hex_compact, cell_polygon, resolution, num_edges)
+            batch.flush(mem_provider, feedback)
+        batch.flush(mem_provider, feedback, 0)
 
         if feedback:
             feedback.setProgress(100)
@@ -319,19 +239,9 @@ def rhealpixcompact(
 
     rhealpix_dggs = RHEALPixDGGS()
 
-    fields = QgsFields()
-    fields.append(QgsField("rhealpix", QVariant.String))
-    fields.append(QgsField("resolution", QVariant.Int))
-    fields.append(QgsField("center_lat", QVariant.Double))
-    fields.append(QgsField("center_lon", QVariant.Double))
-    fields.append(QgsField("avg_edge_len", QVariant.Double))
-    fields.append(QgsField("cell_area", QVariant.Double))
-    fields.append(QgsField("cell_perimeter", QVariant.Double))
     crs = rhealpix_layer.crs().toWkt()
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "rhealpix_compacted", "memory")
+    mem_layer = cell_memory_layer(crs, "rhealpix_compacted", "rhealpix")
     mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
 
     rhealpix_ids = [
         feature[rHEALPixID_field]
@@ -349,6 +259,7 @@ def rhealpixcompact(
 
         total_cells = len(rhealpix_ids_compact)
 
+        batch = CellBatch(None, "rhealpix")
         for i, rhealpix_id_compact in enumerate(rhealpix_ids_compact):
             if feedback:
                 feedback.setProgress(int((i / total_cells) * 100))
@@ -368,27 +279,9 @@ def rhealpixcompact(
             resolution = rhealpix_cell.resolution
             num_edges = 3 if rhealpix_cell.ellipsoidal_shape() == "dart" else 4
 
-            center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-                geodesic_dggs_metrics(cell_polygon, num_edges)
-            )
-
-            cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
-            rhealpix_feature = QgsFeature(fields)
-            rhealpix_feature.setGeometry(cell_geom)
-
-            attributes = {
-                "rhealpix": rhealpix_id_compact,
-                "resolution": resolution,
-                "center_lat": center_lat,
-                "center_lon": center_lon,
-                "avg_edge_len": avg_edge_len,
-                "cell_area": cell_area,
-                "cell_perimeter": cell_perimeter,
-            }
-            rhealpix_feature.setAttributes(
-                [attributes[field.name()] for field in fields]
-            )
-            mem_provider.addFeatures([rhealpix_feature])
+            batch.add(rhealpix_id_compact, cell_polygon, resolution, num_edges)
+            batch.flush(mem_provider, feedback)
+        batch.flush(mem_provider, feedback, 0)
 
         if feedback:
             feedback.setProgress(100)
@@ -407,19 +300,9 @@ def isea4tcompact(
         if not ISEA4TID_field:
             ISEA4TID_field = "isea4t"
 
-        fields = QgsFields()
-        fields.append(QgsField("isea4t", QVariant.String))
-        fields.append(QgsField("resolution", QVariant.Int))
-        fields.append(QgsField("center_lat", QVariant.Double))
-        fields.append(QgsField("center_lon", QVariant.Double))
-        fields.append(QgsField("avg_edge_len", QVariant.Double))
-        fields.append(QgsField("cell_area", QVariant.Double))
-        fields.append(QgsField("cell_perimeter", QVariant.Double))
         crs = isea4t_layer.crs().toWkt()
-        mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "isea4t_compacted", "memory")
+        mem_layer = cell_memory_layer(crs, "isea4t_compacted", "isea4t")
         mem_provider = mem_layer.dataProvider()
-        mem_provider.addAttributes(fields)
-        mem_layer.updateFields()
 
         isea4t_ids = [
             feature[ISEA4TID_field]
@@ -437,6 +320,7 @@ def isea4tcompact(
 
             total_cells = len(isea4t_ids_compact)
 
+            batch = CellBatch(None, "isea4t")
             for i, isea4t_id_compact in enumerate(isea4t_ids_compact):
                 if feedback:
                     feedback.setProgress(int((i / total_cells) * 100))
@@ -448,27 +332,9 @@ def isea4tcompact(
                 resolution = get_isea4t_resolution(isea4t_id_compact)
                 num_edges = 3
 
-                center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-                    geodesic_dggs_metrics(cell_polygon, num_edges)
-                )
-
-                cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
-                ISEA4T_feature = QgsFeature(fields)
-                ISEA4T_feature.setGeometry(cell_geom)
-
-                attributes = {
-                    "isea4t": isea4t_id_compact,
-                    "resolution": resolution,
-                    "center_lat": center_lat,
-                    "center_lon": center_lon,
-                    "avg_edge_len": avg_edge_len,
-                    "cell_area": cell_area,
-                    "cell_perimeter": cell_perimeter,
-                }
-                ISEA4T_feature.setAttributes(
-                    [attributes[field.name()] for field in fields]
-                )
-                mem_provider.addFeatures([ISEA4T_feature])
+                batch.add(isea4t_id_compact, cell_polygon, resolution, num_edges)
+                batch.flush(mem_provider, feedback)
+            batch.flush(mem_provider, feedback, 0)
 
             if feedback:
                 feedback.setProgress(100)
@@ -487,19 +353,9 @@ def isea3hcompact(
         if not ISEA3HID_field:
             ISEA3HID_field = "isea3h"
 
-        fields = QgsFields()
-        fields.append(QgsField("isea3h", QVariant.String))
-        fields.append(QgsField("resolution", QVariant.Int))
-        fields.append(QgsField("center_lat", QVariant.Double))
-        fields.append(QgsField("center_lon", QVariant.Double))
-        fields.append(QgsField("avg_edge_len", QVariant.Double))
-        fields.append(QgsField("cell_area", QVariant.Double))
-        fields.append(QgsField("cell_perimeter", QVariant.Double))
         crs = isea3h_layer.crs().toWkt()
-        mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "isea3h_compacted", "memory")
+        mem_layer = cell_memory_layer(crs, "isea3h_compacted", "isea3h")
         mem_provider = mem_layer.dataProvider()
-        mem_provider.addAttributes(fields)
-        mem_layer.updateFields()
 
         isea3h_ids = [
             feature[ISEA3HID_field]
@@ -517,6 +373,7 @@ def isea3hcompact(
 
             total_cells = len(isea3h_ids_compact)
 
+            batch = CellBatch(None, "isea3h")
             for i, isea3h_id_compact in enumerate(isea3h_ids_compact):
                 if feedback:
                     feedback.setProgress(int((i / total_cells) * 100))
@@ -527,28 +384,9 @@ def isea3hcompact(
                 cell_resolution = get_isea3h_resolution(isea3h_id_compact)
                 num_edges = 6
 
-                center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-                    geodesic_dggs_metrics(cell_polygon, num_edges)
-                )
-
-                cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
-                isea3h_feature = QgsFeature(fields)
-                isea3h_feature.setGeometry(cell_geom)
-
-                attributes = {
-                    "isea3h": isea3h_id_compact,
-                    "resolution": cell_resolution,
-                    "center_lat": center_lat,
-                    "center_lon": center_lon,
-                    "avg_edge_len": avg_edge_len,
-                    "cell_area": cell_area,
-                    "cell_perimeter": cell_perimeter,
-                }
-
-                isea3h_feature.setAttributes(
-                    [attributes[field.name()] for field in fields]
-                )
-                mem_provider.addFeatures([isea3h_feature])
+                batch.add(isea3h_id_compact, cell_polygon, cell_resolution, num_edges)
+                batch.flush(mem_provider, feedback)
+            batch.flush(mem_provider, feedback, 0)
 
             if feedback:
                 feedback.setProgress(100)
@@ -566,19 +404,9 @@ def qtmcompact(
     if not QTMID_field:
         QTMID_field = "qtm"
 
-    fields = QgsFields()
-    fields.append(QgsField("qtm", QVariant.String))
-    fields.append(QgsField("resolution", QVariant.Int))
-    fields.append(QgsField("center_lat", QVariant.Double))
-    fields.append(QgsField("center_lon", QVariant.Double))
-    fields.append(QgsField("avg_edge_len", QVariant.Double))
-    fields.append(QgsField("cell_area", QVariant.Double))
-    fields.append(QgsField("cell_perimeter", QVariant.Double))
     crs = qtm_layer.crs().toWkt()
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "qtm_compacted", "memory")
+    mem_layer = cell_memory_layer(crs, "qtm_compacted", "qtm")
     mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
 
     qtm_ids = [
         feature[QTMID_field]
@@ -596,6 +424,7 @@ def qtmcompact(
 
         total_cells = len(qtm_ids_compact)
 
+        batch = CellBatch(None, "qtm")
         for i, qtm_id_compact in enumerate(qtm_ids_compact):
             if feedback:
                 feedback.setProgress(int((i / total_cells) * 100))
@@ -604,25 +433,10 @@ def qtmcompact(
             cell_polygon = qtm2geo(qtm_id_compact)
             resolution = get_qtm_resolution(qtm_id_compact)
             num_edges = 3
-            center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-                geodesic_dggs_metrics(cell_polygon, num_edges)
-            )
 
-            cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
-            qtm_feature = QgsFeature(fields)
-            qtm_feature.setGeometry(cell_geom)
-
-            attributes = {
-                "qtm": qtm_id_compact,
-                "resolution": resolution,
-                "center_lat": center_lat,
-                "center_lon": center_lon,
-                "avg_edge_len": avg_edge_len,
-                "cell_area": cell_area,
-                "cell_perimeter": cell_perimeter,
-            }
-            qtm_feature.setAttributes([attributes[field.name()] for field in fields])
-            mem_provider.addFeatures([qtm_feature])
+            batch.add(qtm_id_compact, cell_polygon, resolution, num_edges)
+            batch.flush(mem_provider, feedback)
+        batch.flush(mem_provider, feedback, 0)
 
         if feedback:
             feedback.setProgress(100)
@@ -640,20 +454,9 @@ def olccompact(
     if not OLCID_field:
         OLCID_field = "olc"
 
-    fields = QgsFields()
-    fields.append(QgsField("olc", QVariant.String))
-    fields.append(QgsField("resolution", QVariant.Int))
-    fields.append(QgsField("center_lat", QVariant.Double))
-    fields.append(QgsField("center_lon", QVariant.Double))
-    fields.append(QgsField("cell_width", QVariant.Double))
-    fields.append(QgsField("cell_height", QVariant.Double))
-    fields.append(QgsField("cell_area", QVariant.Double))
-    fields.append(QgsField("cell_perimeter", QVariant.Double))
     crs = olc_layer.crs().toWkt()
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "olc_compacted", "memory")
+    mem_layer = cell_memory_layer(crs, "olc_compacted", "olc", graticule=True)
     mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
 
     olc_ids = [
         feature[OLCID_field]
@@ -671,6 +474,7 @@ def olccompact(
 
         total_cells = len(olc_ids_compact)
 
+        batch = CellBatch(None, "olc", graticule=True)
         for i, olc_id_compact in enumerate(olc_ids_compact):
             if feedback:
                 feedback.setProgress(int((i / total_cells) * 100))
@@ -678,30 +482,10 @@ def olccompact(
                     return None
             cell_polygon = olc2geo(olc_id_compact)
             cell_resolution = get_olc_resolution(olc_id_compact)
-            (
-                center_lat,
-                center_lon,
-                cell_width,
-                cell_height,
-                cell_area,
-                cell_perimeter,
-            ) = graticule_dggs_metrics(cell_polygon)
-
-            cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
-            olc_feature = QgsFeature(fields)
-            olc_feature.setGeometry(cell_geom)
-            attributes = {
-                "olc": olc_id_compact,
-                "resolution": cell_resolution,
-                "center_lat": center_lat,
-                "center_lon": center_lon,
-                "cell_width": cell_width,
-                "cell_height": cell_height,
-                "cell_area": cell_area,
-                "cell_perimeter": cell_perimeter,
-            }
-            olc_feature.setAttributes([attributes[field.name()] for field in fields])
-            mem_provider.addFeatures([olc_feature])
+
+            batch.add(olc_id_compact, cell_polygon, cell_resolution)
+            batch.flush(mem_provider, feedback)
+        batch.flush(mem_provider, feedback, 0)
 
         if feedback:
             feedback.setProgress(100)
@@ -719,20 +503,9 @@ def geohashcompact(
     if not GeohashID_field:
         GeohashID_field = "geohash"
 
-    fields = QgsFields()
-    fields.append(QgsField("geohash", QVariant.String))
-    fields.append(QgsField("resolution", QVariant.Int))
-    fields.append(QgsField("center_lat", QVariant.Double))
-    fields.append(QgsField("center_lon", QVariant.Double))
-    fields.append(QgsField("cell_width", QVariant.Double))
-    fields.append(QgsField("cell_height", QVariant.Double))
-    fields.append(QgsField("cell_area", QVariant.Double))
-    fields.append(QgsField("cell_perimeter", QVariant.Double))
     crs = geohash_layer.crs().toWkt()
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "geohash_compacted", "memory")
+    mem_layer = cell_memory_layer(crs, "geohash_compacted", "geohash", graticule=True)
     mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
 
     geohash_ids = [
         feature[GeohashID_field]
@@ -750,6 +523,7 @@ def geohashcompact(
 
         total_cells = len(geohash_ids_compact)
 
+        batch = CellBatch(None, "geohash", graticule=True)
         for i, geohash_id_compact in enumerate(geohash_ids_compact):
             if feedback:
                 feedback.setProgress(int((i / total_cells) * 100))
@@ -757,33 +531,10 @@ def geohashcompact(
                     return None
             cell_polygon = geohash2geo(geohash_id_compact)
             resolution = get_geohash_resolution(geohash_id_compact)
-            (
-                center_lat,
-                center_lon,
-                cell_width,
-                cell_height,
-                cell_area,
-                cell_perimeter,
-            ) = graticule_dggs_metrics(cell_polygon)
-
-            cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
-            geohash_feature = QgsFeature(fields)
-            geohash_feature.setGeometry(cell_geom)
-
-            attributes = {
-                "geohash": geohash_id_compact,
-                "resolution": resolution,
-                "center_lat": center_lat,
-                "center_lon": center_lon,
-                "cell_width": cell_width,
-                "cell_height": cell_height,
-                "cell_area": cell_area,
-                "cell_perimeter": cell_perimeter,
-            }
-            geohash_feature.setAttributes(
-                [attributes[field.name()] for field in fields]
-            )
-            mem_provider.addFeatures([geohash_feature])
+
+            batch.add(geohash_id_compact, cell_polygon, resolution)
+            batch.flush(mem_provider, feedback)
+        batch.flush(mem_provider, feedback, 0)
 
         if feedback:
             feedback.setProgress(100)
@@ -801,20 +552,9 @@ def tilecodecompact(
     if not TilecodeID_field:
         TilecodeID_field = "tilecode"
 
-    fields = QgsFields()
-    fields.append(QgsField("tilecode", QVariant.String))
-    fields.append(QgsField("resolution", QVariant.Int))
-    fields.append(QgsField("center_lat", QVariant.Double))
-    fields.append(QgsField("center_lon", QVariant.Double))
-    fields.append(QgsField("cell_width", QVariant.Double))
-    fields.append(QgsField("cell_height", QVariant.Double))
-    fields.append(QgsField("cell_area", QVariant.Double))
-    fields.append(QgsField("cell_perimeter", QVariant.Double))
     crs = tilecode_layer.crs().toWkt()
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "tilecode_compacted", "memory")
+    mem_layer = cell_memory_layer(crs, "tilecode_compacted", "tilecode", graticule=True)
     mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
 
     tilecode_ids = [
         feature[TilecodeID_field]
@@ -832,6 +572,7 @@ def tilecodecompact(
 
         total_cells = len(tilecode_ids_compact)
 
+        batch = CellBatch(None, "tilecode", graticule=True)
         for i, tilecode_id_compact in enumerate(tilecode_ids_compact):
             if feedback:
                 feedback.setProgress(int((i / total_cells) * 100))
@@ -839,33 +580,10 @@ def tilecodecompact(
                     return None
             cell_polygon = tilecode2geo(tilecode_id_compact)
             resolution = tilecode_resolution(tilecode_id_compact)
-            (
-                center_lat,
-                center_lon,
-                cell_width,
-                cell_height,
-                cell_area,
-                cell_perimeter,
-            ) = graticule_dggs_metrics(cell_polygon)
-
-            cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
-            tilecode_feature = QgsFeature(fields)
-            tilecode_feature.setGeometry(cell_geom)
-
-            attributes = {
-                "tilecode": tilecode_id_compact,
-                "resolution": resolution,
-                "center_lat": center_lat,
-                "center_lon": center_lon,
-                "cell_width": cell_width,
-                "cell_height": cell_height,
-                "cell_area": cell_area,
-                "cell_perimeter": cell_perimeter,
-            }
-            tilecode_feature.setAttributes(
-                [attributes[field.name()] for field in fields]
-            )
-            mem_provider.addFeatures([tilecode_feature])
+
+            batch.add(tilecode_id_compact, cell_polygon, resolution)
+            batch.flush(mem_provider, feedback)
+        batch.flush(mem_provider, feedback, 0)
 
         if feedback:
             feedback.setProgress(100)
@@ -883,20 +601,9 @@ def quadkeycompact(
     if not QuadkeyID_field:
         QuadkeyID_field = "quadkey"
 
-    fields = QgsFields()
-    fields.append(QgsField("quadkey", QVariant.String))
-    fields.append(QgsField("resolution", QVariant.Int))
-    fields.append(QgsField("center_lat", QVariant.Double))
-    fields.append(QgsField("center_lon", QVariant.Double))
-    fields.append(QgsField("cell_width", QVariant.Double))
-    fields.append(QgsField("cell_height", QVariant.Double))
-    fields.append(QgsField("cell_area", QVariant.Double))
-    fields.append(QgsField("cell_perimeter", QVariant.Double))
     crs = quadkey_layer.crs().toWkt()
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "quadkey_compacted", "memory")
+    mem_layer = cell_memory_layer(crs, "quadkey_compacted", "quadkey", graticule=True)
     mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
 
     quadkey_ids = [
         feature[QuadkeyID_field]
@@ -914,6 +621,7 @@ def quadkeycompact(
 
         total_cells = len(quadkey_ids_compact)
 
+        batch = CellBatch(None, "quadkey", graticule=True)
         for i, quadkey_id_compact in enumerate(quadkey_ids_compact):
             if feedback:
                 feedback.setProgress(int((i / total_cells) * 100))
@@ -921,32 +629,10 @@ def quadkeycompact(
                     return None
             cell_polygon = quadkey2geo(quadkey_id_compact)
             resolution = quadkey_resolution(quadkey_id_compact)
-            (
-                center_lat,
-                center_lon,
-                cell_width,
-                cell_height,
-                cell_area,
-                cell_perimeter,
-            ) = graticule_dggs_metrics(cell_polygon)
-            cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
-            quadkey_feature = QgsFeature(fields)
-            quadkey_feature.setGeometry(cell_geom)
-
-            attributes = {
-                "quadkey": quadkey_id_compact,
-                "resolution": resolution,
-                "center_lat": center_lat,
-                "center_lon": center_lon,
-                "cell_width": cell_width,
-                "cell_height": cell_height,
-                "cell_area": cell_area,
-                "cell_perimeter": cell_perimeter,
-            }
-            quadkey_feature.setAttributes(
-                [attributes[field.name()] for field in fields]
-            )
-            mem_provider.addFeatures([quadkey_feature])
+
+            batch.add(quadkey_id_compact, cell_polygon, resolution)
+            batch.flush(mem_provider, feedback)
+        batch.flush(mem_provider, feedback, 0)
 
         if feedback:
             feedback.setProgress(100)
@@ -964,22 +650,12 @@ def dggalcompact(
     if not DGGALID_field:
         DGGALID_field = f"dggal_{dggal_type}"
 
-    fields = QgsFields()
     # Use the specific DGGAL type for the field name
     field_name = f"dggal_{dggal_type}"
-    fields.append(QgsField(field_name, QVariant.String))
-    fields.append(QgsField("resolution", QVariant.Int))
-    fields.append(QgsField("center_lat", QVariant.Double))
-    fields.append(QgsField("center_lon", QVariant.Double))
-    fields.append(QgsField("avg_edge_len", QVariant.Double))
-    fields.append(QgsField("cell_area", QVariant.Double))
-    fields.append(QgsField("cell_perimeter", QVariant.Double))
     crs = dggal_layer.crs().toWkt()
     layer_name = f"dggal_{dggal_type}_compacted" if dggal_type else "dggal_compacted"
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, layer_name, "memory")
+    mem_layer = cell_memory_layer(crs, layer_name, field_name)
     mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
 
     dggal_ids = [
         feature[DGGALID_field]
@@ -997,6 +673,7 @@ def dggalcompact(
 
         total_cells = len(dggal_ids_compact)
 
+        batch = CellBatch(None, field_name)
         for i, dggal_id_compact in enumerate(dggal_ids_compact):
             if feedback:
                 feedback.setProgress(int((i / total_cells) * 100))
@@ -1016,10 +693,6 @@ def dggalcompact(
                     # Fallback values if we can't get them from DGGAL
                     resolution = 0
                     num_edges = 6  # Default for hexagonal cells
-
-                center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-                    geodesic_dggs_metrics(cell_polygon, num_edges)
-                )
             except Exception as e:
                 if feedback:
                     feedback.pushInfo(
@@ -1027,21 +700,9 @@ def dggalcompact(
                     )
                 continue
 
-            cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
-            dggal_feature = QgsFeature(fields)
-            dggal_feature.setGeometry(cell_geom)
-
-            attributes = {
-                field_name: dggal_id_compact,
-                "resolution": resolution,
-                "center_lat": center_lat,
-                "center_lon": center_lon,
-                "avg_edge_len": avg_edge_len,
-                "cell_area": cell_area,
-                "cell_perimeter": cell_perimeter,
-            }
-            dggal_feature.setAttributes([attributes[field.name()] for field in fields])
-            mem_provider.addFeatures([dggal_feature])
+            batch.add(dggal_id_compact, cell_polygon, resolution, num_edges)
+            batch.flush(mem_provider, feedback)
+        batch.flush(mem_provider, feedback, 0)
 
         if feedback:
             feedback.setProgress(100)
@@ -1059,20 +720,9 @@ def digipincompact(
     if not DIGIPINID_field:
         DIGIPINID_field = "digipin"
 
-    fields = QgsFields()
-    fields.append(QgsField("digipin", QVariant.String))
-    fields.append(QgsField("resolution", QVariant.Int))
-    fields.append(QgsField("center_lat", QVariant.Double))
-    fields.append(QgsField("center_lon", QVariant.Double))
-    fields.append(QgsField("cell_width", QVariant.Double))
-    fields.append(QgsField("cell_height", QVariant.Double))
-    fields.append(QgsField("cell_area", QVariant.Double))
-    fields.append(QgsField("cell_perimeter", QVariant.Double))
     crs = digipin_layer.crs().toWkt()
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "digipin_compacted", "memory")
+    mem_layer = cell_memory_layer(crs, "digipin_compacted", "digipin", graticule=True)
     mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
 
     digipin_ids = [
         feature[DIGIPINID_field]
@@ -1090,6 +740,7 @@ def digipincompact(
 
         total_cells = len(digipin_ids_compact)
 
+        batch = CellBatch(None, "digipin", graticule=True)
         for i, digipin_id_compact in enumerate(digipin_ids_compact):
             if feedback:
                 feedback.setProgress(int((i / total_cells) * 100))
@@ -1099,39 +750,16 @@ def digipincompact(
                 cell_polygon = digipin2geo(digipin_id_compact)
                 clean_id = digipin_id_compact.replace("-", "")
                 resolution = len(clean_id)
-                (
-                    center_lat,
-                    center_lon,
-                    cell_width,
-                    cell_height,
-                    cell_area,
-                    cell_perimeter,
-                ) = graticule_dggs_metrics(cell_polygon)
-
-                cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
-                digipin_feature = QgsFeature(fields)
-                digipin_feature.setGeometry(cell_geom)
-
-                attributes = {
-                    "digipin": digipin_id_compact,
-                    "resolution": resolution,
-                    "center_lat": center_lat,
-                    "center_lon": center_lon,
-                    "cell_width": cell_width,
-                    "cell_height": cell_height,
-                    "cell_area": cell_area,
-                    "cell_perimeter": cell_perimeter,
-                }
-                digipin_feature.setAttributes(
-                    [attributes[field.name()] for field in fields]
-                )
-                mem_provider.addFeatures([digipin_feature])
+
+                batch.add(digipin_id_compact, cell_polygon, resolution)
+                batch.flush(mem_provider, feedback)
             except Exception as e:
                 if feedback:
                     feedback.pushInfo(
                         f"Warning: Could not process DIGIPIN ID {digipin_id_compact}: {str(e)}"
                     )
                 continue
+        batch.flush(mem_provider, feedback, 0)
 
         if feedback:
             feedback.setProgress(100)
@@ -1,10 +1,5 @@
-from qgis.PyQt.QtCore import QVariant
 from qgis.core import (
     QgsVectorLayer,
-    QgsFeature,
-    QgsGeometry,
-    QgsField,
-    QgsFields,
     QgsProcessingException,
 )
 import platform
@@ -22,10 +17,6 @@ if platform.system() == "Windows":
     isea3h_dggs = Eaggr(Model.ISEA3H)
     isea4t_dggs = Eaggr(Model.ISEA4T)
 
-from vgrid.utils.geometry import (
-    graticule_dggs_metrics,
-    geodesic_dggs_metrics,
-)
 
 from vgrid.conversion.dggs2geo.h32geo import h32geo
 from vgrid.conversion.dggs2geo.s22geo import s22geo
@@ -57,6 +48,8 @@ from dggal import *
 
 from pyproj import Geod
 
+from .cell_batch import CellBatch, cell_memory_layer
+
 geod = Geod(ellps="WGS84")
 
 
@@ -69,20 +62,9 @@ def h3expand(
     if not H3ID_field:
         H3ID_field = "h3"
 
-    fields = QgsFields()
-    fields.append(QgsField("h3", QVariant.String))
-    fields.append(QgsField("resolution", QVariant.Int))
-    fields.append(QgsField("center_lat", QVariant.Double))
-    fields.append(QgsField("center_lon", QVariant.Double))
-    fields.append(QgsField("avg_edge_len", QVariant.Double))
-    fields.append(QgsField("cell_area", QVariant.Double))
-    fields.append(QgsField("cell_perimeter", QVariant.Double))
-
     crs = h3_layer.crs().toWkt()
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "h3_expanded", "memory")
+    mem_layer = cell_memory_layer(crs, "h3_expanded", "h3")
     mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
 
     h3_ids = [
         feature[H3ID_field] for feature in h3_layer.getFeatures() if feature[H3ID_field]
@@ -106,6 +88,7 @@ def h3expand(
 
         total_cells = len(h3_ids_expand)
 
+        batch = CellBatch(None, "h3")
         for i, h3_id_expand in enumerate(h3_ids_expand):
             if feedback:
                 feedback.setProgress(int((i / total_cells) * 100))
@@ -118,25 +101,10 @@ def h3expand(
                 continue
 
             num_edges = 5 if h3.is_pentagon(h3_id_expand) else 6
-            center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-                geodesic_dggs_metrics(cell_polygon, num_edges)
-            )
 
-            cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
-            h3_feature = QgsFeature(fields)
-            h3_feature.setGeometry(cell_geom)
-
-            attributes = {
-                "h3": h3_id_expand,
-                "resolution": resolution,
-                "center_lat": center_lat,
-                "center_lon": center_lon,
-                "avg_edge_len": avg_edge_len,
-                "cell_area": cell_area,
-                "cell_perimeter": cell_perimeter,
-            }
-            h3_feature.setAttributes([attributes[field.name()] for field in fields])
-            mem_provider.addFeatures([h3_feature])
+            batch.add(h3_id_expand, cell_polygon, resolution, num_edges)
+            batch.flush(mem_provider, feedback)
+        batch.flush(mem_provider, feedback, 0)
 
         if feedback:
             feedback.setProgress(100)
@@ -154,19 +122,9 @@ def s2expand(
     if not S2Token_field:
         S2Token_field = "s2"
 
-    fields = QgsFields()
-    fields.append(QgsField("s2", QVariant.String))
-    fields.append(QgsField("resolution", QVariant.Int))
-    fields.append(QgsField("center_lat", QVariant.Double))
-    fields.append(QgsField("center_lon", QVariant.Double))
-    fields.append(QgsField("avg_edge_len", QVariant.Double))
-    fields.append(QgsField("cell_area", QVariant.Double))
-    fields.append(QgsField("cell_perimeter", QVariant.Double))
     crs = s2_layer.crs().toWkt()
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "s2_expanded", "memory")
+    mem_layer = cell_memory_layer(crs, "s2_expanded", "s2")
     mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
 
     s2_tokens = [
         feature[S2Token_field]
@@ -200,6 +158,7 @@ def s2expand(
 
     total_cells = len(s2_tokens_expand)
 
+    batch = CellBatch(None, "s2")
     for i, s2_token_expand in enumerate(s2_tokens_expand):
         if feedback:
             feedback.setProgress(int((i / total_cells) * 100))
@@ -212,25 +171,10 @@ def s2expand(
             continue
 
         num_edges = 4
-        center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-            geodesic_dggs_metrics(cell_polygon, num_edges)
-        )
 
-        cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
-        s2_feature = QgsFeature(fields)
-        s2_feature.setGeometry(cell_geom)
-
-        attributes = {
-            "s2": s2_token_expand,
-            "resolution": resolution,
-            "center_lat": center_lat,
-            "center_lon": center_lon,
-            "avg_edge_len": avg_edge_len,
-            "cell_area": cell_area,
-            "cell_perimeter": cell_perimeter,
-        }
-        s2_feature.setAttributes([attributes[field.name()] for field in fields])
-        mem_provider.addFeatures([s2_feature])
+        batch.add(s2_token_expand, cell_polygon, resolution, num_edges)
+        batch.flush(mem_provider, feedback)
+    batch.flush(mem_provider, feedback, 0)
 
     if feedback:
         feedback.setProgress(100)
@@ -248,19 +192,9 @@ def a5expand(
     if not A5ID_field:
         A5ID_field = "a5"
 
-    fields = QgsFields()
-    fields.append(QgsField("a5", QVariant.String))
-    fields.append(QgsField("resolution", QVariant.Int))
-    fields.append(QgsField("center_lat", QVariant.Double))
-    fields.append(QgsField("center_lon", QVariant.Double))
-    fields.append(QgsField("avg_edge_len", QVariant.Double))
-    fields.append(QgsField("cell_area", QVariant.Double))
-    fields.append(QgsField("cell_perimeter", QVariant.Double))
     crs = a5_layer.crs().toWkt()
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "a5_expanded", "memory")
+    mem_layer = cell_memory_layer(crs, "a5_expanded", "a5")
     mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
 
     a5_hexes = [
         feature[A5ID_field] for feature in a5_layer.getFeatures() if feature[A5ID_field]
@@ -286,6 +220,7 @@ def a5expand(
 
         total_cells = len(a5_hexes_expand)
 
+        batch = CellBatch(None, "a5")
         for i, a5_hex_expand in enumerate(a5_hexes_expand):
             if feedback:
                 feedback.setProgress(int((i / total_cells) * 100))
@@ -298,25 +233,10 @@ def a5expand(
                 continue
 
             num_edges = 5
-            center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-                geodesic_dggs_metrics(cell_polygon, num_edges)
-            )
 
-            cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
-            a5_feature = QgsFeature(fields)
-            a5_feature.setGeometry(cell_geom)
-
-            attributes = {
-                "a5": a5_hex_expand,
-                "resolution": resolution,
-                "center_lat": center_lat,
-                "center_lon": center_lon,
-                "avg_edge_len": avg_edge_len,
-                "cell_area": cell_area,
-                "cell_perimeter": cell_perimeter,
-            }
-            a5_feature.setAttributes([attributes[field.name()] for field in fields])
-            mem_provider.addFeatures([a5_feature])
+            batch.add(a5_hex_expand, cell_polygon, resolution, num_edges)
+            batch.flush(mem_provider, feedback)
+        batch.flush(mem_provider, feedback, 0)
 
         if feedback:
             feedback.setProgress(100)
@@ -337,19 +257,9 @@ def rhealpixexpand(
     if not rHealPixID_field:
         rHealPixID_field = "rhealpix"
 
-    fields = QgsFields()
-    fields.append(QgsField("rhealpix", QVariant.String))
-    fields.append(QgsField("resolution", QVariant.Int))
-    fields.append(QgsField("center_lat", QVariant.Double))
-    fields.append(QgsField("center_lon", QVariant.Double))
-    fields.append(QgsField("avg_edge_len", QVariant.Double))
-    fields.append(QgsField("cell_area", QVariant.Double))
-    fields.append(QgsField("cell_perimeter", QVariant.Double))
     crs = rhealpix_layer.crs().toWkt()
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "rhealpix_expanded", "memory")
+    mem_layer = cell_memory_layer(crs, "rhealpix_expanded", "rhealpix")
     mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
 
     rhealpix_ids = [
         feature[rHealPixID_field]
@@ -385,6 +295,7 @@ def rhealpixexpand(
 
         total_cells = len(rhealpix_cells_expand)
 
+        batch = CellBatch(None, "rhealpix")
         for i, rhealpix_cell_expand in enumerate(rhealpix_cells_expand):
             if feedback:
                 feedback.setProgress(int((i / total_cells) * 100))
@@ -397,27 +308,10 @@ def rhealpixexpand(
             if not cell_polygon.is_valid:
                 continue
             num_edges = 3 if rhealpix_cell_expand.ellipsoidal_shape() == "dart" else 4
-            center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-                geodesic_dggs_metrics(cell_polygon, num_edges)
-            )
 
-            cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
-            rhealpix_feature = QgsFeature(fields)
-            rhealpix_feature.setGeometry(cell_geom)
-
-            attributes = {
-                "rhealpix": rhealpix_id_expand,
-                "resolution": resolution,
-                "center_lat": center_lat,
-                "center_lon": center_lon,
-                "avg_edge_len": avg_edge_len,
-                "cell_area": cell_area,
-                "cell_perimeter": cell_perimeter,
-            }
-            rhealpix_feature.setAttributes(
-                [attributes[field.name()] for field in fields]
-            )
-            mem_provider.addFeatures([rhealpix_feature])
+            batch.add(rhealpix_id_expand, cell_polygon, resolution, num_edges)
+            batch.flush(mem_provider, feedback)
+        batch.flush(mem_provider, feedback, 0)
 
         if feedback:
             feedback.setProgress(100)
@@ -436,19 +330,9 @@ def isea4texpand(
         if not ISEA4TID_field:
             ISEA4TID_field = "isea4t"
 
-        fields = QgsFields()
-        fields.append(QgsField("isea4t", QVariant.String))
-        fields.append(QgsField("resolution", QVariant.Int))
-        fields.append(QgsField("center_lat", QVariant.Double))
-        fields.append(QgsField("center_lon", QVariant.Double))
-        fields.append(QgsField("avg_edge_len", QVariant.Double))
-        fields.append(QgsField("cell_area", QVariant.Double))
-        fields.append(QgsField("cell_perimeter", QVariant.Double))
         crs = isea4t_layer.crs().toWkt()
-        mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "isea4t_expanded", "memory")
+        mem_layer = cell_memory_layer(crs, "isea4t_expanded", "isea4t")
         mem_provider = mem_layer.dataProvider()
-        mem_provider.addAttributes(fields)
-        mem_layer.updateFields()
 
         isea4t_ids = [
             feature[ISEA4TID_field]
@@ -476,6 +360,7 @@ def isea4texpand(
             isea4t_ids_expand = [c.get_cell_id() for c in isea4t_cells_expand]
             total_cells = len(isea4t_ids_expand)
 
+            batch = CellBatch(None, "isea4t")
             for i, isea4t_id_expand in enumerate(isea4t_ids_expand):
                 if feedback:
                     feedback.setProgress(int((i / total_cells) * 100))
@@ -486,27 +371,10 @@ def isea4texpand(
                 if not cell_polygon.is_valid:
                     continue
                 num_edges = 3
-                center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-                    geodesic_dggs_metrics(cell_polygon, num_edges)
-                )
 
-                cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
-                isea4t_feature = QgsFeature(fields)
-                isea4t_feature.setGeometry(cell_geom)
-
-                attributes = {
-                    "isea4t": isea4t_id_expand,
-                    "resolution": resolution,
-                    "center_lat": center_lat,
-                    "center_lon": center_lon,
-                    "avg_edge_len": avg_edge_len,
-                    "cell_area": cell_area,
-                    "cell_perimeter": cell_perimeter,
-                }
-                isea4t_feature.setAttributes(
-                    [attributes[field.name()] for field in fields]
-                )
-                mem_provider.addFeatures([isea4t_feature])
+                batch.add(isea4t_id_expand, cell_polygon, resolution, num_edges)
+                batch.flush(mem_provider, feedback)
+            batch.flush(mem_provider, feedback, 0)
 
             if feedback:
                 feedback.setProgress(100)
@@ -524,19 +392,9 @@ def isea3hexpand(
     if not ISEA3HID_field:
         ISEA3HID_field = "isea3h"
 
-    fields = QgsFields()
-    fields.append(QgsField("isea3h", QVariant.String))
-    fields.append(QgsField("resolution", QVariant.Int))
-    fields.append(QgsField("center_lat", QVariant.Double))
-    fields.append(QgsField("center_lon", QVariant.Double))
-    fields.append(QgsField("avg_edge_len", QVariant.Double))
-    fields.append(QgsField("cell_area", QVariant.Double))
-    fields.append(QgsField("cell_perimeter", QVariant.Double))
     crs = isea3h_layer.crs().toWkt()
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "isea3h_expanded", "memory")
+    mem_layer = cell_memory_layer(crs, "isea3h_expanded", "isea3h")
     mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
 
     isea3h_ids = [
         feature[ISEA3HID_field]
@@ -570,6 +428,7 @@ def isea3hexpand(
         isea3h_ids_expand = [c.get_cell_id() for c in isea3h_cells_expand]
         total_cells = len(isea3h_ids_expand)
 
+        batch = CellBatch(None, "isea3h")
         for i, isea3h_id_expand in enumerate(isea3h_ids_expand):
             if feedback:
                 feedback.setProgress(int((i / total_cells) * 100))
@@ -581,25 +440,10 @@ def isea3hexpand(
                 continue
 
             num_edges = 6
-            center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-                geodesic_dggs_metrics(cell_polygon, num_edges)
-            )
 
-            cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
-            isea3h_feature = QgsFeature(fields)
-            isea3h_feature.setGeometry(cell_geom)
-
-            attributes = {
-                "isea3h": isea3h_id_expand,
-                "resolution": resolution,
-                "center_lat": center_lat,
-                "center_lon": center_lon,
-                "avg_edge_len": round(avg_edge_len, 3),
-                "cell_area": cell_area,
-                "cell_perimeter": cell_perimeter,
-            }
-            isea3h_feature.setAttributes([attributes[field.name()] for field in fields])
-            mem_provider.addFeatures([isea3h_feature])
+            batch.add(isea3h_id_expand, cell_polygon, resolution, num_edges)
+            batch.flush(mem_provider, feedback)
+        batch.flush(mem_provider, feedback, 0)
 
         if feedback:
             feedback.setProgress(100)
@@ -617,19 +461,9 @@ def qtmexpand(
     if not QTMID_field:
         QTMID_field = "qtm"
 
-    fields = QgsFields()
-    fields.append(QgsField("qtm", QVariant.String))
-    fields.append(QgsField("resolution", QVariant.Int))
-    fields.append(QgsField("center_lat", QVariant.Double))
-    fields.append(QgsField("center_lon", QVariant.Double))
-    fields.append(QgsField("avg_edge_len", QVariant.Double))
-    fields.append(QgsField("cell_area", QVariant.Double))
-    fields.append(QgsField("cell_perimeter", QVariant.Double))
     crs = qtm_layer.crs().toWkt()
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "qtm_expanded", "memory")
+    mem_layer = cell_memory_layer(crs, "qtm_expanded", "qtm")
     mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
 
     qtm_ids = [
         feature[QTMID_field]
@@ -655,6 +489,7 @@ def qtmexpand(
 
         total_cells = len(qtm_ids_expand)
 
+        batch = CellBatch(None, "qtm")
         for i, qtm_id_expand in enumerate(qtm_ids_expand):
             if feedback:
                 feedback.setProgress(int((i / total_cells) * 100))
@@ -666,25 +501,10 @@ def qtmexpand(
                 continue
 
             num_edges = 3
-            center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-                geodesic_dggs_metrics(cell_polygon, num_edges)
-            )
 
-            cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
-            qtm_feature = QgsFeature(fields)
-            qtm_feature.setGeometry(cell_geom)
-
-            attributes = {
-                "qtm": qtm_id_expand,
-                "resolution": resolution,
-                "center_lat": center_lat,
-                "center_lon": center_lon,
-                "avg_edge_len": avg_edge_len,
-                "cell_area": cell_area,
-                "cell_perimeter": cell_perimeter,
-            }
-            qtm_feature.setAttributes([attributes[field.name()] for field in fields])
-            mem_provider.addFeatures([qtm_feature])
+            batch.add(qtm_id_expand, cell_polygon, resolution, num_edges)
+            batch.flush(mem_provider, feedback)
+        batch.flush(mem_provider, feedback, 0)
 
         if feedback:
             feedback.setProgress(100)
@@ -702,20 +522,9 @@ def olcexpand(
     if not OLCID_field:
         OLCID_field = "olc"
 
-    fields = QgsFields()
-    fields.append(QgsField("olc", QVariant.String))
-    fields.append(QgsField("resolution", QVariant.Int))
-    fields.append(QgsField("center_lat", QVariant.Double))
-    fields.append(QgsField("center_lon", QVariant.Double))
-    fields.append(QgsField("cell_width", QVariant.Double))
-    fields.append(QgsField("cell_height", QVariant.Double))
-    fields.append(QgsField("cell_area", QVariant.Double))
-    fields.append(QgsField("cell_perimeter", QVariant.Double))
     crs = olc_layer.crs().toWkt()
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "olc_expanded", "memory")
+    mem_layer = cell_memory_layer(crs, "olc_expanded", "olc", graticule=True)
     mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
 
     olc_ids = [
         feature[OLCID_field]
@@ -741,6 +550,7 @@ def olcexpand(
 
         total_cells = len(olc_ids_expand)
 
+        batch = CellBatch(None, "olc", graticule=True)
         for i, olc_id_expand in enumerate(olc_ids_expand):
             if feedback:
                 feedback.setProgress(int((i / total_cells) * 100))
@@ -751,31 +561,9 @@ def olcexpand(
             if not cell_polygon.is_valid:
                 continue
 
-            (
-                center_lat,
-                center_lon,
-                cell_width,
-                cell_height,
-                cell_area,
-                cell_perimeter,
-            ) = graticule_dggs_metrics(cell_polygon)
-
-            cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
-            olc_feature = QgsFeature(fields)
-            olc_feature.setGeometry(cell_geom)
-
-            attributes = {
-                "olc": olc_id_expand,
-                "resolution": resolution,
-                "center_lat": center_lat,
-                "center_lon": center_lon,
-                "cell_width": cell_width,
-                "cell_height": cell_height,
-                "cell_area": cell_area,
-                "cell_perimeter": cell_perimeter,
-            }
-            olc_feature.setAttributes([attributes[field.name()] for field in fields])
-            mem_provider.addFeatures([olc_feature])
+            batch.add(olc_id_expand, cell_polygon, resolution)
+            batch.flush(mem_provider, feedback)
+        batch.flush(mem_provider, feedback, 0)
 
         if feedback:
             feedback.setProgress(100)
@@ -793,20 +581,9 @@ def geohashexpand(
     if not GeohashID_field:
         GeohashID_field = "geohash"
 
-    fields = QgsFields()
-    fields.append(QgsField("geohash", QVariant.String))
-    fields.append(QgsField("resolution", QVariant.Int))
-    fields.append(QgsField("center_lat", QVariant.Double))
-    fields.append(QgsField("center_lon", QVariant.Double))
-    fields.append(QgsField("cell_width", QVariant.Double))
-    fields.append(QgsField("cell_height", QVariant.Double))
-    fields.append(QgsField("cell_area", QVariant.Double))
-    fields.append(QgsField("cell_perimeter", QVariant.Double))
     crs = geohash_layer.crs().toWkt()
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "geohash_expanded", "memory")
+    mem_layer = cell_memory_layer(crs, "geohash_expanded", "geohash", graticule=True)
     mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
 
     geohash_ids = [
         feature[GeohashID_field]
@@ -832,6 +609,7 @@ def geohashexpand(
 
         total_cells = len(geohash_ids_expand)
 
+        batch = CellBatch(None, "geohash", graticule=True)
         for i, geohash_id_expand in enumerate(geohash_ids_expand):
             if feedback:
                 feedback.setProgress(int((i / total_cells) * 100))
@@ -843,33 +621,9 @@ def geohashexpand(
             if not cell_polygon.is_valid:
                 continue
 
-            (
-                center_lat,
-                center_lon,
-                cell_width,
-                cell_height,
-                cell_area,
-                cell_perimeter,
-            ) = graticule_dggs_metrics(cell_polygon)
-
-            cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
-            geohash_feature = QgsFeature(fields)
-            geohash_feature.setGeometry(cell_geom)
-
-            attributes = {
-                "geohash": geohash_id_expand,
-                "resolution": resolution,
-                "center_lat": center_lat,
-                "center_lon": center_lon,
-                "cell_width": cell_width,
-                "cell_height": cell_height,
-                "cell_area": cell_area,
-                "cell_perimeter": cell_perimeter,
-            }
-            geohash_feature.setAttributes(
-                [attributes[field.name()] for field in fields]
-            )
-            mem_provider.addFeatures([geohash_feature])
+            batch.add(geohash_id_expand, cell_polygon, resolution)
+            batch.flush(mem_provider, feedback)
+        batch.flush(mem_provider, feedback, 0)
 
         if feedback:
             feedback.setProgress(100)
@@ -890,20 +644,9 @@ def tilecodeexpand(
     if not TilecodeID_field:
         TilecodeID_field = "tilecode"
 
-    fields = QgsFields()
-    fields.append(QgsField("tilecode", QVariant.String))
-    fields.append(QgsField("resolution", QVariant.Int))
-    fields.append(QgsField("center_lat", QVariant.Double))
-    fields.append(QgsField("center_lon", QVariant.Double))
-    fields.append(QgsField("cell_width", QVariant.Double))
-    fields.append(QgsField("cell_height", QVariant.Double))
-    fields.append(QgsField("cell_area", QVariant.Double))
-    fields.append(QgsField("cell_perimeter", QVariant.Double))
     crs = tilecode_layer.crs().toWkt()
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "tilecode_expanded", "memory")
+    mem_layer = cell_memory_layer(crs, "tilecode_expanded", "tilecode", graticule=True)
     mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
 
     tilecode_ids = [
         feature[TilecodeID_field]
@@ -929,6 +672,7 @@ def tilecodeexpand(
 
         total_cells = len(tilecode_ids_expand)
 
+        batch = CellBatch(None, "tilecode", graticule=True)
         for i, tilecode_id_expand in enumerate(tilecode_ids_expand):
             if feedback:
                 feedback.setProgress(int((i / total_cells) * 100))
@@ -940,33 +684,9 @@ def tilecodeexpand(
             if not cell_polygon.is_valid:
                 continue
 
-            (
-                center_lat,
-                center_lon,
-                cell_width,
-                cell_height,
-                cell_area,
-                cell_perimeter,
-            ) = graticule_dggs_metrics(cell_polygon)
-
-            cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
-            tilecode_feature = QgsFeature(fields)
-            tilecode_feature.setGeometry(cell_geom)
-
-            attributes = {
-                "tilecode": tilecode_id_expand,
-                "resolution": resolution,
-                "center_lat": center_lat,
-                "center_lon": center_lon,
-                "cell_width": cell_width,
-                "cell_height": cell_height,
-                "cell_area": cell_area,
-                "cell_perimeter": cell_perimeter,
-            }
-            tilecode_feature.setAttributes(
-                [attributes[field.name()] for field in fields]
-            )
-            mem_provider.addFeatures([tilecode_feature])
+            batch.add(tilecode_id_expand, cell_polygon, resolution)
+            batch.flush(mem_provider, feedback)
+        batch.flush(mem_provider, feedback, 0)
 
         if feedback:
             feedback.setProgress(100)
@@ -984,20 +704,9 @@ def quadkeyexpand(
     if not QuadkeyID_field:
         QuadkeyID_field = "quadkey"
 
-    fields = QgsFields()
-    fields.append(QgsField("quadkey", QVariant.String))
-    fields.append(QgsField("resolution", QVariant.Int))
-    fields.append(QgsField("center_lat", QVariant.Double))
-    fields.append(QgsField("center_lon", QVariant.Double))
-    fields.append(QgsField("cell_width", QVariant.Double))
-    fields.append(QgsField("cell_height", QVariant.Double))
-    fields.append(QgsField("cell_area", QVariant.Double))
-    fields.append(QgsField("cell_perimeter", QVariant.Double))
     crs = quadkey_layer.crs().toWkt()
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "quadkey_expanded", "memory")
+    mem_layer = cell_memory_layer(crs, "quadkey_expanded", "quadkey", graticule=True)
     mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
 
     quadkey_ids = [
         feature[QuadkeyID_field]
@@ -1023,6 +732,7 @@ def quadkeyexpand(
 
         total_cells = len(quadkey_ids_expand)
 
+        batch = CellBatch(None, "quadkey", graticule=True)
         for i, quadkey_id_expand in enumerate(quadkey_ids_expand):
             if feedback:
                 feedback.setProgress(int((i / total_cells) * 100))
@@ -1034,33 +744,9 @@ def quadkeyexpand(
             if not cell_polygon.is_valid:
                 continue
 
-            (
-                center_lat,
-                center_lon,
-                cell_width,
-                cell_height,
-                cell_area,
-                cell_perimeter,
-            ) = graticule_dggs_metrics(cell_polygon)
-
-            cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
-            quadkey_feature = QgsFeature(fields)
-            quadkey_feature.setGeometry(cell_geom)
-
-            attributes = {
-                "quadkey": quadkey_id_expand,
-                "resolution": resolution,
-                "center_lat": center_lat,
-                "center_lon": center_lon,
-                "cell_width": cell_width,
-                "cell_height": cell_height,
-                "cell_area": cell_area,
-                "cell_perimeter": cell_perimeter,
-            }
-            quadkey_feature.setAttributes(
-                [attributes[field.name()] for field in fields]
-            )
-            mem_provider.addFeatures([quadkey_feature])
+            batch.add(quadkey_id_expand, cell_polygon, resolution)
+            batch.flush(mem_provider, feedback)
+        batch.flush(mem_provider, feedback, 0)
 
         if feedback:
             feedback.setProgress(100)
@@ -1082,22 +768,12 @@ def dggalexpand(
     if not DGGALID_field:
         DGGALID_field = f"dggal_{dggal_type}"
 
-    fields = QgsFields()
     # Use the specific DGGAL type for the field name
     field_name = f"dggal_{dggal_type}"
-    fields.append(QgsField(field_name, QVariant.String))
-    fields.append(QgsField("resolution", QVariant.Int))
-    fields.append(QgsField("center_lat", QVariant.Double))
-    fields.append(QgsField("center_lon", QVariant.Double))
-    fields.append(QgsField("avg_edge_len", QVariant.Double))
-    fields.append(QgsField("cell_area", QVariant.Double))
-    fields.append(QgsField("cell_perimeter", QVariant.Double))
     crs = dggal_layer.crs().toWkt()
     layer_name = f"dggal_{dggal_type}_expanded" if dggal_type else "dggal_expanded"
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, layer_name, "memory")
+    mem_layer = cell_memory_layer(crs, layer_name, field_name)
     mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
 
     dggal_ids = [
         feature[DGGALID_field]
@@ -1138,6 +814,7 @@ def dggalexpand(
 
         total_cells = len(dggal_ids_expand)
 
+        batch = CellBatch(None, field_name)
         for i, dggal_id_expand in enumerate(dggal_ids_expand):
             if feedback:
                 feedback.setProgress(int((i / total_cells) * 100))
@@ -1157,10 +834,6 @@ def dggalexpand(
                     # Fallback values if we can't get them from DGGAL
                     zone_resolution = resolution
                     num_edges = 6  # Default for hexagonal cells
-
-                center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-                    geodesic_dggs_metrics(cell_polygon, num_edges)
-                )
             except Exception as e:
                 if feedback:
                     feedback.pushInfo(
@@ -1168,21 +841,9 @@ def dggalexpand(
                     )
                 continue
 
-            cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
-            dggal_feature = QgsFeature(fields)
-            dggal_feature.setGeometry(cell_geom)
-
-            attributes = {
-                field_name: dggal_id_expand,
-                "resolution": zone_resolution,
-                "center_lat": center_lat,
-                "center_lon": center_lon,
-                "avg_edge_len": avg_edge_len,
-                "cell_area": cell_area,
-                "cell_perimeter": cell_perimeter,
-            }
-            dggal_feature.setAttributes([attributes[field.name()] for field in fields])
-            mem_provider.addFeatures([dggal_feature])
+            batch.add(dggal_id_expand, cell_polygon, zone_resolution, num_edges)
+            batch.flush(mem_provider, feedback)
+        batch.flush(mem_provider, feedback, 0)
 
         if feedback:
             feedback.setProgress(100)
@@ -1200,20 +861,9 @@ def digipinexpand(
     if not DIGIPINID_field:
         DIGIPINID_field = "digipin"
 
-    fields = QgsFields()
-    fields.append(QgsField("digipin", QVariant.String))
-    fields.append(QgsField("resolution", QVariant.Int))
-    fields.append(QgsField("center_lat", QVariant.Double))
-    fields.append(QgsField("center_lon", QVariant.Double))
-    fields.append(QgsField("cell_width", QVariant.Double))
-    fields.append(QgsField("cell_height", QVariant.Double))
-    fields.append(QgsField("cell_area", QVariant.Double))
-    fields.append(QgsField("cell_perimeter", QVariant.Double))
     crs = digipin_layer.crs().toWkt()
-    mem_layer = QgsVectorLayer("Polygon?crs=" + crs, "digipin_expanded", "memory")
+    mem_layer = cell_memory_layer(crs, "digipin_expanded", "digipin", graticule=True)
     mem_provider = mem_layer.dataProvider()
-    mem_provider.addAttributes(fields)
-    mem_layer.updateFields()
 
     digipin_ids = [
         feature[DIGIPINID_field]
@@ -1243,6 +893,7 @@ def digipinexpand(
 
         total_cells = len(digipin_ids_expand)
 
+        batch = CellBatch(None, "digipin", graticule=True)
         for i, digipin_id_expand in enumerate(digipin_ids_expand):
             if feedback:
                 feedback.setProgress(int((i / total_cells) * 100))
@@ -1255,33 +906,8 @@ def digipinexpand(
                 if not cell_polygon.is_valid:
                     continue
 
-                (
-                    center_lat,
-                    center_lon,
-                    cell_width,
-                    cell_height,
-                    cell_area,
-                    cell_perimeter,
-                ) = graticule_dggs_metrics(cell_polygon)
-
-                cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
-                digipin_feature = QgsFeature(fields)
-                digipin_feature.setGeometry(cell_geom)
-
-                attributes = {
-                    "digipin": digipin_id_expand,
-                    "resolution": resolution,
-                    "center_lat": center_lat,
-                    "center_lon": center_lon,
-                    "cell_width": cell_width,
-                    "cell_height": cell_height,
-                    "cell_area": cell_area,
-                    "cell_perimeter": cell_perimeter,
-                }
-                digipin_feature.setAttributes(
-                    [attributes[field.name()] for field in fields]
-                )
-                mem_provider.addFeatures([digipin_feature])
+                batch.add(digipin_id_expand, cell_polygon, resolution)
+                batch.flush(mem_provider, feedback)
 
             except Exception as e:
                 if feedback:
@@ -1289,6 +915,7 @@ def digipinexpand(
                         f"Warning: Could not process DIGIPIN ID {digipin_id_expand}: {str(e)}"
                     )
                 continue
+        batch.flush(mem_provider, feedback, 0)
 
         if feedback:
             feedback.setProgress(100)
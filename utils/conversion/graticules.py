@@ -0,0 +1,109 @@
+"""Graticule DGGS as ``cell_cover.Graticule`` grids, for ``graticule_cover``.
+
+Cell edges are computed from integer column and row indices the way the
+grid's own decoder computes them, so the polygons match ``olc2geo`` and
+``digipin2geo`` and cells touching an input edge on a grid line are found.
+"""
+
+import numpy as np
+from vgrid.dggs import olc
+from vgrid.dggs.digipin import BOUNDS, DIGIPIN_GRID
+
+from .cell_cover import Graticule
+
+
+class OLCGrid(Graticule):
+    """OLC cells of one code length as a regular lon/lat grid."""
+
+    def __init__(self, resolution):
+        if resolution <= 10:
+            # Pairs of base-20 digits, in units of the last pair
+            lon_scale = lat_scale = olc.PAIR_PRECISION_
+            width = height = 20 * olc.PAIR_PRECISION_ // 20 ** (resolution // 2 - 1)
+        else:
+            # Grid refinement: 4 columns and 5 rows per digit
+            lon_scale = olc.FINAL_LNG_PRECISION_
+            lat_scale = olc.FINAL_LAT_PRECISION_
+            width = olc.GRID_COLUMNS_ ** (15 - resolution)
+            height = olc.GRID_ROWS_ ** (15 - resolution)
+        super().__init__(
+            -180 * lon_scale,
+            -90 * lat_scale,
+            width,
+            height,
+            360 * lon_scale // width,
+            180 * lat_scale // height,
+            lon_scale,
+            lat_scale,
+        )
+        self.resolution = resolution
+
+    def bounds(self, columns, rows):
+        # Cell edges as olc.decode (and so olc2geo) computes them
+        min_x, max_x = self._decoded(columns, self.width, self.lon_scale, 180)
+        min_y, max_y = self._decoded(rows, self.height, self.lat_scale, 90)
+        return min_x, min_y, max_x, max_y
+
+    @staticmethod
+    def _decoded(indices, size, scale, origin):
+        # Pair digits count in units of 1 / PAIR_PRECISION_ degrees and grid
+        # digits in units of 1 / scale; the upper edge is the unrounded lower
+        # one plus the cell size
+        pair = olc.PAIR_PRECISION_
+        pairs, grid = np.divmod(np.asarray(indices) * size, scale // pair)
+        low = (pairs - origin * pair) / pair + grid / scale
+        high = low + size / scale
+        return (
+            np.array([round(value, 14) for value in low.tolist()]),
+            np.array([round(value, 14) for value in high.tolist()]),
+        )
+
+    def cell_ids(self, columns, rows):
+        center_lons = self.lons(columns + 0.5)
+        center_lats = self.lats(rows + 0.5)
+        return [
+            olc.encode(lat, lon, self.resolution)
+            for lat, lon in zip(center_lats.tolist(), center_lons.tolist())
+        ]
+
+
+class DigipinGrid(Graticule):
+    """DIGIPIN cells of one resolution as a regular lon/lat grid."""
+
+    def __init__(self, resolution):
+        # Each level splits the 36 x 36 degree DIGIPIN extent 4 x 4; in units
+        # of 1 / 4**resolution degrees cells are 36 units wide
+        scale = 4**resolution
+        super().__init__(
+            round(BOUNDS["minLon"] * scale),
+            round(BOUNDS["minLat"] * scale),
+            round(BOUNDS["maxLon"] - BOUNDS["minLon"]),
+            round(BOUNDS["maxLat"] - BOUNDS["minLat"]),
+            scale,
+            scale,
+            scale,
+            scale,
+        )
+        self.resolution = resolution
+
+    def cell_ids(self, columns, rows):
+        # Base-4 digits of the column and of the row counted from the north
+        rows_from_north = self.rows - 1 - rows
+        digits = []
+        for level in range(1, self.resolution + 1):
+            shift = 2 * (self.resolution - level)
+            digits.append(
+                [
+                    DIGIPIN_GRID[row][column]
+                    for row, column in zip(
+                        ((rows_from_north >> shift) & 3).tolist(),
+                        ((columns >> shift) & 3).tolist(),
+                    )
+                ]
+            )
+        return [
+            "-".join(
+                "".join(chars[start : start + 3]) for start in range(0, len(chars), 3)
+            )
+            for chars in zip(*digits)
+        ]
@@ -0,0 +1,435 @@
+"""Feature conversion for Vector2DGGS, in QGIS or in a process pool.
+
+Cells are handed to a ``write(feature, cells)`` callback in chunks of at
+most ``SINK_BATCH_SIZE`` while each feature is converted, as plain
+``(wkb, attributes)`` pairs (or as cell rows in the cell row modes), so
+neither QGIS nor a worker holds all cells of a large feature at once.
+
+Input features go to the workers as EPSG:4326 WKB and their chunks come back
+through a bounded queue, so no QGIS object crosses a process boundary. Each
+worker imports the conversion module once, which also sets up DGGAL,
+rHEALPix and EAGGR for the lifetime of the worker; none of the modules it
+imports load the plugin settings or other GUI code. Workers poll a shared
+cancel flag, so canceling also stops the features being converted. When no
+Python interpreter is found for the workers, the pool cannot start or a
+worker dies, the remaining features are converted in QGIS instead.
+"""
+
+import multiprocessing
+import os
+import sys
+import queue
+from concurrent.futures import ProcessPoolExecutor
+
+from qgis.core import QgsFeature, QgsFeatureSink, QgsGeometry
+
+from .cell_batch import CELL_ROW_MODES, SINK_BATCH_SIZE, output_mode, streaming
+from .qgsfeature2dggs import (
+    convert_feature_parts,
+    dggs_conversion_function,
+    qgsfeatures2dggrid,
+)
+
+# Features queued per worker ahead of the ones being converted, and cell
+# chunks waiting per worker to be written
+QUEUE_PER_WORKER = 4
+
+_worker = {}
+
+
+def max_workers():
+    return os.cpu_count() or 1
+
+
+def _python_executable():
+    """Python interpreter for the workers, or None if none is found.
+
+    Inside QGIS ``sys.executable`` is usually QGIS itself, which must never be
+    started as a worker.
+    """
+    if os.path.basename(sys.executable).lower().startswith("python"):
+        return sys.executable
+    for name in (
+        "pythonw.exe",
+        "python.exe",
+        os.path.join("bin", "python3"),
+        os.path.join("bin", "python"),
+    ):
+        path = os.path.join(sys.exec_prefix, name)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def _pool_context():
+    # Never fork QGIS itself: spawn a fresh interpreter on every platform
+    executable = _python_executable()
+    if executable is None:
+        return None
+    context = multiprocessing.get_context("spawn")
+    context.set_executable(executable)
+    return context
+
+
+class _ChunkWriter:
+    """Stream sink handing each chunk of cells to ``write(cells)``."""
+
+    def __init__(self, write, mode):
+        self.write = write
+        self.mode = mode
+
+    def addFeatures(self, features, flags=None):
+        if features:
+            self.write(_cells(features, self.mode))
+        return True
+
+
+def feature_cells(conversion, feature_id, wkb, mode, write, feedback=None):
+    """Convert one feature given as *feature_id* and EPSG:4326 *wkb*.
+
+    *conversion* is ``(conversion_function, resolution, predicate, compact)``.
+    The cells are passed to ``write(cells)`` in chunks as they are built:
+    ``(wkb, attributes)`` pairs with the cell attributes only (*wkb* is None
+    without geometry), or cell rows in the cell row modes. Returns
+    ``(written, error)``, *written* being the number of cells passed on, also
+    when the conversion failed partway.
+    """
+    conversion_function, resolution, predicate, compact = conversion
+    feature = QgsFeature(feature_id)
+    geometry = QgsGeometry()
+    geometry.fromWkb(wkb)
+    feature.setGeometry(geometry)
+    with output_mode(mode), streaming(_ChunkWriter(write, mode), feedback) as stream:
+        try:
+            cell_features = convert_feature_parts(
+                conversion_function, feature, resolution, predicate, compact, feedback
+            )
+            # Cells of batches that do not stream (compaction)
+            for start in range(0, len(cell_features), SINK_BATCH_SIZE):
+                stream.addFeatures(cell_features[start : start + SINK_BATCH_SIZE])
+        except Exception as e:
+            return stream.written, failure_message(feature_id, e, stream.written)
+    return stream.written, None
+
+
+def failure_message(feature_id, error, written=0):
+    """Error report of a feature whose conversion failed after *written* cells."""
+    message = f"Error processing feature {feature_id}: {str(error)}"
+    if written:
+        message += f" ({written} of its cells were already written)"
+    return message
+
+
+def _cells(cell_features, mode):
+    """``(wkb, attributes)`` pairs of *cell_features* (rows in ``CELL_ROW_MODES``)."""
+    if mode in CELL_ROW_MODES:
+        return cell_features
+    return [
+        (
+            bytes(cell.geometry().asWkb()) if cell.hasGeometry() else None,
+            cell.attributes(),
+        )
+        for cell in cell_features
+    ]
+
+
+class _WorkerFeedback:
+    """Cancellation for the conversion functions in a worker process."""
+
+    def __init__(self, cancel):
+        self.cancel = cancel
+
+    def isCanceled(self):
+        return self.cancel.is_set()
+
+    def setProgress(self, progress):
+        pass
+
+    def pushInfo(self, info):
+        pass
+
+
+def _init_worker(dggs_type, resolution, predicate, compact, mode, chunks, cancel):
+    _worker.update(
+        conversion=(
+            dggs_conversion_function(dggs_type),
+            resolution,
+            predicate,
+            compact,
+        ),
+        mode=mode,
+        chunks=chunks,
+        feedback=_WorkerFeedback(cancel),
+    )
+
+
+def _convert(job):
+    index, feature_id, wkb = job
+    return feature_cells(
+        _worker["conversion"],
+        feature_id,
+        wkb,
+        _worker["mode"],
+        lambda cells: _worker["chunks"].put((index, cells)),
+        _worker["feedback"],
+    )
+
+
+def _feature_wkb(feature):
+    return bytes(feature.geometry().asWkb()) if feature.hasGeometry() else b""
+
+
+def _dggrid_converted_features(
+    features, dggs_type, resolution, predicate, mode, write, feedback=None
+):
+    """``converted_features`` of a ``dggrid_*`` type, with one DGGRID run for all."""
+    features = list(features)
+    cell_sources = []  # geometry only, for cells with the cell attributes only
+    for feature in features:
+        cell_source = QgsFeature(feature.id())
+        if feature.hasGeometry():
+            cell_source.setGeometry(feature.geometry())
+        cell_sources.append(cell_source)
+    try:
+        with output_mode(mode):
+            feature_cell_features = qgsfeatures2dggrid(
+                dggs_type[len("dggrid_") :].upper(),
+                cell_sources,
+                resolution,
+                predicate,
+                feedback,
+            )
+    except Exception as e:
+        for feature in features:
+            yield feature, 0, failure_message(feature.id(), e)
+        return
+    for feature, cell_features in zip(features, feature_cell_features):
+        if feedback and feedback.isCanceled():
+            return
+        for start in range(0, len(cell_features), SINK_BATCH_SIZE):
+            write(feature, _cells(cell_features[start : start + SINK_BATCH_SIZE], mode))
+        yield feature, len(cell_features), None
+
+
+def converted_features(
+    features,
+    dggs_type,
+    resolution,
+    predicate,
+    compact,
+    mode,
+    write,
+    workers=1,
+    feedback=None,
+):
+    """Convert EPSG:4326 *features*, passing their cells to ``write(feature, cells)``.
+
+    Cells are passed in chunks, as in ``feature_cells``, while each feature is
+    converted. Yields ``(feature, written, error)`` once a feature is done,
+    *written* being its number of cells and *error* None or the message to
+    report. With more than one of *workers*, features are converted in a pool
+    of worker processes and finish in any order; if the pool cannot be used,
+    the features are converted in this process. DGGRID types convert all
+    *features* in one run of the DGGRID executable, in this process. Stops
+    early if canceled.
+    """
+    if dggs_type.startswith("dggrid_"):
+        yield from _dggrid_converted_features(
+            features, dggs_type, resolution, predicate, mode, write, feedback
+        )
+        return
+
+    conversion = (
+        dggs_conversion_function(dggs_type),
+        resolution,
+        predicate,
+        compact,
+    )
+    if workers <= 1:
+        yield from _converted_in_process(features, conversion, mode, write, feedback)
+        return
+
+    context = _pool_context()
+    if context is None:
+        if feedback:
+            feedback.pushInfo(
+                "No Python interpreter found for worker processes; "
+                "converting features in QGIS"
+            )
+        yield from _converted_in_process(features, conversion, mode, write, feedback)
+        return
+
+    features = iter(features)
+    pending = {}  # job index -> [feature, future, cells written so far]
+    try:
+        yield from _converted_in_pool(
+            features,
+            pending,
+            context,
+            (dggs_type, resolution, predicate, compact, mode),
+            write,
+            workers,
+            feedback,
+        )
+        return
+    except Exception as e:
+        # Pool failed to start or a worker died: finish in this process
+        if feedback:
+            feedback.reportError(
+                f"Worker processes failed ({e!r}); converting the remaining "
+                "features in QGIS"
+            )
+    restart = []
+    for feature, future, written in pending.values():
+        result = _finished_result(future)
+        if result is not None and written >= result[0]:
+            yield feature, *result
+        elif written:
+            # Its cells are partly written already: report, don't redo
+            yield feature, written, failure_message(
+                feature.id(), "worker process failed", written
+            )
+        else:
+            restart.append(feature)
+    yield from _converted_in_process(restart, conversion, mode, write, feedback)
+    yield from _converted_in_process(features, conversion, mode, write, feedback)
+
+
+def _finished_result(future):
+    """Result of a *future* that completed, or None."""
+    if future is None or not future.done() or future.cancelled():
+        return None
+    return None if future.exception() else future.result()
+
+
+def _converted_in_process(features, conversion, mode, write, feedback=None):
+    for feature in features:
+        if feedback and feedback.isCanceled():
+            return
+        written, error = feature_cells(
+            conversion,
+            feature.id(),
+            _feature_wkb(feature),
+            mode,
+            lambda cells: write(feature, cells),
+            feedback,
+        )
+        yield feature, written, error
+
+
+def _converted_in_pool(
+    features, pending, context, conversion_args, write, workers, feedback
+):
+    """``converted_features`` in a pool of *workers* processes.
+
+    Features not reported done stay in *pending* when the pool fails, with the
+    number of their cells written so far.
+    """
+    chunks = context.Queue(maxsize=workers * QUEUE_PER_WORKER)
+    cancel = context.Event()
+
+    def canceled():
+        return feedback is not None and feedback.isCanceled()
+
+    def drain(timeout):
+        """Write the chunks that arrived, waiting up to *timeout* for the first."""
+        while True:
+            try:
+                index, cells = chunks.get(timeout=timeout)
+            except queue.Empty:
+                return
+            entry = pending[index]
+            write(entry[0], cells)
+            entry[2] += len(cells)
+            timeout = 0
+
+    def finished():
+        """Pending features whose conversion returned and whose cells all arrived."""
+        done = []
+        for index, (feature, future, written) in list(pending.items()):
+            if future.done():
+                total, error = future.result()
+                if written >= total:
+                    del pending[index]
+                    done.append((feature, total, error))
+        return done
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(*conversion_args, chunks, cancel),
+    ) as pool:
+        try:
+            index = 0
+            for feature in features:
+                # Queued before submitting, so a failed submit keeps the feature
+                pending[index] = [feature, None, 0]
+                job = (index, feature.id(), _feature_wkb(feature))
+                pending[index][1] = pool.submit(_convert, job)
+                index += 1
+                while len(pending) > workers * QUEUE_PER_WORKER and not canceled():
+                    drain(0.1)
+                    yield from finished()
+                if canceled():
+                    return
+            while pending and not canceled():
+                drain(0.1)
+                yield from finished()
+        finally:
+            if pending:
+                # Stop the running conversions and unblock their last puts
+                cancel.set()
+                pool.shutdown(wait=False, cancel_futures=True)
+                while any(
+                    future is not None and future.running()
+                    for _, future, _ in pending.values()
+                ):
+                    try:
+                        chunks.get(timeout=0.1)
+                    except queue.Empty:
+                        pass
+
+
+def output_features(fields, attributes, cells):
+    """Output features with *fields* for ``(wkb, attributes)`` *cells*.
+
+    Each feature carries the input *attributes* followed by the cell's own.
+    """
+    features = []
+    for wkb, cell_attributes in cells:
+        feature = QgsFeature(fields)
+        if wkb is not None:
+            geometry = QgsGeometry()
+            geometry.fromWkb(wkb)
+            feature.setGeometry(geometry)
+        feature.setAttributes(attributes + cell_attributes)
+        features.append(feature)
+    return features
+
+
+def sink_writer(sink, fields):
+    """``write`` callback for ``converted_features`` adding the cells to *sink*."""
+
+    def write(feature, cells):
+        sink.addFeatures(
+            output_features(fields, feature.attributes(), cells),
+            QgsFeatureSink.FastInsert,
+        )
+
+    return write
+
+
+def report_converted_features(results, feedback, total_features=0):
+    """Run ``converted_features`` *results* to the end, reporting progress.
+
+    Returns the number of features that failed, after reporting them.
+    """
+    num_bad = 0
+    for done, (feature, written, error) in enumerate(results, 1):
+        if error:
+            num_bad += 1
+            feedback.reportError(error)
+        if total_features:
+            feedback.setProgress(int(100 * done / total_features))
+    return num_bad
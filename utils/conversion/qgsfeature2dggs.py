@@ -6,7 +6,6 @@ from vgrid.utils.constants import (
     ISEA3H_RES_ACCURACY_DICT,
     INITIAL_GEOHASHES,
 )
-from vgrid.generator.geohashgrid import expand_geohash_bbox
 from vgrid.dggs import qtm
 from vgrid.dggs.qtm import QTM_INITIAL_FACETS
 from vgrid.conversion.dggscompact.a5compact import a5_compact
@@ -18,39 +17,42 @@ from vgrid.conversion.dggscompact.olccompact import olc_compact
 from vgrid.conversion.dggscompact.qtmcompact import qtm_compact
 from vgrid.conversion.dggscompact.dggalcompact import dggal_compact
 from vgrid.conversion.dggscompact.rhealpixcompact import rhealpix_compact
-from vgrid.utils.geometry import (
-    graticule_dggs_metrics,
-    graticule_dggs_to_feature,
-    geodesic_dggs_metrics,
-    check_predicate,
-)
 from vgrid.conversion.dggs2geo.dggal2geo import dggal2geo
-from vgrid.dggs.digipin import BOUNDS
 from vgrid.conversion.dggs2geo.digipin2geo import digipin2geo
 from vgrid.conversion.dggs2geo.quadkey2geo import quadkey2geo
 from vgrid.conversion.dggs2geo.tilecode2geo import tilecode2geo
 from vgrid.conversion.dggs2geo.geohash2geo import geohash2geo
-from vgrid.generator.olcgrid import olc_refine_cell
 from vgrid.conversion.dggs2geo.olc2geo import olc2geo
 from vgrid.conversion.dggs2geo.qtm2geo import qtm2geo
 from vgrid.conversion.dggs2geo.isea3h2geo import isea3h2geo
 from vgrid.conversion.dggs2geo.isea4t2geo import isea4t2geo
-from vgrid.conversion.dggs2geo.a52geo import a52geo
+from vgrid.conversion.dggs2geo.a52geo import a52geo, a52geo_u64
 from vgrid.conversion.dggs2geo.s22geo import s22geo
 from vgrid.conversion.dggs2geo.h32geo import h32geo
-from vgrid.utils.geometry import geodesic_buffer
 from vgrid.conversion.dggs2geo.rhealpix2geo import rhealpix2geo
-from collections import deque
-from shapely.geometry import Polygon, box
+from functools import partial
+from shapely.geometry import MultiPolygon, Polygon, box
 from shapely.wkt import loads as wkt_loads
+import shapely
 import platform
-from qgis.core import QgsFeature, QgsGeometry, QgsField, QgsFields, QgsWkbTypes
-from qgis.PyQt.QtCore import QVariant
+import sys
+from qgis.core import QgsFeature, QgsGeometry, QgsWkbTypes
 import re
 import h3
 import a5
 from vgrid.dggs import s2, olc, mercantile
 
+from .cell_batch import CellBatch
+from .cell_cover import (
+    NestedGrid,
+    graticule_cover,
+    hierarchical_cover,
+    line_cells,
+    line_vertices,
+    predicate_mask,
+    region_cells,
+)
+from .graticules import DigipinGrid, OLCGrid
 from .crs_helper import (
     flatten_feature_geometry,
     reproject_feature,
@@ -90,9 +92,8 @@ from vgrid.utils.io import (
 from ..dggrid_instance import (
     get_plugin_dggrid_instance,
     build_dggrid_options,
-    vector_geom_to_dggrid_gdf_qgis,
+    vector_geoms_to_dggrid_cells_qgis,
 )
-from ...settings import settings
 from vgrid.dggs.rhealpixdggs.dggs import RHEALPixDGGS
 from vgrid.dggs.rhealpixdggs.ellipsoids import WGS84_ELLIPSOID
 
@@ -150,254 +151,128 @@ def point2h3(feature, resolution, feedback):
     feature_geometry = feature.geometry()
     point = feature_geometry.asPoint()
     h3_id = latlon2h3(point.y(), point.x(), resolution)
-    cell_polygon = h32geo(h3_id)
 
     num_edges = 6
     if h3.is_pentagon(h3_id):
         num_edges = 5
 
-    center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-        geodesic_dggs_metrics(cell_polygon, num_edges)
-    )
-
-    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-    h3_feature = QgsFeature()
-    h3_feature.setGeometry(cell_geometry)
-
-    original_attributes = feature.attributes()
-    original_fields = feature.fields()
-
-    new_fields = QgsFields()
-    new_fields.append(QgsField("h3", QVariant.String))
-    new_fields.append(QgsField("resolution", QVariant.Int))
-    new_fields.append(QgsField("center_lat", QVariant.Double))
-    new_fields.append(QgsField("center_lon", QVariant.Double))
-    new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-    new_fields.append(QgsField("cell_area", QVariant.Double))
-    new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-    # Combine original fields and new fields
-    all_fields = QgsFields()
-    for field in original_fields:
-        all_fields.append(field)
-    for field in new_fields:
-        all_fields.append(field)
-
-    h3_feature.setFields(all_fields)
-
-    # Combine original attributes with new attributes
-    new_attributes = [
-        str(h3_id),
-        resolution,
-        center_lat,
-        center_lon,
-        avg_edge_len,
-        cell_area,
-        cell_perimeter,
-    ]
-    all_attributes = original_attributes + new_attributes
-
-    h3_feature.setAttributes(all_attributes)
-
-    return [h3_feature]
+    batch = CellBatch(feature, "h3")
+    cell_polygon = h32geo(h3_id) if batch.geometry else None
+    batch.add(h3_id, cell_polygon, resolution, num_edges)
+    return batch.features()
 
 
 def polyline2h3(feature, resolution, predicate=None, compact=None, feedback=None):
-    h3_features = []
     feature_geometry = feature.geometry()
-    feature_rect = feature_geometry.boundingBox()
-    min_x = feature_rect.xMinimum()
-    min_y = feature_rect.yMinimum()
-    max_x = feature_rect.xMaximum()
-    max_y = feature_rect.yMaximum()
-    # Create a Shapely box
-    bbox = box(min_x, min_y, max_x, max_y)
-
-    buufer_distance = h3.average_hexagon_edge_length(resolution, unit="m") * 2
-    bbox_buffer = geodesic_buffer(bbox, buufer_distance)
-    bbox_buffer_cells = h3.geo_to_cells(bbox_buffer, resolution)
+    shapely_geom = wkt_loads(feature_geometry.asWkt())
 
     if feedback:
         feedback.pushInfo(f"Processing feature {feature.id()}")
         feedback.setProgress(0)
 
-    total_cells = len(bbox_buffer_cells)
-    for i, bbox_buffer_cell in enumerate(bbox_buffer_cells):
-        if feedback and feedback.isCanceled():
-            return []
-        cell_polygon = h32geo(bbox_buffer_cell)
-        num_edges = 6
-        if h3.is_pentagon(bbox_buffer_cell):
-            num_edges = 5
+    # Walk along the line from cell to neighbouring cell
+    seeds = [
+        h3.latlng_to_cell(lat, lon, resolution)
+        for lon, lat in line_vertices(shapely_geom)
+    ]
+    cells = line_cells(
+        shapely_geom,
+        seeds,
+        lambda h3_id: h3.grid_ring(h3_id, 1),
+        h32geo,
+        feedback,
+    )
+    if cells is None:
+        return []
 
-        h3_id = str(bbox_buffer_cell)
-        center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-            geodesic_dggs_metrics(cell_polygon, num_edges)
-        )
-        cell_resolution = h3.get_resolution(h3_id)
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
+    batch = CellBatch(feature, "h3")
+    for h3_id, cell_polygon in cells.items():
+        num_edges = 5 if h3.is_pentagon(h3_id) else 6
+        batch.add(h3_id, cell_polygon, resolution, num_edges)
 
-        if not check_predicate(cell_geometry, feature_geometry, "intersects"):
-            continue
+    if feedback:
+        feedback.setProgress(100)
 
-        h3_feature = QgsFeature()
-        h3_feature.setGeometry(cell_geometry)
-
-        # Get all attributes from the input feature
-        original_attributes = feature.attributes()
-        original_fields = feature.fields()
-
-        # Define new H3-related attributes
-        new_fields = QgsFields()
-        new_fields.append(QgsField("h3", QVariant.String))
-        new_fields.append(QgsField("resolution", QVariant.Int))
-        new_fields.append(QgsField("center_lat", QVariant.Double))
-        new_fields.append(QgsField("center_lon", QVariant.Double))
-        new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-        new_fields.append(QgsField("cell_area", QVariant.Double))
-        new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-        # Combine original fields and new fields
-        all_fields = QgsFields()
-        for field in original_fields:
-            all_fields.append(field)
-        for field in new_fields:
-            all_fields.append(field)
-
-        h3_feature.setFields(all_fields)
-
-        # Combine original attributes with new attributes
-        new_attributes = [
-            h3_id,
-            cell_resolution,
-            center_lat,
-            center_lon,
-            avg_edge_len,
-            cell_area,
-            cell_perimeter,
-        ]
-        all_attributes = original_attributes + new_attributes
+    return batch.features(feedback)
 
-        h3_feature.setAttributes(all_attributes)
 
-        h3_features.append(h3_feature)
+# Containment mode of h3shape_to_cells_experimental for each spatial predicate
+# (index or name as in cell_cover.PREDICATES); largest_overlap has none
+H3_CONTAINMENT = {
+    None: "overlap",
+    0: "overlap",
+    "intersects": "overlap",
+    "intersect": "overlap",
+    1: "full",
+    "within": "full",
+    2: "center",
+    "centroid_within": "center",
+    "centroid": "center",
+}
 
-        if feedback and i % 100 == 0:
-            feedback.setProgress(int(100 * i / total_cells))
 
-    if feedback:
-        feedback.setProgress(100)
+def h3_polygon_cells(shapely_geom, resolution, predicate=None, feedback=None):
+    """H3 cells of *resolution* matching *predicate* against *shapely_geom*.
 
-    return h3_features
+    The polygon is filled by H3 itself in the matching containment mode. For
+    ``largest_overlap`` the fully contained cells are kept as they are and
+    only the cells crossing the boundary are decoded and checked.
+    """
+    h3shape = h3.geo_to_h3shape(shapely_geom)
+    contain = H3_CONTAINMENT.get(predicate)
+    if contain is not None:
+        return h3.h3shape_to_cells_experimental(h3shape, resolution, contain)
+
+    inner_cells = h3.h3shape_to_cells_experimental(h3shape, resolution, "full")
+    boundary_cells = set(
+        h3.h3shape_to_cells_experimental(h3shape, resolution, "overlap")
+    )
+    boundary_cells = list(boundary_cells.difference(inner_cells))
+    if feedback and feedback.isCanceled():
+        return []
+    boundary_polygons = [h32geo(cell_id) for cell_id in boundary_cells]
+    matches = predicate_mask(boundary_polygons, shapely_geom, predicate)
+    return list(inner_cells) + [
+        cell_id for cell_id, match in zip(boundary_cells, matches) if match
+    ]
 
 
 def polygon2h3(feature, resolution, predicate=None, compact=None, feedback=None):
-    h3_features = []
-    feature_geometry = feature.geometry()
-    shapely_geom = wkt_loads(feature_geometry.asWkt())
-    feature_rect = feature_geometry.boundingBox()
-    min_x = feature_rect.xMinimum()
-    min_y = feature_rect.yMinimum()
-    max_x = feature_rect.xMaximum()
-    max_y = feature_rect.yMaximum()
-    # Create a Shapely box
-    bbox = box(min_x, min_y, max_x, max_y)
-
-    buufer_distance = h3.average_hexagon_edge_length(resolution, unit="m") * 2
-    bbox_buffer = geodesic_buffer(bbox, buufer_distance)
-    bbox_buffer_cells = h3.geo_to_cells(bbox_buffer, resolution)
-
-    # First collect cells that pass the predicate check
-    filtered_cells = []
-    total_cells = len(bbox_buffer_cells)
+    shapely_geom = wkt_loads(feature.geometry().asWkt())
 
     if feedback:
         feedback.pushInfo(f"Processing feature {feature.id()}")
         feedback.setProgress(0)
 
-    for i, bbox_buffer_cell in enumerate(bbox_buffer_cells):
-        if feedback and feedback.isCanceled():
-            return []
-
-        cell_polygon = h32geo(bbox_buffer_cell)
-        if not check_predicate(cell_polygon, shapely_geom, predicate):
-            continue  # Skip non-matching cells
-        filtered_cells.append(bbox_buffer_cell)
-
-        if feedback and i % 100 == 0:
-            feedback.setProgress(int(100 * i / total_cells))
+    filtered_cells = h3_polygon_cells(shapely_geom, resolution, predicate, feedback)
+    if feedback and feedback.isCanceled():
+        return []
 
     # Apply compact after predicate check
     if compact:
         filtered_cells = h3.compact_cells(filtered_cells)
 
     # Convert filtered/compacted cells to features
-    total_filtered_cells = len(filtered_cells)
-    if feedback:
-        feedback.setProgress(0)
-
+    batch = CellBatch(feature, "h3")
+    total_cells = len(filtered_cells)
     for i, cell_id in enumerate(filtered_cells):
         if feedback and feedback.isCanceled():
             return []
 
-        cell_polygon = h32geo(cell_id)
         num_edges = 6
         if h3.is_pentagon(cell_id):
             num_edges = 5
-
         h3_id = str(cell_id)
-        center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-            geodesic_dggs_metrics(cell_polygon, num_edges)
-        )
-        cell_resolution = h3.get_resolution(h3_id)
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-
-        h3_feature = QgsFeature()
-        h3_feature.setGeometry(cell_geometry)
-
-        # Get all attributes from the input feature
-        original_attributes = feature.attributes()
-        original_fields = feature.fields()
-
-        # Define new H3-related attributes
-        new_fields = QgsFields()
-        new_fields.append(QgsField("h3", QVariant.String))
-        new_fields.append(QgsField("resolution", QVariant.Int))
-        new_fields.append(QgsField("center_lat", QVariant.Double))
-        new_fields.append(QgsField("center_lon", QVariant.Double))
-        new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-        new_fields.append(QgsField("cell_area", QVariant.Double))
-        new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-        # Combine original fields and new fields
-        all_fields = QgsFields()
-        for field in original_fields:
-            all_fields.append(field)
-        for field in new_fields:
-            all_fields.append(field)
-
-        h3_feature.setFields(all_fields)
-
-        # Combine original attributes with new attributes
-        new_attributes = [
-            h3_id,
-            cell_resolution,
-            center_lat,
-            center_lon,
-            avg_edge_len,
-            cell_area,
-            cell_perimeter,
-        ]
-        all_attributes = original_attributes + new_attributes
-
-        h3_feature.setAttributes(all_attributes)
-
-        h3_features.append(h3_feature)
+        cell_polygon = h32geo(cell_id) if batch.geometry else None
+        batch.add(h3_id, cell_polygon, h3.get_resolution(h3_id), num_edges)
 
         if feedback and i % 100 == 0:
-            feedback.setProgress(int(100 * i / total_filtered_cells))
+            feedback.setProgress(int(100 * i / total_cells))
 
     if feedback:
         feedback.setProgress(100)
 
-    return h3_features
+    return batch.features(feedback)
 
 
 #######################
@@ -421,238 +296,168 @@ def point2s2(feature, resolution, feedback):
     feature_geometry = feature.geometry()
     point = feature_geometry.asPoint()
     s2_token = latlon2s2(point.y(), point.x(), resolution)
-    cell_polygon = s22geo(s2_token)
-    num_edges = 4
-    center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-        geodesic_dggs_metrics(cell_polygon, num_edges)
-    )
-
-    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-    # Create a single QGIS feature
-    s2_feature = QgsFeature()
-    s2_feature.setGeometry(cell_geometry)
-
-    # Get all attributes from the input feature
-    original_attributes = feature.attributes()
-    original_fields = feature.fields()
-
-    # Define new s2-related attributes
-    new_fields = QgsFields()
-    new_fields.append(QgsField("s2", QVariant.String))
-    new_fields.append(QgsField("resolution", QVariant.Int))
-    new_fields.append(QgsField("center_lat", QVariant.Double))
-    new_fields.append(QgsField("center_lon", QVariant.Double))
-    new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-    new_fields.append(QgsField("cell_area", QVariant.Double))
-    new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-    # Combine original fields and new fields
-    all_fields = QgsFields()
-    for field in original_fields:
-        all_fields.append(field)
-    for field in new_fields:
-        all_fields.append(field)
-
-    s2_feature.setFields(all_fields)
-
-    # Combine original attributes with new attributes
-    new_attributes = [
-        s2_token,
-        resolution,
-        center_lat,
-        center_lon,
-        avg_edge_len,
-        cell_area,
-        cell_perimeter,
-    ]
-    all_attributes = original_attributes + new_attributes
-
-    s2_feature.setAttributes(all_attributes)
-
-    return [s2_feature]
+    batch = CellBatch(feature, "s2")
+    cell_polygon = s22geo(s2_token) if batch.geometry else None
+    batch.add(s2_token, cell_polygon, resolution, 4)
+    return batch.features()
 
 
 def polyline2s2(feature, resolution, predicate=None, compact=None, feedback=None):
-    s2_features = []
-
     feature_geometry = feature.geometry()
     shapely_geom = wkt_loads(feature_geometry.asWkt())
-    feature_rect = feature_geometry.boundingBox()
-    min_x = feature_rect.xMinimum()
-    min_y = feature_rect.yMinimum()
-    max_x = feature_rect.xMaximum()
-    max_y = feature_rect.yMaximum()
     level = resolution
-    coverer = s2.RegionCoverer()
-    coverer.min_level = level
-    coverer.max_level = level
 
-    region = s2.LatLngRect(
-        s2.LatLng.from_degrees(min_y, min_x), s2.LatLng.from_degrees(max_y, max_x)
-    )
+    if feedback:
+        feedback.pushInfo(f"Processing feature {feature.id()}")
+        feedback.setProgress(0)
 
-    covering = coverer.get_covering(region)
-    cell_ids = covering
+    # Walk along the line from cell to neighbouring cell
+    seeds = [
+        s2.CellId.from_lat_lng(s2.LatLng.from_degrees(lat, lon)).parent(level)
+        for lon, lat in line_vertices(shapely_geom)
+    ]
+    cells = line_cells(
+        shapely_geom,
+        seeds,
+        lambda cell_id: cell_id.get_all_neighbors(level),
+        lambda cell_id: s22geo(cell_id.to_token()),
+        feedback,
+    )
+    if cells is None:
+        return []
+    cell_ids = list(cells)
     if compact:
-        covering = s2.CellUnion(covering)
+        covering = s2.CellUnion(cell_ids)
         covering.normalize()
         cell_ids = covering.cell_ids()
 
-    total_cells = len(cell_ids)
-
-    if feedback:
-        feedback.pushInfo(f"Processing feature {feature.id()}")
-        feedback.setProgress(0)
-
-    for i, cell_id in enumerate(cell_ids):
+    batch = CellBatch(feature, "s2")
+    for cell_id in cell_ids:
         if feedback and feedback.isCanceled():
             return []
+        cell_polygon = cells.get(cell_id)
+        if cell_polygon is None and batch.geometry:
+            cell_polygon = s22geo(cell_id.to_token())
+        batch.add(cell_id.to_token(), cell_polygon, cell_id.level(), 4)
 
-        cell_polygon = s22geo(cell_id)
-        if not check_predicate(cell_polygon, shapely_geom, "intersects"):
-            continue
+    if feedback:
+        feedback.setProgress(100)
 
-        cell_token = s2.CellId.to_token(cell_id)
-        cell_resolution = cell_id.level()
+    return batch.features(feedback)
 
-        num_edges = 4
-        center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-            geodesic_dggs_metrics(cell_polygon, num_edges)
-        )
 
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-
-        s2_feature = QgsFeature()
-        s2_feature.setGeometry(cell_geometry)
-
-        # Get all attributes from the input feature
-        original_attributes = feature.attributes()
-        original_fields = feature.fields()
-
-        # Define new S2-related attributes
-        new_fields = QgsFields()
-        new_fields.append(QgsField("s2", QVariant.String))  # Dynamic cell ID field
-        new_fields.append(QgsField("resolution", QVariant.Int))
-        new_fields.append(QgsField("center_lat", QVariant.Double))
-        new_fields.append(QgsField("center_lon", QVariant.Double))
-        new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-        new_fields.append(QgsField("cell_area", QVariant.Double))
-        new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-        # Combine original fields and new fields
-        all_fields = QgsFields()
-        for field in original_fields:
-            all_fields.append(field)
-        for field in new_fields:
-            all_fields.append(field)
-
-        s2_feature.setFields(all_fields)
-
-        # Combine original attributes with new attributes
-        new_attributes = [
-            cell_token,
-            cell_resolution,
-            center_lat,
-            center_lon,
-            avg_edge_len,
-            cell_area,
-            cell_perimeter,
-        ]
-        all_attributes = original_attributes + new_attributes
+class S2PolygonRegion:
+    """S2 region of a shapely polygon for ``s2.RegionCoverer``.
 
-        s2_feature.setAttributes(all_attributes)
+    Cells are compared through their lat/lon bounding rectangles, so
+    ``may_intersect`` never misses a cell touching the polygon and
+    ``contains`` only holds for cells lying entirely inside it.
+    """
 
-        s2_features.append(s2_feature)
+    def __init__(self, shapely_geom):
+        self.geometry = shapely_geom
+        shapely.prepare(self.geometry)
+        min_x, min_y, max_x, max_y = shapely_geom.bounds
+        self.rect = s2.LatLngRect(
+            s2.LatLng.from_degrees(min_y, min_x), s2.LatLng.from_degrees(max_y, max_x)
+        )
 
-        if feedback and i % 100 == 0:
-            feedback.setProgress(int(100 * i / total_cells))
+    def get_cap_bound(self):
+        return self.rect.get_cap_bound()
+
+    def get_rect_bound(self):
+        return self.rect
+
+    @staticmethod
+    def cell_bounds(cell):
+        rect = cell.get_rect_bound()
+        lat_lo = rect.lat_lo().degrees
+        lat_hi = rect.lat_hi().degrees
+        if rect.lng().is_full():
+            return box(-180, lat_lo, 180, lat_hi)
+        lng_lo = rect.lng_lo().degrees
+        lng_hi = rect.lng_hi().degrees
+        if rect.lng().is_inverted():
+            return MultiPolygon(
+                [box(lng_lo, lat_lo, 180, lat_hi), box(-180, lat_lo, lng_hi, lat_hi)]
+            )
+        return box(lng_lo, lat_lo, lng_hi, lat_hi)
 
-    if feedback:
-        feedback.setProgress(100)
+    def may_intersect(self, cell):
+        return self.geometry.intersects(self.cell_bounds(cell))
 
-    return s2_features
+    def contains(self, cell):
+        return self.geometry.contains(self.cell_bounds(cell))
 
 
-def polygon2s2(feature, resolution, predicate=None, compact=None, feedback=None):
-    s2_features = []
-    feature_geometry = feature.geometry()
-    shapely_geom = wkt_loads(feature_geometry.asWkt())
-    feature_rect = feature_geometry.boundingBox()
-    min_x = feature_rect.xMinimum()
-    min_y = feature_rect.yMinimum()
-    max_x = feature_rect.xMaximum()
-    max_y = feature_rect.yMaximum()
-    level = resolution
+def s2_polygon_cells(shapely_geom, level, predicate=None, feedback=None):
+    """S2 cell ids of *level* matching *predicate* against *shapely_geom*.
+
+    The polygon itself is covered, from coarse to fine cells. Cells of the
+    covering that lie inside the polygon are expanded to *level* without any
+    test; only the cells along its boundary are decoded and checked.
+    """
+    region = S2PolygonRegion(shapely_geom)
     coverer = s2.RegionCoverer()
-    coverer.min_level = level
+    coverer.min_level = 0
     coverer.max_level = level
+    coverer.max_cells = sys.maxsize
 
-    region = s2.LatLngRect(
-        s2.LatLng.from_degrees(min_y, min_x), s2.LatLng.from_degrees(max_y, max_x)
-    )
+    cell_ids = []
+    boundary_ids = []
+    for cover_id in coverer.get_covering(region):
+        if feedback and feedback.isCanceled():
+            return []
+        interior = cover_id.level() < level and region.contains(s2.Cell(cover_id))
+        if cover_id.level() == level:
+            children = [cover_id]
+        else:
+            children = []
+            child_id = cover_id.child_begin(level)
+            end_id = cover_id.child_end(level)
+            while child_id != end_id:
+                children.append(child_id)
+                child_id = child_id.next()
+        if interior:
+            cell_ids.extend(children)
+            continue
+        boundary_ids.extend(children)
+
+    boundary_polygons = [
+        s22geo(s2.CellId.to_token(cell_id)) for cell_id in boundary_ids
+    ]
+    matches = predicate_mask(boundary_polygons, shapely_geom, predicate)
+    cell_ids.extend(cell_id for cell_id, match in zip(boundary_ids, matches) if match)
+    return cell_ids
 
-    covering = coverer.get_covering(region)
-    cell_ids = covering
-    total_cells = len(cell_ids)
+
+def polygon2s2(feature, resolution, predicate=None, compact=None, feedback=None):
+    shapely_geom = wkt_loads(feature.geometry().asWkt())
 
     if feedback:
         feedback.pushInfo(f"Processing feature {feature.id()}")
         feedback.setProgress(0)
 
-    original_attributes = feature.attributes()
-    original_fields = feature.fields()
-
-    new_fields = QgsFields()
-    new_fields.append(QgsField("s2", QVariant.String))  # Dynamic cell ID field
-    new_fields.append(QgsField("resolution", QVariant.Int))
-    new_fields.append(QgsField("center_lat", QVariant.Double))
-    new_fields.append(QgsField("center_lon", QVariant.Double))
-    new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-    new_fields.append(QgsField("cell_area", QVariant.Double))
-    new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-
-    all_fields = QgsFields()
-    for field in original_fields:
-        all_fields.append(field)
-    for field in new_fields:
-        all_fields.append(field)
+    matched_cell_ids = s2_polygon_cells(shapely_geom, resolution, predicate, feedback)
+    if feedback and feedback.isCanceled():
+        return []
 
-    polygon_features = []
+    if compact and matched_cell_ids:
+        if feedback:
+            feedback.pushInfo("Compacting cells")
+        covering = s2.CellUnion(matched_cell_ids)
+        covering.normalize()
+        matched_cell_ids = covering.cell_ids()
 
-    for i, cell_id in enumerate(cell_ids):
+    batch = CellBatch(feature, "s2")
+    total_cells = len(matched_cell_ids)
+    for i, cell_id in enumerate(matched_cell_ids):
         if feedback and feedback.isCanceled():
             return []
 
         cell_token = s2.CellId.to_token(cell_id)
-        cell_polygon = s22geo(cell_token)
-        if not check_predicate(cell_polygon, shapely_geom, predicate):
-            continue
-
-        cell_resolution = cell_id.level()
-
-        num_edges = 4
-        center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-            geodesic_dggs_metrics(cell_polygon, num_edges)
-        )
-
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-
-        s2_feature = QgsFeature()
-        s2_feature.setGeometry(cell_geometry)
-        s2_feature.setFields(all_fields)
-
-        new_attributes = [
-            cell_token,
-            cell_resolution,
-            center_lat,
-            center_lon,
-            avg_edge_len,
-            cell_area,
-            cell_perimeter,
-        ]
-        all_attributes = original_attributes + new_attributes
-
-        s2_feature.setAttributes(all_attributes)
-
-        polygon_features.append(s2_feature)
+        cell_polygon = s22geo(cell_token) if batch.geometry else None
+        batch.add(cell_token, cell_polygon, cell_id.level(), 4)
 
         if feedback and i % 100 == 0:
             feedback.setProgress(int(100 * i / total_cells))
@@ -660,68 +465,7 @@ def polygon2s2(feature, resolution, predicate=None, compact=None, feedback=None)
     if feedback:
         feedback.setProgress(100)
 
-    if compact and polygon_features:
-        s2_tokens = [feat["s2"] for feat in polygon_features if feat["s2"]]
-        try:
-            polygon_cell_ids = [s2.CellId.from_token(token) for token in s2_tokens]
-        except Exception:
-            polygon_cell_ids = []
-
-        if polygon_cell_ids:
-            covering = s2.CellUnion(polygon_cell_ids)
-            covering.normalize()
-            compact_cell_ids = covering.cell_ids()
-            compact_features = []
-
-            if feedback:
-                feedback.pushInfo("Compacting cells")
-                feedback.setProgress(0)
-
-            total_cells = len(compact_cell_ids)
-            for i, compact_cell in enumerate(compact_cell_ids):
-                if feedback and feedback.isCanceled():
-                    return []
-
-                cell_token = s2.CellId.to_token(compact_cell)
-                cell_polygon = s22geo(cell_token)
-                cell_resolution = compact_cell.level()
-
-                num_edges = 4
-                center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-                    geodesic_dggs_metrics(cell_polygon, num_edges)
-                )
-
-                cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-
-                s2_feature = QgsFeature()
-                s2_feature.setGeometry(cell_geometry)
-                s2_feature.setFields(all_fields)
-
-                new_attributes = [
-                    cell_token,
-                    cell_resolution,
-                    center_lat,
-                    center_lon,
-                    avg_edge_len,
-                    cell_area,
-                    cell_perimeter,
-                ]
-                all_attributes = original_attributes + new_attributes
-
-                s2_feature.setAttributes(all_attributes)
-                compact_features.append(s2_feature)
-
-                if feedback and total_cells and i % 100 == 0:
-                    feedback.setProgress(int(100 * i / total_cells))
-
-            if feedback:
-                feedback.setProgress(100)
-
-            polygon_features = compact_features
-
-    s2_features = polygon_features
-
-    return s2_features
+    return batch.features(feedback)
 
 
 #######################
@@ -740,6 +484,11 @@ def qgsfeature2a5(feature, resolution, predicate=None, compact=None, feedback=No
         return polygon2a5(feature, resolution, predicate, compact, feedback)
 
 
+def a5_num_edges(resolution):
+    # A5 cells are pentagons, except the triangles of resolution 1
+    return 3 if resolution == 1 else 5
+
+
 def point2a5(feature, resolution, feedback):
     if feedback and feedback.isCanceled():
         return []
@@ -747,443 +496,172 @@ def point2a5(feature, resolution, feedback):
     feature_geometry = feature.geometry()
     point = feature_geometry.asPoint()
     a5_hex = latlon2a5(point.y(), point.x(), resolution)
-    cell_polygon = a52geo(a5_hex)
-    num_edges = 5
-    if resolution == 1:
-        num_edges = 3
-    center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-        geodesic_dggs_metrics(cell_polygon, num_edges)
-    )
-
-    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-    # Create a single QGIS feature
-    a5_feature = QgsFeature()
-    a5_feature.setGeometry(cell_geometry)
-
-    # Get all attributes from the input feature
-    original_attributes = feature.attributes()
-    original_fields = feature.fields()
-
-    # Define new s2-related attributes
-    new_fields = QgsFields()
-    new_fields.append(QgsField("a5", QVariant.String))
-    new_fields.append(QgsField("resolution", QVariant.Int))
-    new_fields.append(QgsField("center_lat", QVariant.Double))
-    new_fields.append(QgsField("center_lon", QVariant.Double))
-    new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-    new_fields.append(QgsField("cell_area", QVariant.Double))
-    new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-    # Combine original fields and new fields
-    all_fields = QgsFields()
-    for field in original_fields:
-        all_fields.append(field)
-    for field in new_fields:
-        all_fields.append(field)
-
-    a5_feature.setFields(all_fields)
-
-    # Combine original attributes with new attributes
-    new_attributes = [
-        a5_hex,
-        resolution,
-        center_lat,
-        center_lon,
-        avg_edge_len,
-        cell_area,
-        cell_perimeter,
-    ]
-    all_attributes = original_attributes + new_attributes
-
-    a5_feature.setAttributes(all_attributes)
-
-    return [a5_feature]
+    batch = CellBatch(feature, "a5")
+    cell_polygon = a52geo(a5_hex) if batch.geometry else None
+    batch.add(a5_hex, cell_polygon, resolution, a5_num_edges(resolution))
+    return batch.features()
 
 
 def polyline2a5(feature, resolution, predicate=None, compact=None, feedback=None):
     """
     Convert a polyline feature to A5 grid cells.
 
-    This mirrors `vgrid.conversion.vector2dggs.vector2a5.polyline2a5`:
-    seed from the polyline bbox centroid, BFS over neighbor cells that intersect
-    the bbox, then keep cells that intersect the input polyline.
+    Walks from the cells of the line's first vertices to the neighbouring
+    cells that intersect the line.
     """
     if feedback and feedback.isCanceled():
         return []
 
-    a5_features = []
     feature_geometry = feature.geometry()
     shapely_geom = wkt_loads(feature_geometry.asWkt())
-    feature_rect = feature_geometry.boundingBox()
-    min_lng = feature_rect.xMinimum()
-    min_lat = feature_rect.yMinimum()
-    max_lng = feature_rect.xMaximum()
-    max_lat = feature_rect.yMaximum()
-
-    bbox_polygon = box(min_lng, min_lat, max_lng, max_lat)
-    bbox_center_lon = bbox_polygon.centroid.x
-    bbox_center_lat = bbox_polygon.centroid.y
-
-    seed_cell_id = a5.lonlat_to_cell((bbox_center_lon, bbox_center_lat), resolution)
-    seed_cell_resolution = a5.get_resolution(seed_cell_id)
-    seed_a5_hex = a5.u64_to_hex(seed_cell_id)
-    seed_cell_polygon = a52geo(seed_a5_hex)
-
-    if seed_cell_polygon is None or seed_cell_polygon.is_empty:
-        return []
 
     if feedback:
         feedback.pushInfo(f"Processing feature {feature.id()}")
         feedback.setProgress(0)
 
-    # Fast-path: seed cell fully contains bbox -> it must intersect the line
-    if seed_cell_polygon.contains(bbox_polygon):
-        num_edges = 5
-        if seed_cell_resolution == 1:
-            num_edges = 3
+    seeds = [
+        a5.lonlat_to_cell(vertex, resolution) for vertex in line_vertices(shapely_geom)
+    ]
+    cells = line_cells(
+        shapely_geom,
+        seeds,
+        lambda cell_id: a5.uncompact(a5.grid_disk_vertex(cell_id, 1), resolution),
+        a52geo_u64,
+        feedback,
+    )
+    if cells is None:
+        return []
 
-        center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-            geodesic_dggs_metrics(seed_cell_polygon, num_edges)
+    batch = CellBatch(feature, "a5")
+    for cell_id, cell_polygon in cells.items():
+        if cell_polygon is None or cell_polygon.is_empty:
+            continue
+        cell_resolution = a5.get_resolution(cell_id)
+        batch.add(
+            a5.u64_to_hex(cell_id),
+            cell_polygon,
+            cell_resolution,
+            a5_num_edges(cell_resolution),
         )
 
-        cell_geometry = QgsGeometry.fromWkt(seed_cell_polygon.wkt)
-        a5_feature = QgsFeature()
-        a5_feature.setGeometry(cell_geometry)
-
-        original_attributes = feature.attributes()
-        original_fields = feature.fields()
-
-        new_fields = QgsFields()
-        new_fields.append(QgsField("a5", QVariant.String))
-        new_fields.append(QgsField("resolution", QVariant.Int))
-        new_fields.append(QgsField("center_lat", QVariant.Double))
-        new_fields.append(QgsField("center_lon", QVariant.Double))
-        new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-        new_fields.append(QgsField("cell_area", QVariant.Double))
-        new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-
-        all_fields = QgsFields()
-        for field in original_fields:
-            all_fields.append(field)
-        for field in new_fields:
-            all_fields.append(field)
-        a5_feature.setFields(all_fields)
-
-        new_attributes = [
-            seed_a5_hex,
-            seed_cell_resolution,
-            center_lat,
-            center_lon,
-            avg_edge_len,
-            cell_area,
-            cell_perimeter,
-        ]
-        a5_feature.setAttributes(original_attributes + new_attributes)
+    if feedback:
+        feedback.setProgress(100)
 
-        if feedback:
-            feedback.setProgress(100)
-        return [a5_feature]
+    return batch.features(feedback)
 
-    intersecting_cells = {}  # {cell_u64: (cell_hex, shapely_polygon)}
-    covered_cells = set()
-    queue = deque([seed_cell_id])
 
-    while queue:
-        if feedback and feedback.isCanceled():
-            return []
+# Tile size and latitude limit (degrees) of the A5 native polygon fill, which
+# fails on points at the poles
+A5_FILL_TILE = 30
+A5_FILL_MAX_LAT = 89.99
 
-        current_cell_id = queue.popleft()
-        if current_cell_id in covered_cells:
-            continue
-        covered_cells.add(current_cell_id)
 
-        cell_hex = a5.u64_to_hex(current_cell_id)
-        cell_polygon = a52geo(cell_hex)
-        if cell_polygon is None or cell_polygon.is_empty:
-            continue
+def a5_cells(geometry, resolution, predicate=None, polygon=None, feedback=None):
+    """``{cell_u64: polygon}`` of the A5 cells matching *predicate* against *geometry*.
 
-        if cell_polygon.intersects(bbox_polygon):
-            intersecting_cells[current_cell_id] = (cell_hex, cell_polygon)
-            neighbors = a5.uncompact(
-                a5.grid_disk_vertex(current_cell_id, 1), resolution
+    The interior of polygonal *geometry* comes from A5's own polygon fill and
+    maps to None (no polygon built); only the cells along its boundary are
+    walked and tested. *polygon* builds a cell's polygon from its u64 id
+    (``a52geo_u64`` by default). Returns None if canceled.
+    """
+    polygon = polygon or a52geo_u64
+    # The fill runs per tile of the geometry, since it misses cells of very
+    # large polygons. The tile rings are
+    # densified so that the great-circle edges of the fill stay within a
+    # fraction of a cell of the planar edges tested here.
+    segment_length = a5.cell_edge_length_avg(resolution) / 111320
+    interior = []
+    for west in range(-180, 180, A5_FILL_TILE):
+        for south in range(-90, 90, A5_FILL_TILE):
+            tile = box(
+                west,
+                max(south, -A5_FILL_MAX_LAT),
+                west + A5_FILL_TILE,
+                min(south + A5_FILL_TILE, A5_FILL_MAX_LAT),
             )
-            for neighbor_id in neighbors:
-                if neighbor_id not in covered_cells:
-                    queue.append(neighbor_id)
-
-    total_cells = len(intersecting_cells)
-    for i, (cell_id, (cell_hex, cell_polygon)) in enumerate(intersecting_cells.items()):
-        if feedback and feedback.isCanceled():
-            return []
-
-        if not cell_polygon.intersects(shapely_geom):
-            continue
-
-        cell_resolution = a5.get_resolution(cell_id)
-        num_edges = 5
-        if cell_resolution == 1:
-            num_edges = 3
+            if not tile.intersects(geometry):
+                continue
+            tile_geometry = shapely.segmentize(
+                shapely.intersection(geometry, tile), segment_length
+            )
+            for part in shapely.get_parts(tile_geometry):
+                if not isinstance(part, Polygon) or part.is_empty:
+                    continue
+                rings = [list(ring.coords) for ring in (part.exterior, *part.interiors)]
+                interior.extend(
+                    a5.uncompact(a5.polygon_to_cells(rings, resolution), resolution)
+                )
 
-        center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-            geodesic_dggs_metrics(cell_polygon, num_edges)
+    seeds = [
+        a5.lonlat_to_cell(
+            (lon, min(max(lat, -A5_FILL_MAX_LAT), A5_FILL_MAX_LAT)), resolution
         )
-
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-        a5_feature = QgsFeature()
-        a5_feature.setGeometry(cell_geometry)
-
-        original_attributes = feature.attributes()
-        original_fields = feature.fields()
-
-        new_fields = QgsFields()
-        new_fields.append(QgsField("a5", QVariant.String))
-        new_fields.append(QgsField("resolution", QVariant.Int))
-        new_fields.append(QgsField("center_lat", QVariant.Double))
-        new_fields.append(QgsField("center_lon", QVariant.Double))
-        new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-        new_fields.append(QgsField("cell_area", QVariant.Double))
-        new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-
-        all_fields = QgsFields()
-        for field in original_fields:
-            all_fields.append(field)
-        for field in new_fields:
-            all_fields.append(field)
-        a5_feature.setFields(all_fields)
-
-        new_attributes = [
-            cell_hex,
-            cell_resolution,
-            center_lat,
-            center_lon,
-            avg_edge_len,
-            cell_area,
-            cell_perimeter,
-        ]
-        a5_feature.setAttributes(original_attributes + new_attributes)
-
-        a5_features.append(a5_feature)
-
-        if feedback and total_cells and i % 100 == 0:
-            feedback.setProgress(int(100 * i / total_cells))
-
-    if feedback:
-        feedback.setProgress(100)
-
-    return a5_features
+        for lon, lat in line_vertices(geometry.boundary)
+    ]
+    return region_cells(
+        geometry,
+        interior,
+        seeds,
+        lambda cell_id: a5.uncompact(a5.grid_disk_vertex(cell_id, 1), resolution),
+        polygon,
+        a5.cell_to_lonlat,
+        predicate,
+        feedback,
+    )
 
 
 def polygon2a5(feature, resolution, predicate=None, compact=None, feedback=None):
     """
     Convert a polygon feature to A5 grid cells.
 
-    This mirrors the discovery strategy used in `vgrid.conversion.vector2dggs.vector2a5.polygon2a5`:
-    seed from the polygon bbox centroid, BFS over neighbor cells that intersect the bbox,
-    then filter candidate cells using `check_predicate` against the input polygon.
+    Cells inside the polygon come from A5's native polygon fill; only the
+    cells along its boundary are built and tested with `predicate_mask`.
     """
     if feedback and feedback.isCanceled():
         return []
 
     feature_geometry = feature.geometry()
     shapely_geom = wkt_loads(feature_geometry.asWkt())
-    feature_rect = feature_geometry.boundingBox()
-    min_lng = feature_rect.xMinimum()
-    min_lat = feature_rect.yMinimum()
-    max_lng = feature_rect.xMaximum()
-    max_lat = feature_rect.yMaximum()
-
-    bbox_polygon = box(min_lng, min_lat, max_lng, max_lat)
-    bbox_center_lon = bbox_polygon.centroid.x
-    bbox_center_lat = bbox_polygon.centroid.y
-
-    seed_cell_id = a5.lonlat_to_cell((bbox_center_lon, bbox_center_lat), resolution)
-    seed_cell_resolution = a5.get_resolution(seed_cell_id)
-    seed_a5_hex = a5.u64_to_hex(seed_cell_id)
-    seed_cell_polygon = a52geo(seed_a5_hex)
-
-    if seed_cell_polygon is None or seed_cell_polygon.is_empty:
-        return []
 
     if feedback:
         feedback.pushInfo(f"Processing feature {feature.id()}")
         feedback.setProgress(0)
 
-    # Fast-path: seed cell fully contains bbox
-    if seed_cell_polygon.contains(bbox_polygon):
-        if predicate and (
-            not check_predicate(seed_cell_polygon, shapely_geom, predicate)
-        ):
+    cells = a5_cells(shapely_geom, resolution, predicate, feedback=feedback)
+    if cells is None:
+        return []
+
+    batch = CellBatch(feature, "a5", stream=not compact)
+    total_cells = len(cells)
+    for i, (cell_id, cell_polygon) in enumerate(cells.items()):
+        if feedback and feedback.isCanceled():
             return []
 
-        num_edges = 5
-        if seed_cell_resolution == 1:
-            num_edges = 3
-        center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-            geodesic_dggs_metrics(seed_cell_polygon, num_edges)
+        if cell_polygon is None and batch.geometry:
+            cell_polygon = a52geo_u64(cell_id)
+        cell_resolution = a5.get_resolution(cell_id)
+        batch.add(
+            a5.u64_to_hex(cell_id),
+            cell_polygon,
+            cell_resolution,
+            a5_num_edges(cell_resolution),
         )
 
-        cell_geometry = QgsGeometry.fromWkt(seed_cell_polygon.wkt)
-        a5_feature = QgsFeature()
-        a5_feature.setGeometry(cell_geometry)
-
-        original_attributes = feature.attributes()
-        original_fields = feature.fields()
-
-        new_fields = QgsFields()
-        new_fields.append(QgsField("a5", QVariant.String))
-        new_fields.append(QgsField("resolution", QVariant.Int))
-        new_fields.append(QgsField("center_lat", QVariant.Double))
-        new_fields.append(QgsField("center_lon", QVariant.Double))
-        new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-        new_fields.append(QgsField("cell_area", QVariant.Double))
-        new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-
-        all_fields = QgsFields()
-        for field in original_fields:
-            all_fields.append(field)
-        for field in new_fields:
-            all_fields.append(field)
-        a5_feature.setFields(all_fields)
-
-        new_attributes = [
-            seed_a5_hex,
-            seed_cell_resolution,
-            center_lat,
-            center_lon,
-            avg_edge_len,
-            cell_area,
-            cell_perimeter,
-        ]
-        a5_feature.setAttributes(original_attributes + new_attributes)
+        if feedback and total_cells and i % 100 == 0:
+            feedback.setProgress(int(100 * i / total_cells))
 
-        if feedback:
-            feedback.setProgress(100)
-        return [a5_feature]
+    if feedback:
+        feedback.setProgress(100)
 
-    # BFS discovery over bbox-intersecting cells
-    intersecting_cells = {}  # {cell_u64: (cell_hex, shapely_polygon)}
-    covered_cells = set()
-    queue = deque([seed_cell_id])
+    if compact and batch:
+        batch = a5compact_batch(batch, feedback)
 
-    while queue:
-        if feedback and feedback.isCanceled():
-            return []
+    return batch.features(feedback)
 
-        current_cell_id = queue.popleft()
-        if current_cell_id in covered_cells:
-            continue
-        covered_cells.add(current_cell_id)
 
-        cell_hex = a5.u64_to_hex(current_cell_id)
-        cell_polygon = a52geo(cell_hex)
-        if cell_polygon is None or cell_polygon.is_empty:
-            continue
-
-        if cell_polygon.intersects(bbox_polygon):
-            intersecting_cells[current_cell_id] = (cell_hex, cell_polygon)
-            neighbors = a5.uncompact(
-                a5.grid_disk_vertex(current_cell_id, 1), resolution
-            )
-            for neighbor_id in neighbors:
-                if neighbor_id not in covered_cells:
-                    queue.append(neighbor_id)
-
-    a5_features = []
-    total_cells = len(intersecting_cells)
-
-    for i, (cell_id, (cell_hex, cell_polygon)) in enumerate(intersecting_cells.items()):
-        if feedback and feedback.isCanceled():
-            return []
-
-        if not check_predicate(cell_polygon, shapely_geom, predicate):
-            continue
-
-        cell_resolution = a5.get_resolution(cell_id)
-        num_edges = 5
-        if cell_resolution == 1:
-            num_edges = 3
-
-        center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-            geodesic_dggs_metrics(cell_polygon, num_edges)
-        )
-
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-        a5_feature = QgsFeature()
-        a5_feature.setGeometry(cell_geometry)
-
-        original_attributes = feature.attributes()
-        original_fields = feature.fields()
-
-        new_fields = QgsFields()
-        new_fields.append(QgsField("a5", QVariant.String))
-        new_fields.append(QgsField("resolution", QVariant.Int))
-        new_fields.append(QgsField("center_lat", QVariant.Double))
-        new_fields.append(QgsField("center_lon", QVariant.Double))
-        new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-        new_fields.append(QgsField("cell_area", QVariant.Double))
-        new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-
-        all_fields = QgsFields()
-        for field in original_fields:
-            all_fields.append(field)
-        for field in new_fields:
-            all_fields.append(field)
-        a5_feature.setFields(all_fields)
-
-        new_attributes = [
-            cell_hex,
-            cell_resolution,
-            center_lat,
-            center_lon,
-            avg_edge_len,
-            cell_area,
-            cell_perimeter,
-        ]
-        a5_feature.setAttributes(original_attributes + new_attributes)
-
-        a5_features.append(a5_feature)
-
-        if feedback and total_cells and i % 100 == 0:
-            feedback.setProgress(int(100 * i / total_cells))
-
-    if feedback:
-        feedback.setProgress(100)
-
-    if compact and a5_features:
-        a5_features = a5compact_from_qgsfeatures(a5_features, feedback)
-
-    return a5_features
-
-
-def a5compact_from_qgsfeatures(qgs_features, feedback):
-    original_fields = qgs_features[0].fields()
-    # Get original attributes from the first feature (excluding A5-specific fields)
-    original_attributes = qgs_features[0].attributes()
-
-    # Find the indices of A5-specific fields to exclude from original attributes
-    a5_field_names = [
-        "a5",
-        "resolution",
-        "center_lat",
-        "center_lon",
-        "avg_edge_len",
-        "cell_area",
-    ]
-    a5_field_indices = []
-    for field_name in a5_field_names:
-        field_index = original_fields.indexOf(field_name)
-        if field_index >= 0:
-            a5_field_indices.append(field_index)
-
-    # Create list of original attributes excluding A5-specific fields
-    preserved_attributes = []
-    for i, attr in enumerate(original_attributes):
-        if i not in a5_field_indices:
-            preserved_attributes.append(attr)
-
-    a5_hexes = [f["a5"] for f in qgs_features if f["a5"]]
-
-    a5_hexes_compact = a5_compact(a5_hexes)
-    a5_features = []
+def a5compact_batch(batch, feedback):
+    a5_hexes_compact = a5_compact(batch.ids)
+    compact_batch = batch.empty()
     total_cells = len(a5_hexes_compact)
     if feedback:
         feedback.pushInfo("Compacting cells")
@@ -1191,44 +669,21 @@ def a5compact_from_qgsfeatures(qgs_features, feedback):
 
     for i, a5_hex_compact in enumerate(a5_hexes_compact):
         if feedback and feedback.isCanceled():
-            return []
-        cell_polygon = a52geo(a5_hex_compact)
+            return batch.empty()
         cell_resolution = a5.get_resolution(a5.hex_to_u64(a5_hex_compact))
-        num_edges = 5  # A5 cells are pentagons
-        if cell_resolution == 1:
-            num_edges = 3
-        center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-            geodesic_dggs_metrics(cell_polygon, num_edges)
+        compact_batch.add(
+            a5_hex_compact,
+            a52geo(a5_hex_compact),
+            cell_resolution,
+            a5_num_edges(cell_resolution),
         )
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-
-        a5_feature = QgsFeature()
-        a5_feature.setFields(original_fields)
-        a5_feature.setGeometry(cell_geometry)
-
-        # Set preserved original attributes
-        attr_index = 0
-        for j, attr in enumerate(original_attributes):
-            if j not in a5_field_indices:
-                a5_feature[original_fields[j].name()] = preserved_attributes[attr_index]
-                attr_index += 1
-
-        # Overwrite A5-specific attributes
-        a5_feature["a5"] = a5_hex_compact
-        a5_feature["resolution"] = cell_resolution
-        a5_feature["center_lat"] = center_lat
-        a5_feature["center_lon"] = center_lon
-        a5_feature["avg_edge_len"] = avg_edge_len
-        a5_feature["cell_area"] = cell_area
-        a5_feature["cell_perimeter"] = cell_perimeter
-        a5_features.append(a5_feature)
         if feedback and i % 100 == 0:
             feedback.setProgress(int(100 * i / total_cells))
 
     if feedback:
         feedback.setProgress(100)
 
-    return a5_features
+    return compact_batch
 
 
 ######################
@@ -1262,52 +717,10 @@ def point2dggal(dggal_type, feature, resolution, feedback):
     num_edges = dggrs.countZoneEdges(zone)
 
     cell_polygon = dggal2geo(dggal_type, dggal_id)
-    center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-        geodesic_dggs_metrics(cell_polygon, num_edges)
-    )
 
-    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-    # Create a single QGIS feature
-    dggal_feature = QgsFeature()
-    dggal_feature.setGeometry(cell_geometry)
-
-    # Get all attributes from the input feature
-    original_attributes = feature.attributes()
-    original_fields = feature.fields()
-
-    # Define new s2-related attributes
-    new_fields = QgsFields()
-    new_fields.append(QgsField(dggal_type, QVariant.String))
-    new_fields.append(QgsField("resolution", QVariant.Int))
-    new_fields.append(QgsField("center_lat", QVariant.Double))
-    new_fields.append(QgsField("center_lon", QVariant.Double))
-    new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-    new_fields.append(QgsField("cell_area", QVariant.Double))
-    new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-    # Combine original fields and new fields
-    all_fields = QgsFields()
-    for field in original_fields:
-        all_fields.append(field)
-    for field in new_fields:
-        all_fields.append(field)
-
-    dggal_feature.setFields(all_fields)
-
-    # Combine original attributes with new attributes
-    new_attributes = [
-        dggal_id,
-        resolution,
-        center_lat,
-        center_lon,
-        avg_edge_len,
-        cell_area,
-        cell_perimeter,
-    ]
-    all_attributes = original_attributes + new_attributes
-
-    dggal_feature.setAttributes(all_attributes)
-
-    return [dggal_feature]
+    batch = CellBatch(feature, f"dggal_{dggal_type}")
+    batch.add(dggal_id, cell_polygon, resolution, num_edges)
+    return batch.features()
 
 
 def polyline2dggal(
@@ -1320,7 +733,6 @@ def polyline2dggal(
 
     feature_geometry = feature.geometry()
     shapely_geom = wkt_loads(feature_geometry.asWkt())
-    feature_rect = feature_geometry.boundingBox()
 
     if feedback:
         feedback.pushInfo(f"Processing feature {feature.id()}")
@@ -1330,92 +742,42 @@ def polyline2dggal(
     dggs_class_name = DGGAL_TYPES[dggal_type]["class_name"]
     dggrs = globals()[dggs_class_name]()
 
-    # Convert bounds from (minx, miny, maxx, maxy) to (min_lon, min_lat, max_lon, max_lat)
-    min_lon, min_lat = feature_rect.xMinimum(), feature_rect.yMinimum()
-    max_lon, max_lat = feature_rect.xMaximum(), feature_rect.yMaximum()
-
-    # Create GeoExtent for DGGAL
-    ll = GeoPoint(min_lat, min_lon)
-    ur = GeoPoint(max_lat, max_lon)
-    geo_extent = GeoExtent(ll, ur)
-
-    # Get zones from DGGAL
-    zones = dggrs.listZones(resolution, geo_extent)
-
-    dggal_features = []
-    total_zones = len(zones)
-
-    for idx, zone in enumerate(zones):
-        if feedback and feedback.isCanceled():
-            return []
-
-        zone_id = dggrs.getZoneTextID(zone)
-        num_edges = dggrs.countZoneEdges(zone)
-        cell_resolution = dggrs.getZoneLevel(zone)
-
-        # Convert zone to geometry using dggal2geo
-        cell_polygon = dggal2geo(dggal_type, zone_id)
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-
-        # Check intersection with the feature geometry
-        if not check_predicate(cell_polygon, shapely_geom, "intersects"):
-            continue
-
-        # Calculate metrics
-        center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-            geodesic_dggs_metrics(cell_polygon, num_edges)
-        )
-
-        # Create QGIS feature
-        dggal_feature = QgsFeature()
-        dggal_feature.setGeometry(cell_geometry)
-
-        # Get all attributes from the input feature
-        original_attributes = feature.attributes()
-        original_fields = feature.fields()
-
-        # Define new DGGAL-related attributes
-        new_fields = QgsFields()
-        new_fields.append(QgsField(f"dggal_{dggal_type}", QVariant.String))
-        new_fields.append(QgsField("resolution", QVariant.Int))
-        new_fields.append(QgsField("center_lat", QVariant.Double))
-        new_fields.append(QgsField("center_lon", QVariant.Double))
-        new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-        new_fields.append(QgsField("cell_area", QVariant.Double))
-        new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-
-        # Combine original fields and new fields
-        all_fields = QgsFields()
-        for field in original_fields:
-            all_fields.append(field)
-        for field in new_fields:
-            all_fields.append(field)
-
-        dggal_feature.setFields(all_fields)
-
-        # Combine original attributes with new attributes
-        new_attributes = [
-            zone_id,
-            cell_resolution,
-            center_lat,
-            center_lon,
-            avg_edge_len,
-            cell_area,
-            cell_perimeter,
+    def neighbors(zone_id):
+        zone = dggrs.getZoneFromTextID(zone_id)
+        return [
+            dggrs.getZoneTextID(neighbor)
+            for neighbor in dggrs.getZoneNeighbors(zone, None)
         ]
-        all_attributes = original_attributes + new_attributes
-
-        dggal_feature.setAttributes(all_attributes)
 
-        dggal_features.append(dggal_feature)
+    # Walk along the line from zone to neighbouring zone
+    seeds = [
+        latlon2dggal(dggal_type, lat, lon, resolution)
+        for lon, lat in line_vertices(shapely_geom)
+    ]
+    cells = line_cells(
+        shapely_geom,
+        seeds,
+        neighbors,
+        lambda zone_id: dggal2geo(dggal_type, zone_id),
+        feedback,
+    )
+    if cells is None:
+        return []
 
-        if feedback and idx % 100 == 0:
-            feedback.setProgress(int(100 * idx / total_zones))
+    batch = CellBatch(feature, f"dggal_{dggal_type}")
+    for zone_id, cell_polygon in cells.items():
+        zone = dggrs.getZoneFromTextID(zone_id)
+        batch.add(
+            zone_id,
+            cell_polygon,
+            dggrs.getZoneLevel(zone),
+            dggrs.countZoneEdges(zone),
+        )
 
     if feedback:
         feedback.setProgress(100)
 
-    return dggal_features
+    return batch.features(feedback)
 
 
 def polygon2dggal(
@@ -1449,72 +811,30 @@ def polygon2dggal(
     # Get zones from DGGAL
     zones = dggrs.listZones(resolution, geo_extent)
 
-    dggal_features = []
+    batch = CellBatch(feature, f"dggal_{dggal_type}", stream=not compact)
     total_zones = len(zones)
 
+    # Convert zones to geometry using dggal2geo
+    zone_ids = [dggrs.getZoneTextID(zone) for zone in zones]
+    cell_polygons = [dggal2geo(dggal_type, zone_id) for zone_id in zone_ids]
+    # Check predicate with the feature geometry
+    matches = predicate_mask(cell_polygons, shapely_geom, predicate)
+
     for idx, zone in enumerate(zones):
         if feedback and feedback.isCanceled():
             return []
 
-        zone_id = dggrs.getZoneTextID(zone)
-        num_edges = dggrs.countZoneEdges(zone)
-        cell_resolution = dggrs.getZoneLevel(zone)
-
-        # Convert zone to geometry using dggal2geo
-        cell_polygon = dggal2geo(dggal_type, zone_id)
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-
-        # Check predicate with the feature geometry
-        if not check_predicate(cell_polygon, shapely_geom, predicate):
+        if not matches[idx]:
             continue
+        zone_id = zone_ids[idx]
+        cell_polygon = cell_polygons[idx]
 
-        # Calculate metrics
-        center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-            geodesic_dggs_metrics(cell_polygon, num_edges)
-        )
-
-        # Create QGIS feature
-        dggal_feature = QgsFeature()
-        dggal_feature.setGeometry(cell_geometry)
-
-        # Get all attributes from the input feature
-        original_attributes = feature.attributes()
-        original_fields = feature.fields()
-
-        # Define new DGGAL-related attributes
-        new_fields = QgsFields()
-        new_fields.append(QgsField(f"dggal_{dggal_type}", QVariant.String))
-        new_fields.append(QgsField("resolution", QVariant.Int))
-        new_fields.append(QgsField("center_lat", QVariant.Double))
-        new_fields.append(QgsField("center_lon", QVariant.Double))
-        new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-        new_fields.append(QgsField("cell_area", QVariant.Double))
-        new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-
-        # Combine original fields and new fields
-        all_fields = QgsFields()
-        for field in original_fields:
-            all_fields.append(field)
-        for field in new_fields:
-            all_fields.append(field)
-
-        dggal_feature.setFields(all_fields)
-
-        # Combine original attributes with new attributes
-        new_attributes = [
+        batch.add(
             zone_id,
-            cell_resolution,
-            center_lat,
-            center_lon,
-            avg_edge_len,
-            cell_area,
-            cell_perimeter,
-        ]
-        all_attributes = original_attributes + new_attributes
-
-        dggal_feature.setAttributes(all_attributes)
-
-        dggal_features.append(dggal_feature)
+            cell_polygon,
+            dggrs.getZoneLevel(zone),
+            dggrs.countZoneEdges(zone),
+        )
 
         if feedback and idx % 100 == 0:
             feedback.setProgress(int(100 * idx / total_zones))
@@ -1523,54 +843,15 @@ def polygon2dggal(
         feedback.setProgress(100)
 
     # Apply compact mode if enabled
-    if compact and dggal_features:
-        dggal_features = dggalcompact_from_qgsfeatures(dggal_features, feedback)
-
-    return dggal_features
-
-
-def dggalcompact_from_qgsfeatures(qgs_features, feedback):
-    # Find the DGGAL field name from the fields
-    original_fields = qgs_features[0].fields()
-    dggal_field_name = None
-    for field in original_fields:
-        if field.name().startswith("dggal_"):
-            dggal_field_name = field.name()
-            dggal_type = field.name().replace("dggal_", "")
-            break
-
-    if dggal_field_name is None:
-        return qgs_features  # Return original features if no DGGAL field found
-
-    # Get original attributes from the first feature (excluding DGGAL-specific fields)
-    original_attributes = qgs_features[0].attributes()
-
-    # Find the indices of DGGAL-specific fields to exclude from original attributes
-    dggal_field_names = [
-        dggal_field_name,
-        "resolution",
-        "center_lat",
-        "center_lon",
-        "avg_edge_len",
-        "cell_area",
-        "cell_perimeter",
-    ]
-    dggal_field_indices = []
-    for field_name in dggal_field_names:
-        field_index = original_fields.indexOf(field_name)
-        if field_index >= 0:
-            dggal_field_indices.append(field_index)
-
-    # Create list of original attributes excluding DGGAL-specific fields
-    preserved_attributes = []
-    for i, attr in enumerate(original_attributes):
-        if i not in dggal_field_indices:
-            preserved_attributes.append(attr)
-
-    dggal_ids = [f[dggal_field_name] for f in qgs_features if f[dggal_field_name]]
-
-    dggal_ids_compact = dggal_compact(dggal_type, dggal_ids)
-    dggal_features = []
+    if compact and batch:
+        batch = dggalcompact_batch(dggal_type, dggrs, batch, feedback)
+
+    return batch.features(feedback)
+
+
+def dggalcompact_batch(dggal_type, dggrs, batch, feedback):
+    dggal_ids_compact = dggal_compact(dggal_type, batch.ids)
+    compact_batch = batch.empty()
     total_cells = len(dggal_ids_compact)
     if feedback:
         feedback.pushInfo("Compacting cells")
@@ -1578,47 +859,21 @@ def dggalcompact_from_qgsfeatures(qgs_features, feedback):
 
     for i, dggal_id_compact in enumerate(dggal_ids_compact):
         if feedback and feedback.isCanceled():
-            return []
-        dggs_class_name = DGGAL_TYPES[dggal_type]["class_name"]
-        dggrs = getattr(dggal, dggs_class_name)()
+            return batch.empty()
         zone = dggrs.getZoneFromTextID(dggal_id_compact)
-        num_edges = dggrs.countZoneEdges(zone)
-        cell_polygon = dggal2geo(dggal_type, dggal_id_compact)
-        cell_resolution = dggrs.getZoneLevel(zone)
-        center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-            geodesic_dggs_metrics(cell_polygon, num_edges)
+        compact_batch.add(
+            dggal_id_compact,
+            dggal2geo(dggal_type, dggal_id_compact),
+            dggrs.getZoneLevel(zone),
+            dggrs.countZoneEdges(zone),
         )
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-
-        dggal_feature = QgsFeature()
-        dggal_feature.setFields(original_fields)
-        dggal_feature.setGeometry(cell_geometry)
-
-        # Set preserved original attributes
-        attr_index = 0
-        for j, attr in enumerate(original_attributes):
-            if j not in dggal_field_indices:
-                dggal_feature[original_fields[j].name()] = preserved_attributes[
-                    attr_index
-                ]
-                attr_index += 1
-
-        # Overwrite DGGAL-specific attributes
-        dggal_feature[dggal_field_name] = dggal_id_compact
-        dggal_feature["resolution"] = cell_resolution
-        dggal_feature["center_lat"] = center_lat
-        dggal_feature["center_lon"] = center_lon
-        dggal_feature["avg_edge_len"] = avg_edge_len
-        dggal_feature["cell_area"] = cell_area
-        dggal_feature["cell_perimeter"] = cell_perimeter
-        dggal_features.append(dggal_feature)
         if feedback and i % 100 == 0:
             feedback.setProgress(int(100 * i / total_cells))
 
     if feedback:
         feedback.setProgress(100)
 
-    return dggal_features
+    return compact_batch
 
 
 #######################
@@ -1639,6 +894,11 @@ def qgsfeature2rhealpix(
         return polygon2rhealpix(feature, resolution, predicate, compact, feedback)
 
 
+def rhealpix_num_edges(cell):
+    # Dart-shaped polar cells have three edges
+    return 3 if cell.ellipsoidal_shape() == "dart" else 4
+
+
 def point2rhealpix(feature, resolution, feedback):
     if feedback and feedback.isCanceled():
         return []
@@ -1653,240 +913,91 @@ def point2rhealpix(feature, resolution, feedback):
         resolution, (longitude, latitude), plane=False
     )
     seed_cell_id = str(seed_cell)  # Unique identifier for the current cell
-    seed_cell_polygon = rhealpix2geo(seed_cell_id)
-
-    num_edges = 4
-    if seed_cell.ellipsoidal_shape() == "dart":
-        num_edges = 3
-    center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-        geodesic_dggs_metrics(seed_cell_polygon, num_edges)
+    batch = CellBatch(feature, "rhealpix")
+    seed_cell_polygon = rhealpix2geo(seed_cell_id) if batch.geometry else None
+    batch.add(
+        seed_cell_id, seed_cell_polygon, resolution, rhealpix_num_edges(seed_cell)
     )
+    return batch.features()
 
-    cell_geometry = QgsGeometry.fromWkt(seed_cell_polygon.wkt)
-
-    # Create a single QGIS feature
-    rhealpix_feature = QgsFeature()
-    rhealpix_feature.setGeometry(cell_geometry)
-
-    # Get all attributes from the input feature
-    original_attributes = feature.attributes()
-    original_fields = feature.fields()
-
-    # Define new s2-related attributes
-    new_fields = QgsFields()
-    new_fields.append(QgsField("rhealpix", QVariant.String))
-    new_fields.append(QgsField("resolution", QVariant.Int))
-    new_fields.append(QgsField("center_lat", QVariant.Double))
-    new_fields.append(QgsField("center_lon", QVariant.Double))
-    new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-    new_fields.append(QgsField("cell_area", QVariant.Double))
-    new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-    # Combine original fields and new fields
-    all_fields = QgsFields()
-    for field in original_fields:
-        all_fields.append(field)
-    for field in new_fields:
-        all_fields.append(field)
-
-    rhealpix_feature.setFields(all_fields)
-
-    # Combine original attributes with new attributes
-    new_attributes = [
-        seed_cell_id,
-        resolution,
-        center_lat,
-        center_lon,
-        avg_edge_len,
-        cell_area,
-        cell_perimeter,
-    ]
-    all_attributes = original_attributes + new_attributes
-
-    rhealpix_feature.setAttributes(all_attributes)
-
-    return [rhealpix_feature]
-
-
-def polyline2rhealpix(feature, resolution, predicate=None, compact=None, feedback=None):
-    rhealpix_features = []
-
-    feature_geometry = feature.geometry()
-    shapely_geom = wkt_loads(feature_geometry.asWkt())
-
-    feature_rect = feature_geometry.boundingBox()
-    min_x = feature_rect.xMinimum()
-    min_y = feature_rect.yMinimum()
-    max_x = feature_rect.xMaximum()
-    max_y = feature_rect.yMaximum()
-
-    # Create a bounding box polygon
-    bbox_polygon = box(min_x, min_y, max_x, max_y)
-
-    bbox_center_lon = bbox_polygon.centroid.x
-    bbox_center_lat = bbox_polygon.centroid.y
-    seed_point = (bbox_center_lon, bbox_center_lat)
-
-    seed_cell = rhealpix_dggs.cell_from_point(resolution, seed_point, plane=False)
-    seed_cell_id = str(seed_cell)  # Unique identifier for the current cell
-    seed_cell_polygon = rhealpix2geo(seed_cell_id)
-
-    if seed_cell_polygon.contains(bbox_polygon):
-        num_edges = 4
-        if seed_cell.ellipsoidal_shape() == "dart":
-            num_edges = 3
-        center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-            geodesic_dggs_metrics(seed_cell_polygon, num_edges)
-        )
-        cell_resolution = resolution
-        cell_geometry = QgsGeometry.fromWkt(seed_cell_polygon.wkt)
-        # Create a single QGIS feature
-        rhealpix_feature = QgsFeature()
-        rhealpix_feature.setGeometry(cell_geometry)
-
-        # Get all attributes from the input feature
-        original_attributes = feature.attributes()
-        original_fields = feature.fields()
-
-        # Define new S2-related attributes
-        new_fields = QgsFields()
-        new_fields.append(QgsField("rhealpix", QVariant.String))
-        new_fields.append(QgsField("resolution", QVariant.Int))
-        new_fields.append(QgsField("center_lat", QVariant.Double))
-        new_fields.append(QgsField("center_lon", QVariant.Double))
-        new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-        new_fields.append(QgsField("cell_area", QVariant.Double))
-        new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-        # Combine original fields and new fields
-        all_fields = QgsFields()
-        for field in original_fields:
-            all_fields.append(field)
-        for field in new_fields:
-            all_fields.append(field)
-
-        rhealpix_feature.setFields(all_fields)
-
-        # Combine original attributes with new attributes
-        new_attributes = [
-            seed_cell_id,
-            cell_resolution,
-            center_lat,
-            center_lon,
-            avg_edge_len,
-            cell_area,
-            cell_perimeter,
-        ]
-        all_attributes = original_attributes + new_attributes
-
-        rhealpix_feature.setAttributes(all_attributes)
 
-        rhealpix_features.append(rhealpix_feature)
+def rhealpix_bbox_cells(seed_cell, bbox_polygon, feedback):
+    """``{cell_id: polygon}`` of the cells reached by BFS from *seed_cell*.
 
-    else:
-        # Initialize sets and queue
-        covered_cells = set()  # Cells that have been processed (by their unique ID)
-        queue = [seed_cell]  # Queue for BFS exploration
-        while queue:
-            if feedback and feedback.isCanceled():
-                return []
-            current_cell = queue.pop()
-            current_cell_id = str(
-                current_cell
-            )  # Unique identifier for the current cell
+    The search stops at cells not intersecting *bbox_polygon*. Returns None
+    if canceled.
+    """
+    covered_cells = {}  # Cells that have been processed (by their unique ID)
+    queue = [seed_cell]  # Queue for BFS exploration
+    while queue:
+        if feedback and feedback.isCanceled():
+            return None
+        current_cell = queue.pop()
+        current_cell_id = str(current_cell)  # Unique identifier for the current cell
 
-            if current_cell_id in covered_cells:
-                continue
+        if current_cell_id in covered_cells:
+            continue
 
-            # Add current cell to the covered set
-            covered_cells.add(current_cell_id)
+        # Convert current cell to polygon and add it to the covered cells
+        cell_polygon = rhealpix2geo(current_cell_id)
+        covered_cells[current_cell_id] = cell_polygon
+        if not cell_polygon.intersects(bbox_polygon):
+            continue
+        # Get neighbors and add to queue
+        neighbors = current_cell.neighbors(plane=False)
+        for _, neighbor in neighbors.items():
+            neighbor_id = str(neighbor)  # Unique identifier for the neighbor
+            if neighbor_id not in covered_cells:
+                queue.append(neighbor)
+    return covered_cells
 
-            # Convert current cell to polygon
-            cell_polygon = rhealpix2geo(current_cell_id)
-            if not cell_polygon.intersects(bbox_polygon):
-                continue  # Get neighbors and add to queue
-            neighbors = current_cell.neighbors(plane=False)
-            for _, neighbor in neighbors.items():
-                neighbor_id = str(neighbor)  # Unique identifier for the neighbor
-                if neighbor_id not in covered_cells:
-                    queue.append(neighbor)
 
-        total_cells = len(covered_cells)
+def rhealpix_cell_from_id(cell_id):
+    rhealpix_uids = (cell_id[0],) + tuple(map(int, cell_id[1:]))
+    return rhealpix_dggs.cell(rhealpix_uids)
 
-        if feedback:
-            feedback.pushInfo(f"Processing feature {feature.id()}")
-            feedback.setProgress(0)
 
-        for i, cell_id in enumerate(covered_cells):
-            if feedback and feedback.isCanceled():
-                return []
+def rhealpix_neighbor_ids(cell_id):
+    cell = rhealpix_cell_from_id(cell_id)
+    return [str(neighbor) for neighbor in cell.neighbors(plane=False).values()]
 
-            rhealpix_uids = (cell_id[0],) + tuple(map(int, cell_id[1:]))
-            rhelpix_cell = rhealpix_dggs.cell(rhealpix_uids)
-            cell_polygon = rhealpix2geo(cell_id)
 
-            num_edges = 4
-            if seed_cell.ellipsoidal_shape() == "dart":
-                num_edges = 3
-            center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-                geodesic_dggs_metrics(cell_polygon, num_edges)
-            )
-            cell_resolution = rhelpix_cell.resolution
-            cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-            if not check_predicate(cell_polygon, shapely_geom, "intersects"):
-                continue
-            # Create a single QGIS feature
-            rhealpix_feature = QgsFeature()
-            rhealpix_feature.setGeometry(cell_geometry)
-
-            # Get all attributes from the input feature
-            original_attributes = feature.attributes()
-            original_fields = feature.fields()
-
-            # Define new S2-related attributes
-            new_fields = QgsFields()
-            new_fields.append(QgsField("rhealpix", QVariant.String))
-            new_fields.append(QgsField("resolution", QVariant.Int))
-            new_fields.append(QgsField("center_lat", QVariant.Double))
-            new_fields.append(QgsField("center_lon", QVariant.Double))
-            new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-            new_fields.append(QgsField("cell_area", QVariant.Double))
-            new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-            # Combine original fields and new fields
-            all_fields = QgsFields()
-            for field in original_fields:
-                all_fields.append(field)
-            for field in new_fields:
-                all_fields.append(field)
-
-            rhealpix_feature.setFields(all_fields)
-
-            # Combine original attributes with new attributes
-            new_attributes = [
-                cell_id,
-                cell_resolution,
-                center_lat,
-                center_lon,
-                avg_edge_len,
-                cell_area,
-                cell_perimeter,
-            ]
-            all_attributes = original_attributes + new_attributes
+def polyline2rhealpix(feature, resolution, predicate=None, compact=None, feedback=None):
+    feature_geometry = feature.geometry()
+    shapely_geom = wkt_loads(feature_geometry.asWkt())
 
-            rhealpix_feature.setAttributes(all_attributes)
+    if feedback:
+        feedback.pushInfo(f"Processing feature {feature.id()}")
+        feedback.setProgress(0)
 
-            rhealpix_features.append(rhealpix_feature)
+    # Walk along the line from cell to neighbouring cell
+    seeds = [
+        str(rhealpix_dggs.cell_from_point(resolution, vertex, plane=False))
+        for vertex in line_vertices(shapely_geom)
+    ]
+    cells = line_cells(
+        shapely_geom, seeds, rhealpix_neighbor_ids, rhealpix2geo, feedback
+    )
+    if cells is None:
+        return []
 
-            if feedback and i % 100 == 0:
-                feedback.setProgress(int(100 * i / total_cells))
+    batch = CellBatch(feature, "rhealpix")
+    for cell_id, cell_polygon in cells.items():
+        rhealpix_cell = rhealpix_cell_from_id(cell_id)
+        batch.add(
+            cell_id,
+            cell_polygon,
+            rhealpix_cell.resolution,
+            rhealpix_num_edges(rhealpix_cell),
+        )
 
     if feedback:
         feedback.setProgress(100)
 
-    return rhealpix_features
+    return batch.features(feedback)
 
 
 def polygon2rhealpix(feature, resolution, predicate=None, compact=None, feedback=None):
-    rhealpix_features = []
-
     feature_geometry = feature.geometry()
     shapely_geom = wkt_loads(feature_geometry.asWkt())
 
@@ -1907,85 +1018,16 @@ def polygon2rhealpix(feature, resolution, predicate=None, compact=None, feedback
     seed_cell_id = str(seed_cell)  # Unique identifier for the current cell
     seed_cell_polygon = rhealpix2geo(seed_cell_id)
 
+    batch = CellBatch(feature, "rhealpix", stream=not compact)
     if seed_cell_polygon.contains(bbox_polygon):
-        num_edges = 4
-        if seed_cell.ellipsoidal_shape() == "dart":
-            num_edges = 3
-        center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-            geodesic_dggs_metrics(seed_cell_polygon, num_edges)
+        batch.add(
+            seed_cell_id, seed_cell_polygon, resolution, rhealpix_num_edges(seed_cell)
         )
-        cell_resolution = resolution
-        cell_geometry = QgsGeometry.fromWkt(seed_cell_polygon.wkt)
-        # Create a single QGIS feature
-        rhealpix_feature = QgsFeature()
-        rhealpix_feature.setGeometry(cell_geometry)
-
-        # Get all attributes from the input feature
-        original_attributes = feature.attributes()
-        original_fields = feature.fields()
-
-        # Define new S2-related attributes
-        new_fields = QgsFields()
-        new_fields.append(QgsField("rhealpix", QVariant.String))
-        new_fields.append(QgsField("resolution", QVariant.Int))
-        new_fields.append(QgsField("center_lat", QVariant.Double))
-        new_fields.append(QgsField("center_lon", QVariant.Double))
-        new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-        new_fields.append(QgsField("cell_area", QVariant.Double))
-        new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-        # Combine original fields and new fields
-        all_fields = QgsFields()
-        for field in original_fields:
-            all_fields.append(field)
-        for field in new_fields:
-            all_fields.append(field)
-
-        rhealpix_feature.setFields(all_fields)
-
-        # Combine original attributes with new attributes
-        new_attributes = [
-            seed_cell_id,
-            cell_resolution,
-            center_lat,
-            center_lon,
-            avg_edge_len,
-            cell_area,
-            cell_perimeter,
-        ]
-        all_attributes = original_attributes + new_attributes
-
-        rhealpix_feature.setAttributes(all_attributes)
-
-        rhealpix_features.append(rhealpix_feature)
 
     else:
-        # Initialize sets and queue
-        covered_cells = set()  # Cells that have been processed (by their unique ID)
-        queue = [seed_cell]  # Queue for BFS exploration
-        while queue:
-            if feedback and feedback.isCanceled():
-                return []
-            current_cell = queue.pop()
-            current_cell_id = str(
-                current_cell
-            )  # Unique identifier for the current cell
-
-            if current_cell_id in covered_cells:
-                continue
-
-            # Add current cell to the covered set
-            covered_cells.add(current_cell_id)
-
-            # Convert current cell to polygon
-            cell_polygon = rhealpix2geo(current_cell_id)
-            if not cell_polygon.intersects(bbox_polygon):
-                continue
-            # Get neighbors and add to queue
-            neighbors = current_cell.neighbors(plane=False)
-            for _, neighbor in neighbors.items():
-                neighbor_id = str(neighbor)  # Unique identifier for the neighbor
-                if neighbor_id not in covered_cells:
-                    queue.append(neighbor)
+        covered_cells = rhealpix_bbox_cells(seed_cell, bbox_polygon, feedback)
+        if covered_cells is None:
+            return []
 
         total_cells = len(covered_cells)
 
@@ -1993,79 +1035,29 @@ def polygon2rhealpix(feature, resolution, predicate=None, compact=None, feedback
             feedback.pushInfo(f"Processing feature {feature.id()}")
             feedback.setProgress(0)
 
-        for i, cell_id in enumerate(covered_cells):
+        matches = predicate_mask(list(covered_cells.values()), shapely_geom, predicate)
+        for i, (cell_id, cell_polygon) in enumerate(covered_cells.items()):
             if feedback and feedback.isCanceled():
                 return []
 
-            rhealpix_uids = (cell_id[0],) + tuple(map(int, cell_id[1:]))
-            rhelpix_cell = rhealpix_dggs.cell(rhealpix_uids)
-            cell_polygon = rhealpix2geo(cell_id)
-            if not check_predicate(cell_polygon, shapely_geom, predicate):
+            if not matches[i]:
                 continue
 
-            num_edges = 4
-            if rhelpix_cell.ellipsoidal_shape() == "dart":
-                num_edges = 3
-            center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-                geodesic_dggs_metrics(cell_polygon, num_edges)
-            )
-            cell_resolution = rhelpix_cell.resolution
-            cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-            # Create a single QGIS feature
-            rhealpix_feature = QgsFeature()
-            rhealpix_feature.setGeometry(cell_geometry)
-
-            # Get all attributes from the input feature
-            original_attributes = feature.attributes()
-            original_fields = feature.fields()
-
-            # Define new S2-related attributes
-            new_fields = QgsFields()
-            new_fields.append(QgsField("rhealpix", QVariant.String))
-            new_fields.append(QgsField("resolution", QVariant.Int))
-            new_fields.append(QgsField("center_lat", QVariant.Double))
-            new_fields.append(QgsField("center_lon", QVariant.Double))
-            new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-            new_fields.append(QgsField("cell_area", QVariant.Double))
-            new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-            # Combine original fields and new fields
-            all_fields = QgsFields()
-            for field in original_fields:
-                all_fields.append(field)
-            for field in new_fields:
-                all_fields.append(field)
-
-            rhealpix_feature.setFields(all_fields)
-
-            # Combine original attributes with new attributes
-            new_attributes = [
+            rhealpix_cell = rhealpix_cell_from_id(cell_id)
+            batch.add(
                 cell_id,
-                cell_resolution,
-                center_lat,
-                center_lon,
-                avg_edge_len,
-                cell_area,
-                cell_perimeter,
-            ]
-            all_attributes = original_attributes + new_attributes
-
-            rhealpix_feature.setAttributes(all_attributes)
-
-            rhealpix_features.append(rhealpix_feature)
+                cell_polygon,
+                rhealpix_cell.resolution,
+                rhealpix_num_edges(rhealpix_cell),
+            )
 
             if feedback and i % 100 == 0:
                 feedback.setProgress(int(100 * i / total_cells))
 
-        # Compact mode: apply to rhealpix_features after predicate check
-        if compact:
-            # Extract cell IDs from rhealpix_features
-            cells_to_process = [
-                f["rhealpix"] for f in rhealpix_features if f["rhealpix"]
-            ]
-            # Apply compact
-            cells_to_process = rhealpix_compact(cells_to_process)
-            # Rebuild rhealpix_features with compacted cells
-            rhealpix_features = []
+        # Compact mode: apply to the matched cells after predicate check
+        if compact and batch:
+            cells_to_process = rhealpix_compact(batch.ids)
+            batch = batch.empty()
             total_cells = len(cells_to_process)
             if feedback:
                 feedback.pushInfo("Compacting cells")
@@ -2075,62 +1067,14 @@ def polygon2rhealpix(feature, resolution, predicate=None, compact=None, feedback
                 if feedback and feedback.isCanceled():
                     return []
 
-                rhealpix_uids = (cell_id[0],) + tuple(map(int, cell_id[1:]))
-                rhelpix_cell = rhealpix_dggs.cell(rhealpix_uids)
-                cell_polygon = rhealpix2geo(cell_id)
-
                 # No need to re-check predicate for parent cells from compact mode
-
-                num_edges = 4
-                if rhelpix_cell.ellipsoidal_shape() == "dart":
-                    num_edges = 3
-                center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-                    geodesic_dggs_metrics(cell_polygon, num_edges)
-                )
-                cell_resolution = rhelpix_cell.resolution
-                cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-
-                # Create a single QGIS feature
-                rhealpix_feature = QgsFeature()
-                rhealpix_feature.setGeometry(cell_geometry)
-
-                # Get all attributes from the input feature
-                original_attributes = feature.attributes()
-                original_fields = feature.fields()
-
-                # Define new S2-related attributes
-                new_fields = QgsFields()
-                new_fields.append(QgsField("rhealpix", QVariant.String))
-                new_fields.append(QgsField("resolution", QVariant.Int))
-                new_fields.append(QgsField("center_lat", QVariant.Double))
-                new_fields.append(QgsField("center_lon", QVariant.Double))
-                new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-                new_fields.append(QgsField("cell_area", QVariant.Double))
-                new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-                # Combine original fields and new fields
-                all_fields = QgsFields()
-                for field in original_fields:
-                    all_fields.append(field)
-                for field in new_fields:
-                    all_fields.append(field)
-
-                rhealpix_feature.setFields(all_fields)
-
-                # Combine original attributes with new attributes
-                new_attributes = [
+                rhealpix_cell = rhealpix_cell_from_id(cell_id)
+                batch.add(
                     cell_id,
-                    cell_resolution,
-                    center_lat,
-                    center_lon,
-                    avg_edge_len,
-                    cell_area,
-                    cell_perimeter,
-                ]
-                all_attributes = original_attributes + new_attributes
-
-                rhealpix_feature.setAttributes(all_attributes)
-
-                rhealpix_features.append(rhealpix_feature)
+                    rhealpix2geo(cell_id),
+                    rhealpix_cell.resolution,
+                    rhealpix_num_edges(rhealpix_cell),
+                )
 
                 if feedback and i % 100 == 0:
                     feedback.setProgress(int(100 * i / total_cells))
@@ -2138,7 +1082,7 @@ def polygon2rhealpix(feature, resolution, predicate=None, compact=None, feedback
     if feedback:
         feedback.setProgress(100)
 
-    return rhealpix_features
+    return batch.features(feedback)
 
 
 #######################
@@ -2165,63 +1109,14 @@ def point2isea4t(feature, resolution, feedback):
     feature_geometry = feature.geometry()
     point = feature_geometry.asPoint()
     isea4t_id = latlon2isea4t(point.y(), point.x(), resolution)
-    cell_polygon = isea4t2geo(isea4t_id)
-
-    num_edges = 3
-    center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-        geodesic_dggs_metrics(cell_polygon, num_edges)
-    )
-
-    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-
-    # Create a single QGIS feature
-    isea4t_feature = QgsFeature()
-    isea4t_feature.setGeometry(cell_geometry)
-
-    # Get all attributes from the input feature
-    original_attributes = feature.attributes()
-    original_fields = feature.fields()
-
-    # Define new s2-related attributes
-    new_fields = QgsFields()
-    new_fields.append(QgsField("isea4t", QVariant.String))
-    new_fields.append(QgsField("resolution", QVariant.Int))
-    new_fields.append(QgsField("center_lat", QVariant.Double))
-    new_fields.append(QgsField("center_lon", QVariant.Double))
-    new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-    new_fields.append(QgsField("cell_area", QVariant.Double))
-    new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-    # Combine original fields and new fields
-    all_fields = QgsFields()
-    for field in original_fields:
-        all_fields.append(field)
-    for field in new_fields:
-        all_fields.append(field)
-
-    isea4t_feature.setFields(all_fields)
-
-    # Combine original attributes with new attributes
-    new_attributes = [
-        isea4t_id,
-        resolution,
-        center_lat,
-        center_lon,
-        avg_edge_len,
-        cell_area,
-        cell_perimeter,
-    ]
-    all_attributes = original_attributes + new_attributes
-
-    isea4t_feature.setAttributes(all_attributes)
-
-    return [isea4t_feature]
+    batch = CellBatch(feature, "isea4t")
+    cell_polygon = isea4t2geo(isea4t_id) if batch.geometry else None
+    batch.add(isea4t_id, cell_polygon, resolution, 3)
+    return batch.features()
 
 
-def polyline2isea4t(feature, resolution, predicate=None, compact=None, feedback=None):
-    isea4t_features = []
-    feature_geometry = feature.geometry()
-    shapely_geom = wkt_loads(feature_geometry.asWkt())
-
+def isea4t_bbox_children(feature_geometry, resolution):
+    """ISEA4T cells at *resolution* covering the bounding box of *feature_geometry*."""
     feature_rect = feature_geometry.boundingBox()
     min_x = feature_rect.xMinimum()
     min_y = feature_rect.yMinimum()
@@ -2239,10 +1134,16 @@ def polyline2isea4t(feature, resolution, predicate=None, compact=None, feedback=
     # for shape in shapes:
     bbox_cells = shape.get_shape().get_outer_ring().get_cells()
     bounding_cell = isea4t_dggs.get_bounding_dggs_cell(bbox_cells)
-    bounding_child_cells = get_isea4t_children_cells_within_bbox(
+    return get_isea4t_children_cells_within_bbox(
         bounding_cell.get_cell_id(), bounding_box, resolution
     )
 
+
+def polyline2isea4t(feature, resolution, predicate=None, compact=None, feedback=None):
+    feature_geometry = feature.geometry()
+    shapely_geom = wkt_loads(feature_geometry.asWkt())
+    bounding_child_cells = isea4t_bbox_children(feature_geometry, resolution)
+
     if compact:
         bounding_child_cells = isea4t_compact(bounding_child_cells)
 
@@ -2252,62 +1153,17 @@ def polyline2isea4t(feature, resolution, predicate=None, compact=None, feedback=
         feedback.pushInfo(f"Processing feature {feature.id()}")
         feedback.setProgress(0)
 
-    for i, child in enumerate(bounding_child_cells):
+    batch = CellBatch(feature, "isea4t")
+    cell_polygons = [isea4t2geo(isea4t_id) for isea4t_id in bounding_child_cells]
+    matches = predicate_mask(cell_polygons, shapely_geom, "intersects")
+    for i, isea4t_id in enumerate(bounding_child_cells):
         if feedback and feedback.isCanceled():
             return []
-        isea4t_id = child
-        cell_polygon = isea4t2geo(isea4t_id)
-        if not check_predicate(cell_polygon, shapely_geom, "intersects"):
+        if not matches[i]:
             continue
+        cell_polygon = cell_polygons[i]
 
-        num_edges = 3
-        center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-            geodesic_dggs_metrics(cell_polygon, num_edges)
-        )
-        cell_resolution = len(isea4t_id) - 2
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-
-        # Create a single QGIS feature
-        isea4t_feature = QgsFeature()
-        isea4t_feature.setGeometry(cell_geometry)
-
-        # Get all attributes from the input feature
-        original_attributes = feature.attributes()
-        original_fields = feature.fields()
-
-        # Define new S2-related attributes
-        new_fields = QgsFields()
-        new_fields.append(QgsField("isea4t", QVariant.String))
-        new_fields.append(QgsField("resolution", QVariant.Int))
-        new_fields.append(QgsField("center_lat", QVariant.Double))
-        new_fields.append(QgsField("center_lon", QVariant.Double))
-        new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-        new_fields.append(QgsField("cell_area", QVariant.Double))
-        new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-        # Combine original fields and new fields
-        all_fields = QgsFields()
-        for field in original_fields:
-            all_fields.append(field)
-        for field in new_fields:
-            all_fields.append(field)
-
-        isea4t_feature.setFields(all_fields)
-
-        # Combine original attributes with new attributes
-        new_attributes = [
-            isea4t_id,
-            cell_resolution,
-            center_lat,
-            center_lon,
-            avg_edge_len,
-            cell_area,
-            cell_perimeter,
-        ]
-        all_attributes = original_attributes + new_attributes
-
-        isea4t_feature.setAttributes(all_attributes)
-
-        isea4t_features.append(isea4t_feature)
+        batch.add(isea4t_id, cell_polygon, len(isea4t_id) - 2, 3)
 
         if feedback and i % 100 == 0:
             feedback.setProgress(int(100 * i / total_cells))
@@ -2315,51 +1171,13 @@ def polyline2isea4t(feature, resolution, predicate=None, compact=None, feedback=
     if feedback:
         feedback.setProgress(100)
 
-    return isea4t_features
+    return batch.features(feedback)
 
 
 def polygon2isea4t(feature, resolution, predicate=None, compact=None, feedback=None):
-    isea4t_features = []
     feature_geometry = feature.geometry()
     shapely_geom = wkt_loads(feature_geometry.asWkt())
-
-    # Prepare combined field schema once
-    original_attributes = feature.attributes()
-    original_fields = feature.fields()
-    new_fields = QgsFields()
-    new_fields.append(QgsField("isea4t", QVariant.String))
-    new_fields.append(QgsField("resolution", QVariant.Int))
-    new_fields.append(QgsField("center_lat", QVariant.Double))
-    new_fields.append(QgsField("center_lon", QVariant.Double))
-    new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-    new_fields.append(QgsField("cell_area", QVariant.Double))
-    new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-    all_fields = QgsFields()
-    for field in original_fields:
-        all_fields.append(field)
-    for field in new_fields:
-        all_fields.append(field)
-
-    feature_rect = feature_geometry.boundingBox()
-    min_x = feature_rect.xMinimum()
-    min_y = feature_rect.yMinimum()
-    max_x = feature_rect.xMaximum()
-    max_y = feature_rect.yMaximum()
-
-    # Create a bounding box polygon
-    bounding_box = box(min_x, min_y, max_x, max_y)
-    bounding_box_wkt = bounding_box.wkt  # Create a bounding box polygon
-    accuracy = ISEA4T_RES_ACCURACY_DICT.get(resolution)
-    shapes = isea4t_dggs.convert_shape_string_to_dggs_shapes(
-        bounding_box_wkt, ShapeStringFormat.WKT, accuracy
-    )
-    shape = shapes[0]
-    # for shape in shapes:
-    bbox_cells = shape.get_shape().get_outer_ring().get_cells()
-    bounding_cell = isea4t_dggs.get_bounding_dggs_cell(bbox_cells)
-    bounding_child_cells = get_isea4t_children_cells_within_bbox(
-        bounding_cell.get_cell_id(), bounding_box, resolution
-    )
+    bounding_child_cells = isea4t_bbox_children(feature_geometry, resolution)
 
     total_cells = len(bounding_child_cells)
 
@@ -2367,41 +1185,17 @@ def polygon2isea4t(feature, resolution, predicate=None, compact=None, feedback=N
         feedback.pushInfo(f"Processing feature {feature.id()}")
         feedback.setProgress(0)
 
-    for i, child in enumerate(bounding_child_cells):
+    batch = CellBatch(feature, "isea4t", stream=not compact)
+    cell_polygons = [isea4t2geo(isea4t_id) for isea4t_id in bounding_child_cells]
+    matches = predicate_mask(cell_polygons, shapely_geom, predicate)
+    for i, isea4t_id in enumerate(bounding_child_cells):
         if feedback and feedback.isCanceled():
             return []
-        isea4t_id = child
-        cell_polygon = isea4t2geo(isea4t_id)
-        if not check_predicate(cell_polygon, shapely_geom, predicate):
+        if not matches[i]:
             continue
+        cell_polygon = cell_polygons[i]
 
-        num_edges = 3
-        center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-            geodesic_dggs_metrics(cell_polygon, num_edges)
-        )
-        cell_resolution = len(isea4t_id) - 2
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-
-        # Create a single QGIS feature
-        isea4t_feature = QgsFeature()
-        isea4t_feature.setGeometry(cell_geometry)
-        isea4t_feature.setFields(all_fields)
-
-        # Combine original attributes with new attributes
-        new_attributes = [
-            isea4t_id,
-            cell_resolution,
-            center_lat,
-            center_lon,
-            avg_edge_len,
-            cell_area,
-            cell_perimeter,
-        ]
-        all_attributes = original_attributes + new_attributes
-
-        isea4t_feature.setAttributes(all_attributes)
-
-        isea4t_features.append(isea4t_feature)
+        batch.add(isea4t_id, cell_polygon, len(isea4t_id) - 2, 3)
 
         if feedback and i % 100 == 0:
             feedback.setProgress(int(100 * i / total_cells))
@@ -2410,10 +1204,9 @@ def polygon2isea4t(feature, resolution, predicate=None, compact=None, feedback=N
         feedback.setProgress(100)
 
     # Compact mode: apply after predicate filtering similar to vector2isea4t
-    if compact and isea4t_features:
-        cells_to_process = [f["isea4t"] for f in isea4t_features if f["isea4t"]]
-        cells_to_process = isea4t_compact(cells_to_process)
-        compact_features = []
+    if compact and batch:
+        cells_to_process = isea4t_compact(batch.ids)
+        batch = batch.empty()
         total_cells = len(cells_to_process)
         if feedback:
             feedback.pushInfo("Compacting cells")
@@ -2423,43 +1216,15 @@ def polygon2isea4t(feature, resolution, predicate=None, compact=None, feedback=N
             if feedback and feedback.isCanceled():
                 return []
 
-            cell_polygon = isea4t2geo(cell_id)
-            num_edges = 3
-            cell_resolution = len(cell_id) - 2
-            (
-                center_lat,
-                center_lon,
-                avg_edge_len,
-                cell_area,
-                cell_perimeter,
-            ) = geodesic_dggs_metrics(cell_polygon, num_edges)
-            cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-
-            isea4t_feature = QgsFeature()
-            isea4t_feature.setGeometry(cell_geometry)
-            isea4t_feature.setFields(all_fields)
-
-            new_attributes = [
-                cell_id,
-                cell_resolution,
-                center_lat,
-                center_lon,
-                avg_edge_len,
-                cell_area,
-                cell_perimeter,
-            ]
-            all_attributes = original_attributes + new_attributes
-            isea4t_feature.setAttributes(all_attributes)
-            compact_features.append(isea4t_feature)
+            batch.add(cell_id, isea4t2geo(cell_id), len(cell_id) - 2, 3)
 
             if feedback and i % 100 == 0 and total_cells:
                 feedback.setProgress(int(100 * i / total_cells))
 
         if feedback:
             feedback.setProgress(100)
-        isea4t_features = compact_features
 
-    return isea4t_features
+    return batch.features(feedback)
 
 
 #######################
@@ -2483,66 +1248,24 @@ def point2isea3h(feature, resolution, feedback):
     feature_geometry = feature.geometry()
     point = feature_geometry.asPoint()
     isea3h_id = latlon2isea3h(point.y(), point.x(), resolution)
-    cell_polygon = isea3h2geo(isea3h_id)
-
-    num_edges = 6
-    cell_resolution = resolution
-    if cell_resolution == 0:
-        num_edges = 3  # icosahedron faces
-    center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-        geodesic_dggs_metrics(cell_polygon, num_edges)
-    )
+    batch = CellBatch(feature, "isea3h")
+    cell_polygon = isea3h2geo(isea3h_id) if batch.geometry else None
+    batch.add(isea3h_id, cell_polygon, resolution, isea3h_num_edges(resolution))
+    return batch.features()
 
-    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-
-    # Create a single QGIS feature
-    isea3h_feature = QgsFeature()
-    isea3h_feature.setGeometry(cell_geometry)
-
-    # Get all attributes from the input feature
-    original_attributes = feature.attributes()
-    original_fields = feature.fields()
-
-    # Define new s2-related attributes
-    new_fields = QgsFields()
-    new_fields.append(QgsField("isea3h", QVariant.String))
-    new_fields.append(QgsField("resolution", QVariant.Int))
-    new_fields.append(QgsField("center_lat", QVariant.Double))
-    new_fields.append(QgsField("center_lon", QVariant.Double))
-    new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-    new_fields.append(QgsField("cell_area", QVariant.Double))
-    new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-    # Combine original fields and new fields
-    all_fields = QgsFields()
-    for field in original_fields:
-        all_fields.append(field)
-    for field in new_fields:
-        all_fields.append(field)
-
-    isea3h_feature.setFields(all_fields)
-
-    # Combine original attributes with new attributes
-    new_attributes = [
-        isea3h_id,
-        cell_resolution,
-        center_lat,
-        center_lon,
-        avg_edge_len,
-        cell_area,
-        cell_perimeter,
-    ]
-    all_attributes = original_attributes + new_attributes
 
-    isea3h_feature.setAttributes(all_attributes)
+def isea3h_num_edges(resolution):
+    # Resolution 0 cells are the icosahedron faces
+    return 3 if resolution == 0 else 6
 
-    return [isea3h_feature]
 
+def isea3h_cell_resolution(isea3h_cell):
+    isea3h2point = isea3h_dggs.convert_dggs_cell_to_point(isea3h_cell)
+    return ISEA3H_ACCURACY_RES_DICT.get(isea3h2point._accuracy)
 
-def polyline2isea3h(feature, resolution, predicate=None, compact=None, feedback=None):
-    isea3h_features = []
 
-    feature_geometry = feature.geometry()
-    shapely_geom = wkt_loads(feature_geometry.asWkt())
+def isea3h_bbox_children(feature_geometry, resolution):
+    """ISEA3H cells at *resolution* covering the bounding box of *feature_geometry*."""
     feature_rect = feature_geometry.boundingBox()
     min_x = feature_rect.xMinimum()
     min_y = feature_rect.yMinimum()
@@ -2560,171 +1283,74 @@ def polyline2isea3h(feature, resolution, predicate=None, compact=None, feedback=
     # for shape in shapes:
     bbox_cells = shape.get_shape().get_outer_ring().get_cells()
     bounding_cell = isea3h_dggs.get_bounding_dggs_cell(bbox_cells)
-    bounding_child_cells = get_isea3h_children_cells_within_bbox(
+    return get_isea3h_children_cells_within_bbox(
         bounding_cell.get_cell_id(), bounding_box, resolution
     )
 
+
+def polyline2isea3h(feature, resolution, predicate=None, compact=None, feedback=None):
+    feature_geometry = feature.geometry()
+    shapely_geom = wkt_loads(feature_geometry.asWkt())
+    bounding_child_cells = isea3h_bbox_children(feature_geometry, resolution)
+
     total_cells = len(bounding_child_cells)
 
     if feedback:
         feedback.pushInfo(f"Processing feature {feature.id()}")
         feedback.setProgress(0)
 
-    for i, child in enumerate(bounding_child_cells):
+    batch = CellBatch(feature, "isea3h")
+    isea3h_cells = [DggsCell(child) for child in bounding_child_cells]
+    cell_polygons = [isea3h2geo(cell.get_cell_id()) for cell in isea3h_cells]
+    matches = predicate_mask(cell_polygons, shapely_geom, "intersects")
+    for i, isea3h_cell in enumerate(isea3h_cells):
         if feedback and feedback.isCanceled():
             return []
-        isea3h_cell = DggsCell(child)
-        isea3h_id = isea3h_cell.get_cell_id()
-        cell_polygon = isea3h2geo(isea3h_id)
-        if not check_predicate(cell_polygon, shapely_geom, "intersects"):
+        if not matches[i]:
             continue
-        isea3h2point = isea3h_dggs.convert_dggs_cell_to_point(isea3h_cell)
-        cell_accuracy = isea3h2point._accuracy
-        cell_resolution = ISEA3H_ACCURACY_RES_DICT.get(cell_accuracy)
-        num_edges = 3 if cell_resolution == 0 else 6
-        center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-            geodesic_dggs_metrics(cell_polygon, num_edges)
+        isea3h_id = isea3h_cell.get_cell_id()
+        cell_polygon = cell_polygons[i]
+        cell_resolution = isea3h_cell_resolution(isea3h_cell)
+        batch.add(
+            isea3h_id, cell_polygon, cell_resolution, isea3h_num_edges(cell_resolution)
         )
 
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-        # Create a single QGIS feature
-        isea3h_feature = QgsFeature()
-        isea3h_feature.setGeometry(cell_geometry)
-
-        # Get all attributes from the input feature
-        original_attributes = feature.attributes()
-        original_fields = feature.fields()
-
-        # Define new S2-related attributes
-        new_fields = QgsFields()
-        new_fields.append(QgsField("isea3h", QVariant.String))
-        new_fields.append(QgsField("resolution", QVariant.Int))
-        new_fields.append(QgsField("center_lat", QVariant.Double))
-        new_fields.append(QgsField("center_lon", QVariant.Double))
-        new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-        new_fields.append(QgsField("cell_area", QVariant.Double))
-        new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-        # Combine original fields and new fields
-        all_fields = QgsFields()
-        for field in original_fields:
-            all_fields.append(field)
-        for field in new_fields:
-            all_fields.append(field)
-
-        isea3h_feature.setFields(all_fields)
-
-        # Combine original attributes with new attributes
-        new_attributes = [
-            isea3h_id,
-            cell_resolution,
-            center_lat,
-            center_lon,
-            avg_edge_len,
-            cell_area,
-            cell_perimeter,
-        ]
-        all_attributes = original_attributes + new_attributes
-
-        isea3h_feature.setAttributes(all_attributes)
-
-        isea3h_features.append(isea3h_feature)
         if feedback and i % 100 == 0:
             feedback.setProgress(int(100 * i / total_cells))
 
     if feedback:
         feedback.setProgress(100)
 
-    return isea3h_features
+    return batch.features(feedback)
 
 
 def polygon2isea3h(feature, resolution, predicate=None, compact=None, feedback=None):
-    isea3h_features = []
-
     feature_geometry = feature.geometry()
     shapely_geom = wkt_loads(feature_geometry.asWkt())
+    bounding_child_cells = isea3h_bbox_children(feature_geometry, resolution)
 
-    # Prepare combined field schema once
-    original_attributes = feature.attributes()
-    original_fields = feature.fields()
-    new_fields = QgsFields()
-    new_fields.append(QgsField("isea3h", QVariant.String))
-    new_fields.append(QgsField("resolution", QVariant.Int))
-    new_fields.append(QgsField("center_lat", QVariant.Double))
-    new_fields.append(QgsField("center_lon", QVariant.Double))
-    new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-    new_fields.append(QgsField("cell_area", QVariant.Double))
-    new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-    all_fields = QgsFields()
-    for field in original_fields:
-        all_fields.append(field)
-    for field in new_fields:
-        all_fields.append(field)
-
-    feature_rect = feature_geometry.boundingBox()
-    min_x = feature_rect.xMinimum()
-    min_y = feature_rect.yMinimum()
-    max_x = feature_rect.xMaximum()
-    max_y = feature_rect.yMaximum()
-
-    # Create a bounding box polygon
-    bounding_box = box(min_x, min_y, max_x, max_y)
-    bounding_box_wkt = bounding_box.wkt  # Create a bounding box polygon
-    accuracy = ISEA3H_RES_ACCURACY_DICT.get(resolution)
-    shapes = isea3h_dggs.convert_shape_string_to_dggs_shapes(
-        bounding_box_wkt, ShapeStringFormat.WKT, accuracy
-    )
-    shape = shapes[0]
-    # for shape in shapes:
-    bbox_cells = shape.get_shape().get_outer_ring().get_cells()
-    bounding_cell = isea3h_dggs.get_bounding_dggs_cell(bbox_cells)
-    bounding_child_cells = get_isea3h_children_cells_within_bbox(
-        bounding_cell.get_cell_id(), bounding_box, resolution
-    )
-
-    total_cells = len(bounding_child_cells)
+    total_cells = len(bounding_child_cells)
 
     if feedback:
         feedback.pushInfo(f"Processing feature {feature.id()}")
         feedback.setProgress(0)
 
-    for i, child in enumerate(bounding_child_cells):
+    batch = CellBatch(feature, "isea3h", stream=not compact)
+    isea3h_cells = [DggsCell(child) for child in bounding_child_cells]
+    cell_polygons = [isea3h2geo(cell.get_cell_id()) for cell in isea3h_cells]
+    matches = predicate_mask(cell_polygons, shapely_geom, predicate)
+    for i, isea3h_cell in enumerate(isea3h_cells):
         if feedback and feedback.isCanceled():
             return []
-        isea3h_cell = DggsCell(child)
-        isea3h_id = isea3h_cell.get_cell_id()
-        cell_polygon = isea3h2geo(isea3h_id)
-        if not check_predicate(cell_polygon, shapely_geom, predicate):
+        if not matches[i]:
             continue
-        isea3h2point = isea3h_dggs.convert_dggs_cell_to_point(isea3h_cell)
-        cell_accuracy = isea3h2point._accuracy
-        cell_resolution = ISEA3H_ACCURACY_RES_DICT.get(cell_accuracy)
-
-        num_edges = 3 if cell_resolution == 0 else 6
-        center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-            geodesic_dggs_metrics(cell_polygon, num_edges)
+        isea3h_id = isea3h_cell.get_cell_id()
+        cell_polygon = cell_polygons[i]
+        cell_resolution = isea3h_cell_resolution(isea3h_cell)
+        batch.add(
+            isea3h_id, cell_polygon, cell_resolution, isea3h_num_edges(cell_resolution)
         )
 
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-        # Create a single QGIS feature
-        isea3h_feature = QgsFeature()
-        isea3h_feature.setGeometry(cell_geometry)
-        isea3h_feature.setFields(all_fields)
-
-        # Combine original attributes with new attributes
-        new_attributes = [
-            isea3h_id,
-            cell_resolution,
-            center_lat,
-            center_lon,
-            avg_edge_len,
-            cell_area,
-            cell_perimeter,
-        ]
-        all_attributes = original_attributes + new_attributes
-
-        isea3h_feature.setAttributes(all_attributes)
-
-        isea3h_features.append(isea3h_feature)
         if feedback and i % 100 == 0:
             feedback.setProgress(int(100 * i / total_cells))
 
@@ -2732,10 +1358,9 @@ def polygon2isea3h(feature, resolution, predicate=None, compact=None, feedback=N
         feedback.setProgress(100)
 
     # Compact mode: apply after predicate filtering similar to vector2isea3h
-    if compact and isea3h_features:
-        cells_to_process = [f["isea3h"] for f in isea3h_features if f["isea3h"]]
-        cells_to_process = isea3h_compact(cells_to_process)
-        compact_features = []
+    if compact and batch:
+        cells_to_process = isea3h_compact(batch.ids)
+        batch = batch.empty()
         total_cells = len(cells_to_process)
         if feedback:
             feedback.pushInfo("Compacting cells")
@@ -2745,42 +1370,21 @@ def polygon2isea3h(feature, resolution, predicate=None, compact=None, feedback=N
             if feedback and feedback.isCanceled():
                 return []
 
-            cell_polygon = isea3h2geo(cell_id)
-            isea3h_cell = DggsCell(cell_id)
-            isea3h2point = isea3h_dggs.convert_dggs_cell_to_point(isea3h_cell)
-            cell_accuracy = isea3h2point._accuracy
-            cell_resolution = ISEA3H_ACCURACY_RES_DICT.get(cell_accuracy)
-            num_edges = 3 if cell_resolution == 0 else 6
-            center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-                geodesic_dggs_metrics(cell_polygon, num_edges)
-            )
-            cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-
-            isea3h_feature = QgsFeature()
-            isea3h_feature.setGeometry(cell_geometry)
-            isea3h_feature.setFields(all_fields)
-
-            new_attributes = [
+            cell_resolution = isea3h_cell_resolution(DggsCell(cell_id))
+            batch.add(
                 cell_id,
+                isea3h2geo(cell_id),
                 cell_resolution,
-                center_lat,
-                center_lon,
-                avg_edge_len,
-                cell_area,
-                cell_perimeter,
-            ]
-            all_attributes = original_attributes + new_attributes
-            isea3h_feature.setAttributes(all_attributes)
-            compact_features.append(isea3h_feature)
+                isea3h_num_edges(cell_resolution),
+            )
 
             if feedback and i % 100 == 0 and total_cells:
                 feedback.setProgress(int(100 * i / total_cells))
 
         if feedback:
             feedback.setProgress(100)
-        isea3h_features = compact_features
 
-    return isea3h_features
+    return batch.features(feedback)
 
 
 #######################
@@ -2805,63 +1409,15 @@ def point2qtm(feature, resolution, feedback):
     feature_geometry = feature.geometry()
     point = feature_geometry.asPoint()
     qtm_id = latlon2qtm(point.y(), point.x(), resolution)
-    cell_polygon = qtm2geo(qtm_id)
-    num_edges = 3
-    center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-        geodesic_dggs_metrics(cell_polygon, num_edges)
-    )
-    cell_resolution = resolution
-    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-
-    qtm_feature = QgsFeature()
-    qtm_feature.setGeometry(cell_geometry)
-
-    # Get all attributes from the input feature
-    original_attributes = feature.attributes()
-    original_fields = feature.fields()
-
-    # Define new s2-related attributes
-    new_fields = QgsFields()
-    new_fields.append(QgsField("qtm", QVariant.String))
-    new_fields.append(QgsField("resolution", QVariant.Int))
-    new_fields.append(QgsField("center_lat", QVariant.Double))
-    new_fields.append(QgsField("center_lon", QVariant.Double))
-    new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-    new_fields.append(QgsField("cell_area", QVariant.Double))
-    new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-    # Combine original fields and new fields
-    all_fields = QgsFields()
-    for field in original_fields:
-        all_fields.append(field)
-    for field in new_fields:
-        all_fields.append(field)
-
-    qtm_feature.setFields(all_fields)
-
-    # Combine original attributes with new attributes
-    new_attributes = [
-        qtm_id,
-        cell_resolution,
-        center_lat,
-        center_lon,
-        avg_edge_len,
-        cell_area,
-        cell_perimeter,
-    ]
-    all_attributes = original_attributes + new_attributes
-
-    qtm_feature.setAttributes(all_attributes)
-
-    return [qtm_feature]
+    batch = CellBatch(feature, "qtm")
+    cell_polygon = qtm2geo(qtm_id) if batch.geometry else None
+    batch.add(qtm_id, cell_polygon, resolution, 3)
+    return batch.features()
 
 
-def qtmcompact_from_qgsfeatures(qgs_features, feedback):
-    original_fields = qgs_features[0].fields()
-
-    qtm_ids = [f["qtm"] for f in qgs_features if f["qtm"]]
-
-    qtm_ids_compact = qtm_compact(qtm_ids)
-    qtm_features = []
+def qtmcompact_batch(batch, feedback):
+    qtm_ids_compact = qtm_compact(batch.ids)
+    compact_batch = batch.empty()
     total_cells = len(qtm_ids_compact)
     if feedback:
         feedback.pushInfo("Compacting cells")
@@ -2869,339 +1425,72 @@ def qtmcompact_from_qgsfeatures(qgs_features, feedback):
 
     for i, qtm_id_compact in enumerate(qtm_ids_compact):
         if feedback and feedback.isCanceled():
-            return []
-        cell_polygon = qtm2geo(qtm_id_compact)
-        cell_resolution = len(qtm_id_compact)
-        num_edges = 3
-        center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-            geodesic_dggs_metrics(cell_polygon, num_edges)
+            return batch.empty()
+        compact_batch.add(
+            qtm_id_compact, qtm2geo(qtm_id_compact), len(qtm_id_compact), 3
         )
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-
-        qtm_feature = QgsFeature()
-        qtm_feature.setFields(original_fields)
-        qtm_feature.setGeometry(cell_geometry)
-
-        qtm_feature["qtm"] = qtm_id_compact
-        qtm_feature["resolution"] = cell_resolution
-        qtm_feature["center_lat"] = center_lat
-        qtm_feature["center_lon"] = center_lon
-        qtm_feature["avg_edge_len"] = avg_edge_len
-        qtm_feature["cell_area"] = cell_area
-        qtm_feature["cell_perimeter"] = cell_perimeter
-        qtm_features.append(qtm_feature)
         if feedback and i % 100 == 0:
             feedback.setProgress(int(100 * i / total_cells))
 
     if feedback:
         feedback.setProgress(100)
 
-    return qtm_features
+    return compact_batch
 
 
 def polyline2qtm(feature, resolution, predicate=None, compact=None, feedback=None):
-    qtm_features = []
+    # Same hierarchical cover as polygons, keeping the facets the line crosses
+    return polygon2qtm(feature, resolution, "intersects", compact, feedback)
 
-    feature_geometry = feature.geometry()
-    levelFacets = {}
-    QTMID = {}
 
-    if feedback:
-        feedback.pushInfo(f"Processing feature {feature.id()}")
-        feedback.setProgress(0)
+class QTMGrid(NestedGrid):
+    """QTM facets as ``(qtm_id, facet)``, subdivided with ``qtm.divideFacet``."""
 
-    for lvl in range(resolution):
-        levelFacets[lvl] = []
-        QTMID[lvl] = []
-
-        if lvl == 0:
-            for i, facet in enumerate(QTM_INITIAL_FACETS):
-                QTMID[0].append(str(i + 1))
-                facet_geom = qtm.constructGeometry(facet)
-                num_edges = 3
-                center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-                    geodesic_dggs_metrics(facet_geom, num_edges)
-                )
+    child_digits = "0123"
 
-                levelFacets[0].append(facet)
-                cell_geometry = QgsGeometry.fromWkt(facet_geom.wkt)
-
-                keep = cell_geometry.intersects(feature_geometry)
-                if keep and resolution == 1:
-                    # Create a single QGIS feature
-                    qtm_feature = QgsFeature()
-                    qtm_feature.setGeometry(cell_geometry)
-
-                    # Get all attributes from the input feature
-                    original_attributes = feature.attributes()
-                    original_fields = feature.fields()
-
-                    # Define new S2-related attributes
-                    new_fields = QgsFields()
-                    new_fields.append(QgsField("qtm", QVariant.String))
-                    new_fields.append(QgsField("resolution", QVariant.Int))
-                    new_fields.append(QgsField("center_lat", QVariant.Double))
-                    new_fields.append(QgsField("center_lon", QVariant.Double))
-                    new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-                    new_fields.append(QgsField("cell_area", QVariant.Double))
-                    new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-                    # Combine original fields and new fields
-                    all_fields = QgsFields()
-                    for field in original_fields:
-                        all_fields.append(field)
-                    for field in new_fields:
-                        all_fields.append(field)
-
-                    qtm_feature.setFields(all_fields)
-
-                    # Combine original attributes with new attributes
-                    new_attributes = [
-                        QTMID[0][i],
-                        resolution,
-                        center_lat,
-                        center_lon,
-                        avg_edge_len,
-                        cell_area,
-                        cell_perimeter,
-                    ]
-                    all_attributes = original_attributes + new_attributes
-
-                    qtm_feature.setAttributes(all_attributes)
-                    qtm_features.append(qtm_feature)
-
-                    if feedback:
-                        feedback.setProgress(100)
-                    return qtm_features
-        else:
-            total_cells = len(levelFacets[lvl - 1])
-            for i, pf in enumerate(levelFacets[lvl - 1]):
-                if feedback and feedback.isCanceled():
-                    return []
-                subdivided_facets = qtm.divideFacet(pf)
-                for j, subfacet in enumerate(subdivided_facets):
-                    subfacet_geom = qtm.constructGeometry(subfacet)
-                    cell_geometry = QgsGeometry.fromWkt(subfacet_geom.wkt)
-                    keep = cell_geometry.intersects(feature_geometry)
-                    if keep:
-                        new_id = QTMID[lvl - 1][i] + str(j)
-                        QTMID[lvl].append(new_id)
-                        levelFacets[lvl].append(subfacet)
-                        if lvl == resolution - 1:  # Only store final resolution
-                            num_edges = 3
-                            (
-                                center_lat,
-                                center_lon,
-                                avg_edge_len,
-                                cell_area,
-                                cell_perimeter,
-                            ) = geodesic_dggs_metrics(subfacet_geom, num_edges)
-
-                            # Create a single QGIS feature
-                            qtm_feature = QgsFeature()
-                            qtm_feature.setGeometry(cell_geometry)
-
-                            # Get all attributes from the input feature
-                            original_attributes = feature.attributes()
-                            original_fields = feature.fields()
-
-                            # Define new S2-related attributes
-                            new_fields = QgsFields()
-                            new_fields.append(QgsField("qtm", QVariant.String))
-                            new_fields.append(QgsField("resolution", QVariant.Int))
-                            new_fields.append(QgsField("center_lat", QVariant.Double))
-                            new_fields.append(QgsField("center_lon", QVariant.Double))
-                            new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-                            new_fields.append(QgsField("cell_area", QVariant.Double))
-                            new_fields.append(
-                                QgsField("cell_perimeter", QVariant.Double)
-                            )
-                            # Combine original fields and new fields
-                            all_fields = QgsFields()
-                            for field in original_fields:
-                                all_fields.append(field)
-                            for field in new_fields:
-                                all_fields.append(field)
-
-                            qtm_feature.setFields(all_fields)
-
-                            # Combine original attributes with new attributes
-                            new_attributes = [
-                                new_id,
-                                resolution,
-                                center_lat,
-                                center_lon,
-                                avg_edge_len,
-                                cell_area,
-                                cell_perimeter,
-                            ]
-                            all_attributes = original_attributes + new_attributes
-
-                            qtm_feature.setAttributes(all_attributes)
-
-                            qtm_features.append(qtm_feature)
-                            if feedback and i % 100 == 0:
-                                feedback.setProgress(int(100 * i / total_cells))
+    def roots(self):
+        return [(str(i + 1), facet) for i, facet in enumerate(QTM_INITIAL_FACETS)]
 
-    if feedback:
-        feedback.setProgress(100)
+    def children(self, cell):
+        qtm_id, facet = cell
+        return [
+            (qtm_id + str(j), subfacet)
+            for j, subfacet in enumerate(qtm.divideFacet(facet))
+        ]
 
-    if compact:
-        qtm_features = qtmcompact_from_qgsfeatures(qtm_features, feedback)
+    def resolution(self, cell):
+        return len(cell[0])
 
-    return qtm_features
+    def cell_id(self, cell):
+        return cell[0]
 
+    def polygon(self, cell):
+        return qtm.constructGeometry(cell[1])
 
-def polygon2qtm(feature, resolution, predicate, compact, feedback):
-    qtm_features = []
 
-    feature_geometry = feature.geometry()
-    levelFacets = {}
-    QTMID = {}
+def polygon2qtm(feature, resolution, predicate, compact, feedback):
+    feature_shapely = wkt_loads(feature.geometry().asWkt())
 
     if feedback:
         feedback.pushInfo(f"Processing feature {feature.id()}")
         feedback.setProgress(0)
 
-    for lvl in range(resolution):
-        levelFacets[lvl] = []
-        QTMID[lvl] = []
-
-        if lvl == 0:
-            for i, facet in enumerate(QTM_INITIAL_FACETS):
-                QTMID[0].append(str(i + 1))
-                facet_geom = qtm.constructGeometry(facet)
-                num_edges = 3
-                center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-                    geodesic_dggs_metrics(facet_geom, num_edges)
-                )
+    cells = hierarchical_cover(
+        QTMGrid(), feature_shapely, resolution, predicate, compact, feedback
+    )
+    if feedback and feedback.isCanceled():
+        return []
 
-                levelFacets[0].append(facet)
-                cell_geometry = QgsGeometry.fromWkt(facet_geom.wkt)
-
-                keep = check_predicate(cell_geometry, feature_geometry, predicate)
-                if keep and resolution == 1:
-                    # Create a single QGIS feature
-                    qtm_feature = QgsFeature()
-                    qtm_feature.setGeometry(cell_geometry)
-
-                    # Get all attributes from the input feature
-                    original_attributes = feature.attributes()
-                    original_fields = feature.fields()
-
-                    # Define new S2-related attributes
-                    new_fields = QgsFields()
-                    new_fields.append(QgsField("qtm", QVariant.String))
-                    new_fields.append(QgsField("resolution", QVariant.Int))
-                    new_fields.append(QgsField("center_lat", QVariant.Double))
-                    new_fields.append(QgsField("center_lon", QVariant.Double))
-                    new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-                    new_fields.append(QgsField("cell_area", QVariant.Double))
-                    new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-                    # Combine original fields and new fields
-                    all_fields = QgsFields()
-                    for field in original_fields:
-                        all_fields.append(field)
-                    for field in new_fields:
-                        all_fields.append(field)
-
-                    qtm_feature.setFields(all_fields)
-
-                    # Combine original attributes with new attributes
-                    new_attributes = [
-                        QTMID[0][i],
-                        resolution,
-                        center_lat,
-                        center_lon,
-                        avg_edge_len,
-                        cell_area,
-                        cell_perimeter,
-                    ]
-                    all_attributes = original_attributes + new_attributes
-
-                    qtm_feature.setAttributes(all_attributes)
-                    qtm_features.append(qtm_feature)
-
-                    if feedback:
-                        feedback.setProgress(100)
-                    return qtm_features
-        else:
-            total_cells = len(levelFacets[lvl - 1])
-            for i, pf in enumerate(levelFacets[lvl - 1]):
-                if feedback and feedback.isCanceled():
-                    return []
-                subdivided_facets = qtm.divideFacet(pf)
-                for j, subfacet in enumerate(subdivided_facets):
-                    subfacet_geom = qtm.constructGeometry(subfacet)
-                    cell_geometry = QgsGeometry.fromWkt(subfacet_geom.wkt)
-
-                    keep = check_predicate(cell_geometry, feature_geometry, predicate)
-                    if keep:
-                        new_id = QTMID[lvl - 1][i] + str(j)
-                        QTMID[lvl].append(new_id)
-                        levelFacets[lvl].append(subfacet)
-                        if lvl == resolution - 1:  # Only store final resolution
-                            num_edges = 3
-                            (
-                                center_lat,
-                                center_lon,
-                                avg_edge_len,
-                                cell_area,
-                                cell_perimeter,
-                            ) = geodesic_dggs_metrics(subfacet_geom, num_edges)
-
-                            # Create a single QGIS feature
-                            qtm_feature = QgsFeature()
-                            qtm_feature.setGeometry(cell_geometry)
-
-                            # Get all attributes from the input feature
-                            original_attributes = feature.attributes()
-                            original_fields = feature.fields()
-
-                            # Define new S2-related attributes
-                            new_fields = QgsFields()
-                            new_fields.append(QgsField("qtm", QVariant.String))
-                            new_fields.append(QgsField("resolution", QVariant.Int))
-                            new_fields.append(QgsField("center_lat", QVariant.Double))
-                            new_fields.append(QgsField("center_lon", QVariant.Double))
-                            new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-                            new_fields.append(QgsField("cell_area", QVariant.Double))
-                            new_fields.append(
-                                QgsField("cell_perimeter", QVariant.Double)
-                            )
-                            # Combine original fields and new fields
-                            all_fields = QgsFields()
-                            for field in original_fields:
-                                all_fields.append(field)
-                            for field in new_fields:
-                                all_fields.append(field)
-
-                            qtm_feature.setFields(all_fields)
-
-                            # Combine original attributes with new attributes
-                            new_attributes = [
-                                new_id,
-                                resolution,
-                                center_lat,
-                                center_lon,
-                                avg_edge_len,
-                                cell_area,
-                                cell_perimeter,
-                            ]
-                            all_attributes = original_attributes + new_attributes
-
-                            qtm_feature.setAttributes(all_attributes)
-
-                            qtm_features.append(qtm_feature)
-                            if feedback and i % 100 == 0:
-                                feedback.setProgress(int(100 * i / total_cells))
+    batch = CellBatch(feature, "qtm")
+    for qtm_id, cell_polygon in cells:
+        if cell_polygon is None and batch.geometry:
+            cell_polygon = qtm2geo(qtm_id)
+        batch.add(qtm_id, cell_polygon, len(qtm_id), 3)
 
     if feedback:
         feedback.setProgress(100)
 
-    if compact:
-        qtm_features = qtmcompact_from_qgsfeatures(qtm_features, feedback)
-
-    return qtm_features
+    return batch.features(feedback)
 
 
 #######################
@@ -3225,60 +1514,15 @@ def point2olc(feature, resolution, feedback):
     feature_geometry = feature.geometry()
     point = feature_geometry.asPoint()
     olc_id = latlon2olc(point.y(), point.x(), resolution)
-    cell_polygon = olc2geo(olc_id)
-    # Create the b
-    center_lat, center_lon, cell_width, cell_height, cell_area, cell_perimeter = (
-        graticule_dggs_metrics(cell_polygon)
-    )
+    batch = CellBatch(feature, "olc", graticule=True)
+    cell_polygon = olc2geo(olc_id) if batch.geometry else None
+    batch.add(olc_id, cell_polygon, resolution)
+    return batch.features()
 
-    # Get all attributes from the input feature
-    original_attributes = feature.attributes()
-    original_fields = feature.fields()
-
-    new_fields = QgsFields()
-    new_fields.append(QgsField("olc", QVariant.String))
-    new_fields.append(QgsField("resolution", QVariant.Int))
-    new_fields.append(QgsField("center_lat", QVariant.Double))
-    new_fields.append(QgsField("center_lon", QVariant.Double))
-    new_fields.append(QgsField("cell_width", QVariant.Double))
-    new_fields.append(QgsField("cell_height", QVariant.Double))
-    new_fields.append(QgsField("cell_area", QVariant.Double))
-    new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-    # Combine original fields and new fields
-    all_fields = QgsFields()
-    for field in original_fields:
-        all_fields.append(field)
-    for field in new_fields:
-        all_fields.append(field)
-
-    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-    olc_feature = QgsFeature()
-    olc_feature.setGeometry(cell_geometry)
-    olc_feature.setFields(all_fields)
-
-    # Combine original attributes with new attributes
-    new_attributes = [
-        olc_id,
-        resolution,
-        center_lat,
-        center_lon,
-        cell_width,
-        cell_height,
-        cell_area,
-        cell_perimeter,
-    ]
-    all_attributes = original_attributes + new_attributes
-
-    olc_feature.setAttributes(all_attributes)
-
-    return [olc_feature]
 
-
-def olccompact_from_qgsfeatures(qgs_features, feedback):
-    original_fields = qgs_features[0].fields()
-    olc_ids = [f["olc"] for f in qgs_features if f["olc"]]
-    olc_ids_compact = olc_compact(olc_ids)
-    olc_features = []
+def olccompact_batch(batch, feedback):
+    olc_ids_compact = olc_compact(batch.ids)
+    compact_batch = batch.empty()
 
     total_cells = len(olc_ids_compact)
     if feedback:
@@ -3287,11 +1531,10 @@ def olccompact_from_qgsfeatures(qgs_features, feedback):
 
     for i, olc_id_compact in enumerate(olc_ids_compact):
         if feedback and feedback.isCanceled():
-            return []
+            return batch.empty()
         coord = olc.decode(olc_id_compact)
         min_lat, min_lon = coord.latitudeLo, coord.longitudeLo
         max_lat, max_lon = coord.latitudeHi, coord.longitudeHi
-        cell_resolution = coord.codeLength
 
         # Define the polygon based on the bounding box
         cell_polygon = Polygon(
@@ -3303,388 +1546,44 @@ def olccompact_from_qgsfeatures(qgs_features, feedback):
                 [min_lon, min_lat],  # Closing the polygon (same as the first point)
             ]
         )
-        center_lat, center_lon, cell_width, cell_height, cell_area, cell_perimeter = (
-            graticule_dggs_metrics(cell_polygon)
-        )
-
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-
-        olc_feature = QgsFeature()
-        olc_feature.setFields(original_fields)
-        olc_feature.setGeometry(cell_geometry)
-
-        olc_feature["olc"] = olc_id_compact
-        olc_feature["resolution"] = cell_resolution
-        olc_feature["center_lat"] = center_lat
-        olc_feature["center_lon"] = center_lon
-        olc_feature["cell_width"] = cell_width
-        olc_feature["cell_height"] = cell_height
-        olc_feature["cell_area"] = cell_area
-        olc_feature["cell_perimeter"] = cell_perimeter
-        olc_features.append(olc_feature)
+        compact_batch.add(olc_id_compact, cell_polygon, coord.codeLength)
         if feedback and i % 100 == 0:
             feedback.setProgress(int(100 * i / total_cells))
 
     if feedback:
         feedback.setProgress(100)
 
-    return olc_features
-
-
-def generate_olc_grid(resolution):
-    """
-    Generate a global grid of Open Location Codes (Plus Codes) at the specified precision
-    as a GeoJSON-like feature collection.
-    """
-    # Define the boundaries of the world
-    sw_lat, sw_lng = -90, -180
-    ne_lat, ne_lng = 90, 180
-
-    # Get the precision step size
-    area = olc.decode(olc.encode(sw_lat, sw_lng, resolution))
-    lat_step = area.latitudeHi - area.latitudeLo
-    lng_step = area.longitudeHi - area.longitudeLo
-
-    olc_features = []
-
-    # Calculate the total number of steps for progress tracking
-    total_lat_steps = int((ne_lat - sw_lat) / lat_step)
-    total_lng_steps = int((ne_lng - sw_lng) / lng_step)
-    total_lat_steps * total_lng_steps
-
-    lat = sw_lat
-    while lat < ne_lat:
-        lng = sw_lng
-        while lng < ne_lng:
-            # Generate the Plus Code for the center of the cell
-            center_lat = lat + lat_step / 2
-            center_lon = lng + lng_step / 2
-            olc_id = olc.encode(center_lat, center_lon, resolution)
-            cell_polygon = Polygon(
-                [
-                    [lng, lat],  # SW
-                    [lng, lat + lat_step],  # NW
-                    [lng + lng_step, lat + lat_step],  # NE
-                    [lng + lng_step, lat],  # SE
-                    [lng, lat],  # Close the polygon
-                ]
-            )
-            olc_feature = graticule_dggs_to_feature(
-                "olc", olc_id, resolution, cell_polygon
-            )
-            olc_features.append(olc_feature)
-            lng += lng_step
-        lat += lat_step
-
-    # Return the feature collection
-    return {"type": "FeatureCollection", "features": olc_features}
+    return compact_batch
 
 
 def polyline2olc(feature, resolution, predicate=None, compact=None, feedback=None):
-    olc_features = []
-
-    feature_geometry = feature.geometry()
-    feature_shapely = wkt_loads(feature_geometry.asWkt())
-    fields = QgsFields()
-    fields.append(QgsField("resolution", QVariant.Int))
-    fields.append(QgsField("olc", QVariant.String))
-
-    base_resolution = 2
-    base_cells = generate_olc_grid(base_resolution)
-
-    seed_cells = []
-    for base_cell in base_cells["features"]:
-        base_cell_poly = Polygon(base_cell["geometry"]["coordinates"][0])
-        if base_cell_poly.intersects(feature_shapely):
-            seed_cells.append(base_cell)
-
-    refined_features = []
-    for seed_cell in seed_cells:
-        seed_cell_poly = Polygon(seed_cell["geometry"]["coordinates"][0])
-
-        if seed_cell_poly.contains(feature_shapely) and resolution == base_resolution:
-            refined_features.append(seed_cell)
-        else:
-            # Convert pandas Series objects to dictionary format
-            olc_records = olc_refine_cell(
-                seed_cell_poly.bounds, base_resolution, resolution, feature_shapely
-            )
-            for record in olc_records:
-                # Convert pandas Series to dictionary format
-                if hasattr(record, "to_dict"):
-                    record_dict = record.to_dict()
-                else:
-                    # If it's already a dict-like object, use it as is
-                    record_dict = record
-
-                # Ensure the record has the expected structure
-                # If geometry is a shapely geometry, convert to GeoJSON mapping for consistency
-                if "geometry" in record_dict and hasattr(
-                    record_dict["geometry"], "wkt"
-                ):
-                    from shapely.geometry import mapping
-
-                    record_dict["geometry"] = mapping(record_dict["geometry"])
-
-                refined_features.append(record_dict)
-
-    resolution_features = [
-        refine_feature
-        for refine_feature in refined_features
-        if refine_feature["resolution"] == resolution
-    ]
-
-    seen_olc_ids = set()
-    total_cells = len(resolution_features)
-    if feedback:
-        feedback.pushInfo(f"Processing feature {feature.id()}")
-        feedback.setProgress(0)
-
-    for i, resolution_feature in enumerate(resolution_features):
-        if feedback and feedback.isCanceled():
-            return []
-        olc_id = resolution_feature["olc"]
-        if olc_id not in seen_olc_ids:
-            seen_olc_ids.add(olc_id)
-
-            # Normalize geometry to a Shapely Polygon
-            geom_obj = resolution_feature.get("geometry")
-            try:
-                if hasattr(geom_obj, "geom_type"):
-                    cell_polygon = geom_obj
-                else:
-                    from shapely.geometry import shape
-
-                    cell_polygon = shape(geom_obj)
-            except Exception:
-                # Fallback to previous behavior if it's a plain coordinates array
-                cell_polygon = Polygon(resolution_feature["geometry"]["coordinates"][0])
-            olc_id = resolution_feature["olc"]
-            cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-
-            # Predicate-based filtering
-            if not check_predicate(cell_geometry, feature_geometry, "intersects"):
-                continue  # Skip non-matching cells
-
-            # Compute additional attributes
-            cell_resolution = resolution
-            (
-                center_lat,
-                center_lon,
-                cell_width,
-                cell_height,
-                cell_area,
-                cell_perimeter,
-            ) = graticule_dggs_metrics(cell_polygon)
-
-            olc_feature = QgsFeature()
-            olc_feature.setGeometry(cell_geometry)
-
-            original_attributes = feature.attributes()
-            original_fields = feature.fields()
-
-            new_fields = QgsFields()
-            new_fields.append(QgsField("olc", QVariant.String))
-            new_fields.append(QgsField("resolution", QVariant.Int))
-            new_fields.append(QgsField("center_lat", QVariant.Double))
-            new_fields.append(QgsField("center_lon", QVariant.Double))
-            new_fields.append(QgsField("cell_width", QVariant.Double))
-            new_fields.append(QgsField("cell_height", QVariant.Double))
-            new_fields.append(QgsField("cell_area", QVariant.Double))
-            new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-
-            # Combine original fields and new fields
-            all_fields = QgsFields()
-            for field in original_fields:
-                all_fields.append(field)
-            for field in new_fields:
-                all_fields.append(field)
-
-            cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-            olc_feature = QgsFeature()
-            olc_feature.setGeometry(cell_geometry)
-            olc_feature.setFields(all_fields)
-
-            # Combine original attributes with new attributes
-            new_attributes = [
-                olc_id,
-                cell_resolution,
-                center_lat,
-                center_lon,
-                cell_width,
-                cell_height,
-                cell_area,
-                cell_perimeter,
-            ]
-            all_attributes = original_attributes + new_attributes
-
-            olc_feature.setAttributes(all_attributes)
-
-            # Create QgsFeature
-            olc_features.append(olc_feature)
-            if feedback and i % 100 == 0:
-                feedback.setProgress(int(100 * i / total_cells))
-
-    if feedback:
-        feedback.setProgress(100)
-
-    if compact:
-        olc_features = olccompact_from_qgsfeatures(olc_features, feedback)
-
-    return olc_features
+    return polygon2olc(feature, resolution, "intersects", compact, feedback)
 
 
 def polygon2olc(feature, resolution, predicate=None, compact=None, feedback=None):
-    olc_features = []
-
     feature_geometry = feature.geometry()
     feature_shapely = wkt_loads(feature_geometry.asWkt())
-    fields = QgsFields()
-    fields.append(QgsField("resolution", QVariant.Int))
-    fields.append(QgsField("olc", QVariant.String))
-
-    base_resolution = 2
-    base_cells = generate_olc_grid(base_resolution)
-
-    seed_cells = []
-    for base_cell in base_cells["features"]:
-        base_cell_poly = Polygon(base_cell["geometry"]["coordinates"][0])
-        if base_cell_poly.intersects(feature_shapely):
-            seed_cells.append(base_cell)
-
-    refined_features = []
-    for seed_cell in seed_cells:
-        seed_cell_poly = Polygon(seed_cell["geometry"]["coordinates"][0])
 
-        if seed_cell_poly.contains(feature_shapely) and resolution == base_resolution:
-            refined_features.append(seed_cell)
-        else:
-            # Convert pandas Series objects to dictionary format
-            olc_records = olc_refine_cell(
-                seed_cell_poly.bounds, base_resolution, resolution, feature_shapely
-            )
-            for record in olc_records:
-                # Convert pandas Series to dictionary format
-                if hasattr(record, "to_dict"):
-                    record_dict = record.to_dict()
-                else:
-                    # If it's already a dict-like object, use it as is
-                    record_dict = record
-
-                # Ensure the record has the expected structure
-                # If geometry is a shapely geometry, convert to GeoJSON mapping for consistency
-                if "geometry" in record_dict and hasattr(
-                    record_dict["geometry"], "wkt"
-                ):
-                    from shapely.geometry import mapping
-
-                    record_dict["geometry"] = mapping(record_dict["geometry"])
-
-                refined_features.append(record_dict)
-
-    resolution_features = [
-        refine_feature
-        for refine_feature in refined_features
-        if refine_feature["resolution"] == resolution
-    ]
-
-    seen_olc_ids = set()
-    total_cells = len(resolution_features)
     if feedback:
         feedback.pushInfo(f"Processing feature {feature.id()}")
         feedback.setProgress(0)
 
-    for i, resolution_feature in enumerate(resolution_features):
-        if feedback and feedback.isCanceled():
-            return []
-        olc_id = resolution_feature["olc"]
-        if olc_id not in seen_olc_ids:
-            seen_olc_ids.add(olc_id)
-
-            # Normalize geometry to a Shapely Polygon
-            geom_obj = resolution_feature.get("geometry")
-            try:
-                if hasattr(geom_obj, "geom_type"):
-                    cell_polygon = geom_obj
-                else:
-                    from shapely.geometry import shape
-
-                    cell_polygon = shape(geom_obj)
-            except Exception:
-                # Fallback to previous behavior if it's a plain coordinates array
-                cell_polygon = Polygon(resolution_feature["geometry"]["coordinates"][0])
-            olc_id = resolution_feature["olc"]
-            cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-
-            if not check_predicate(cell_geometry, feature_geometry, predicate):
-                continue  # Skip non-matching cells
-
-            # Compute additional attributes
-            cell_resolution = resolution
-            (
-                center_lat,
-                center_lon,
-                cell_width,
-                cell_height,
-                cell_area,
-                cell_perimeter,
-            ) = graticule_dggs_metrics(cell_polygon)
-
-            olc_feature = QgsFeature()
-            olc_feature.setGeometry(cell_geometry)
-
-            original_attributes = feature.attributes()
-            original_fields = feature.fields()
-
-            new_fields = QgsFields()
-            new_fields.append(QgsField("olc", QVariant.String))
-            new_fields.append(QgsField("resolution", QVariant.Int))
-            new_fields.append(QgsField("center_lat", QVariant.Double))
-            new_fields.append(QgsField("center_lon", QVariant.Double))
-            new_fields.append(QgsField("cell_width", QVariant.Double))
-            new_fields.append(QgsField("cell_height", QVariant.Double))
-            new_fields.append(QgsField("cell_area", QVariant.Double))
-            new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-
-            # Combine original fields and new fields
-            all_fields = QgsFields()
-            for field in original_fields:
-                all_fields.append(field)
-            for field in new_fields:
-                all_fields.append(field)
-
-            cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-            olc_feature = QgsFeature()
-            olc_feature.setGeometry(cell_geometry)
-            olc_feature.setFields(all_fields)
-
-            # Combine original attributes with new attributes
-            new_attributes = [
-                olc_id,
-                cell_resolution,
-                center_lat,
-                center_lon,
-                cell_width,
-                cell_height,
-                cell_area,
-                cell_perimeter,
-            ]
-            all_attributes = original_attributes + new_attributes
-
-            olc_feature.setAttributes(all_attributes)
-
-            # Create QgsFeature
-            olc_features.append(olc_feature)
-            if feedback and i % 100 == 0:
-                feedback.setProgress(int(100 * i / total_cells))
+    batch = CellBatch(feature, "olc", graticule=True, stream=not compact)
+    cells = graticule_cover(
+        OLCGrid(resolution), feature_shapely, predicate, batch.geometry, feedback
+    )
+    for olc_id, cell_polygon in cells:
+        batch.add(olc_id, cell_polygon, resolution)
+    if feedback and feedback.isCanceled():
+        return []
 
     if feedback:
         feedback.setProgress(100)
 
-    if compact:
-        olc_features = olccompact_from_qgsfeatures(olc_features, feedback)
+    if compact and batch:
+        batch = olccompact_batch(batch, feedback)
 
-    return olc_features
+    return batch.features(feedback)
 
 
 #######################
@@ -3710,63 +1609,15 @@ def point2geohash(feature, resolution, feedback):
     feature_geometry = feature.geometry()
     point = feature_geometry.asPoint()
     geohash_id = latlon2geohash(point.y(), point.x(), resolution)
-    cell_polygon = geohash2geo(geohash_id)
-    center_lat, center_lon, cell_width, cell_height, cell_area, cell_perimeter = (
-        graticule_dggs_metrics(cell_polygon)
-    )
-
-    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-    # Create a single QGIS feature
-    geohash_feature = QgsFeature()
-    geohash_feature.setGeometry(cell_geometry)
-
-    # Get all attributes from the input feature
-    original_attributes = feature.attributes()
-    original_fields = feature.fields()
-
-    new_fields = QgsFields()
-    new_fields.append(QgsField("geohash", QVariant.String))
-    new_fields.append(QgsField("resolution", QVariant.Int))
-    new_fields.append(QgsField("center_lat", QVariant.Double))
-    new_fields.append(QgsField("center_lon", QVariant.Double))
-    new_fields.append(QgsField("cell_width", QVariant.Double))
-    new_fields.append(QgsField("cell_height", QVariant.Double))
-    new_fields.append(QgsField("cell_area", QVariant.Double))
-    new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-    # Combine original fields and new fields
-    all_fields = QgsFields()
-    for field in original_fields:
-        all_fields.append(field)
-    for field in new_fields:
-        all_fields.append(field)
-
-    geohash_feature.setFields(all_fields)
-
-    # Combine original attributes with new attributes
-    new_attributes = [
-        geohash_id,
-        resolution,
-        center_lat,
-        center_lon,
-        cell_width,
-        cell_height,
-        cell_area,
-        cell_perimeter,
-    ]
-    all_attributes = original_attributes + new_attributes
-
-    geohash_feature.setAttributes(all_attributes)
-
-    return [geohash_feature]
-
+    batch = CellBatch(feature, "geohash", graticule=True)
+    cell_polygon = geohash2geo(geohash_id) if batch.geometry else None
+    batch.add(geohash_id, cell_polygon, resolution)
+    return batch.features()
 
-def geohashcompact_from_qgsfeatures(qgs_features, feedback):
-    original_fields = qgs_features[0].fields()
 
-    geohash_ids = [f["geohash"] for f in qgs_features if f["geohash"]]
-
-    geohash_ids_compact = geohash_compact(geohash_ids)
-    geohash_features = []
+def geohashcompact_batch(batch, feedback):
+    geohash_ids_compact = geohash_compact(batch.ids)
+    compact_batch = batch.empty()
 
     total_cells = len(geohash_ids_compact)
     if feedback:
@@ -3775,219 +1626,70 @@ def geohashcompact_from_qgsfeatures(qgs_features, feedback):
 
     for i, geohash_id_compact in enumerate(geohash_ids_compact):
         if feedback and feedback.isCanceled():
-            return []
-        cell_polygon = geohash2geo(geohash_id_compact)
-        cell_resolution = len(geohash_id_compact)
-
-        center_lat, center_lon, cell_width, cell_height, cell_area, cell_perimeter = (
-            graticule_dggs_metrics(cell_polygon)
+            return batch.empty()
+        compact_batch.add(
+            geohash_id_compact,
+            geohash2geo(geohash_id_compact),
+            len(geohash_id_compact),
         )
-
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-
-        geohash_feature = QgsFeature()
-        geohash_feature.setFields(original_fields)
-        geohash_feature.setGeometry(cell_geometry)
-
-        geohash_feature["geohash"] = geohash_id_compact
-        geohash_feature["resolution"] = cell_resolution
-        geohash_feature["center_lat"] = center_lat
-        geohash_feature["center_lon"] = center_lon
-        geohash_feature["cell_width"] = cell_width
-        geohash_feature["cell_height"] = cell_height
-        geohash_feature["cell_area"] = cell_area
-        geohash_feature["cell_perimeter"] = cell_perimeter
-        geohash_features.append(geohash_feature)
         if feedback and i % 100 == 0:
             feedback.setProgress(int(100 * i / total_cells))
 
     if feedback:
         feedback.setProgress(100)
 
-    return geohash_features
+    return compact_batch
 
 
 def polyline2geohash(feature, resolution, predicate=None, compact=None, feedback=None):
-    geohash_features = []
-    feature_geometry = feature.geometry()
-    feature_shapely = wkt_loads(feature_geometry.asWkt())
-
-    intersected_geohashes = {
-        gh for gh in INITIAL_GEOHASHES if geohash2geo(gh).intersects(feature_shapely)
-    }
-    # Expand geohash bounding box
-
-    geohashes = set()
-    for gh in intersected_geohashes:
-        expand_geohash_bbox(gh, resolution, geohashes, feature_shapely)
+    # Same hierarchical cover as polygons, keeping the cells the line crosses
+    return polygon2geohash(feature, resolution, "intersects", compact, feedback)
 
-    if feedback:
-        feedback.pushInfo(f"Processing feature {feature.id()}")
-        feedback.setProgress(0)
-
-    total_cells = len(geohashes)
 
-    # Step 4: Generate features for geohashes that intersect the bounding box
-    for i, gh in enumerate(geohashes):
-        if feedback and feedback.isCanceled():
-            return []
-
-        cell_polygon = geohash2geo(gh)
-        # if cell_polygon.intersects(feature):
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-        # Predicate-based filtering
-        if not check_predicate(cell_geometry, feature_geometry, "intersects"):
-            continue
+class GeohashGrid(NestedGrid):
+    """Geohash cells as their ids."""
 
-        # Create a single QGIS feature
-        geohash_feature = QgsFeature()
-        geohash_feature.setGeometry(cell_geometry)
+    child_digits = "0123456789bcdefghjkmnpqrstuvwxyz"
 
-        center_lat, center_lon, cell_width, cell_height, cell_area, cell_perimeter = (
-            graticule_dggs_metrics(cell_polygon)
-        )
-        cell_resolution = resolution
-
-        # Get all attributes from the input feature
-        original_attributes = feature.attributes()
-        original_fields = feature.fields()
-
-        new_fields = QgsFields()
-        new_fields.append(QgsField("geohash", QVariant.String))
-        new_fields.append(QgsField("resolution", QVariant.Int))
-        new_fields.append(QgsField("center_lat", QVariant.Double))
-        new_fields.append(QgsField("center_lon", QVariant.Double))
-        new_fields.append(QgsField("cell_width", QVariant.Double))
-        new_fields.append(QgsField("cell_height", QVariant.Double))
-        new_fields.append(QgsField("cell_area", QVariant.Double))
-        new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-        # Combine original fields and new fields
-        all_fields = QgsFields()
-        for field in original_fields:
-            all_fields.append(field)
-        for field in new_fields:
-            all_fields.append(field)
-
-        geohash_feature.setFields(all_fields)
-
-        # Combine original attributes with new attributes
-        new_attributes = [
-            gh,
-            cell_resolution,
-            center_lat,
-            center_lon,
-            cell_width,
-            cell_height,
-            cell_area,
-            cell_perimeter,
-        ]
-        all_attributes = original_attributes + new_attributes
+    def roots(self):
+        return INITIAL_GEOHASHES
 
-        geohash_feature.setAttributes(all_attributes)
+    def children(self, cell):
+        return [cell + char for char in self.child_digits]
 
-        geohash_features.append(geohash_feature)
+    def resolution(self, cell):
+        return len(cell)
 
-        if feedback and i % 100 == 0:
-            feedback.setProgress(int(100 * i / total_cells))
+    def cell_id(self, cell):
+        return cell
 
-    if feedback:
-        feedback.setProgress(100)
-
-    if compact:
-        geohash_features = geohashcompact_from_qgsfeatures(geohash_features, feedback)
-
-    return geohash_features
+    def polygon(self, cell):
+        return geohash2geo(cell)
 
 
 def polygon2geohash(feature, resolution, predicate=None, compact=None, feedback=None):
-    geohash_features = []
-    feature_geometry = feature.geometry()
-    feature_shapely = wkt_loads(feature_geometry.asWkt())
-
-    intersected_geohashes = {
-        gh for gh in INITIAL_GEOHASHES if geohash2geo(gh).intersects(feature_shapely)
-    }
-    # Expand geohash bounding box
-
-    geohashes = set()
-    for gh in intersected_geohashes:
-        expand_geohash_bbox(gh, resolution, geohashes, feature_shapely)
+    feature_shapely = wkt_loads(feature.geometry().asWkt())
 
     if feedback:
         feedback.pushInfo(f"Processing feature {feature.id()}")
         feedback.setProgress(0)
 
-    total_cells = len(geohashes)
-
-    # Step 4: Generate features for geohashes that intersect the bounding box
-    for i, gh in enumerate(geohashes):
-        if feedback and feedback.isCanceled():
-            return []
-
-        cell_polygon = geohash2geo(gh)
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-        # Predicate-based filtering
-        if not check_predicate(cell_geometry, feature_geometry, predicate):
-            continue
-
-        # Create a single QGIS feature
-        geohash_feature = QgsFeature()
-        geohash_feature.setGeometry(cell_geometry)
-
-        center_lat, center_lon, cell_width, cell_height, cell_area, cell_perimeter = (
-            graticule_dggs_metrics(cell_polygon)
-        )
-        cell_resolution = resolution
-
-        # Get all attributes from the input feature
-        original_attributes = feature.attributes()
-        original_fields = feature.fields()
-
-        new_fields = QgsFields()
-        new_fields.append(QgsField("geohash", QVariant.String))
-        new_fields.append(QgsField("resolution", QVariant.Int))
-        new_fields.append(QgsField("center_lat", QVariant.Double))
-        new_fields.append(QgsField("center_lon", QVariant.Double))
-        new_fields.append(QgsField("cell_width", QVariant.Double))
-        new_fields.append(QgsField("cell_height", QVariant.Double))
-        new_fields.append(QgsField("cell_area", QVariant.Double))
-        new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-        # Combine original fields and new fields
-        all_fields = QgsFields()
-        for field in original_fields:
-            all_fields.append(field)
-        for field in new_fields:
-            all_fields.append(field)
-
-        geohash_feature.setFields(all_fields)
-
-        # Combine original attributes with new attributes
-        new_attributes = [
-            gh,
-            cell_resolution,
-            center_lat,
-            center_lon,
-            cell_width,
-            cell_height,
-            cell_area,
-            cell_perimeter,
-        ]
-        all_attributes = original_attributes + new_attributes
-
-        geohash_feature.setAttributes(all_attributes)
-
-        geohash_features.append(geohash_feature)
+    cells = hierarchical_cover(
+        GeohashGrid(), feature_shapely, resolution, predicate, compact, feedback
+    )
+    if feedback and feedback.isCanceled():
+        return []
 
-        if feedback and i % 100 == 0:
-            feedback.setProgress(int(100 * i / total_cells))
+    batch = CellBatch(feature, "geohash", graticule=True)
+    for geohash_id, cell_polygon in cells:
+        if cell_polygon is None and batch.geometry:
+            cell_polygon = geohash2geo(geohash_id)
+        batch.add(geohash_id, cell_polygon, len(geohash_id))
 
     if feedback:
         feedback.setProgress(100)
 
-    if compact:
-        geohash_features = geohashcompact_from_qgsfeatures(geohash_features, feedback)
-
-    return geohash_features
+    return batch.features(feedback)
 
 
 #######################
@@ -4014,66 +1716,65 @@ def point2tilecode(feature, resolution, feedback):
     point = feature_geometry.asPoint()
     tilecode_id = latlon2tilecode(point.y(), point.x(), resolution)
     tilecode_cell = mercantile.tile(point.x(), point.y(), resolution)
-    resolution = tilecode_cell.z
-    cell_polygon = tilecode2geo(tilecode_id)
-    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-    center_lat, center_lon, cell_width, cell_height, cell_area, cell_perimeter = (
-        graticule_dggs_metrics(cell_polygon)
+    batch = CellBatch(feature, "tilecode", graticule=True)
+    cell_polygon = tilecode2geo(tilecode_id) if batch.geometry else None
+    batch.add(tilecode_id, cell_polygon, tilecode_cell.z)
+    return batch.features()
+
+
+def tile_polygon(x, y, z):
+    """EPSG:4326 polygon of the web mercator tile *x*, *y*, *z*."""
+    # Get the bounds of the tile in (west, south, east, north)
+    bounds = mercantile.bounds(x, y, z)
+    # Create the bounding box coordinates for the polygon
+    min_lat, min_lon = bounds.south, bounds.west
+    max_lat, max_lon = bounds.north, bounds.east
+    return Polygon(
+        [
+            [min_lon, min_lat],  # Bottom-left corner
+            [max_lon, min_lat],  # Bottom-right corner
+            [max_lon, max_lat],  # Top-right corner
+            [min_lon, max_lat],  # Top-left corner
+            [min_lon, min_lat],  # Closing the polygon (same as the first point)
+        ]
     )
 
-    # Create a single QGIS feature
-    tilecode_feature = QgsFeature()
-    tilecode_feature.setGeometry(cell_geometry)
-
-    # Get all attributes from the input feature
-    original_attributes = feature.attributes()
-    original_fields = feature.fields()
-
-    # Define new s2-related attributes
-    new_fields = QgsFields()
-    new_fields.append(QgsField("tilecode", QVariant.String))
-    new_fields.append(QgsField("resolution", QVariant.Int))
-    new_fields.append(QgsField("center_lat", QVariant.Double))
-    new_fields.append(QgsField("center_lon", QVariant.Double))
-    new_fields.append(QgsField("cell_width", QVariant.Double))
-    new_fields.append(QgsField("cell_width", QVariant.Double))
-    new_fields.append(QgsField("cell_height", QVariant.Double))
-    new_fields.append(QgsField("cell_area", QVariant.Double))
-    new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-    # Combine original fields and new fields
-    all_fields = QgsFields()
-    for field in original_fields:
-        all_fields.append(field)
-    for field in new_fields:
-        all_fields.append(field)
-
-    tilecode_feature.setFields(all_fields)
-
-    # Combine original attributes with new attributes
-    new_attributes = [
-        tilecode_id,
-        resolution,
-        center_lat,
-        center_lon,
-        cell_width,
-        cell_height,
-        cell_area,
-        cell_perimeter,
-    ]
-    all_attributes = original_attributes + new_attributes
 
-    tilecode_feature.setAttributes(all_attributes)
+class TileGrid(NestedGrid):
+    """Web mercator tiles as ``(x, y, z)``, named by *tile_id(x, y, z)*."""
+
+    def __init__(self, tile_id):
+        self.tile_id = tile_id
+
+    def roots(self):
+        return [(0, 0, 0)]
+
+    def children(self, cell):
+        x, y, z = cell
+        return [(2 * x + dx, 2 * y + dy, z + 1) for dy in range(2) for dx in range(2)]
 
-    return [tilecode_feature]
+    def resolution(self, cell):
+        return cell[2]
 
+    def cell_id(self, cell):
+        return self.tile_id(*cell)
 
-def tilecodecompact_from_qgsfeatures(qgs_features, feedback):
-    original_fields = qgs_features[0].fields()
+    def polygon(self, cell):
+        return tile_polygon(*cell)
+
+    def descendant_ids(self, cell, resolution):
+        x, y, z = cell
+        n = 1 << (resolution - z)
+        return [
+            self.tile_id(tile_x, tile_y, resolution)
+            for tile_y in range(y * n, (y + 1) * n)
+            for tile_x in range(x * n, (x + 1) * n)
+        ]
 
-    tilecode_ids = [f["tilecode"] for f in qgs_features if f["tilecode"]]
 
-    tilecode_ids_compact = tilecode_compact(tilecode_ids)
-    tilecode_features = []
+def tilecodecompact_batch(batch, feedback):
+    tilecode_ids_compact = tilecode_compact(batch.ids)
+    compact_batch = batch.empty()
     total_cells = len(tilecode_ids_compact)
 
     if feedback:
@@ -4082,7 +1783,7 @@ def tilecodecompact_from_qgsfeatures(qgs_features, feedback):
 
     for i, tilecode_id_compact in enumerate(tilecode_ids_compact):
         if feedback and feedback.isCanceled():
-            return []
+            return batch.empty()
 
         match = re.match(r"z(\d+)x(\d+)y(\d+)", tilecode_id_compact)
         if not match:
@@ -4092,43 +1793,7 @@ def tilecodecompact_from_qgsfeatures(qgs_features, feedback):
         z = int(match.group(1))
         x = int(match.group(2))
         y = int(match.group(3))
-
-        # Get the bounds of the tile in (west, south, east, north)
-        bounds = mercantile.bounds(x, y, z)
-        # Create the bounding box coordinates for the polygon
-        min_lat, min_lon = bounds.south, bounds.west
-        max_lat, max_lon = bounds.north, bounds.east
-        cell_polygon = Polygon(
-            [
-                [min_lon, min_lat],  # Bottom-left corner
-                [max_lon, min_lat],  # Bottom-right corner
-                [max_lon, max_lat],  # Top-right corner
-                [min_lon, max_lat],  # Top-left corner
-                [min_lon, min_lat],  # Closing the polygon (same as the first point)
-            ]
-        )
-
-        cell_resolution = z
-
-        center_lat, center_lon, cell_width, cell_height, cell_area, cell_perimeter = (
-            graticule_dggs_metrics(cell_polygon)
-        )
-
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-
-        tilecode_feature = QgsFeature()
-        tilecode_feature.setFields(original_fields)
-        tilecode_feature.setGeometry(cell_geometry)
-
-        tilecode_feature["tilecode"] = tilecode_id_compact
-        tilecode_feature["resolution"] = cell_resolution
-        tilecode_feature["center_lat"] = center_lat
-        tilecode_feature["center_lon"] = center_lon
-        tilecode_feature["cell_width"] = cell_width
-        tilecode_feature["cell_height"] = cell_height
-        tilecode_feature["cell_area"] = cell_area
-        tilecode_feature["cell_perimeter"] = cell_perimeter
-        tilecode_features.append(tilecode_feature)
+        compact_batch.add(tilecode_id_compact, tile_polygon(x, y, z), z)
 
         if feedback and i % 100 == 0:
             feedback.setProgress(int(100 * i / total_cells))
@@ -4136,213 +1801,39 @@ def tilecodecompact_from_qgsfeatures(qgs_features, feedback):
     if feedback:
         feedback.setProgress(100)
 
-    return tilecode_features
+    return compact_batch
 
 
 def polyline2tilecode(feature, resolution, predicate=None, compact=None, feedback=None):
-    tilecode_features = []
-    feature_geometry = feature.geometry()
-    feature_rect = feature_geometry.boundingBox()
-    min_x = feature_rect.xMinimum()
-    min_y = feature_rect.yMinimum()
-    max_x = feature_rect.xMaximum()
-    max_y = feature_rect.yMaximum()
-
-    tiles = list(mercantile.tiles(min_x, min_y, max_x, max_y, resolution))
-    total_cells = len(tiles)
-
-    if feedback:
-        feedback.pushInfo(f"Processing feature {feature.id()}")
-        feedback.setProgress(0)
-
-    for i, tile in enumerate(tiles):
-        if feedback and feedback.isCanceled():
-            return []
-        z, x, y = tile.z, tile.x, tile.y
-        tilecode_id = f"z{tile.z}x{tile.x}y{tile.y}"
-        bounds = mercantile.bounds(x, y, z)
-        # Create the bounding box coordinates for the polygon
-        min_lat, min_lon = bounds.south, bounds.west
-        max_lat, max_lon = bounds.north, bounds.east
-
-        cell_polygon = Polygon(
-            [
-                [min_lon, min_lat],  # Bottom-left corner
-                [max_lon, min_lat],  # Bottom-right corner
-                [max_lon, max_lat],  # Top-right corner
-                [min_lon, max_lat],  # Top-left corner
-                [min_lon, min_lat],  # Closing the polygon (same as the first point)
-            ]
-        )
-
-        # if cell_polygon.intersects(feature):
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-        if not check_predicate(cell_geometry, feature_geometry, "intersects"):
-            continue
-
-        # Create a single QGIS feature
-        tilecode_feature = QgsFeature()
-        tilecode_feature.setGeometry(cell_geometry)
-
-        center_lat, center_lon, cell_width, cell_height, cell_area, cell_perimeter = (
-            graticule_dggs_metrics(cell_polygon)
-        )
-        resolution = tile.z
-
-        # Get all attributes from the input feature
-        original_attributes = feature.attributes()
-        original_fields = feature.fields()
-
-        # Define new H3-related attributes
-        new_fields = QgsFields()
-        new_fields.append(QgsField("tilecode", QVariant.String))
-        new_fields.append(QgsField("resolution", QVariant.Int))
-        new_fields.append(QgsField("center_lat", QVariant.Double))
-        new_fields.append(QgsField("center_lon", QVariant.Double))
-        new_fields.append(QgsField("cell_width", QVariant.Double))
-        new_fields.append(QgsField("cell_height", QVariant.Double))
-        new_fields.append(QgsField("cell_area", QVariant.Double))
-        new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-        # Combine original fields and new fields
-        all_fields = QgsFields()
-        for field in original_fields:
-            all_fields.append(field)
-        for field in new_fields:
-            all_fields.append(field)
-
-        tilecode_feature.setFields(all_fields)
-
-        # Combine original attributes with new attributes
-        new_attributes = [
-            tilecode_id,
-            resolution,
-            center_lat,
-            center_lon,
-            cell_width,
-            cell_height,
-            cell_area,
-            cell_perimeter,
-        ]
-        all_attributes = original_attributes + new_attributes
-
-        tilecode_feature.setAttributes(all_attributes)
-
-        tilecode_features.append(tilecode_feature)
-        if feedback and i % 100 == 0:
-            feedback.setProgress(int(100 * i / total_cells))
-
-    if feedback:
-        feedback.setProgress(100)
-
-    if compact:
-        tilecode_features = tilecodecompact_from_qgsfeatures(
-            tilecode_features, feedback
-        )
-
-    return tilecode_features
+    # Same hierarchical cover as polygons, keeping the cells the line crosses
+    return polygon2tilecode(feature, resolution, "intersects", compact, feedback)
 
 
 def polygon2tilecode(feature, resolution, predicate=None, compact=None, feedback=None):
-    tilecode_features = []
-    feature_geometry = feature.geometry()
-    feature_rect = feature_geometry.boundingBox()
-    min_x = feature_rect.xMinimum()
-    min_y = feature_rect.yMinimum()
-    max_x = feature_rect.xMaximum()
-    max_y = feature_rect.yMaximum()
-
-    tiles = list(mercantile.tiles(min_x, min_y, max_x, max_y, resolution))
-    total_cells = len(tiles)
+    feature_shapely = wkt_loads(feature.geometry().asWkt())
 
     if feedback:
         feedback.pushInfo(f"Processing feature {feature.id()}")
         feedback.setProgress(0)
 
-    for i, tile in enumerate(tiles):
-        if feedback and feedback.isCanceled():
-            return []
-        z, x, y = tile.z, tile.x, tile.y
-        tilecode_id = f"z{tile.z}x{tile.x}y{tile.y}"
-        bounds = mercantile.bounds(x, y, z)
-        # Create the bounding box coordinates for the polygon
-        min_lat, min_lon = bounds.south, bounds.west
-        max_lat, max_lon = bounds.north, bounds.east
-
-        cell_polygon = Polygon(
-            [
-                [min_lon, min_lat],  # Bottom-left corner
-                [max_lon, min_lat],  # Bottom-right corner
-                [max_lon, max_lat],  # Top-right corner
-                [min_lon, max_lat],  # Top-left corner
-                [min_lon, min_lat],  # Closing the polygon (same as the first point)
-            ]
-        )
-
-        # if cell_polygon.intersects(feature):
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-        if not check_predicate(cell_geometry, feature_geometry, predicate):
-            continue
-
-        # Create a single QGIS feature
-        tilecode_feature = QgsFeature()
-        tilecode_feature.setGeometry(cell_geometry)
-
-        center_lat, center_lon, cell_width, cell_height, cell_area, cell_perimeter = (
-            graticule_dggs_metrics(cell_polygon)
-        )
-        resolution = tile.z
-
-        # Get all attributes from the input feature
-        original_attributes = feature.attributes()
-        original_fields = feature.fields()
-
-        # Define new H3-related attributes
-        new_fields = QgsFields()
-        new_fields.append(QgsField("tilecode", QVariant.String))
-        new_fields.append(QgsField("resolution", QVariant.Int))
-        new_fields.append(QgsField("center_lat", QVariant.Double))
-        new_fields.append(QgsField("center_lon", QVariant.Double))
-        new_fields.append(QgsField("cell_width", QVariant.Double))
-        new_fields.append(QgsField("cell_height", QVariant.Double))
-        new_fields.append(QgsField("cell_area", QVariant.Double))
-        new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-        # Combine original fields and new fields
-        all_fields = QgsFields()
-        for field in original_fields:
-            all_fields.append(field)
-        for field in new_fields:
-            all_fields.append(field)
-
-        tilecode_feature.setFields(all_fields)
-
-        # Combine original attributes with new attributes
-        new_attributes = [
-            tilecode_id,
-            resolution,
-            center_lat,
-            center_lon,
-            cell_width,
-            cell_height,
-            cell_area,
-            cell_perimeter,
-        ]
-        all_attributes = original_attributes + new_attributes
-
-        tilecode_feature.setAttributes(all_attributes)
+    grid = TileGrid(lambda x, y, z: f"z{z}x{x}y{y}")
+    cells = hierarchical_cover(
+        grid, feature_shapely, resolution, predicate, compact, feedback
+    )
+    if feedback and feedback.isCanceled():
+        return []
 
-        tilecode_features.append(tilecode_feature)
-        if feedback and i % 100 == 0:
-            feedback.setProgress(int(100 * i / total_cells))
+    batch = CellBatch(feature, "tilecode", graticule=True)
+    for tilecode_id, cell_polygon in cells:
+        if cell_polygon is None and batch.geometry:
+            cell_polygon = tilecode2geo(tilecode_id)
+        z = int(re.match(r"z(\d+)", tilecode_id).group(1))
+        batch.add(tilecode_id, cell_polygon, z)
 
     if feedback:
         feedback.setProgress(100)
 
-    if compact:
-        tilecode_features = tilecodecompact_from_qgsfeatures(
-            tilecode_features, feedback
-        )
-
-    return tilecode_features
+    return batch.features(feedback)
 
 
 #######################
@@ -4369,318 +1860,68 @@ def point2quadkey(feature, resolution, feedback):
     point = feature_geometry.asPoint()
     quadkey_id = latlon2quadkey(point.y(), point.x(), resolution)
     quadkey_cell = mercantile.tile(point.x(), point.y(), resolution)
-    cell_resolution = quadkey_cell.z
-    cell_polygon = quadkey2geo(quadkey_id)
-    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-    center_lat, center_lon, cell_width, cell_height, cell_area, cell_perimeter = (
-        graticule_dggs_metrics(cell_polygon)
-    )
-
-    # Create a single QGIS feature
-    quadkey_feature = QgsFeature()
-    quadkey_feature.setGeometry(cell_geometry)
-
-    # Get all attributes from the input feature
-    original_attributes = feature.attributes()
-    original_fields = feature.fields()
-
-    # Define new s2-related attributes
-    new_fields = QgsFields()
-    new_fields.append(QgsField("quadkey", QVariant.String))
-    new_fields.append(QgsField("resolution", QVariant.Int))
-    new_fields.append(QgsField("center_lat", QVariant.Double))
-    new_fields.append(QgsField("center_lon", QVariant.Double))
-    new_fields.append(QgsField("cell_width", QVariant.Double))
-    new_fields.append(QgsField("cell_height", QVariant.Double))
-    new_fields.append(QgsField("cell_area", QVariant.Double))
-    new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-    # Combine original fields and new fields
-    all_fields = QgsFields()
-    for field in original_fields:
-        all_fields.append(field)
-    for field in new_fields:
-        all_fields.append(field)
-
-    quadkey_feature.setFields(all_fields)
-
-    # Combine original attributes with new attributes
-    new_attributes = [
-        quadkey_id,
-        cell_resolution,
-        center_lat,
-        center_lon,
-        cell_width,
-        cell_height,
-        cell_area,
-        cell_perimeter,
-    ]
-    all_attributes = original_attributes + new_attributes
-
-    quadkey_feature.setAttributes(all_attributes)
-
-    return [quadkey_feature]
+    batch = CellBatch(feature, "quadkey", graticule=True)
+    cell_polygon = quadkey2geo(quadkey_id) if batch.geometry else None
+    batch.add(quadkey_id, cell_polygon, quadkey_cell.z)
+    return batch.features()
 
 
-def quadkeycompact_from_qgsfeatures(qgs_features, feedback):
-    original_fields = qgs_features[0].fields()
-
-    quadkey_ids = [f["quadkey"] for f in qgs_features if f["quadkey"]]
-
-    quadkey_ids_compact = quadkey_compact(quadkey_ids)
-    quadkey_features = []
-
+def quadkeycompact_batch(batch, feedback):
+    quadkey_ids_compact = quadkey_compact(batch.ids)
+    compact_batch = batch.empty()
     total_cells = len(quadkey_ids_compact)
+
     if feedback:
         feedback.pushInfo("Compacting cells")
         feedback.setProgress(0)
 
     for i, quadkey_id_compact in enumerate(quadkey_ids_compact):
         if feedback and feedback.isCanceled():
-            return []
-        quadkey_id_compact_tile = mercantile.quadkey_to_tile(quadkey_id_compact)
-        # Convert matched groups to integers
-        z = quadkey_id_compact_tile.z
-        x = quadkey_id_compact_tile.x
-        y = quadkey_id_compact_tile.y
-
-        # Get the bounds of the tile in (west, south, east, north)
-        bounds = mercantile.bounds(x, y, z)
-        # Create the bounding box coordinates for the polygon
-        min_lat, min_lon = bounds.south, bounds.west
-        max_lat, max_lon = bounds.north, bounds.east
-        cell_polygon = Polygon(
-            [
-                [min_lon, min_lat],  # Bottom-left corner
-                [max_lon, min_lat],  # Bottom-right corner
-                [max_lon, max_lat],  # Top-right corner
-                [min_lon, max_lat],  # Top-left corner
-                [min_lon, min_lat],  # Closing the polygon (same as the first point)
-            ]
-        )
-
-        cell_resolution = z
+            return batch.empty()
 
-        center_lat, center_lon, cell_width, cell_height, cell_area, cell_perimeter = (
-            graticule_dggs_metrics(cell_polygon)
+        tile = mercantile.quadkey_to_tile(quadkey_id_compact)
+        compact_batch.add(
+            quadkey_id_compact, tile_polygon(tile.x, tile.y, tile.z), tile.z
         )
 
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-
-        quadkey_feature = QgsFeature()
-        quadkey_feature.setFields(original_fields)
-        quadkey_feature.setGeometry(cell_geometry)
-
-        quadkey_feature["quadkey"] = quadkey_id_compact
-        quadkey_feature["resolution"] = cell_resolution
-        quadkey_feature["center_lat"] = center_lat
-        quadkey_feature["center_lon"] = center_lon
-        quadkey_feature["cell_width"] = cell_width
-        quadkey_feature["cell_height"] = cell_height
-        quadkey_feature["cell_area"] = cell_area
-        quadkey_feature["cell_perimeter"] = cell_perimeter
-        quadkey_features.append(quadkey_feature)
         if feedback and i % 100 == 0:
             feedback.setProgress(int(100 * i / total_cells))
 
     if feedback:
         feedback.setProgress(100)
 
-    return quadkey_features
+    return compact_batch
 
 
 def polyline2quadkey(feature, resolution, predicate=None, compact=None, feedback=None):
-    quadkey_features = []
-    feature_geometry = feature.geometry()
-    feature_rect = feature_geometry.boundingBox()
-    min_x = feature_rect.xMinimum()
-    min_y = feature_rect.yMinimum()
-    max_x = feature_rect.xMaximum()
-    max_y = feature_rect.yMaximum()
-
-    tiles = list(mercantile.tiles(min_x, min_y, max_x, max_y, resolution))
-    total_cells = len(tiles)
-
-    if feedback:
-        feedback.pushInfo(f"Processing feature {feature.id()}")
-        feedback.setProgress(0)
-
-    for i, tile in enumerate(tiles):
-        if feedback and feedback.isCanceled():
-            return []
-        z, x, y = tile.z, tile.x, tile.y
-        quadkey_id = mercantile.quadkey(tile)
-        bounds = mercantile.bounds(x, y, z)
-        # Create the bounding box coordinates for the polygon
-        min_lat, min_lon = bounds.south, bounds.west
-        max_lat, max_lon = bounds.north, bounds.east
-
-        cell_polygon = Polygon(
-            [
-                [min_lon, min_lat],  # Bottom-left corner
-                [max_lon, min_lat],  # Bottom-right corner
-                [max_lon, max_lat],  # Top-right corner
-                [min_lon, max_lat],  # Top-left corner
-                [min_lon, min_lat],  # Closing the polygon (same as the first point)
-            ]
-        )
-
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-        # Predicate-based filtering
-        if not check_predicate(cell_geometry, feature_geometry, "intersects"):
-            continue
-
-        quadkey_feature = QgsFeature()
-        quadkey_feature.setGeometry(cell_geometry)
-
-        center_lat, center_lon, cell_width, cell_height, cell_area, cell_perimeter = (
-            graticule_dggs_metrics(cell_polygon)
-        )
-        cell_resolution = tile.z
-
-        original_attributes = feature.attributes()
-        original_fields = feature.fields()
-
-        new_fields = QgsFields()
-        new_fields.append(QgsField("quadkey", QVariant.String))
-        new_fields.append(QgsField("resolution", QVariant.Int))
-        new_fields.append(QgsField("center_lat", QVariant.Double))
-        new_fields.append(QgsField("center_lon", QVariant.Double))
-        new_fields.append(QgsField("cell_width", QVariant.Double))
-        new_fields.append(QgsField("cell_height", QVariant.Double))
-        new_fields.append(QgsField("cell_area", QVariant.Double))
-        new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-        all_fields = QgsFields()
-        for field in original_fields:
-            all_fields.append(field)
-        for field in new_fields:
-            all_fields.append(field)
-
-        quadkey_feature.setFields(all_fields)
-
-        new_attributes = [
-            quadkey_id,
-            cell_resolution,
-            center_lat,
-            center_lon,
-            cell_width,
-            cell_height,
-            cell_area,
-            cell_perimeter,
-        ]
-        all_attributes = original_attributes + new_attributes
-
-        quadkey_feature.setAttributes(all_attributes)
-
-        quadkey_features.append(quadkey_feature)
-
-        if feedback and i % 100 == 0:
-            feedback.setProgress(int(100 * i / total_cells))
-
-    if feedback:
-        feedback.setProgress(100)
-
-    if compact:
-        quadkey_features = quadkeycompact_from_qgsfeatures(quadkey_features, feedback)
-
-    return quadkey_features
+    # Same hierarchical cover as polygons, keeping the cells the line crosses
+    return polygon2quadkey(feature, resolution, "intersects", compact, feedback)
 
 
 def polygon2quadkey(feature, resolution, predicate=None, compact=None, feedback=None):
-    quadkey_features = []
-    feature_geometry = feature.geometry()
-    feature_rect = feature_geometry.boundingBox()
-    min_x = feature_rect.xMinimum()
-    min_y = feature_rect.yMinimum()
-    max_x = feature_rect.xMaximum()
-    max_y = feature_rect.yMaximum()
-
-    tiles = list(mercantile.tiles(min_x, min_y, max_x, max_y, resolution))
-    total_cells = len(tiles)
+    feature_shapely = wkt_loads(feature.geometry().asWkt())
 
     if feedback:
         feedback.pushInfo(f"Processing feature {feature.id()}")
         feedback.setProgress(0)
 
-    for i, tile in enumerate(tiles):
-        if feedback and feedback.isCanceled():
-            return []
-        z, x, y = tile.z, tile.x, tile.y
-        quadkey_id = mercantile.quadkey(tile)
-        bounds = mercantile.bounds(x, y, z)
-        # Create the bounding box coordinates for the polygon
-        min_lat, min_lon = bounds.south, bounds.west
-        max_lat, max_lon = bounds.north, bounds.east
-
-        cell_polygon = Polygon(
-            [
-                [min_lon, min_lat],  # Bottom-left corner
-                [max_lon, min_lat],  # Bottom-right corner
-                [max_lon, max_lat],  # Top-right corner
-                [min_lon, max_lat],  # Top-left corner
-                [min_lon, min_lat],  # Closing the polygon (same as the first point)
-            ]
-        )
-
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-        # Predicate-based filtering
-        if not check_predicate(cell_geometry, feature_geometry, predicate):
-            continue
-
-        quadkey_feature = QgsFeature()
-        quadkey_feature.setGeometry(cell_geometry)
-
-        center_lat, center_lon, cell_width, cell_height, cell_area, cell_perimeter = (
-            graticule_dggs_metrics(cell_polygon)
-        )
-        cell_resolution = tile.z
-
-        original_attributes = feature.attributes()
-        original_fields = feature.fields()
-
-        new_fields = QgsFields()
-        new_fields.append(QgsField("quadkey", QVariant.String))
-        new_fields.append(QgsField("resolution", QVariant.Int))
-        new_fields.append(QgsField("center_lat", QVariant.Double))
-        new_fields.append(QgsField("center_lon", QVariant.Double))
-        new_fields.append(QgsField("cell_width", QVariant.Double))
-        new_fields.append(QgsField("cell_height", QVariant.Double))
-        new_fields.append(QgsField("cell_area", QVariant.Double))
-        new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-
-        all_fields = QgsFields()
-        for field in original_fields:
-            all_fields.append(field)
-        for field in new_fields:
-            all_fields.append(field)
-
-        quadkey_feature.setFields(all_fields)
-
-        new_attributes = [
-            quadkey_id,
-            cell_resolution,
-            center_lat,
-            center_lon,
-            cell_width,
-            cell_height,
-            cell_area,
-            cell_perimeter,
-        ]
-        all_attributes = original_attributes + new_attributes
-
-        quadkey_feature.setAttributes(all_attributes)
-
-        quadkey_features.append(quadkey_feature)
+    grid = TileGrid(lambda x, y, z: mercantile.quadkey(x, y, z))
+    cells = hierarchical_cover(
+        grid, feature_shapely, resolution, predicate, compact, feedback
+    )
+    if feedback and feedback.isCanceled():
+        return []
 
-        if feedback and i % 100 == 0:
-            feedback.setProgress(int(100 * i / total_cells))
+    batch = CellBatch(feature, "quadkey", graticule=True)
+    for quadkey_id, cell_polygon in cells:
+        if cell_polygon is None and batch.geometry:
+            cell_polygon = quadkey2geo(quadkey_id)
+        batch.add(quadkey_id, cell_polygon, len(quadkey_id))
 
     if feedback:
         feedback.setProgress(100)
 
-    if compact:
-        quadkey_features = quadkeycompact_from_qgsfeatures(quadkey_features, feedback)
-
-    return quadkey_features
+    return batch.features(feedback)
 
 
 #######################
@@ -4708,64 +1949,15 @@ def point2digipin(feature, resolution, feedback):
     feature_geometry = feature.geometry()
     point = feature_geometry.asPoint()
     digipin_id = latlon2digipin(point.y(), point.x(), resolution)
-    cell_polygon = digipin2geo(digipin_id)
-    cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-    center_lat, center_lon, cell_width, cell_height, cell_area, cell_perimeter = (
-        graticule_dggs_metrics(cell_polygon)
-    )
-
-    # Create a single QGIS feature
-    digipin_feature = QgsFeature()
-    digipin_feature.setGeometry(cell_geometry)
-
-    # Get all attributes from the input feature
-    original_attributes = feature.attributes()
-    original_fields = feature.fields()
-
-    # Define new digipin-related attributes
-    new_fields = QgsFields()
-    new_fields.append(QgsField("digipin", QVariant.String))
-    new_fields.append(QgsField("resolution", QVariant.Int))
-    new_fields.append(QgsField("center_lat", QVariant.Double))
-    new_fields.append(QgsField("center_lon", QVariant.Double))
-    new_fields.append(QgsField("cell_width", QVariant.Double))
-    new_fields.append(QgsField("cell_height", QVariant.Double))
-    new_fields.append(QgsField("cell_area", QVariant.Double))
-    new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-    # Combine original fields and new fields
-    all_fields = QgsFields()
-    for field in original_fields:
-        all_fields.append(field)
-    for field in new_fields:
-        all_fields.append(field)
-
-    digipin_feature.setFields(all_fields)
-
-    # Combine original attributes with new attributes
-    new_attributes = [
-        digipin_id,
-        resolution,
-        center_lat,
-        center_lon,
-        cell_width,
-        cell_height,
-        cell_area,
-        cell_perimeter,
-    ]
-    all_attributes = original_attributes + new_attributes
-
-    digipin_feature.setAttributes(all_attributes)
-
-    return [digipin_feature]
+    batch = CellBatch(feature, "digipin", graticule=True)
+    cell_polygon = digipin2geo(digipin_id) if batch.geometry else None
+    batch.add(digipin_id, cell_polygon, resolution)
+    return batch.features()
 
 
-def digipincompact_from_qgsfeatures(qgs_features, feedback):
-    original_fields = qgs_features[0].fields()
-
-    digipin_ids = [f["digipin"] for f in qgs_features if f["digipin"]]
-
-    digipin_ids_compact = digipin_compact(digipin_ids)
-    digipin_features = []
+def digipincompact_batch(batch, feedback):
+    digipin_ids_compact = digipin_compact(batch.ids)
+    compact_batch = batch.empty()
 
     total_cells = len(digipin_ids_compact)
     if feedback:
@@ -4774,300 +1966,50 @@ def digipincompact_from_qgsfeatures(qgs_features, feedback):
 
     for i, digipin_id_compact in enumerate(digipin_ids_compact):
         if feedback and feedback.isCanceled():
-            return []
-
-        cell_polygon = digipin2geo(digipin_id_compact)
-        clean_id = digipin_id_compact.replace("-", "")
-        cell_resolution = len(clean_id)
+            return batch.empty()
 
-        center_lat, center_lon, cell_width, cell_height, cell_area, cell_perimeter = (
-            graticule_dggs_metrics(cell_polygon)
+        compact_batch.add(
+            digipin_id_compact,
+            digipin2geo(digipin_id_compact),
+            len(digipin_id_compact.replace("-", "")),
         )
-
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-
-        digipin_feature = QgsFeature()
-        digipin_feature.setFields(original_fields)
-        digipin_feature.setGeometry(cell_geometry)
-
-        digipin_feature["digipin"] = digipin_id_compact
-        digipin_feature["resolution"] = cell_resolution
-        digipin_feature["center_lat"] = center_lat
-        digipin_feature["center_lon"] = center_lon
-        digipin_feature["cell_width"] = cell_width
-        digipin_feature["cell_height"] = cell_height
-        digipin_feature["cell_area"] = cell_area
-        digipin_feature["cell_perimeter"] = cell_perimeter
-        digipin_features.append(digipin_feature)
         if feedback and i % 100 == 0:
             feedback.setProgress(int(100 * i / total_cells))
 
     if feedback:
         feedback.setProgress(100)
 
-    return digipin_features
+    return compact_batch
 
 
 def polyline2digipin(feature, resolution, predicate=None, compact=None, feedback=None):
-    digipin_features = []
-    feature_geometry = feature.geometry()
-    feature_rect = feature_geometry.boundingBox()
-    min_lon = feature_rect.xMinimum()
-    min_lat = feature_rect.yMinimum()
-    max_lon = feature_rect.xMaximum()
-    max_lat = feature_rect.yMaximum()
-
-    # Constrain to DIGIPIN bounds (India region)
-    min_lat = max(min_lat, BOUNDS["minLat"])
-    min_lon = max(min_lon, BOUNDS["minLon"])
-    max_lat = min(max_lat, BOUNDS["maxLat"])
-    max_lon = min(max_lon, BOUNDS["maxLon"])
-
-    # Calculate sampling density based on resolution (following digipingrid.py approach)
-    # Each level divides the cell by 4 (2x2 grid)
-    base_width = 9.0  # degrees at resolution 1
-    factor = 0.25 ** (resolution - 1)  # each level divides by 4
-    sample_width = base_width * factor
-
-    seen_cells = set()
-
-    # Calculate approximate number of cells for progress tracking
-    lat_range = max_lat - min_lat
-    lon_range = max_lon - min_lon
-    estimated_cells = int((lat_range * lon_range) / (sample_width * sample_width))
-
-    if feedback:
-        feedback.pushInfo(f"Processing feature {feature.id()}")
-        feedback.setProgress(0)
-
-    cell_count = 0
-
-    # Sample points across the bounding box
-    lon = min_lon
-    while lon <= max_lon:
-        lat = min_lat
-        while lat <= max_lat:
-            if feedback and feedback.isCanceled():
-                return []
-            # Get DIGIPIN code for this point at the specified resolution
-            digipin_id = latlon2digipin(lat, lon, resolution)
-
-            if digipin_id == "Out of Bound":
-                lat += sample_width
-                continue
-
-            if digipin_id in seen_cells:
-                lat += sample_width
-                continue
-
-            seen_cells.add(digipin_id)
-
-            # Get the bounds for this DIGIPIN cell
-            cell_polygon = digipin2geo(digipin_id)
-
-            if isinstance(cell_polygon, str):  # Error like 'Invalid DIGIPIN'
-                lat += sample_width
-                continue
-
-            # Convert to QgsGeometry for intersection check
-            cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-
-            # Check if cell intersects with polyline
-            if cell_geometry.intersects(feature_geometry):
-                digipin_feature = QgsFeature()
-                digipin_feature.setGeometry(cell_geometry)
-
-                (
-                    center_lat,
-                    center_lon,
-                    cell_width,
-                    cell_height,
-                    cell_area,
-                    cell_perimeter,
-                ) = graticule_dggs_metrics(cell_polygon)
-
-                original_attributes = feature.attributes()
-                original_fields = feature.fields()
-
-                new_fields = QgsFields()
-                new_fields.append(QgsField("digipin", QVariant.String))
-                new_fields.append(QgsField("resolution", QVariant.Int))
-                new_fields.append(QgsField("center_lat", QVariant.Double))
-                new_fields.append(QgsField("center_lon", QVariant.Double))
-                new_fields.append(QgsField("cell_width", QVariant.Double))
-                new_fields.append(QgsField("cell_height", QVariant.Double))
-                new_fields.append(QgsField("cell_area", QVariant.Double))
-                new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-                all_fields = QgsFields()
-                for field in original_fields:
-                    all_fields.append(field)
-                for field in new_fields:
-                    all_fields.append(field)
-
-                digipin_feature.setFields(all_fields)
-
-                new_attributes = [
-                    digipin_id,
-                    resolution,
-                    center_lat,
-                    center_lon,
-                    cell_width,
-                    cell_height,
-                    cell_area,
-                    cell_perimeter,
-                ]
-                all_attributes = original_attributes + new_attributes
-
-                digipin_feature.setAttributes(all_attributes)
-
-                digipin_features.append(digipin_feature)
-                cell_count += 1
-
-            lat += sample_width
-            if feedback and cell_count % 100 == 0:
-                feedback.setProgress(int(100 * cell_count / estimated_cells))
-        lon += sample_width
-
-    if feedback:
-        feedback.setProgress(100)
-
-    if compact:
-        digipin_features = digipincompact_from_qgsfeatures(digipin_features, feedback)
-
-    return digipin_features
+    return polygon2digipin(feature, resolution, "intersects", compact, feedback)
 
 
 def polygon2digipin(feature, resolution, predicate=None, compact=None, feedback=None):
-    digipin_features = []
     feature_geometry = feature.geometry()
-    feature_rect = feature_geometry.boundingBox()
-    min_lon = feature_rect.xMinimum()
-    min_lat = feature_rect.yMinimum()
-    max_lon = feature_rect.xMaximum()
-    max_lat = feature_rect.yMaximum()
-
-    # Constrain to DIGIPIN bounds (India region)
-    min_lat = max(min_lat, BOUNDS["minLat"])
-    min_lon = max(min_lon, BOUNDS["minLon"])
-    max_lat = min(max_lat, BOUNDS["maxLat"])
-    max_lon = min(max_lon, BOUNDS["maxLon"])
-
-    # Calculate sampling density based on resolution (following digipingrid.py approach)
-    # Each level divides the cell by 4 (2x2 grid)
-    base_width = 9.0  # degrees at resolution 1
-    factor = 0.25 ** (resolution - 1)  # each level divides by 4
-    sample_width = base_width * factor
-
-    seen_cells = set()
-
-    # Calculate approximate number of cells for progress tracking
-    lat_range = max_lat - min_lat
-    lon_range = max_lon - min_lon
-    estimated_cells = int((lat_range * lon_range) / (sample_width * sample_width))
+    feature_shapely = wkt_loads(feature_geometry.asWkt())
 
     if feedback:
         feedback.pushInfo(f"Processing feature {feature.id()}")
         feedback.setProgress(0)
 
-    cell_count = 0
-
-    # Sample points across the bounding box
-    lon = min_lon
-    while lon <= max_lon:
-        lat = min_lat
-        while lat <= max_lat:
-            if feedback and feedback.isCanceled():
-                return []
-            # Get DIGIPIN code for this point at the specified resolution
-            digipin_id = latlon2digipin(lat, lon, resolution)
-
-            if digipin_id == "Out of Bound":
-                lat += sample_width
-                continue
-
-            if digipin_id in seen_cells:
-                lat += sample_width
-                continue
-
-            seen_cells.add(digipin_id)
-
-            # Get the bounds for this DIGIPIN cell
-            cell_polygon = digipin2geo(digipin_id)
-
-            if isinstance(cell_polygon, str):  # Error like 'Invalid DIGIPIN'
-                lat += sample_width
-                continue
-            # Convert to QgsGeometry for intersection check
-            cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-
-            # Predicate-based filtering
-            if not check_predicate(cell_geometry, feature_geometry, predicate):
-                lat += sample_width
-                continue
-
-            digipin_feature = QgsFeature()
-            digipin_feature.setGeometry(cell_geometry)
-
-            (
-                center_lat,
-                center_lon,
-                cell_width,
-                cell_height,
-                cell_area,
-                cell_perimeter,
-            ) = graticule_dggs_metrics(cell_polygon)
-
-            original_attributes = feature.attributes()
-            original_fields = feature.fields()
-
-            new_fields = QgsFields()
-            new_fields.append(QgsField("digipin", QVariant.String))
-            new_fields.append(QgsField("resolution", QVariant.Int))
-            new_fields.append(QgsField("center_lat", QVariant.Double))
-            new_fields.append(QgsField("center_lon", QVariant.Double))
-            new_fields.append(QgsField("cell_width", QVariant.Double))
-            new_fields.append(QgsField("cell_height", QVariant.Double))
-            new_fields.append(QgsField("cell_area", QVariant.Double))
-            new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-
-            all_fields = QgsFields()
-            for field in original_fields:
-                all_fields.append(field)
-            for field in new_fields:
-                all_fields.append(field)
-
-            digipin_feature.setFields(all_fields)
-
-            new_attributes = [
-                digipin_id,
-                resolution,
-                center_lat,
-                center_lon,
-                cell_width,
-                cell_height,
-                cell_area,
-                cell_perimeter,
-            ]
-            all_attributes = original_attributes + new_attributes
-
-            digipin_feature.setAttributes(all_attributes)
-
-            digipin_features.append(digipin_feature)
-            cell_count += 1
-
-            lat += sample_width
-        lon += sample_width
-
-        if feedback and cell_count % 100 == 0:
-            feedback.setProgress(int(100 * cell_count / estimated_cells))
+    batch = CellBatch(feature, "digipin", graticule=True, stream=not compact)
+    cells = graticule_cover(
+        DigipinGrid(resolution), feature_shapely, predicate, batch.geometry, feedback
+    )
+    for digipin_id, cell_polygon in cells:
+        batch.add(digipin_id, cell_polygon, resolution)
+    if feedback and feedback.isCanceled():
+        return []
 
     if feedback:
         feedback.setProgress(100)
 
-    if compact:
-        digipin_features = digipincompact_from_qgsfeatures(digipin_features, feedback)
+    if compact and batch:
+        batch = digipincompact_batch(batch, feedback)
 
-    return digipin_features
+    return batch.features(feedback)
 
 
 #######################
@@ -5075,117 +2017,164 @@ def polygon2digipin(feature, resolution, predicate=None, compact=None, feedback=
 #######################
 
 
-def _dggrid_cell_id(row, field_name):
-    for col in (field_name, "seqnum", "global_id", "name"):
-        if col in row.index:
-            val = row[col]
-            if val is not None:
-                return str(val)
-    return None
-
-
-def _dggrid_gdf_to_qgs_features(gdf, field_name, resolution, input_feature, feedback):
-    if gdf is None or gdf.empty:
-        return []
-
-    original_attributes = input_feature.attributes()
-    original_fields = input_feature.fields()
-
-    new_fields = QgsFields()
-    new_fields.append(QgsField(field_name, QVariant.String))
-    new_fields.append(QgsField("resolution", QVariant.Int))
-    new_fields.append(QgsField("center_lat", QVariant.Double))
-    new_fields.append(QgsField("center_lon", QVariant.Double))
-    new_fields.append(QgsField("avg_edge_len", QVariant.Double))
-    new_fields.append(QgsField("cell_area", QVariant.Double))
-    new_fields.append(QgsField("cell_perimeter", QVariant.Double))
-
-    all_fields = QgsFields()
-    for field in original_fields:
-        all_fields.append(field)
-    for field in new_fields:
-        all_fields.append(field)
-
-    dggrid_features = []
-    total = len(gdf)
-
-    if feedback:
-        feedback.pushInfo(f"Processing feature {input_feature.id()}")
-        feedback.setProgress(0)
-
-    for idx, row in gdf.iterrows():
-        if feedback and feedback.isCanceled():
-            return []
-
-        cell_polygon = row.geometry
-        if cell_polygon is None or cell_polygon.is_empty:
-            continue
-
-        cell_id = _dggrid_cell_id(row, field_name)
-        if cell_id is None:
-            continue
-
-        num_edges = (
-            len(cell_polygon.exterior.coords) - 1
-            if hasattr(cell_polygon, "exterior")
-            else 4
-        )
-        center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-            geodesic_dggs_metrics(cell_polygon, num_edges)
-        )
-
-        dggrid_feature = QgsFeature()
-        dggrid_feature.setGeometry(QgsGeometry.fromWkt(cell_polygon.wkt))
-        dggrid_feature.setFields(all_fields)
-        dggrid_feature.setAttributes(
-            original_attributes
-            + [
-                cell_id,
-                resolution,
-                center_lat,
-                center_lon,
-                avg_edge_len,
-                cell_area,
-                cell_perimeter,
-            ]
-        )
-        dggrid_features.append(dggrid_feature)
-
-        if feedback and total and idx % 100 == 0:
-            feedback.setProgress(int(100 * idx / total))
-
-    if feedback:
-        feedback.setProgress(100)
-
-    return dggrid_features
+def qgsfeatures2dggrid(dggs_type, features, resolution, predicate=None, feedback=None):
+    """Cell features of each of *features*, with one DGGRID run for all of them.
 
+    The parts of every point, line and polygon feature are converted together
+    by ``vector_geoms_to_dggrid_cells_qgis``. Returns one list of cell
+    features per input feature.
+    """
+    # Plugin settings import the GUI; worker processes never get here
+    from ...settings import settings
 
-def qgsfeature2dggrid(
-    dggs_type, feature, resolution, predicate=None, compact=None, feedback=None
-):
     resolution = validate_dggrid_resolution(dggs_type, resolution)
     dggrid_instance = get_plugin_dggrid_instance()
     dggrid_options = build_dggrid_options(settings.dggridDensificationSpinBox)
     field_name = f"dggrid_{dggs_type.lower()}"
 
-    geometry = feature.geometry()
-    shapely_geom = wkt_loads(geometry.asWkt())
-
-    if geometry.wkbType() not in (
-        QgsWkbTypes.Point,
-        QgsWkbTypes.LineString,
-        QgsWkbTypes.Polygon,
-    ):
-        return []
+    parts = []
+    part_features = []  # index in features of each part
+    for index, feature in enumerate(features):
+        if not feature.hasGeometry():
+            continue
+        shapely_geom = wkt_loads(feature.geometry().asWkt())
+        if shapely_geom.geom_type == "GeometryCollection":
+            continue
+        for part in shapely.get_parts(shapely_geom):
+            if not part.is_empty:
+                parts.append(part)
+                part_features.append(index)
 
-    gdf = vector_geom_to_dggrid_gdf_qgis(
+    part_cells = vector_geoms_to_dggrid_cells_qgis(
         dggrid_instance,
         dggs_type,
-        shapely_geom,
+        parts,
         resolution,
         predicate=predicate,
         output_address_type="SEQNUM",
         options=dggrid_options,
+        feedback=feedback,
     )
+    if feedback and feedback.isCanceled():
+        return [[] for _ in features]
+
+    batches = [CellBatch(feature, field_name, stream=False) for feature in features]
+    for index, cells in zip(part_features, part_cells):
+        for cell_id, cell_polygon in cells:
+            if cell_polygon is None or cell_polygon.is_empty:
+                continue
+            num_edges = (
+                len(cell_polygon.exterior.coords) - 1
+                if hasattr(cell_polygon, "exterior")
+                else 4
+            )
+            batches[index].add(cell_id, cell_polygon, resolution, num_edges)
+    return [batch.features(feedback) for batch in batches]
 
-    return _dggrid_gdf_to_qgs_features(gdf, field_name, resolution, feature, feedback)
+
+def qgsfeature2dggrid(
+    dggs_type, feature, resolution, predicate=None, compact=None, feedback=None
+):
+    if feedback:
+        feedback.pushInfo(f"Processing feature {feature.id()}")
+    return qgsfeatures2dggrid(dggs_type, [feature], resolution, predicate, feedback)[0]
+
+
+#######################
+# Conversion dispatch
+#######################
+DGGS_CONVERSION_FUNCTIONS = {
+    "h3": qgsfeature2h3,
+    "s2": qgsfeature2s2,
+    "a5": qgsfeature2a5,
+    "rhealpix": qgsfeature2rhealpix,
+    "isea4t": qgsfeature2isea4t,
+    "isea3h": qgsfeature2isea3h,
+    "qtm": qgsfeature2qtm,
+    "olc": qgsfeature2olc,
+    "geohash": qgsfeature2geohash,
+    "tilecode": qgsfeature2tilecode,
+    "quadkey": qgsfeature2quadkey,
+    "digipin": qgsfeature2digipin,
+}
+
+
+def dggs_conversion_function(dggs_type):
+    """``(feature, resolution, predicate, compact, feedback)`` converter of *dggs_type*.
+
+    *dggs_type* is a lowercase Vector2DGGS type such as ``h3``,
+    ``dggal_isea9r`` or ``dggrid_isea7h``. Returns None for unknown types.
+    """
+    if dggs_type.startswith("dggal_"):
+        return partial(qgsfeature2dggal, dggs_type[len("dggal_") :])
+    if dggs_type.startswith("dggrid_"):
+        return partial(qgsfeature2dggrid, dggs_type[len("dggrid_") :].upper())
+    return DGGS_CONVERSION_FUNCTIONS.get(dggs_type)
+
+
+CELL_POLYGON_FUNCTIONS = {
+    "h3": h32geo,
+    "s2": s22geo,
+    "a5": a52geo,
+    "rhealpix": rhealpix2geo,
+    "isea4t": isea4t2geo,
+    "isea3h": isea3h2geo,
+    "qtm": qtm2geo,
+    "olc": olc2geo,
+    "geohash": geohash2geo,
+    "tilecode": tilecode2geo,
+    "quadkey": quadkey2geo,
+    "digipin": digipin2geo,
+}
+
+
+def cell_polygon_function(dggs_type):
+    """``cell_id -> EPSG:4326 polygon`` decoder of Vector2DGGS type *dggs_type*.
+
+    Returns None for DGGRID types, whose cells always come with their
+    polygons, and for unknown types.
+    """
+    if dggs_type.startswith("dggal_"):
+        return partial(dggal2geo, dggs_type[len("dggal_") :])
+    return CELL_POLYGON_FUNCTIONS.get(dggs_type)
+
+
+def convert_feature_parts(
+    conversion_function,
+    feature,
+    resolution,
+    predicate=None,
+    compact=None,
+    feedback=None,
+):
+    """Cell features of *feature*, converting each part of a multipart geometry."""
+    feature_geom = feature.geometry()
+    flat_type = QgsWkbTypes.flatType(feature_geom.wkbType())
+
+    if flat_type == QgsWkbTypes.MultiPoint:
+        parts = [
+            QgsGeometry.fromPointXY(point) for point in feature_geom.asMultiPoint()
+        ]
+    elif flat_type == QgsWkbTypes.MultiLineString:
+        parts = [
+            QgsGeometry.fromPolylineXY(line) for line in feature_geom.asMultiPolyline()
+        ]
+    elif flat_type == QgsWkbTypes.MultiPolygon:
+        parts = [
+            QgsGeometry.fromPolygonXY(polygon)
+            for polygon in feature_geom.asMultiPolygon()
+        ]
+    else:  # Single part features
+        result = conversion_function(feature, resolution, predicate, compact, feedback)
+        return result if result is not None else []
+
+    cell_features = []
+    for part in parts:
+        part_feature = QgsFeature(feature)
+        part_feature.setGeometry(part)
+        result = conversion_function(
+            part_feature, resolution, predicate, compact, feedback
+        )
+        if result:
+            cell_features.extend(result)
+    return cell_features
@@ -32,7 +32,6 @@ from vgrid.conversion.dggs2geo.tilecode2geo import tilecode2geo
 from vgrid.dggs.rhealpixdggs.dggs import RHEALPixDGGS
 from vgrid.dggs.rhealpixdggs.ellipsoids import WGS84_ELLIPSOID
 from vgrid.utils.constants import DGGAL_TYPES
-from vgrid.utils.geometry import geodesic_dggs_metrics, graticule_dggs_metrics
 
 from dggal import *
 from ...utils.resampling import dggsgrid
@@ -57,18 +56,8 @@ if platform.system() == "Windows":
 
 
 def _geodesic_meta(cell_polygon, num_edges, cell_id, resolution):
-    center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-        geodesic_dggs_metrics(cell_polygon, num_edges)
-    )
-    return {
-        "id": cell_id,
-        "resolution": resolution,
-        "center_lat": center_lat,
-        "center_lon": center_lon,
-        "avg_edge_len": avg_edge_len,
-        "cell_area": cell_area,
-        "cell_perimeter": cell_perimeter,
-    }
+    # Metrics are filled in for all cells at once by build_binning_qgs_layer
+    return {"id": cell_id, "resolution": resolution, "num_edges": num_edges}
 
 
 def _h3_cell_builder(cell_id, resolution):
@@ -333,17 +322,7 @@ def raster2digipin(
         cell_polygon = digipin2geo(cid)
         if not cell_polygon or isinstance(cell_polygon, str):
             return None
-        clat, clon, cw, ch, carea, cperi = graticule_dggs_metrics(cell_polygon)
-        return cell_polygon, {
-            "id": cid,
-            "resolution": res,
-            "center_lat": clat,
-            "center_lon": clon,
-            "cell_width": cw,
-            "cell_height": ch,
-            "cell_area": carea,
-            "cell_perimeter": cperi,
-        }
+        return cell_polygon, {"id": cid, "resolution": res}
 
     def digipin_grid_gen(res, feat, fb):
         from vgrid.generator.digipingrid import digipin_grid
@@ -26,6 +26,9 @@ from vgrid.utils.io import (
     validate_raster_stats_option,
 )
 
+from ..cell_metrics import geodesic_cell_metrics, graticule_cell_metrics
+from .cell_batch import GEODESIC_FIELDS, GRATICULE_FIELDS
+
 
 def normalize_method(method: str) -> str:
     return normalize_raster2dggs_method(method)
@@ -269,7 +272,9 @@ def build_binning_qgs_layer(
     """
     Build a memory layer from a binning accumulator.
 
-    ``cell_builder(cell_id)`` returns ``(cell_polygon, id_value)`` or ``None`` to skip.
+    ``cell_builder(cell_id, resolution)`` returns ``(cell_polygon, meta)`` or
+    ``None`` to skip; ``meta`` holds the ``id`` and, for geodesic grids, the
+    cell's ``num_edges``. Cell metrics are computed for all cells in one pass.
     """
     crs_auth = raster_layer.crs().authid()
     layer = QgsVectorLayer(f"Polygon?crs={crs_auth}", layer_name, "memory")
@@ -286,6 +291,7 @@ def build_binning_qgs_layer(
     res_idx = fields.indexOf("resolution")
     band_start = fields.indexOf("band_1")
 
+    cells = []
     items = list(acc.items())
     total = len(items)
     for i, (cell_id, cell_acc) in enumerate(items):
@@ -297,26 +303,44 @@ def build_binning_qgs_layer(
         cell_polygon, meta = built
         if cell_polygon is None or cell_polygon.is_empty:
             continue
+        cells.append((cell_id, cell_polygon, meta, cell_acc))
+        if feedback and total:
+            feedback.setProgress(int(50 * i / total))
+
+    polygons = [cell_polygon for _, cell_polygon, _, _ in cells]
+    if digipin_metrics_fn:
+        names = GRATICULE_FIELDS
+        columns = graticule_cell_metrics(polygons)
+    else:
+        names = GEODESIC_FIELDS
+        columns = geodesic_cell_metrics(
+            polygons, [meta.get("num_edges", 4) for _, _, meta, _ in cells]
+        )
+    metric_idx = [fields.indexOf(name) for name in names]
+    columns = [column.tolist() for column in columns]
 
+    features = []
+    for i, (cell_id, cell_polygon, meta, cell_acc) in enumerate(cells):
+        if feedback and feedback.isCanceled():
+            return None
         band_values = finalize_dggs_band_values(cell_acc, stats)
         attrs = [None] * fields.count()
         attrs[id_idx] = meta.get("id", cell_id)
         attrs[res_idx] = resolution
-        for key, val in meta.items():
-            idx = fields.indexOf(key)
-            if idx >= 0:
-                attrs[idx] = val
+        for idx, column in zip(metric_idx, columns):
+            attrs[idx] = column[i]
         for bi, bv in enumerate(band_values):
             attrs[band_start + bi] = bv
 
         feat = QgsFeature(fields)
         feat.setGeometry(QgsGeometry.fromWkt(cell_polygon.wkt))
         feat.setAttributes(attrs)
-        provider.addFeature(feat)
+        features.append(feat)
 
-        if feedback and total:
-            feedback.setProgress(int(100 * i / total))
+        if feedback and cells:
+            feedback.setProgress(50 + int(50 * i / len(cells)))
 
+    provider.addFeatures(features)
     layer.updateExtents()
     return layer
 
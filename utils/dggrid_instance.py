@@ -28,6 +28,9 @@ DGGRID_TYPES_NO_ANTIMERIDIAN = frozenset(
     }
 )
 
+# Degrees added around the feature extents that clip a multi-feature grid
+_DGGRID_CLIP_MARGIN = 1e-6
+
 # DGGRID v8.43 accepts shapefile_id_field_length only in 1..50 (default 11).
 _DGGRID_SHAPEFILE_ID_FIELD_LENGTH_MAX = 50
 
@@ -380,8 +383,12 @@ def generate_grid_qgis(
     split_antimeridian=False,
     aggregate=False,
     options=None,
+    clip_geom=None,
 ):
-    """Same logic as vgrid.generator.dggridgen.generate_grid, without pyproj set_crs."""
+    """Same logic as vgrid.generator.dggridgen.generate_grid, without pyproj set_crs.
+
+    *clip_geom* (Shapely, EPSG:4326) clips the grid instead of the box of *bbox*.
+    """
     from shapely.geometry import box
 
     from vgrid.utils.io import (
@@ -394,7 +401,7 @@ def generate_grid_qgis(
     dggs_type = validate_dggrid_type(dggs_type)
     resolution = validate_dggrid_resolution(dggs_type, resolution)
     bbox = validate_bbox(bbox)
-    if bbox and is_full_world_bbox(bbox):
+    if bbox and is_full_world_bbox(bbox) and clip_geom is None:
         bbox = None
 
     if dggs_type in DGGRID_TYPES_NO_ANTIMERIDIAN:
@@ -403,7 +410,7 @@ def generate_grid_qgis(
 
     with patch_geopandas_for_dggrid_qgis():
         if bbox:
-            bounding_box = box(*bbox)
+            bounding_box = clip_geom if clip_geom is not None else box(*bbox)
             kwargs = {
                 "split_dateline": False,
                 "output_address_type": output_address_type,
@@ -563,90 +570,140 @@ def dggrid_bin_qgis(
     return gpd.GeoDataFrame(out, geometry="geometry", crs=grid_gdf.crs or "EPSG:4326")
 
 
-def vector_geom_to_dggrid_gdf_qgis(
+def vector_geoms_to_dggrid_cells_qgis(
     dggrid_instance,
     dggs_type,
-    shapely_geom,
+    shapely_geoms,
     resolution,
     predicate=None,
     output_address_type="SEQNUM",
     options=None,
+    feedback=None,
 ):
     """
-    DGGRID cells for one Shapely geometry (point/line/polygon).
-
-    Uses ``generate_grid_qgis`` / cached cell lookup instead of vgrid
-    ``vector2dggrid`` so pyproj is never invoked with EPSG:4326 inside QGIS.
+    DGGRID cells for many Shapely geometries (points/lines/polygons) at once.
+
+    All points go through one DGGRID point-to-cell run (and one run for their
+    cell polygons); lines and polygons share one grid clipped to the boxes of
+    their extents, whose cells are assigned back to them with an STRtree
+    join and the predicate. Returns one list of ``(cell_id, polygon)`` per
+    geometry, so a whole layer starts DGGRID a few times instead of once per
+    feature. Uses ``generate_grid_qgis`` so pyproj is never invoked with
+    EPSG:4326 inside QGIS.
     """
     import geopandas as gpd
+    import numpy as np
+    import shapely
 
-    from vgrid.utils.geometry import check_predicate
     from vgrid.utils.io import validate_dggrid_resolution, validate_dggrid_type
 
+    from .conversion.cell_cover import predicate_mask
+
     dggs_type = validate_dggrid_type(dggs_type)
     resolution = validate_dggrid_resolution(dggs_type, resolution)
-    geom_type = shapely_geom.geom_type
-
-    if geom_type == "Point":
-        cell_id = cached_latlon2dggrid(
-            dggrid_instance,
-            dggs_type,
-            float(shapely_geom.y),
-            float(shapely_geom.x),
-            resolution,
-            output_address_type,
+    cells = [[] for _ in shapely_geoms]
+
+    points = [i for i, geom in enumerate(shapely_geoms) if geom.geom_type == "Point"]
+    if points:
+        if feedback:
+            feedback.pushInfo(f"Locating {len(points)} point(s) in DGGRID cells...")
+        points_gdf = gpd.GeoDataFrame(
+            geometry=[shapely_geoms[i] for i in points], crs=None
         )
-        cell_geom = cached_dggrid_cell_geometry(
+        with patch_geopandas_for_dggrid_qgis():
+            points_gdf = dggrid_instance.cells_for_geo_points(
+                geodf_points_wgs84=points_gdf,
+                cell_ids_only=True,
+                dggs_type=dggs_type,
+                resolution=resolution,
+                output_address_type=output_address_type,
+            )
+        point_cell_ids = [normalize_dggrid_cell_id(v) for v in points_gdf["name"]]
+        lookup = batch_dggrid_cells_qgis(
             dggrid_instance,
             dggs_type,
-            cell_id,
+            sorted(set(filter(None, point_cell_ids))),
             resolution,
-            split_antimeridian=dggs_type not in DGGRID_TYPES_NO_ANTIMERIDIAN,
+            output_address_type=output_address_type,
             options=options,
+            feedback=feedback,
         )
-        id_col = (
-            "seqnum" if output_address_type == "SEQNUM" else output_address_type.lower()
-        )
-        return gpd.GeoDataFrame(
-            {id_col: [str(cell_id)], "geometry": [cell_geom]},
-            geometry="geometry",
-            crs=None,
+        for i, cell_id in zip(points, point_cell_ids):
+            info = lookup.get(cell_id)
+            if info:
+                cells[i].append((cell_id, info["geometry"]))
+
+    others = [
+        i
+        for i, geom in enumerate(shapely_geoms)
+        if geom.geom_type in ("LineString", "LinearRing", "Polygon")
+    ]
+    if not others:
+        return cells
+
+    # Padded so that the boxes of vertical or horizontal lines keep an area
+    bounds = np.asarray([shapely_geoms[i].bounds for i in others])
+    boxes = shapely.box(
+        bounds[:, 0] - _DGGRID_CLIP_MARGIN,
+        bounds[:, 1] - _DGGRID_CLIP_MARGIN,
+        bounds[:, 2] + _DGGRID_CLIP_MARGIN,
+        bounds[:, 3] + _DGGRID_CLIP_MARGIN,
+    )
+    clip_geom = shapely.union_all(boxes)
+    if feedback:
+        feedback.pushInfo(
+            f"Generating DGGRID {dggs_type} grid for {len(others)} geometries..."
         )
-
     gdf = generate_grid_qgis(
         dggrid_instance,
         dggs_type,
         resolution,
-        shapely_geom.bounds,
+        clip_geom.bounds,
         output_address_type=output_address_type,
         split_antimeridian=False,
         aggregate=False,
         options=options,
+        clip_geom=clip_geom,
     )
-
     if gdf is None or gdf.empty:
-        return gdf
-
-    if (
-        output_address_type == "SEQNUM"
-        and "name" in gdf.columns
-        and "seqnum" not in gdf.columns
-    ):
-        gdf = gdf.rename(columns={"name": "seqnum"})
-
-    if geom_type in ("LineString", "LinearRing"):
-        gdf = gdf[gdf.intersects(shapely_geom)]
-    elif geom_type == "Polygon":
-        if predicate:
-            gdf = gdf[
-                gdf.geometry.apply(
-                    lambda cell: check_predicate(cell, shapely_geom, predicate)
-                )
-            ]
-        else:
-            gdf = gdf[gdf.intersects(shapely_geom)]
+        return cells
 
-    return _ensure_active_geometry_qgis(gdf)
+    id_col = (
+        "seqnum" if output_address_type == "SEQNUM" else output_address_type.lower()
+    )
+    id_col = next(
+        (col for col in (id_col, "seqnum", "global_id", "name") if col in gdf.columns),
+        None,
+    )
+    if id_col is None:
+        return cells
+    grid_ids = [normalize_dggrid_cell_id(v) for v in gdf[id_col]]
+    grid_polygons = np.asarray(gdf.geometry.to_numpy(), dtype=object)
+
+    tree = shapely.STRtree(grid_polygons)
+    geoms = np.asarray([shapely_geoms[i] for i in others], dtype=object)
+    geom_index, cell_index = tree.query(geoms, predicate="intersects")
+    order = np.lexsort((cell_index, geom_index))  # grid order within a geometry
+    geom_index, cell_index = geom_index[order], cell_index[order]
+    starts = np.searchsorted(geom_index, np.arange(len(others) + 1))
+    for k, i in enumerate(others):
+        if feedback and feedback.isCanceled():
+            break
+        candidates = cell_index[starts[k] : starts[k + 1]]
+        if not len(candidates):
+            continue
+        geom = shapely_geoms[i]
+        matches = predicate_mask(
+            grid_polygons[candidates],
+            geom,
+            predicate if geom.geom_type == "Polygon" else None,
+        )
+        cells[i] = [
+            (grid_ids[c], grid_polygons[c])
+            for c in candidates[matches]
+            if grid_ids[c] is not None
+        ]
+    return cells
 
 
 def create_dggrid_instance(executable=None, feedback=None, **kwargs) -> DGGRIDv8:
@@ -775,9 +832,10 @@ def batch_dggrid_cells_qgis(
     metrics, and resolution. Also seeds the geometry WKT cache for reuse.
     """
     from vgrid.conversion.dggs2geo.dggrid2geo import dggrid2geo
-    from vgrid.utils.geometry import geodesic_dggs_metrics
     from vgrid.utils.io import validate_dggrid_resolution, validate_dggrid_type
 
+    from .cell_metrics import geodesic_cell_metrics, metric_rows
+
     dggs_type = validate_dggrid_type(dggs_type)
     resolution = validate_dggrid_resolution(dggs_type, resolution)
     split_antimeridian = dggs_type not in DGGRID_TYPES_NO_ANTIMERIDIAN
@@ -826,6 +884,17 @@ def batch_dggrid_cells_qgis(
     from vgrid.utils.geometry import dggrid_num_edges
 
     num_edges = dggrid_num_edges(dggs_type)
+    # Metrics of all non-empty polygons in one pass
+    geoms = list(gdf.geometry)
+    valid = [
+        i for i, geom in enumerate(geoms) if geom is not None and not geom.is_empty
+    ]
+    metrics = dict(
+        zip(
+            valid,
+            metric_rows(geodesic_cell_metrics([geoms[i] for i in valid], num_edges)),
+        )
+    )
     for idx in range(len(gdf)):
         if feedback and feedback.isCanceled():
             break
@@ -842,9 +911,7 @@ def batch_dggrid_cells_qgis(
         if not cell_id_str:
             continue
 
-        center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-            geodesic_dggs_metrics(geom, num_edges)
-        )
+        center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = metrics[idx]
         cell_info = {
             "geometry": geom,
             "cell_id": cell_id_str,
@@ -18,16 +18,13 @@ from qgis.core import (
     QgsGeometry,
 )
 from qgis.PyQt.QtCore import QVariant
+from ..conversion.cell_batch import CellBatch
 import h3
 from vgrid.dggs import s2, qtm, olc, mercantile
 from vgrid.dggs.qtm import QTM_INITIAL_FACETS
 from vgrid.generator.olcgrid import olc_refine_cell
 from vgrid.utils.antimeridian import fix_polygon
-from vgrid.utils.geometry import (
-    geodesic_dggs_metrics,
-    graticule_dggs_metrics,
-    graticule_dggs_to_geoseries,
-)
+from vgrid.utils.geometry import graticule_dggs_to_geoseries
 from vgrid.utils.constants import INITIAL_GEOHASHES
 from vgrid.utils.io import (
     is_full_world_bbox,
@@ -213,7 +210,7 @@ def generate_h3_grid(
             f"Generating H3 grid at resolution {resolution} with {total} cells..."
         )
 
-    h3_features = []
+    batch = CellBatch(None, "h3")
     for idx, h3_cell in enumerate(h3_cells):
         if feedback:
             if feedback.isCanceled():
@@ -228,24 +225,8 @@ def generate_h3_grid(
 
         h3_id = str(h3_cell)
         num_edges = 6 if not h3.is_pentagon(h3_id) else 5
-        center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-            geodesic_dggs_metrics(cell_polygon, num_edges)
-        )
 
-        qgs_feature = QgsFeature()
-        qgs_feature.setGeometry(QgsGeometry.fromWkt(cell_polygon.wkt))
-        qgs_feature.setAttributes(
-            [
-                h3_id,
-                resolution,
-                center_lat,
-                center_lon,
-                avg_edge_len,
-                cell_area,
-                cell_perimeter,
-            ]
-        )
-        h3_features.append(qgs_feature)
+        batch.add(h3_id, cell_polygon, resolution, num_edges)
 
     fields = QgsFields()
     fields.append(QgsField("h3", QVariant.String))
@@ -260,7 +241,7 @@ def generate_h3_grid(
     layer.startEditing()
     layer.dataProvider().addAttributes(fields)
     layer.updateFields()
-    layer.dataProvider().addFeatures(h3_features)
+    layer.dataProvider().addFeatures(batch.features(feedback))
     layer.commitChanges()
 
     if feedback:
@@ -300,7 +281,7 @@ def generate_s2_grid(
 
     covering = coverer.get_covering(region)
 
-    s2_features = []
+    batch = CellBatch(None, "s2")
     total = len(covering)
 
     if feedback:
@@ -321,24 +302,8 @@ def generate_s2_grid(
         if not cell_polygon.intersects(unified_geom):
             continue
         num_edges = 4
-        center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-            geodesic_dggs_metrics(cell_polygon, num_edges)
-        )
 
-        qgs_feature = QgsFeature()
-        qgs_feature.setGeometry(QgsGeometry.fromWkt(cell_polygon.wkt))
-        qgs_feature.setAttributes(
-            [
-                s2_token,
-                resolution,
-                center_lat,
-                center_lon,
-                avg_edge_len,
-                cell_area,
-                cell_perimeter,
-            ]
-        )
-        s2_features.append(qgs_feature)
+        batch.add(s2_token, cell_polygon, resolution, num_edges)
 
     fields = QgsFields()
     fields.append(QgsField("s2", QVariant.String))
@@ -352,12 +317,12 @@ def generate_s2_grid(
     layer.startEditing()
     layer.dataProvider().addAttributes(fields)
     layer.updateFields()
-    layer.dataProvider().addFeatures(s2_features)
+    layer.dataProvider().addFeatures(batch.features(feedback))
     layer.commitChanges()
 
     if feedback:
         feedback.pushInfo(
-            f"Completed generating S2 grid with {len(s2_features)} intersecting features."
+            f"Completed generating S2 grid with {len(batch)} intersecting features."
         )
 
     return layer
@@ -416,7 +381,7 @@ def generate_rhealpix_grid(
                     if neighbor_id not in covered_cells:
                         queue.append(neighbor)
 
-    rhealpix_features = []
+    batch = CellBatch(None, "rhealpix")
     cells_to_process = list(intersecting_cells.items())
     total = len(cells_to_process)
 
@@ -428,24 +393,8 @@ def generate_rhealpix_grid(
             continue
 
         num_edges = 3 if cell.ellipsoidal_shape() == "dart" else 4
-        center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-            geodesic_dggs_metrics(cell_polygon, num_edges)
-        )
 
-        feature = QgsFeature()
-        feature.setGeometry(QgsGeometry.fromWkt(cell_polygon.wkt))
-        feature.setAttributes(
-            [
-                cell_id,
-                resolution,
-                center_lat,
-                center_lon,
-                avg_edge_len,
-                cell_area,
-                cell_perimeter,
-            ]
-        )
-        rhealpix_features.append(feature)
+        batch.add(cell_id, cell_polygon, resolution, num_edges)
 
         if feedback and total:
             feedback.setProgress(int((i + 1) / total * 100))
@@ -462,13 +411,13 @@ def generate_rhealpix_grid(
     layer.startEditing()
     layer.dataProvider().addAttributes(fields)
     layer.updateFields()
-    layer.dataProvider().addFeatures(rhealpix_features)
+    layer.dataProvider().addFeatures(batch.features(feedback))
     layer.commitChanges()
     layer.updateExtents()
 
     if feedback:
         feedback.pushInfo(
-            f"Completed generating rHEALPix grid with {len(rhealpix_features)} features."
+            f"Completed generating rHEALPix grid with {len(batch)} features."
         )
         feedback.setProgress(100)
 
@@ -508,7 +457,7 @@ def generate_isea4t_grid(
             bounding_cell.get_cell_id(), bbox_polygon, resolution
         )
 
-    isea4t_features = []
+    batch = CellBatch(None, "isea4t")
 
     for i, child in enumerate(bounding_children):
         if feedback and feedback.isCanceled():
@@ -525,24 +474,8 @@ def generate_isea4t_grid(
             continue
 
         num_edges = 3
-        center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-            geodesic_dggs_metrics(cell_polygon, num_edges)
-        )
 
-        feature = QgsFeature()
-        feature.setGeometry(QgsGeometry.fromWkt(cell_polygon.wkt))
-        feature.setAttributes(
-            [
-                isea4t_id,
-                resolution,
-                center_lat,
-                center_lon,
-                avg_edge_len,
-                cell_area,
-                cell_perimeter,
-            ]
-        )
-        isea4t_features.append(feature)
+        batch.add(isea4t_id, cell_polygon, resolution, num_edges)
 
         if feedback:
             feedback.setProgress(int((i + 1) / len(bounding_children) * 100))
@@ -559,12 +492,12 @@ def generate_isea4t_grid(
     layer.startEditing()
     layer.dataProvider().addAttributes(fields)
     layer.updateFields()
-    layer.dataProvider().addFeatures(isea4t_features)
+    layer.dataProvider().addFeatures(batch.features(feedback))
     layer.commitChanges()
 
     if feedback:
         feedback.pushInfo(
-            f"Completed generating ISEA4T grid with {len(isea4t_features)} features."
+            f"Completed generating ISEA4T grid with {len(batch)} features."
         )
         feedback.setProgress(100)
 
@@ -593,7 +526,7 @@ def generate_qtm_grid(resolution, qgs_features, feedback=None):
 
     levelFacets = {}
     QTMID = {}
-    qtm_features = []
+    batch = CellBatch(None, "qtm")
 
     for lvl in range(resolution):
         if feedback and feedback.isCanceled():
@@ -616,24 +549,8 @@ def generate_qtm_grid(resolution, qgs_features, feedback=None):
                         continue
                     qtm_id = QTMID[0][i]
                     num_edges = 3
-                    center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-                        geodesic_dggs_metrics(facet_geom, num_edges)
-                    )
-
-                    feature = QgsFeature()
-                    feature.setGeometry(QgsGeometry.fromWkt(facet_geom.wkt))
-                    feature.setAttributes(
-                        [
-                            qtm_id,
-                            resolution,
-                            center_lat,
-                            center_lon,
-                            avg_edge_len,
-                            cell_area,
-                            cell_perimeter,
-                        ]
-                    )
-                    qtm_features.append(feature)
+
+                    batch.add(qtm_id, facet_geom, resolution, num_edges)
 
         else:
             for i, pf in enumerate(levelFacets[lvl - 1]):
@@ -649,28 +566,8 @@ def generate_qtm_grid(resolution, qgs_features, feedback=None):
                             if not shape(subfacet_geom).intersects(unified_geom):
                                 continue
                             num_edges = 3
-                            (
-                                center_lat,
-                                center_lon,
-                                avg_edge_len,
-                                cell_area,
-                                cell_perimeter,
-                            ) = geodesic_dggs_metrics(subfacet_geom, num_edges)
-
-                            feature = QgsFeature()
-                            feature.setGeometry(QgsGeometry.fromWkt(subfacet_geom.wkt))
-                            feature.setAttributes(
-                                [
-                                    new_id,
-                                    resolution,
-                                    center_lat,
-                                    center_lon,
-                                    avg_edge_len,
-                                    cell_area,
-                                    cell_perimeter,
-                                ]
-                            )
-                            qtm_features.append(feature)
+
+                            batch.add(new_id, subfacet_geom, resolution, num_edges)
 
     fields = QgsFields()
     fields.append(QgsField("qtm", QVariant.String))
@@ -684,12 +581,12 @@ def generate_qtm_grid(resolution, qgs_features, feedback=None):
     layer.startEditing()
     layer.dataProvider().addAttributes(fields)
     layer.updateFields()
-    layer.dataProvider().addFeatures(qtm_features)
+    layer.dataProvider().addFeatures(batch.features(feedback))
     layer.commitChanges()
     layer.updateExtents()
 
     if feedback:
-        feedback.pushInfo(f"Generated QTM grid with {len(qtm_features)} features.")
+        feedback.pushInfo(f"Generated QTM grid with {len(batch)} features.")
         feedback.setProgress(100)
 
     return layer
@@ -816,35 +713,7 @@ def _olc_record_id(record):
 
 def _olc_record_to_qgs_feature(record):
     if isinstance(record, QgsFeature):
-        field_names = record.fields().names()
-        if "center_lat" in field_names:
-            return record
-        olc_id = _olc_record_id(record)
-        cell_geom = record.geometry()
-        cell_polygon = load_wkt(cell_geom.asWkt())
-        (
-            center_lat,
-            center_lon,
-            cell_width,
-            cell_height,
-            cell_area,
-            cell_perimeter,
-        ) = graticule_dggs_metrics(cell_polygon)
-        feat = QgsFeature()
-        feat.setGeometry(cell_geom)
-        feat.setAttributes(
-            [
-                olc_id,
-                olc.decode(olc_id).codeLength,
-                center_lat,
-                center_lon,
-                cell_width,
-                cell_height,
-                cell_area,
-                cell_perimeter,
-            ]
-        )
-        return feat
+        return record
 
     cell_polygon = record["geometry"]
     feat = QgsFeature()
@@ -878,6 +747,7 @@ def _olc_build_layer(records, resolution, feedback=None):
 
     seen_olc_ids = set()
     qgis_features = []
+    batch = CellBatch(None, "olc", graticule=True)
     total = len(records)
     for idx, record in enumerate(records):
         if _olc_record_resolution(record) != resolution:
@@ -886,7 +756,15 @@ def _olc_build_layer(records, resolution, feedback=None):
         if olc_id in seen_olc_ids:
             continue
         seen_olc_ids.add(olc_id)
-        qgis_features.append(_olc_record_to_qgs_feature(record))
+        if (
+            isinstance(record, QgsFeature)
+            and "center_lat" not in record.fields().names()
+        ):
+            # Plain OLC cells: metrics are computed for all of them at once below
+            cell_polygon = load_wkt(record.geometry().asWkt())
+            batch.add(olc_id, cell_polygon, olc.decode(olc_id).codeLength)
+        else:
+            qgis_features.append(_olc_record_to_qgs_feature(record))
         if feedback and total:
             feedback.setProgress(int((idx + 1) / total * 100))
 
@@ -894,6 +772,7 @@ def _olc_build_layer(records, resolution, feedback=None):
     layer.startEditing()
     layer.dataProvider().addAttributes(fields)
     layer.updateFields()
+    qgis_features.extend(batch.features(feedback))
     layer.dataProvider().addFeatures(qgis_features)
     layer.commitChanges()
 
@@ -975,33 +854,10 @@ def generate_geohash_grid(resolution, qgs_features, feedback=None):
     fields.append(QgsField("cell_height", QVariant.Double))
     fields.append(QgsField("cell_area", QVariant.Double))
     fields.append(QgsField("cell_perimeter", QVariant.Double))
-    qgis_features = []
+    batch = CellBatch(None, "geohash", graticule=True)
     for i, gh in enumerate(geohashes_geom):
         cell_polygon = geohash2geo(gh)
-        (
-            center_lat,
-            center_lon,
-            cell_width,
-            cell_height,
-            cell_area,
-            cell_perimeter,
-        ) = graticule_dggs_metrics(cell_polygon)
-        cell_geometry = QgsGeometry.fromWkt(cell_polygon.wkt)
-        feat = QgsFeature()
-        feat.setGeometry(cell_geometry)
-        feat.setAttributes(
-            [
-                gh,
-                resolution,
-                center_lat,
-                center_lon,
-                cell_width,
-                cell_height,
-                cell_area,
-                cell_perimeter,
-            ]
-        )
-        qgis_features.append(feat)
+        batch.add(gh, cell_polygon, resolution)
 
         if feedback:
             feedback.setProgress(int((i + 1) / len(geohashes_geom) * 100))
@@ -1012,11 +868,11 @@ def generate_geohash_grid(resolution, qgs_features, feedback=None):
     layer.startEditing()
     layer.dataProvider().addAttributes(fields)
     layer.updateFields()
-    layer.dataProvider().addFeatures(qgis_features)
+    layer.dataProvider().addFeatures(batch.features(feedback))
     layer.commitChanges()
 
     if feedback:
-        feedback.pushInfo(f"Generated {len(qgis_features)} Geohash cells.")
+        feedback.pushInfo(f"Generated {len(batch)} Geohash cells.")
         feedback.setProgress(100)
 
     return layer
@@ -1046,7 +902,7 @@ def generate_tilecode_grid(resolution, qgs_features, feedback=None):
     fields.append(QgsField("cell_height", QVariant.Double))
     fields.append(QgsField("cell_area", QVariant.Double))
     fields.append(QgsField("cell_perimeter", QVariant.Double))
-    qgis_features = []
+    batch = CellBatch(None, "tilecode", graticule=True)
 
     # Step 4: Iterate over tiles and test intersection
     for i, tile in enumerate(tiles):
@@ -1064,30 +920,7 @@ def generate_tilecode_grid(resolution, qgs_features, feedback=None):
             ]
         )
 
-        cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
-        (
-            center_lat,
-            center_lon,
-            cell_width,
-            cell_height,
-            cell_area,
-            cell_perimeter,
-        ) = graticule_dggs_metrics(cell_polygon)
-        feature = QgsFeature()
-        feature.setGeometry(cell_geom)
-        feature.setAttributes(
-            [
-                tilecode_id,
-                resolution,
-                center_lat,
-                center_lon,
-                cell_width,
-                cell_height,
-                cell_area,
-                cell_perimeter,
-            ]
-        )
-        qgis_features.append(feature)
+        batch.add(tilecode_id, cell_polygon, resolution)
 
         if feedback:
             feedback.setProgress(int(i / total * 100))
@@ -1098,11 +931,11 @@ def generate_tilecode_grid(resolution, qgs_features, feedback=None):
     layer.startEditing()
     layer.dataProvider().addAttributes(fields)
     layer.updateFields()
-    layer.dataProvider().addFeatures(qgis_features)
+    layer.dataProvider().addFeatures(batch.features(feedback))
     layer.commitChanges()
 
     if feedback:
-        feedback.pushInfo(f"Generated {len(qgis_features)} Tilecode cells.")
+        feedback.pushInfo(f"Generated {len(batch)} Tilecode cells.")
         feedback.setProgress(100)
 
     return layer
@@ -1132,7 +965,7 @@ def generate_quadkey_grid(resolution, qgs_features, feedback=None):
     fields.append(QgsField("cell_height", QVariant.Double))
     fields.append(QgsField("cell_area", QVariant.Double))
     fields.append(QgsField("cell_perimeter", QVariant.Double))
-    qgis_features = []
+    batch = CellBatch(None, "quadkey", graticule=True)
 
     # Step 4: Iterate over tiles and test intersection
     for i, tile in enumerate(tiles):
@@ -1150,30 +983,7 @@ def generate_quadkey_grid(resolution, qgs_features, feedback=None):
             ]
         )
 
-        cell_geom = QgsGeometry.fromWkt(cell_polygon.wkt)
-        (
-            center_lat,
-            center_lon,
-            cell_width,
-            cell_height,
-            cell_area,
-            cell_perimeter,
-        ) = graticule_dggs_metrics(cell_polygon)
-        feature = QgsFeature()
-        feature.setGeometry(cell_geom)
-        feature.setAttributes(
-            [
-                quadkey_id,
-                resolution,
-                center_lat,
-                center_lon,
-                cell_width,
-                cell_height,
-                cell_area,
-                cell_perimeter,
-            ]
-        )
-        qgis_features.append(feature)
+        batch.add(quadkey_id, cell_polygon, resolution)
 
         if feedback:
             feedback.setProgress(int(i / total * 100))
@@ -1184,11 +994,11 @@ def generate_quadkey_grid(resolution, qgs_features, feedback=None):
     layer.startEditing()
     layer.dataProvider().addAttributes(fields)
     layer.updateFields()
-    layer.dataProvider().addFeatures(qgis_features)
+    layer.dataProvider().addFeatures(batch.features(feedback))
     layer.commitChanges()
 
     if feedback:
-        feedback.pushInfo(f"Generated {len(qgis_features)} Quadkey cells.")
+        feedback.pushInfo(f"Generated {len(batch)} Quadkey cells.")
         feedback.setProgress(100)
 
     return layer
@@ -1253,7 +1063,7 @@ def generate_a5_grid(
     fields.append(QgsField("avg_edge_len", QVariant.Double))
     fields.append(QgsField("cell_area", QVariant.Double))
     fields.append(QgsField("cell_perimeter", QVariant.Double))
-    a5_features = []
+    batch = CellBatch(None, "a5")
     total = len(intersecting_cells)
 
     if feedback:
@@ -1270,26 +1080,10 @@ def generate_a5_grid(
         num_edges = 5
         if a5.get_resolution(cell_id) == 1:
             num_edges = 3
-        center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-            geodesic_dggs_metrics(cell_polygon, num_edges)
-        )
 
-        qgs_feature = QgsFeature()
-        qgs_feature.setGeometry(QgsGeometry.fromWkt(cell_polygon.wkt))
-        qgs_feature.setAttributes(
-            [
-                a5_hex,
-                resolution,
-                center_lat,
-                center_lon,
-                avg_edge_len,
-                cell_area,
-                cell_perimeter,
-            ]
-        )
-        a5_features.append(qgs_feature)
+        batch.add(a5_hex, cell_polygon, resolution, num_edges)
 
-    if not a5_features:
+    if not batch:
         raise ValueError(
             "No A5 cells were generated. Check the input parameters and A5 library functions."
         )
@@ -1298,11 +1092,11 @@ def generate_a5_grid(
     layer.startEditing()
     layer.dataProvider().addAttributes(fields)
     layer.updateFields()
-    layer.dataProvider().addFeatures(a5_features)
+    layer.dataProvider().addFeatures(batch.features(feedback))
     layer.commitChanges()
 
     if feedback:
-        feedback.pushInfo(f"Generated {len(a5_features)} A5 cells.")
+        feedback.pushInfo(f"Generated {len(batch)} A5 cells.")
         feedback.setProgress(100)
 
     return layer
@@ -1363,7 +1157,7 @@ def generate_dggal_grid(
     fields.append(QgsField("cell_area", QVariant.Double))
     fields.append(QgsField("cell_perimeter", QVariant.Double))
 
-    dggal_features = []
+    batch = CellBatch(None, field_name)
     for idx, zone in enumerate(zones):
         if feedback:
             if feedback.isCanceled():
@@ -1379,26 +1173,10 @@ def generate_dggal_grid(
 
         num_edges = dggrs.countZoneEdges(zone)
         cell_resolution = dggrs.getZoneLevel(zone)
-        center_lat, center_lon, avg_edge_len, cell_area, cell_perimeter = (
-            geodesic_dggs_metrics(cell_polygon, num_edges)
-        )
 
-        qgs_feature = QgsFeature()
-        qgs_feature.setGeometry(QgsGeometry.fromWkt(cell_polygon.wkt))
-        qgs_feature.setAttributes(
-            [
-                zone_id,
-                cell_resolution,
-                center_lat,
-                center_lon,
-                avg_edge_len,
-                cell_area,
-                cell_perimeter,
-            ]
-        )
-        dggal_features.append(qgs_feature)
+        batch.add(zone_id, cell_polygon, cell_resolution, num_edges)
 
-    if not dggal_features:
+    if not batch:
         raise ValueError(
             f"No DGGAL cells generated for type {dggal_type!r} at resolution {resolution}."
         )
@@ -1409,7 +1187,7 @@ def generate_dggal_grid(
     layer.startEditing()
     layer.dataProvider().addAttributes(fields)
     layer.updateFields()
-    layer.dataProvider().addFeatures(dggal_features)
+    layer.dataProvider().addFeatures(batch.features(feedback))
     layer.commitChanges()
 
     if feedback:
@@ -50,6 +50,7 @@ from .dggsclient import DGGSClientWidget
 from .dggsjson2geojson import DGGSJSON2GeoJSONWidget
 from .utils import tr
 from .utils.dggs_viz_menu import setup_dggs_visualization_menus
+from .dggsgrid.overlay_manager import OverlayManager
 from .dggsgrid.h3grid import H3Grid
 from .dggsgrid.a5grid import A5Grid
 from .dggsgrid.s2grid import S2Grid
@@ -57,24 +58,7 @@ from .dggsgrid.rhealpixgrid import RhealpixGrid
 from .dggsgrid.isea4tgrid import ISEA4TGrid
 from .dggsgrid.isea3hgrid import ISEA3HGrid
 from .dggsgrid.easegrid import EASEGrid
-from .dggsgrid.dggal_gnosisgrid import DGGALGnosisGrid
-from .dggsgrid.dggal_isea3hgrid import DGGALISEA3HGrid
-from .dggsgrid.dggal_isea4rgrid import DGGALISEA4RGrid
-from .dggsgrid.dggal_isea7hgrid import DGGALISEA7HGrid
-from .dggsgrid.dggal_isea7h_z7grid import DGGALISEA7H_Z7Grid
-from .dggsgrid.dggal_isea9rgrid import DGGALISEA9RGrid
-from .dggsgrid.dggal_ivea3hgrid import DGGALIVEA3HGrid
-from .dggsgrid.dggal_ivea4rgrid import DGGALIVEA4RGrid
-from .dggsgrid.dggal_ivea7hgrid import DGGALIVEA7HGrid
-from .dggsgrid.dggal_ivea7h_z7grid import DGGALIVEA7H_Z7Grid
-from .dggsgrid.dggal_ivea9rgrid import DGGALIVEA9RGrid
-from .dggsgrid.dggal_rtea3hgrid import DGGALRTEA3HGrid
-from .dggsgrid.dggal_rtea4rgrid import DGGALRTEA4RGrid
-from .dggsgrid.dggal_rtea7hgrid import DGGALRTEA7HGrid
-from .dggsgrid.dggal_rtea7h_z7grid import DGGALRTEA7H_Z7Grid
-from .dggsgrid.dggal_rtea9rgrid import DGGALRTEA9RGrid
-from .dggsgrid.dggal_healpixgrid import DGGALHEALPixGrid
-from .dggsgrid.dggal_rhealpixgrid import DGGALRHEALPixGrid
+from .dggsgrid.dggalgrid import DGGALGrid
 
 from .dggsgrid.qtmgrid import QTMGrid
 from .dggsgrid.olcgrid import OLCGrid
@@ -122,6 +106,7 @@ class VgridTools(object):
         self.canvas = iface.mapCanvas()
         self.provider = VgridProvider()
 
+        self.overlay_manager = OverlayManager(self.canvas)
         self.h3grid = H3Grid(self, self.canvas, self.iface)
         self.a5grid = A5Grid(self, self.canvas, self.iface)
         self.s2grid = S2Grid(self, self.canvas, self.iface)
@@ -129,24 +114,24 @@ class VgridTools(object):
         self.isea4tgrid = ISEA4TGrid(self, self.canvas, self.iface)
         self.isea3hgrid = ISEA3HGrid(self, self.canvas, self.iface)
         self.easegrid = EASEGrid(self, self.canvas, self.iface)
-        self.dggal_gnosisgrid = DGGALGnosisGrid(self, self.canvas, self.iface)
-        self.dggal_isea3hgrid = DGGALISEA3HGrid(self, self.canvas, self.iface)
-        self.dggal_isea4rgrid = DGGALISEA4RGrid(self, self.canvas, self.iface)
-        self.dggal_isea7hgrid = DGGALISEA7HGrid(self, self.canvas, self.iface)
-        self.dggal_isea7h_z7grid = DGGALISEA7H_Z7Grid(self, self.canvas, self.iface)
-        self.dggal_isea9rgrid = DGGALISEA9RGrid(self, self.canvas, self.iface)
-        self.dggal_ivea3hgrid = DGGALIVEA3HGrid(self, self.canvas, self.iface)
-        self.dggal_ivea4rgrid = DGGALIVEA4RGrid(self, self.canvas, self.iface)
-        self.dggal_ivea7hgrid = DGGALIVEA7HGrid(self, self.canvas, self.iface)
-        self.dggal_ivea7h_z7grid = DGGALIVEA7H_Z7Grid(self, self.canvas, self.iface)
-        self.dggal_ivea9rgrid = DGGALIVEA9RGrid(self, self.canvas, self.iface)
-        self.dggal_rtea3hgrid = DGGALRTEA3HGrid(self, self.canvas, self.iface)
-        self.dggal_rtea4rgrid = DGGALRTEA4RGrid(self, self.canvas, self.iface)
-        self.dggal_rtea7hgrid = DGGALRTEA7HGrid(self, self.canvas, self.iface)
-        self.dggal_rtea7h_z7grid = DGGALRTEA7H_Z7Grid(self, self.canvas, self.iface)
-        self.dggal_rtea9rgrid = DGGALRTEA9RGrid(self, self.canvas, self.iface)
-        self.dggal_rhealpixgrid = DGGALRHEALPixGrid(self, self.canvas, self.iface)
-        self.dggal_healpixgrid = DGGALHEALPixGrid(self, self.canvas, self.iface)
+        self.dggal_gnosisgrid = DGGALGrid(self, self.canvas, self.iface, "gnosis")
+        self.dggal_isea3hgrid = DGGALGrid(self, self.canvas, self.iface, "isea3h")
+        self.dggal_isea4rgrid = DGGALGrid(self, self.canvas, self.iface, "isea4r")
+        self.dggal_isea7hgrid = DGGALGrid(self, self.canvas, self.iface, "isea7h")
+        self.dggal_isea7h_z7grid = DGGALGrid(self, self.canvas, self.iface, "isea7h_z7")
+        self.dggal_isea9rgrid = DGGALGrid(self, self.canvas, self.iface, "isea9r")
+        self.dggal_ivea3hgrid = DGGALGrid(self, self.canvas, self.iface, "ivea3h")
+        self.dggal_ivea4rgrid = DGGALGrid(self, self.canvas, self.iface, "ivea4r")
+        self.dggal_ivea7hgrid = DGGALGrid(self, self.canvas, self.iface, "ivea7h")
+        self.dggal_ivea7h_z7grid = DGGALGrid(self, self.canvas, self.iface, "ivea7h_z7")
+        self.dggal_ivea9rgrid = DGGALGrid(self, self.canvas, self.iface, "ivea9r")
+        self.dggal_rtea3hgrid = DGGALGrid(self, self.canvas, self.iface, "rtea3h")
+        self.dggal_rtea4rgrid = DGGALGrid(self, self.canvas, self.iface, "rtea4r")
+        self.dggal_rtea7hgrid = DGGALGrid(self, self.canvas, self.iface, "rtea7h")
+        self.dggal_rtea7h_z7grid = DGGALGrid(self, self.canvas, self.iface, "rtea7h_z7")
+        self.dggal_rtea9rgrid = DGGALGrid(self, self.canvas, self.iface, "rtea9r")
+        self.dggal_rhealpixgrid = DGGALGrid(self, self.canvas, self.iface, "rhealpix")
+        self.dggal_healpixgrid = DGGALGrid(self, self.canvas, self.iface, "healpix")
         self.qtmgrid = QTMGrid(self, self.canvas, self.iface)
         self.olcgrid = OLCGrid(self, self.canvas, self.iface)
         self.geohashgrid = GeohashGrid(self, self.canvas, self.iface)
@@ -738,6 +723,8 @@ class VgridTools(object):
                     dggrid_grid.cleanup()
                 except Exception:
                     pass
+        if getattr(self, "overlay_manager", None):
+            self.overlay_manager.cleanup()
         from .utils.dggrid_instance import reset_plugin_dggrid_instance
 
         reset_plugin_dggrid_instance()
@@ -1001,7 +988,8 @@ class VgridTools(object):
             )
 
     def clearDGGRIDCaches(self):
-        """Remove DGGRID cache artifacts (*.txt, meta*, temp*) from the dggrid folder."""
+        """Remove DGGRID cache artifacts (*.txt, meta*, temp*) and the overlay tile cache."""
+        from .dggsgrid.dggrid_tiles import clear_dggrid_tiles
         from .utils.dggrid_instance import (
             clear_dggrid_cache_files,
             reset_plugin_dggrid_instance,
@@ -1009,6 +997,7 @@ class VgridTools(object):
 
         reset_plugin_dggrid_instance()
         removed, errors = clear_dggrid_cache_files()
+        removed_tiles = clear_dggrid_tiles()
         if errors:
             detail = "\n".join(f"{name}: {err}" for name, err in errors[:10])
             QMessageBox.warning(
@@ -1016,13 +1005,15 @@ class VgridTools(object):
                 tr("Vgrid"),
                 tr(
                     "Removed {0} file(s). Some files could not be deleted:\n\n{1}"
-                ).format(len(removed), detail),
+                ).format(len(removed) + removed_tiles, detail),
             )
         else:
             QMessageBox.information(
                 self.iface.mainWindow(),
                 tr("Vgrid"),
-                tr("Removed {0} DGGRID cache file(s).").format(len(removed)),
+                tr("Removed {0} DGGRID cache file(s).").format(
+                    len(removed) + removed_tiles
+                ),
             )
 
     def VgridHome(self):